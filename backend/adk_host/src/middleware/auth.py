@@ -1,47 +1,334 @@
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
 import httpx
 
 from common.src.config import get_settings
 
+try:
+    from jose import jwt, JWTError
+except ImportError:  # local verification needs python-jose
+    jwt = None
+    JWTError = Exception
+
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
 settings = get_settings()
 
+def token_hash(token: str) -> str:
+    """SHA256 of a token, as stored in the auth service blacklist"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def verify_token_locally(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
+    """Verify signature, type and expiry; mirrors auth_service security.verify_token"""
+    try:
+        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+
+        if payload.get("type") != token_type:
+            logger.warning(f"Invalid token type. Expected: {token_type}, Got: {payload.get('type')}")
+            return None
+
+        exp = payload.get("exp")
+        if exp and datetime.now(timezone.utc) > datetime.fromtimestamp(exp, tz=timezone.utc):
+            logger.debug("Token has expired")
+            return None
+
+        return payload
+    except JWTError as e:
+        logger.warning(f"JWT verification failed: {e}")
+        return None
+
+def _unverified_exp(token: str) -> Optional[float]:
+    """``exp`` claim read without verification (only used to bound cache lifetime)"""
+    try:
+        segment = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+class TokenClaimsCache:
+    """LRU cache of authenticated users keyed by token hash
+
+    Entries live for ``ttl`` seconds but never past the token's own ``exp``.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[0])
+
+    def put(self, key: str, user: Dict[str, Any], exp: Optional[float]):
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        if expires_at <= time.time():
+            return
+        self._entries[key] = (dict(user), expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        self._entries.pop(key, None)
+
+    def discard_user(self, user_id: Any):
+        for key in [k for k, (user, _) in self._entries.items() if user.get("id") == user_id]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+class RevocationFeed:
+    """Revoked token hashes polled from the auth service blacklist
+
+    While the feed is stale (no successful poll for a few intervals) tokens
+    are verified by the auth service instead of locally. Polls page by the
+    blacklist's row id and re-read ``OVERLAP`` ids below the last version,
+    so rows whose transactions commit out of id order are still received.
+    """
+
+    STALE_AFTER_POLLS = 4
+    OVERLAP = 100
+
+    def __init__(self, auth_service_url: str, poll_seconds: int):
+        self.url = f"{auth_service_url}/api/v1/auth/revocations"
+        self.poll_seconds = poll_seconds
+        self._revoked: Dict[str, float] = {}
+        self._user_cutoffs: Dict[int, tuple] = {}
+        self.version: Optional[int] = None
+        self._last_success: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._on_revoke = []
+        self._on_revoke_user = []
+
+    def on_revoke(self, callback, user_callback=None):
+        self._on_revoke.append(callback)
+        if user_callback is not None:
+            self._on_revoke_user.append(user_callback)
+
+    @property
+    def fresh(self) -> bool:
+        return (
+            self._last_success is not None
+            and time.monotonic() - self._last_success < self.poll_seconds * self.STALE_AFTER_POLLS
+        )
+
+    def is_revoked(self, key: str) -> bool:
+        expires_at = self._revoked.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._revoked[key]
+            return False
+        return True
+
+    def is_user_revoked(self, payload: Dict[str, Any]) -> bool:
+        """Whether the token's user revoked all tokens issued before the cutoff second"""
+        try:
+            cutoff = self._user_cutoffs.get(int(payload.get("sub")))
+        except (TypeError, ValueError):
+            return False
+        return bool(cutoff) and cutoff[1] > time.time() and float(payload.get("iat") or 0) < cutoff[0]
+
+    async def poll(self, client: httpx.AsyncClient) -> int:
+        """Fetch revocations since the previous poll; returns how many were new"""
+        params = {"after_id": max(self.version - self.OVERLAP, 0)} if self.version is not None else None
+        response = await client.get(self.url, params=params, timeout=5.0)
+        response.raise_for_status()
+        data = response.json()
+
+        added = 0
+        # Entries in the overlap window repeat; only new ones notify callbacks
+        for entry in data.get("revoked", []):
+            key = entry["token_hash"]
+            is_new = key not in self._revoked
+            self._revoked[key] = datetime.fromisoformat(entry["expires_at"]).timestamp()
+            if is_new:
+                added += 1
+                for callback in self._on_revoke:
+                    callback(key)
+        for entry in data.get("revoked_users", []):
+            user_id = entry["user_id"]
+            # Truncated like iat; same-second tokens stay valid
+            issued_before = float(int(datetime.fromisoformat(entry["issued_before"]).timestamp()))
+            expires_at = datetime.fromisoformat(entry["expires_at"]).timestamp()
+            current = self._user_cutoffs.get(user_id)
+            if current is None or issued_before > current[0]:
+                added += 1
+                self._user_cutoffs[user_id] = (issued_before, max(expires_at, current[1] if current else 0))
+                for callback in self._on_revoke_user:
+                    callback(user_id)
+
+        now = time.time()
+        self._revoked = {k: v for k, v in self._revoked.items() if v > now}
+        self._user_cutoffs = {u: c for u, c in self._user_cutoffs.items() if c[1] > now}
+        self.version = data["version"]
+        self._last_success = time.monotonic()
+        return added
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, client: httpx.AsyncClient):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(client))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, client: httpx.AsyncClient):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                added = await self.poll(client)
+                if added:
+                    logger.info(f"🔒 {added} token revocation(s) received")
+            except Exception as e:
+                logger.warning(f"⚠️ Revocation feed poll failed: {e}")
+
 class AuthMiddleware:
     def __init__(self):
         self.auth_service_url = settings.auth_service_url or "http://auth-service:8003"
-    
+        self.local_verification = settings.auth_local_verification and jwt is not None
+        if settings.auth_local_verification and jwt is None:
+            logger.warning("⚠️ python-jose not installed, verifying every token with the auth service")
+        self.cache = TokenClaimsCache(settings.auth_claims_cache_ttl, settings.auth_claims_cache_size)
+        self.revocations = RevocationFeed(self.auth_service_url, settings.auth_revocation_poll_seconds)
+        self.revocations.on_revoke(self.cache.discard, self.cache.discard_user)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.remote_verifications = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=5.0))
+        return self._client
+
+    async def _ensure_revocation_feed(self):
+        """Load the revocation list before the first local verification, then keep polling"""
+        if not self.local_verification or self.revocations.started:
+            return
+        try:
+            await self.revocations.poll(self.client)
+        except Exception as e:
+            logger.warning(f"⚠️ Revocation feed unavailable, verifying with auth service: {e}")
+        self.revocations.start(self.client)
+
+    async def close(self):
+        await self.revocations.stop()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def get_current_user(
         self,
         credentials: HTTPAuthorizationCredentials = Depends(security)
     ) -> dict:
-        """Validate JWT token and return current user"""
+        """Validate JWT token and return current user
+
+        Tokens are verified in-process (signature, type, expiry) and the
+        resulting user is cached by token hash; the auth service is only
+        called when local verification is unavailable or the revocation feed
+        is stale. Locally verified users are built from token claims.
+        """
         token = credentials.credentials
-        
-        # Call auth service to verify token
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.auth_service_url}/verify-token",
-                    json={"token": token}
-                )
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Invalid authentication credentials",
-                        headers={"WWW-Authenticate": "Bearer"},
-                    )
-                
-                user_data = response.json()
-                return user_data
-                
-            except httpx.RequestError:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="Authentication service unavailable"
-                )
+        key = token_hash(token)
+
+        await self._ensure_revocation_feed()
+        if self.revocations.is_revoked(key):
+            self.cache.discard(key)
+            raise self._unauthorized()
+
+        user = self.cache.get(key)
+        if user is not None:
+            return user
+
+        if self.local_verification and self.revocations.fresh:
+            payload = verify_token_locally(token)
+            if payload is None or self.revocations.is_user_revoked(payload):
+                raise self._unauthorized()
+            user = self._user_from_claims(payload)
+            exp = payload.get("exp")
+        else:
+            user = await self._verify_remotely(token)
+            exp = _unverified_exp(token)
+
+        self.cache.put(key, user, exp)
+        return user
+
+    async def _verify_remotely(self, token: str) -> dict:
+        """Call auth service to verify token"""
+        self.remote_verifications += 1
+        try:
+            response = await self.client.post(
+                f"{self.auth_service_url}/api/v1/auth/verify-token",
+                json={"token": token}
+            )
+        except httpx.RequestError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service unavailable"
+            )
+
+        if response.status_code != 200:
+            raise self._unauthorized()
+
+        return response.json()
+
+    @staticmethod
+    def _user_from_claims(payload: Dict[str, Any]) -> dict:
+        sub = payload.get("sub")
+        return {
+            "id": int(sub) if isinstance(sub, str) and sub.isdigit() else sub,
+            "email": payload.get("email"),
+            "role": payload.get("role"),
+        }
+
+    @staticmethod
+    def _unauthorized() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "local_verification": self.local_verification,
+            "revocation_feed_fresh": self.revocations.fresh,
+            "remote_verifications": self.remote_verifications,
+            "claims_cache": self.cache.stats(),
+        }
 
 # Create singleton instance
 auth_middleware = AuthMiddleware()
@@ -59,4 +346,4 @@ def require_role(allowed_roles: List[str]):
                 detail=f"User role '{current_user.get('role')}' not authorized for this action"
             )
         return current_user
-    return role_checker 
\ No newline at end of file
+    return role_checker
@@ -0,0 +1,212 @@
+"""Tests for local JWT verification, the claims cache and the revocation feed."""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-for-testing-only-32-chars")
+os.environ.setdefault("GCP_PROJECT_ID", "test-project")
+os.environ.setdefault("GCS_BUCKET_NAME", "test-bucket")
+os.environ.setdefault("GEMINI_MODEL", "gemini-2.5-flash")
+
+# Import as the adk_host.src package so common.src resolves
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from jose import jwt
+
+from adk_host.src.middleware import auth
+from adk_host.src.middleware.auth import (
+    AuthMiddleware,
+    TokenClaimsCache,
+    token_hash,
+    verify_token_locally,
+)
+
+
+def make_token(user_id=1, token_type="access", expires_in=timedelta(minutes=30), issued_at=None):
+    issued_at = issued_at or datetime.now(timezone.utc)
+    claims = {
+        "sub": str(user_id),
+        "email": f"user{user_id}@example.com",
+        "role": "teacher",
+        "type": token_type,
+        "iat": int(issued_at.timestamp()),
+        "exp": int((issued_at + expires_in).timestamp()),
+    }
+    return jwt.encode(claims, auth.settings.jwt_secret_key, algorithm=auth.settings.jwt_algorithm)
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+class FakeAuthService:
+    """Serves /revocations and /verify-token for a middleware under test"""
+
+    def __init__(self):
+        self.revoked = []
+        self.revoked_users = []
+        self.feed_available = True
+        self.feed_polls = 0
+        self.verify_calls = 0
+
+    def revoke(self, token):
+        self.revoked.append({
+            "token_hash": token_hash(token),
+            "expires_at": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+        })
+
+    def revoke_user(self, user_id, issued_before):
+        self.revoked_users.append({
+            "user_id": user_id,
+            "issued_before": issued_before.isoformat(),
+            "expires_at": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+        })
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/revocations"):
+            self.feed_polls += 1
+            if not self.feed_available:
+                return httpx.Response(503)
+            return httpx.Response(200, json={
+                "revoked": self.revoked,
+                "revoked_users": self.revoked_users,
+                "version": len(self.revoked) + len(self.revoked_users),
+                "as_of": datetime.now(timezone.utc).isoformat(),
+            })
+        if request.url.path.endswith("/verify-token"):
+            self.verify_calls += 1
+            return httpx.Response(200, json={"id": 1, "email": "remote@example.com", "role": "teacher"})
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def service():
+    return FakeAuthService()
+
+
+@pytest_asyncio.fixture
+async def middleware(service):
+    middleware = AuthMiddleware()
+    middleware.local_verification = True
+    middleware._client = httpx.AsyncClient(transport=httpx.MockTransport(service.handler))
+    yield middleware
+    await middleware.close()
+
+
+class TestVerifyTokenLocally:
+    def test_valid_access_token(self):
+        payload = verify_token_locally(make_token(user_id=5))
+        assert payload["sub"] == "5"
+
+    def test_expired_token_rejected(self):
+        token = make_token(issued_at=datetime.now(timezone.utc) - timedelta(hours=2), expires_in=timedelta(hours=1))
+        assert verify_token_locally(token) is None
+
+    def test_wrong_token_type_rejected(self):
+        assert verify_token_locally(make_token(token_type="refresh")) is None
+
+    def test_bad_signature_rejected(self):
+        token = jwt.encode({"sub": "1", "type": "access"}, "another-secret-key-that-is-long-enough", algorithm="HS256")
+        assert verify_token_locally(token) is None
+
+
+class TestTokenClaimsCache:
+    def test_entry_expires_after_ttl(self, monkeypatch):
+        now = [1_000_000.0]
+        monkeypatch.setattr(auth.time, "time", lambda: now[0])
+        cache = TokenClaimsCache(ttl=60, max_size=10)
+
+        cache.put("k", {"id": 1}, exp=None)
+        now[0] += 59
+        assert cache.get("k") == {"id": 1}
+        now[0] += 2
+        assert cache.get("k") is None
+        assert cache.stats() == {"size": 0, "hits": 1, "misses": 1}
+
+    def test_entry_never_outlives_token(self, monkeypatch):
+        now = [1_000_000.0]
+        monkeypatch.setattr(auth.time, "time", lambda: now[0])
+        cache = TokenClaimsCache(ttl=300, max_size=10)
+
+        cache.put("k", {"id": 1}, exp=now[0] + 10)
+        now[0] += 11
+        assert cache.get("k") is None
+
+    def test_least_recently_used_evicted(self):
+        cache = TokenClaimsCache(ttl=60, max_size=2)
+        cache.put("a", {"id": 1}, exp=None)
+        cache.put("b", {"id": 2}, exp=None)
+        cache.get("a")
+        cache.put("c", {"id": 3}, exp=None)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"id": 1}
+
+
+class TestAuthMiddleware:
+    @pytest.mark.asyncio
+    async def test_local_verification_skips_auth_service(self, middleware, service):
+        token = make_token(user_id=4)
+
+        for _ in range(5):
+            user = await middleware.get_current_user(bearer(token))
+
+        assert user == {"id": 4, "email": "user4@example.com", "role": "teacher"}
+        assert service.verify_calls == 0
+        assert service.feed_polls == 1
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_rejected_after_poll(self, middleware, service):
+        token = make_token(user_id=4)
+        await middleware.get_current_user(bearer(token))
+
+        service.revoke(token)
+        # Still served from the cache until the feed polls
+        assert (await middleware.get_current_user(bearer(token)))["id"] == 4
+
+        assert await middleware.revocations.poll(middleware.client) == 1
+        with pytest.raises(HTTPException) as exc_info:
+            await middleware.get_current_user(bearer(token))
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_same_second_relogin_survives_user_revocation(self, middleware, service):
+        cutoff = datetime.now(timezone.utc).replace(microsecond=700000)
+        service.revoke_user(4, issued_before=cutoff)
+        await middleware.revocations.poll(middleware.client)
+
+        old = make_token(user_id=4, issued_at=cutoff - timedelta(seconds=1))
+        relogin = make_token(user_id=4, issued_at=cutoff)
+
+        assert (await middleware.get_current_user(bearer(relogin)))["id"] == 4
+        with pytest.raises(HTTPException):
+            await middleware.get_current_user(bearer(old))
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_auth_service_when_feed_unavailable(self, middleware, service):
+        service.feed_available = False
+
+        user = await middleware.get_current_user(bearer(make_token(user_id=4)))
+
+        assert user == {"id": 1, "email": "remote@example.com", "role": "teacher"}
+        assert service.verify_calls == 1
+        assert middleware.get_stats()["revocation_feed_fresh"] is False
+
+    @pytest.mark.asyncio
+    async def test_expired_token_rejected_without_remote_call(self, middleware, service):
+        token = make_token(issued_at=datetime.now(timezone.utc) - timedelta(hours=2), expires_in=timedelta(hours=1))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await middleware.get_current_user(bearer(token))
+
+        assert exc_info.value.status_code == 401
+        assert service.verify_calls == 0
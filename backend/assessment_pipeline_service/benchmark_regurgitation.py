@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark the indexed regurgitation detector on large source documents
+Compares against the previous per-query SequenceMatcher / substring scan
+implementation and checks both produce identical reports
+"""
+
+import asyncio
+import difflib
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from assessment_pipeline_service.src.quality_assurance import RegurgitationDetector, SourceTextIndex
+
+WORDS_PER_PAGE = 500
+
+VOCABULARY = (
+    "reading fluency comprehension decoding phonological awareness working memory processing speed "
+    "verbal reasoning math calculation problem solving written expression spelling attention "
+    "classroom teacher reports observation accommodations intervention progress benchmark "
+    "assessment standard score percentile average below above range grade level peers "
+    "the and of to in with student will when given during demonstrate show"
+).split()
+
+
+class LegacyRegurgitationDetector(RegurgitationDetector):
+    """Pre-index implementation: every query re-analyses the whole source"""
+
+    def _calculate_comprehensive_similarity(self, text1, text2):
+        if isinstance(text2, SourceTextIndex):
+            text2 = text2.text
+        if not text1 or not text2:
+            return 0.0
+        tokens1 = [w for w in re.findall(r'\b\w+\b', text1.lower()) if w not in self.stop_words and len(w) > 2]
+        tokens2 = [w for w in re.findall(r'\b\w+\b', text2.lower()) if w not in self.stop_words and len(w) > 2]
+        if not tokens1 or not tokens2:
+            return 0.0
+        set1, set2 = set(tokens1), set(tokens2)
+        jaccard = len(set1 & set2) / len(set1 | set2) if set1 | set2 else 0
+        sequence_sim = difflib.SequenceMatcher(None, tokens1, tokens2).ratio()
+        ngram_sim = self._calculate_ngram_similarity(tokens1, tokens2, n=3)
+        return min(1.0, jaccard * 0.4 + sequence_sim * 0.3 + ngram_sim * 0.3)
+
+    def _identify_flagged_passages(self, generated_text, source_text, similarity_threshold=0.75):
+        if isinstance(source_text, SourceTextIndex):
+            source_text = source_text.text
+        flagged = []
+        sentences = [s.strip() for s in re.split(r'[.!?]+', generated_text) if s.strip()]
+        words = generated_text.split()
+        chunks = [' '.join(words[i:i + 15]) for i in range(0, len(words), 5)]
+        chunks = [c for c in chunks if len(c) > 50]
+        for sentence in sentences:
+            if len(sentence) < 30:
+                continue
+            sim = self._calculate_comprehensive_similarity(self._clean_text(sentence), source_text)
+            if sim >= similarity_threshold:
+                flagged.append((sentence, sim))
+        for chunk in chunks:
+            sim = self._calculate_comprehensive_similarity(self._clean_text(chunk), source_text)
+            if sim >= similarity_threshold * 1.1:
+                flagged.append((chunk, sim))
+        unique = {}
+        for passage, sim in flagged:
+            key = passage[:50]
+            if key not in unique or sim > unique[key][1]:
+                unique[key] = (passage, sim)
+        return sorted(unique.values(), key=lambda x: x[1], reverse=True)
+
+    def _detect_common_phrases(self, generated_content, source_documents):
+        source_text = self._clean_text(" ".join(source_documents))
+        all_generated = self._clean_text(" ".join(generated_content.values()))
+        common = []
+        source_words = source_text.split()
+        for length in range(3, 9):
+            for i in range(len(source_words) - length + 1):
+                phrase = ' '.join(source_words[i:i + length])
+                if all(w in self.stop_words for w in phrase.split()):
+                    continue
+                if phrase in all_generated:
+                    common.append({"phrase": phrase, "length": length,
+                                   "appears_in_source": True, "appears_in_generated": True})
+        return sorted(common, key=lambda x: x['length'], reverse=True)[:10]
+
+
+def make_source(pages: int, rng: random.Random) -> str:
+    sentences = []
+    for _ in range(pages * WORDS_PER_PAGE // 12):
+        sentences.append(" ".join(rng.choice(VOCABULARY) for _ in range(12)).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def make_generated(source: str, rng: random.Random) -> dict:
+    source_sentences = source.split(". ")
+    sections = {}
+    for name in ["present_levels", "strengths", "needs", "goals", "accommodations"]:
+        parts = []
+        for _ in range(20):
+            if rng.random() < 0.3:
+                parts.append(rng.choice(source_sentences))  # Copied from the source
+            else:
+                parts.append(" ".join(rng.choice(VOCABULARY) for _ in range(14)))
+        sections[name] = ". ".join(parts) + "."
+    return sections
+
+
+async def run(pages: int):
+    rng = random.Random(pages)
+    source = make_source(pages, rng)
+    generated = make_generated(source, rng)
+
+    start = time.perf_counter()
+    legacy = await LegacyRegurgitationDetector().detect_regurgitation(generated, [source], 0.10)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = await RegurgitationDetector().detect_regurgitation(generated, [source], 0.10)
+    indexed_seconds = time.perf_counter() - start
+
+    assert indexed == legacy, "Indexed detector diverged from the legacy implementation"
+    print(f"{pages:>3} pages: legacy {legacy_seconds:7.2f}s  indexed {indexed_seconds:6.2f}s  "
+          f"speedup {legacy_seconds / indexed_seconds:5.1f}x  "
+          f"({indexed['similarity_percentage']}% similarity, {len(indexed['flagged_passages'])} flagged)")
+
+
+def main():
+    for pages in [5, 20, 50]:
+        asyncio.run(run(pages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark inter-service calls through the pooled HTTP client
+Compares against the previous client-per-request implementation using a
+local keep-alive HTTP server standing in for the special education service
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from assessment_pipeline_service.src.service_clients import PooledHTTPClient, SpecialEducationServiceClient
+
+CALLS = 300
+CONCURRENCY = 10
+
+
+class LegacySpecialEducationServiceClient(SpecialEducationServiceClient):
+    """Pre-pool implementation: a new AsyncClient (and connection) per call"""
+
+    async def _execute_request(self, method, url, **kwargs):
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response.json()
+
+
+async def handle_connection(reader, writer, counter):
+    """Minimal HTTP/1.1 keep-alive server answering every request with JSON"""
+    counter["connections"] += 1
+    body = json.dumps({"id": "doc-1", "status": "ok"}).encode()
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.decode().split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run(client, base_url):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def call(n):
+        async with semaphore:
+            await client.update_assessment_document(f"doc-{n}", {"processing_status": "processing"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(n) for n in range(CALLS)))
+    return time.perf_counter() - start
+
+
+async def main():
+    counter = {"connections": 0}
+    server = await asyncio.start_server(lambda r, w: handle_connection(r, w, counter), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    print(f"{CALLS} document updates, {CONCURRENCY} concurrent")
+
+    legacy_time = await run(LegacySpecialEducationServiceClient(base_url=base_url), base_url)
+    legacy_connections = counter["connections"]
+    print(f"  client per request: {legacy_time:.2f}s, {legacy_connections} connections")
+
+    counter["connections"] = 0
+    pool = PooledHTTPClient()
+    pooled_time = await run(SpecialEducationServiceClient(base_url=base_url, http_client=pool), base_url)
+    metrics = pool.get_metrics()
+    await pool.close()
+    print(f"  pooled client:      {pooled_time:.2f}s, {counter['connections']} connections")
+    print(f"  pool metrics: {json.dumps(metrics)}")
+    print(f"  speedup: {legacy_time / pooled_time:.1f}x")
+
+    server.close()
+    await server.wait_closed()
+
+    assert metrics["requests"] == CALLS and metrics["errors"] == 0
+    assert counter["connections"] <= CONCURRENCY
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
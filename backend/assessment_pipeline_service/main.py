@@ -47,6 +47,10 @@ async def lifespan(app: FastAPI):
         # Assessment pipeline models are now integrated into the special education service
         logger.info("Assessment pipeline service ready - using shared database")
         
+        # One pooled HTTP client for all inter-service calls
+        from assessment_pipeline_service.src.service_clients import get_shared_http_client
+        await get_shared_http_client().start()
+        
     except Exception as e:
         logger.error(f"Failed to initialize service: {e}")
         raise
@@ -55,6 +59,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Assessment Pipeline Service shutting down...")
+    from assessment_pipeline_service.src.service_clients import close_shared_http_client
+    await close_shared_http_client()
 
 # Create FastAPI app
 app = FastAPI(
@@ -108,7 +114,7 @@ async def health_check():
         db_healthy = await check_database_connection()
         
         # Check auth service connection
-        from assessment_pipeline_service.src.service_clients import auth_client
+        from assessment_pipeline_service.src.service_clients import auth_client, get_shared_http_client
         auth_health = await auth_client.health_check()
         auth_healthy = auth_health.get("healthy", False)
         
@@ -131,7 +137,8 @@ async def health_check():
             "dependencies": {
                 "special_education_service": "connected" if db_healthy else "disconnected",
                 "auth_service": auth_health
-            }
+            },
+            "http_pool": get_shared_http_client().get_metrics()
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -3,6 +3,7 @@ Stage 1: Assessment document intake and processing
 """
 import re
 import json
+import asyncio
 import logging
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
@@ -103,13 +104,13 @@ class AssessmentIntakeProcessor:
         
         logger.info(f"Processing assessment document: {document_path}")
         
+        # Process with Document AI once and detect the type from its text
+        document = await self._process_with_document_ai(document_path)
+        
         # Detect assessment type
-        assessment_type = await self._detect_assessment_type(document_path)
+        assessment_type = await self._detect_assessment_type(document_path, document=document)
         logger.info(f"Detected assessment type: {assessment_type}")
         
-        # Process with Document AI
-        document = await self._process_with_document_ai(document_path)
-        
         # Store Document AI confidence for overall confidence calculation
         doc_ai_confidence = self._extract_document_ai_confidence(document)
         
@@ -178,20 +179,27 @@ class AssessmentIntakeProcessor:
         logger.warning("No Document AI confidence data available")
         return 0.85  # Default confidence if none available
     
-    async def _detect_assessment_type(self, document_path: str) -> AssessmentType:
-        """Auto-detect the type of assessment using ML classifier and pattern matching"""
+    async def _detect_assessment_type(
+        self,
+        document_path: str,
+        document: Optional[documentai.Document] = None
+    ) -> AssessmentType:
+        """Auto-detect the type of assessment using ML classifier and pattern matching
+        
+        Pass an already processed ``document`` to avoid a second Document AI call.
+        """
         
         logger.info(f"Auto-detecting assessment type for: {document_path}")
         
         # First, try Document AI for quick text extraction
         try:
-            document = await self._process_with_document_ai(document_path)
+            if document is None:
+                document = await self._process_with_document_ai(document_path)
             text = document.text.lower()
         except Exception as e:
             logger.warning(f"Document AI extraction failed, using fallback: {e}")
             # Fallback to basic file reading
-            with open(document_path, 'rb') as f:
-                content = f.read()
+            content = await asyncio.to_thread(Path(document_path).read_bytes)
             text = str(content).lower()
         
         # Enhanced pattern matching with confidence scoring
@@ -290,8 +298,7 @@ class AssessmentIntakeProcessor:
         """Process document with Google Document AI"""
         
         # Read document
-        with open(document_path, 'rb') as f:
-            content = f.read()
+        content = await asyncio.to_thread(Path(document_path).read_bytes)
         
         # Determine MIME type
         mime_type = self._get_mime_type(document_path)
@@ -305,8 +312,9 @@ class AssessmentIntakeProcessor:
             )
         )
         
-        # Process document
-        result = self.client.process_document(request=request)
+        # Process document off the event loop; the client call blocks for the
+        # whole OCR round trip
+        result = await asyncio.to_thread(self.client.process_document, request=request)
         
         return result.document
     
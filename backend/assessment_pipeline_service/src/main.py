@@ -16,6 +16,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from api.processing_routes import router as processing_router
 from src.service_communication import service_comm_manager
+from src.service_clients import get_shared_http_client, close_shared_http_client
 
 # Configure logging
 logging.basicConfig(
@@ -31,11 +32,13 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Starting Assessment Pipeline Service v2.0.0")
     logger.info("📊 Architecture: Processing-only microservice")
     logger.info("🔗 Service communication: Enabled")
+    await get_shared_http_client().start()
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Assessment Pipeline Service")
+    await close_shared_http_client()
 
 # Create FastAPI application
 app = FastAPI(
@@ -4,6 +4,7 @@ Coordinates the entire flow from document upload to RAG-enhanced IEP generation
 """
 import logging
 import asyncio
+import os
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from uuid import UUID, uuid4
@@ -73,8 +74,13 @@ class PipelineStage:
 class AssessmentPipelineOrchestrator:
     """Orchestrates the complete assessment pipeline from upload to IEP generation"""
     
-    def __init__(self):
+    def __init__(self, max_concurrent_documents: Optional[int] = None):
         self.intake_processor = AssessmentIntakeProcessor()
+        
+        # Documents in a run are sent to Document AI concurrently, up to this cap
+        self.max_concurrent_documents = max_concurrent_documents or int(
+            os.getenv("PIPELINE_MAX_CONCURRENT_DOCUMENTS", "4")
+        )
         self.quantification_engine = QuantificationEngine()
         self.rag_integration = RAGIntegrationService()
         
@@ -143,18 +149,9 @@ class AssessmentPipelineOrchestrator:
             stage_1.start()
             
             try:
-                extracted_data = []
-                for doc in assessment_documents:
-                    # Process each document through Document AI
-                    extraction_result = await self.intake_processor.process_document(
-                        file_path=doc.file_path,
-                        assessment_type=doc.assessment_type,
-                        metadata={
-                            "student_id": student_id,
-                            "document_id": doc.document_id if hasattr(doc, 'document_id') else str(uuid4())
-                        }
-                    )
-                    extracted_data.append(extraction_result)
+                extracted_data = await self._process_documents_concurrently(
+                    student_id, assessment_documents
+                )
                 
                 # Calculate overall extraction confidence
                 confidences = [data.extraction_confidence for data in extracted_data if data.extraction_confidence]
@@ -235,6 +232,37 @@ class AssessmentPipelineOrchestrator:
             self._fail_pipeline(str(e))
             raise
     
+    async def _process_documents_concurrently(
+        self,
+        student_id: str,
+        assessment_documents: List[AssessmentUploadDTO]
+    ) -> List[ExtractedDataDTO]:
+        """Run Document AI intake for all documents with bounded concurrency
+        
+        Results keep the input order. If any document fails, the remaining
+        ones are cancelled and the error is raised.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_documents)
+        
+        async def process_one(doc: AssessmentUploadDTO) -> ExtractedDataDTO:
+            async with semaphore:
+                return await self.intake_processor.process_document(
+                    file_path=doc.file_path,
+                    assessment_type=getattr(doc, 'document_type', None),
+                    metadata={
+                        "student_id": student_id,
+                        "document_id": doc.document_id if hasattr(doc, 'document_id') else str(uuid4())
+                    }
+                )
+        
+        tasks = [asyncio.create_task(process_one(doc)) for doc in assessment_documents]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            raise
+    
     async def execute_partial_pipeline(
         self,
         student_id: str,
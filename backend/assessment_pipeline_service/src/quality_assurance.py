@@ -5,7 +5,7 @@ Implements quality gates for RAG-enhanced content generation
 import re
 import logging
 import difflib
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 import numpy as np
 from collections import Counter
@@ -220,6 +220,88 @@ class QualityAssuranceEngine:
         return recommendations
 
 
+class SourceTextIndex:
+    """Precomputed view of the cleaned source text for one review
+
+    Built once per regurgitation review so that every section, sentence and
+    chunk query runs against the index instead of re-tokenizing and
+    re-analysing the whole source:
+
+    - the filtered token set and trigram shingle set answer the Jaccard and
+      n-gram similarity in time proportional to the query
+    - a SequenceMatcher holds the source as its cached second sequence, so
+      its junk/popularity analysis of the source is done once
+    """
+
+    def __init__(self, text: str, stop_words: set, ngram_size: int = 3):
+        self.text = text
+        self.ngram_size = ngram_size
+        self.tokens = [
+            word for word in re.findall(r'\b\w+\b', text.lower())
+            if word not in stop_words and len(word) > 2
+        ]
+        self.token_set = set(self.tokens)
+        self.ngrams = set(
+            tuple(self.tokens[i:i + ngram_size])
+            for i in range(len(self.tokens) - ngram_size + 1)
+        )
+        self._matcher = difflib.SequenceMatcher(None)
+        self._matcher.set_seq2(self.tokens)
+
+    def sequence_ratio(self, tokens: List[str]) -> float:
+        """difflib ratio of tokens against the source tokens"""
+        self._matcher.set_seq1(tokens)
+        return self._matcher.ratio()
+
+
+class SubstringIndex:
+    """Suffix automaton answering ``phrase in text`` in O(len(phrase))"""
+
+    def __init__(self, text: str):
+        self._next: List[Dict[str, int]] = [{}]
+        self._link = [-1]
+        self._length = [0]
+        last = 0
+        for char in text:
+            last = self._extend(last, char)
+
+    def _extend(self, last: int, char: str) -> int:
+        current = len(self._next)
+        self._next.append({})
+        self._length.append(self._length[last] + 1)
+        self._link.append(0)
+        state = last
+        while state != -1 and char not in self._next[state]:
+            self._next[state][char] = current
+            state = self._link[state]
+        if state != -1:
+            target = self._next[state][char]
+            if self._length[state] + 1 == self._length[target]:
+                self._link[current] = target
+            else:
+                clone = len(self._next)
+                self._next.append(dict(self._next[target]))
+                self._length.append(self._length[state] + 1)
+                self._link.append(self._link[target])
+                while state != -1 and self._next[state].get(char) == target:
+                    self._next[state][char] = clone
+                    state = self._link[state]
+                self._link[target] = clone
+                self._link[current] = clone
+        return current
+
+    def advance(self, state: Optional[int], fragment: str) -> Optional[int]:
+        """Follow fragment from state; None once the text stops matching"""
+        for char in fragment:
+            if state is None:
+                return None
+            state = self._next[state].get(char)
+        return state
+
+    def __contains__(self, phrase: str) -> bool:
+        return self.advance(0, phrase) is not None
+
+
 class RegurgitationDetector:
     """Detects text regurgitation from source documents"""
     
@@ -266,6 +348,9 @@ class RegurgitationDetector:
             logger.warning("Source documents are empty after cleaning")
             return results
         
+        # Index the source once; every query below runs against it
+        source_index = SourceTextIndex(source_text, self.stop_words)
+        
         total_similarity = 0
         section_count = 0
         highest_similarity = 0
@@ -280,7 +365,7 @@ class RegurgitationDetector:
             
             # Calculate multiple similarity metrics
             section_similarity = self._calculate_comprehensive_similarity(
-                clean_content, source_text
+                clean_content, source_index
             )
             
             results["section_similarities"][section_name] = round(section_similarity * 100, 2)
@@ -294,7 +379,7 @@ class RegurgitationDetector:
             
             # Check for flagged passages (high similarity chunks)
             flagged = self._identify_flagged_passages(
-                clean_content, source_text, similarity_threshold=0.75
+                clean_content, source_index, similarity_threshold=0.75
             )
             
             if flagged:
@@ -354,36 +439,55 @@ class RegurgitationDetector:
         
         return cleaned
     
-    def _calculate_comprehensive_similarity(self, text1: str, text2: str) -> float:
-        """Calculate similarity using multiple metrics"""
+    def _calculate_comprehensive_similarity(self, text1: str, text2: Union[str, SourceTextIndex]) -> float:
+        """Calculate similarity using multiple metrics
+        
+        text2 may be a prebuilt SourceTextIndex so repeated queries against
+        the same source skip re-tokenizing it.
+        """
         
         if not text1 or not text2:
             return 0.0
         
+        source = text2 if isinstance(text2, SourceTextIndex) else SourceTextIndex(text2, self.stop_words)
+        
         # Tokenize and filter stop words
         tokens1 = [word for word in re.findall(r'\b\w+\b', text1.lower()) 
                   if word not in self.stop_words and len(word) > 2]
-        tokens2 = [word for word in re.findall(r'\b\w+\b', text2.lower()) 
-                  if word not in self.stop_words and len(word) > 2]
         
-        if not tokens1 or not tokens2:
+        if not tokens1 or not source.tokens:
             return 0.0
         
         # 1. Jaccard similarity (unique words)
-        set1, set2 = set(tokens1), set(tokens2)
-        jaccard = len(set1.intersection(set2)) / len(set1.union(set2)) if set1.union(set2) else 0
+        set1 = set(tokens1)
+        intersection = sum(1 for token in set1 if token in source.token_set)
+        union = len(set1) + len(source.token_set) - intersection
+        jaccard = intersection / union if union else 0
         
         # 2. Sequence similarity (order matters)
-        sequence_sim = difflib.SequenceMatcher(None, tokens1, tokens2).ratio()
+        sequence_sim = source.sequence_ratio(tokens1)
         
         # 3. N-gram similarity (phrases)
-        ngram_sim = self._calculate_ngram_similarity(tokens1, tokens2, n=3)
+        ngram_sim = self._calculate_indexed_ngram_similarity(tokens1, source)
         
         # Weighted combination
         similarity = (jaccard * 0.4) + (sequence_sim * 0.3) + (ngram_sim * 0.3)
         
         return min(1.0, similarity)
     
+    def _calculate_indexed_ngram_similarity(self, tokens: List[str], source: SourceTextIndex) -> float:
+        """N-gram Jaccard similarity against the source shingle set"""
+        
+        n = source.ngram_size
+        if len(tokens) < n or len(source.tokens) < n:
+            return 0.0
+        
+        ngrams = set(tuple(tokens[i:i+n]) for i in range(len(tokens) - n + 1))
+        intersection = sum(1 for ngram in ngrams if ngram in source.ngrams)
+        union = len(ngrams) + len(source.ngrams) - intersection
+        
+        return intersection / union if union > 0 else 0.0
+    
     def _calculate_ngram_similarity(self, tokens1: List[str], tokens2: List[str], n: int = 3) -> float:
         """Calculate n-gram similarity between token lists"""
         
@@ -406,7 +510,7 @@ class RegurgitationDetector:
     def _identify_flagged_passages(
         self, 
         generated_text: str, 
-        source_text: str, 
+        source_text: Union[str, SourceTextIndex], 
         similarity_threshold: float = 0.75
     ) -> List[Tuple[str, float]]:
         """Identify specific passages with high similarity"""
@@ -416,6 +520,9 @@ class RegurgitationDetector:
         if not generated_text or not source_text:
             return flagged_passages
         
+        if not isinstance(source_text, SourceTextIndex):
+            source_text = SourceTextIndex(source_text, self.stop_words)
+        
         # Split into sentences and longer chunks
         sentences = [s.strip() for s in re.split(r'[.!?]+', generated_text) if s.strip()]
         
@@ -469,30 +576,46 @@ class RegurgitationDetector:
         source_text = self._clean_text(" ".join(source_documents))
         all_generated = self._clean_text(" ".join(generated_content.values()))
         
-        common_phrases = []
+        if not all_generated:
+            return []
         
-        # Extract phrases of 3-8 words from source
+        generated_index = SubstringIndex(all_generated)
+        matches = []
+        
+        # Extend 3-8 word phrases from each source position through the
+        # generated-text automaton; a phrase that does not occur cannot be
+        # extended into one that does
         source_words = source_text.split()
-        for length in range(3, 9):  # 3 to 8 word phrases
-            for i in range(len(source_words) - length + 1):
-                phrase = ' '.join(source_words[i:i+length])
+        for i in range(len(source_words)):
+            state = 0
+            for length in range(1, min(8, len(source_words) - i) + 1):
+                fragment = source_words[i + length - 1] if length == 1 else " " + source_words[i + length - 1]
+                state = generated_index.advance(state, fragment)
+                if state is None:
+                    break
+                if length < 3:
+                    continue
                 
                 # Skip if contains only stop words
-                phrase_words = phrase.split()
+                phrase_words = source_words[i:i + length]
                 if all(word in self.stop_words for word in phrase_words):
                     continue
                 
-                # Check if phrase appears in generated content
-                if phrase in all_generated:
-                    common_phrases.append({
-                        "phrase": phrase,
-                        "length": length,
-                        "appears_in_source": True,
-                        "appears_in_generated": True
-                    })
+                matches.append((length, i))
+        
+        # Longest first, then source order
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        common_phrases = [
+            {
+                "phrase": " ".join(source_words[i:i + length]),
+                "length": length,
+                "appears_in_source": True,
+                "appears_in_generated": True
+            } for length, i in matches[:10]
+        ]
         
         # Return top 10 most common phrases
-        return sorted(common_phrases, key=lambda x: x['length'], reverse=True)[:10]
+        return common_phrases
 
 
 class SMARTCriteriaValidator:
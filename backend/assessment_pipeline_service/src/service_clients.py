@@ -4,7 +4,7 @@ Service clients for inter-service communication with enhanced error handling
 import httpx
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Set, Union
 from uuid import UUID
 import os
 from datetime import datetime, timedelta
@@ -29,6 +29,178 @@ class ServiceValidationError(ServiceError):
     """Service returned validation error"""
     pass
 
+class PooledHTTPClient:
+    """Long-lived, connection-pooled HTTP client shared by the service clients
+
+    Calls reuse keep-alive connections instead of paying a TCP (and TLS)
+    handshake per request. The underlying ``httpx.AsyncClient`` is opened
+    lazily on first use or by ``start()`` from the app lifespan, and closed
+    by ``close()`` on shutdown. HTTP/2 is used when enabled and the ``h2``
+    package is installed.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None
+    ):
+        # Explicit arguments win, including 0; None falls back to the environment
+        if max_connections is None:
+            max_connections = int(os.getenv("SERVICE_HTTP_MAX_CONNECTIONS", "100"))
+        if max_keepalive_connections is None:
+            max_keepalive_connections = int(os.getenv("SERVICE_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        if keepalive_expiry is None:
+            keepalive_expiry = float(os.getenv("SERVICE_HTTP_KEEPALIVE_EXPIRY", "30"))
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        if http2 is None:
+            http2 = os.getenv("SERVICE_HTTP2", "false").lower() in ("1", "true", "yes")
+        self.http2 = http2 and self._h2_available()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._retiring: Set[Any] = set()
+        self.reset_metrics()
+
+    @staticmethod
+    def _h2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("⚠️ SERVICE_HTTP2 requested but the h2 package is not installed, using HTTP/1.1")
+            return False
+
+    def reset_metrics(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.http_versions: Dict[str, int] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them (scripts may
+        # call asyncio.run more than once)
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._retire_client()
+            self._client = httpx.AsyncClient(limits=self.limits, http2=self.http2)
+            self._loop = loop
+            logger.info(
+                f"🔗 Opened pooled service HTTP client "
+                f"(max_connections={self.limits.max_connections}, "
+                f"keepalive={self.limits.max_keepalive_connections}, http2={self.http2})"
+            )
+        return self._client
+
+    def _retire_client(self):
+        """Close a client left open by another event loop before replacing it"""
+        old_client, old_loop = self._client, self._loop
+        self._client = None
+        self._loop = None
+        if old_client is None or old_client.is_closed:
+            return
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            # Still serving another thread: close on the loop that owns the sockets
+            future = asyncio.run_coroutine_threadsafe(self._aclose_quietly(old_client), old_loop)
+        else:
+            future = asyncio.get_running_loop().create_task(self._aclose_quietly(old_client))
+        self._retiring.add(future)
+        future.add_done_callback(self._retiring.discard)
+
+    @staticmethod
+    async def _aclose_quietly(client: httpx.AsyncClient):
+        try:
+            await client.aclose()
+            logger.info("🔌 Closed pooled service HTTP client from a previous event loop")
+        except Exception as e:
+            # Transports bound to a finished loop are released when collected
+            logger.debug(f"Closing stale pooled HTTP client failed: {e}")
+
+    async def start(self):
+        """Open the pool ahead of the first request"""
+        self.client
+
+    async def close(self):
+        """Close pooled connections; a later request reopens the pool"""
+        if self._client is not None and not self._client.is_closed and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+            logger.info("🔌 Closed pooled service HTTP client")
+        self._client = None
+        self._loop = None
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        # httpcore trace events fire only when the pool has to dial out
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Union[httpx.Timeout, float, None] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request on a pooled connection"""
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions.setdefault("trace", self._trace)
+
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            response = await self.client.request(
+                method, url, timeout=timeout, extensions=extensions, **kwargs
+            )
+            self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+            return response
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool usage counters; ``connections_reused`` counts requests served without a new connection"""
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "connections_opened": self.connections_opened,
+            "connections_reused": max(0, self.requests - self.errors - self.connections_opened),
+            "tls_handshakes": self.tls_handshakes,
+            "http_versions": dict(self.http_versions)
+        }
+
+_shared_http_client: Optional[PooledHTTPClient] = None
+
+def get_shared_http_client() -> PooledHTTPClient:
+    """Get the process-wide pooled HTTP client"""
+    global _shared_http_client
+    if _shared_http_client is None:
+        _shared_http_client = PooledHTTPClient()
+    return _shared_http_client
+
+async def close_shared_http_client():
+    """Close the pooled HTTP client (app shutdown)"""
+    if _shared_http_client is not None:
+        await _shared_http_client.close()
+
 class CircuitBreakerState(Enum):
     CLOSED = "closed"
     OPEN = "open"
@@ -79,9 +251,16 @@ class CircuitBreaker:
 class SpecialEducationServiceClient:
     """Enhanced client for communicating with the Special Education Service"""
     
-    def __init__(self, base_url: str = None, max_retries: int = 3, retry_delay: float = 1.0):
+    def __init__(
+        self,
+        base_url: str = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        http_client: Optional[PooledHTTPClient] = None
+    ):
         self.base_url = base_url or os.getenv("SPECIAL_EDUCATION_SERVICE_URL", "http://localhost:8005")
         self.timeout = httpx.Timeout(timeout=60.0, connect=10.0, read=50.0)
+        self._http_client = http_client
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=60)
@@ -132,11 +311,14 @@ class SpecialEducationServiceClient:
     
     async def _execute_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
         """Execute a single HTTP request"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.request(method, url, **kwargs)
-            response.raise_for_status()
-            return response.json()
+        response = await self.http_client.request(method, url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response.json()
     
+    @property
+    def http_client(self) -> PooledHTTPClient:
+        return self._http_client or get_shared_http_client()
+
     def _extract_error_detail(self, response: httpx.Response) -> str:
         """Extract error details from response"""
         try:
@@ -226,24 +408,25 @@ class SpecialEducationServiceClient:
     async def health_check(self) -> Dict[str, Any]:
         """Check if the special education service is healthy with detailed status"""
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(timeout=5.0)) as client:
-                response = await client.get(f"{self.base_url}/health")
-                if response.status_code == 200:
-                    health_data = response.json()
-                    return {
-                        "healthy": True,
-                        "status": health_data.get("status", "unknown"),
-                        "response_time_ms": response.elapsed.total_seconds() * 1000,
-                        "circuit_breaker_state": self.circuit_breaker.state.value,
-                        "details": health_data
-                    }
-                else:
-                    return {
-                        "healthy": False,
-                        "status": f"HTTP {response.status_code}",
-                        "circuit_breaker_state": self.circuit_breaker.state.value,
-                        "error": response.text
-                    }
+            response = await self.http_client.request(
+                "GET", f"{self.base_url}/health", timeout=httpx.Timeout(timeout=5.0)
+            )
+            if response.status_code == 200:
+                health_data = response.json()
+                return {
+                    "healthy": True,
+                    "status": health_data.get("status", "unknown"),
+                    "response_time_ms": response.elapsed.total_seconds() * 1000,
+                    "circuit_breaker_state": self.circuit_breaker.state.value,
+                    "details": health_data
+                }
+            else:
+                return {
+                    "healthy": False,
+                    "status": f"HTTP {response.status_code}",
+                    "circuit_breaker_state": self.circuit_breaker.state.value,
+                    "error": response.text
+                }
         except Exception as e:
             logger.error(f"Health check failed for special education service: {e}")
             return {
@@ -258,15 +441,17 @@ class SpecialEducationServiceClient:
             "state": self.circuit_breaker.state.value,
             "failure_count": self.circuit_breaker.failure_count,
             "failure_threshold": self.circuit_breaker.failure_threshold,
-            "last_failure": self.circuit_breaker.last_failure_time.isoformat() if self.circuit_breaker.last_failure_time else None
+            "last_failure": self.circuit_breaker.last_failure_time.isoformat() if self.circuit_breaker.last_failure_time else None,
+            "http_pool": self.http_client.get_metrics()
         }
 
 class AuthServiceClient:
     """Enhanced client for communicating with the Auth Service"""
     
-    def __init__(self, base_url: str = None, max_retries: int = 2):
+    def __init__(self, base_url: str = None, max_retries: int = 2, http_client: Optional[PooledHTTPClient] = None):
         self.base_url = base_url or os.getenv("AUTH_SERVICE_URL", "http://localhost:8003")
         self.timeout = httpx.Timeout(timeout=10.0, connect=5.0)
+        self._http_client = http_client
         self.max_retries = max_retries
         self.circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
     
@@ -283,19 +468,24 @@ class AuthServiceClient:
     
     async def _validate_token_impl(self, token: str) -> Optional[Dict[str, Any]]:
         """Internal token validation implementation"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/auth/verify-token",
-                json={"token": token}
-            )
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 401:
-                logger.warning("Invalid token provided")
-                return None
-            else:
-                response.raise_for_status()
-                return None
+        response = await self.http_client.request(
+            "POST",
+            f"{self.base_url}/auth/verify-token",
+            timeout=self.timeout,
+            json={"token": token}
+        )
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 401:
+            logger.warning("Invalid token provided")
+            return None
+        else:
+            response.raise_for_status()
+            return None
+    
+    @property
+    def http_client(self) -> PooledHTTPClient:
+        return self._http_client or get_shared_http_client()
     
     async def get_user_info(self, user_id: UUID) -> Optional[Dict[str, Any]]:
         """Get user information by ID with enhanced error handling"""
@@ -310,38 +500,38 @@ class AuthServiceClient:
     
     async def _get_user_info_impl(self, user_id: UUID) -> Optional[Dict[str, Any]]:
         """Internal user info implementation"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(f"{self.base_url}/users/{user_id}")
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                logger.warning(f"User {user_id} not found")
-                return None
-            else:
-                response.raise_for_status()
-                return None
+        response = await self.http_client.request("GET", f"{self.base_url}/users/{user_id}", timeout=self.timeout)
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 404:
+            logger.warning(f"User {user_id} not found")
+            return None
+        else:
+            response.raise_for_status()
+            return None
     
     async def health_check(self) -> Dict[str, Any]:
         """Check if the auth service is healthy with detailed status"""
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(timeout=5.0)) as client:
-                response = await client.get(f"{self.base_url}/health")
-                if response.status_code == 200:
-                    health_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
-                    return {
-                        "healthy": True,
-                        "status": health_data.get("status", "healthy"),
-                        "response_time_ms": response.elapsed.total_seconds() * 1000,
-                        "circuit_breaker_state": self.circuit_breaker.state.value,
-                        "details": health_data
-                    }
-                else:
-                    return {
-                        "healthy": False,
-                        "status": f"HTTP {response.status_code}",
-                        "circuit_breaker_state": self.circuit_breaker.state.value,
-                        "error": response.text
-                    }
+            response = await self.http_client.request(
+                "GET", f"{self.base_url}/health", timeout=httpx.Timeout(timeout=5.0)
+            )
+            if response.status_code == 200:
+                health_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
+                return {
+                    "healthy": True,
+                    "status": health_data.get("status", "healthy"),
+                    "response_time_ms": response.elapsed.total_seconds() * 1000,
+                    "circuit_breaker_state": self.circuit_breaker.state.value,
+                    "details": health_data
+                }
+            else:
+                return {
+                    "healthy": False,
+                    "status": f"HTTP {response.status_code}",
+                    "circuit_breaker_state": self.circuit_breaker.state.value,
+                    "error": response.text
+                }
         except Exception as e:
             logger.error(f"Health check failed for auth service: {e}")
             return {
@@ -356,7 +546,8 @@ class AuthServiceClient:
             "state": self.circuit_breaker.state.value,
             "failure_count": self.circuit_breaker.failure_count,
             "failure_threshold": self.circuit_breaker.failure_threshold,
-            "last_failure": self.circuit_breaker.last_failure_time.isoformat() if self.circuit_breaker.last_failure_time else None
+            "last_failure": self.circuit_breaker.last_failure_time.isoformat() if self.circuit_breaker.last_failure_time else None,
+            "http_pool": self.http_client.get_metrics()
         }
 
 # Global service clients (initialized at startup)
@@ -60,6 +60,9 @@ class AuthSettings(BaseSettings):
     max_sessions_per_user: int = Field(default=5)
     session_cleanup_interval_hours: int = Field(default=24)
     
+    # Token revocation filter (seconds between version-stamp polls of the blacklist)
+    revocation_poll_seconds: int = Field(default=5, ge=1)
+    
     @field_validator('cors_origins', mode='before')
     @classmethod
     def parse_cors_origins(cls, v):
@@ -33,7 +33,8 @@ class AuthorizationError(HTTPException):
         )
 
 async def get_current_user_token(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """Extract and verify the current user's token."""
     if not credentials:
@@ -45,6 +46,10 @@ async def get_current_user_token(
     if not payload:
         raise AuthenticationError("Invalid or expired token")
     
+    # Answered from the in-memory revocation filter unless it reports a hit
+    if await TokenBlacklistRepository(db).is_token_blacklisted(token, payload):
+        raise AuthenticationError("Token has been revoked")
+    
     return payload
 
 async def get_current_user(
@@ -86,7 +91,7 @@ async def get_optional_current_user(
         token = credentials.credentials
         payload = verify_token(token, token_type="access")
         
-        if not payload:
+        if not payload or await TokenBlacklistRepository(db).is_token_blacklisted(token, payload):
             return None
         
         user_id = int(payload.get("sub"))
@@ -212,7 +217,7 @@ class OptionalAuth:
             return None
         
         try:
-            token_payload = await get_current_user_token(credentials)
+            token_payload = await get_current_user_token(credentials, db)
             user_repo = UserRepository(db)
             user_id = int(token_payload.get("sub"))
             user = await user_repo.get_by_id(user_id)
@@ -6,7 +6,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_auth_settings
-from .database import create_tables, close_db
+from .database import create_tables, close_db, async_session_factory
+from .revocation_filter import RevocationFilterSync, get_revocation_filter
 from .middleware.error_handler import (
     ErrorHandlerMiddleware, SecurityHeadersMiddleware,
     RequestLoggingMiddleware, RateLimitMiddleware
@@ -30,12 +31,18 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     logger.info("Starting Authentication Service...")
+    revocation_sync = RevocationFilterSync(
+        get_revocation_filter(), async_session_factory, settings.revocation_poll_seconds
+    )
     
     try:
         # Create database tables
         await create_tables()
         logger.info("Database tables created successfully")
         
+        # Load revoked tokens so auth checks skip the blacklist table
+        await revocation_sync.start()
+        
         logger.info("Authentication Service started successfully")
         yield
         
@@ -46,6 +53,7 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown
         logger.info("Shutting down Authentication Service...")
+        await revocation_sync.stop()
         await close_db()
         logger.info("Authentication Service shutdown complete")
 
@@ -1,13 +1,14 @@
 """Repository for managing token blacklist operations."""
 
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
 from sqlalchemy.exc import IntegrityError
 
 from ..models.token_blacklist import TokenBlacklist
 from ..security import generate_token_hash
+from ..revocation_filter import USER_CUTOFF_PREFIX, RevocationFilter, get_revocation_filter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,8 +16,9 @@ logger = logging.getLogger(__name__)
 class TokenBlacklistRepository:
     """Repository for token blacklist operations."""
     
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, revocation_filter: Optional[RevocationFilter] = None):
         self.db = db_session
+        self.filter = revocation_filter or get_revocation_filter()
     
     async def blacklist_token(
         self, 
@@ -50,6 +52,7 @@ class TokenBlacklistRepository:
             self.db.add(blacklist_entry)
             await self.db.commit()
             await self.db.refresh(blacklist_entry)
+            self.filter.add(token_hash, user_id, blacklist_entry.blacklisted_at, expires_at)
             
             logger.debug(f"Token blacklisted for user {user_id}: {reason}")
             return blacklist_entry
@@ -62,43 +65,95 @@ class TokenBlacklistRepository:
             )
             return result.scalar_one()
     
-    async def is_token_blacklisted(self, token: str) -> bool:
+    async def is_token_blacklisted(self, token: str, payload: Optional[Dict[str, Any]] = None) -> bool:
         """
         Check if a token is blacklisted.
         
+        Once the revocation filter is loaded the database is only queried
+        when the filter reports a possible revocation.
+        
         Args:
             token: The JWT token to check
+            payload: Decoded token claims, to apply per-user revocations
         
         Returns:
             True if token is blacklisted, False otherwise
         """
         token_hash = generate_token_hash(token)
         
+        if self.filter.loaded and not self.filter.might_be_revoked(token_hash, payload):
+            return False
+        
         result = await self.db.execute(
-            select(TokenBlacklist).where(
+            select(TokenBlacklist.id).where(
                 TokenBlacklist.token_hash == token_hash,
                 TokenBlacklist.expires_at > datetime.now(timezone.utc)
             )
         )
+        if result.first() is not None:
+            return True
         
-        return result.scalar_one_or_none() is not None
+        if payload and payload.get("sub") and payload.get("iat"):
+            try:
+                user_id = int(payload["sub"])
+            except (TypeError, ValueError):
+                return False
+            # Revoked if iat < cutoff truncated to the second, i.e. the
+            # cutoff is at least one whole second after iat
+            issued_at = datetime.fromtimestamp(int(float(payload["iat"])), tz=timezone.utc)
+            result = await self.db.execute(
+                select(TokenBlacklist.id).where(
+                    TokenBlacklist.user_id == user_id,
+                    TokenBlacklist.token_hash.startswith(USER_CUTOFF_PREFIX),
+                    TokenBlacklist.blacklisted_at >= issued_at + timedelta(seconds=1),
+                    TokenBlacklist.expires_at > datetime.now(timezone.utc)
+                ).limit(1)
+            )
+            return result.first() is not None
+        
+        return False
     
-    async def blacklist_all_user_tokens(self, user_id: int, reason: str = "logout_all") -> int:
+    async def blacklist_all_user_tokens(
+        self,
+        user_id: int,
+        reason: str = "logout_all",
+        token_lifetime: Optional[timedelta] = None
+    ) -> int:
         """
         Blacklist all active tokens for a user.
         
         This is done by setting a user-level blacklist timestamp.
         All tokens issued before this timestamp are considered invalid.
+        The timestamp is truncated to whole seconds, matching ``iat``, so a
+        token issued in the same second (an immediate re-login) stays valid.
+        The timestamp is stored as a ``user:<id>:<time>`` blacklist row that
+        expires once every token issued before it has expired.
         
         Args:
             user_id: ID of the user
             reason: Reason for blacklisting all tokens
+            token_lifetime: Longest access token lifetime (defaults to settings)
         
         Returns:
             Number of future tokens that will be invalidated
         """
-        # In a real implementation, you might maintain a user blacklist timestamp
-        # For now, we'll just return 0 as this would require session tracking
+        if token_lifetime is None:
+            from ..config import get_auth_settings
+            token_lifetime = timedelta(minutes=get_auth_settings().access_token_expire_minutes)
+        
+        now = datetime.now(timezone.utc)
+        cutoff = now.replace(microsecond=0)
+        cutoff_entry = TokenBlacklist(
+            token_hash=f"{USER_CUTOFF_PREFIX}{user_id}:{now.timestamp():.6f}",
+            user_id=user_id,
+            blacklisted_at=cutoff,
+            expires_at=now + token_lifetime,
+            reason=reason
+        )
+        self.db.add(cutoff_entry)
+        await self.db.commit()
+        self.filter.add(cutoff_entry.token_hash, user_id, cutoff, cutoff_entry.expires_at)
+        
         logger.info(f"Blacklisted all tokens for user {user_id}: {reason}")
         return 0
     
@@ -117,12 +172,49 @@ class TokenBlacklistRepository:
         
         await self.db.commit()
         deleted_count = result.rowcount
+        self.filter.prune()
         
         if deleted_count > 0:
             logger.info(f"Cleaned up {deleted_count} expired blacklist entries")
         
         return deleted_count
     
+    async def get_revocation_version(self) -> int:
+        """
+        Get the blacklist version stamp (the highest row id, 0 when empty).
+        
+        Returns:
+            Version stamp for paging the revocation feed
+        """
+        result = await self.db.execute(select(func.max(TokenBlacklist.id)))
+        return result.scalar() or 0
+    
+    async def get_revoked_after(self, after_id: Optional[int], up_to: int) -> list[TokenBlacklist]:
+        """
+        Get unexpired blacklist entries with ``after_id < id <= up_to``.
+        
+        Used as the revocation feed for services that verify tokens locally.
+        Paging by id rather than ``blacklisted_at`` means a row whose
+        transaction commits late is still returned, provided callers re-read
+        an overlap window below their last version.
+        
+        Args:
+            after_id: Only return entries with a higher id (all when None)
+            up_to: Version stamp read at the start of the request
+        
+        Returns:
+            List of blacklisted token entries, oldest first
+        """
+        query = select(TokenBlacklist).where(
+            TokenBlacklist.id <= up_to,
+            TokenBlacklist.expires_at > datetime.now(timezone.utc)
+        )
+        if after_id is not None:
+            query = query.where(TokenBlacklist.id > after_id)
+        
+        result = await self.db.execute(query.order_by(TokenBlacklist.id))
+        return result.scalars().all()
+    
     async def get_blacklisted_tokens_for_user(self, user_id: int) -> list[TokenBlacklist]:
         """
         Get all blacklisted tokens for a specific user.
@@ -0,0 +1,197 @@
+"""In-memory filter of revoked tokens in front of the token blacklist table."""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models.token_blacklist import TokenBlacklist
+
+logger = logging.getLogger(__name__)
+
+# Blacklist rows keyed ``user:<id>:<timestamp>`` revoke every token issued
+# to that user before ``blacklisted_at`` (see blacklist_all_user_tokens).
+# ``iat`` has whole-second precision, so cutoffs are truncated to the second
+# and compared exclusively: a token issued in the same second as the cutoff
+# (a re-login right after logout-all) stays valid.
+USER_CUTOFF_PREFIX = "user:"
+
+# Rows re-read below the version stamp on every sync, in case ids from
+# concurrent transactions commit out of order (a lower id can become visible
+# after the max id has stopped moving)
+SYNC_OVERLAP = 100
+
+class RevocationFilter:
+    """
+    Set of unexpired revoked token hashes and per-user revocation cutoffs.
+
+    Loaded from ``token_blacklist`` at startup and updated in-process when
+    tokens are blacklisted. Other replicas pick up new rows by polling the
+    table's version stamp (the highest row id): rows are only ever inserted,
+    or deleted once expired, so fetching ``id > version - SYNC_OVERLAP``
+    keeps every replica complete. A token that misses the filter is not revoked; a hit is
+    confirmed against the database.
+    """
+
+    def __init__(self):
+        self._hashes: Dict[str, float] = {}
+        self._user_cutoffs: Dict[int, tuple[float, float]] = {}
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self.version is not None
+
+    def add(self, token_hash: str, user_id: int, blacklisted_at: datetime, expires_at: datetime) -> bool:
+        """
+        Record a blacklist row (token hash or user cutoff).
+
+        Returns:
+            True if the row was not already reflected in the filter
+        """
+        expires = _timestamp(expires_at)
+        if token_hash.startswith(USER_CUTOFF_PREFIX):
+            cutoff = float(int(_timestamp(blacklisted_at)))
+            current = self._user_cutoffs.get(user_id)
+            if current is not None:
+                cutoff, expires = max(cutoff, current[0]), max(expires, current[1])
+            self._user_cutoffs[user_id] = (cutoff, expires)
+            return current != (cutoff, expires)
+        current = self._hashes.get(token_hash)
+        self._hashes[token_hash] = expires
+        return current != expires
+
+    def might_be_revoked(self, token_hash: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Check the filter without touching the database.
+
+        Args:
+            token_hash: SHA256 of the token
+            payload: Decoded token claims, used for per-user cutoffs
+
+        Returns:
+            False if the token is definitely not revoked
+        """
+        now = datetime.now(timezone.utc).timestamp()
+
+        expires = self._hashes.get(token_hash)
+        if expires is not None and expires > now:
+            self.hits += 1
+            return True
+
+        if payload and self._user_cutoffs:
+            try:
+                cutoff = self._user_cutoffs.get(int(payload.get("sub")))
+            except (TypeError, ValueError):
+                cutoff = None
+            if cutoff and cutoff[1] > now and float(payload.get("iat") or 0) < cutoff[0]:
+                self.hits += 1
+                return True
+
+        self.misses += 1
+        return False
+
+    def prune(self):
+        """Drop entries whose tokens have expired anyway."""
+        now = datetime.now(timezone.utc).timestamp()
+        self._hashes = {h: exp for h, exp in self._hashes.items() if exp > now}
+        self._user_cutoffs = {u: c for u, c in self._user_cutoffs.items() if c[1] > now}
+
+    async def sync(self, db: AsyncSession) -> int:
+        """
+        Load blacklist rows added since the last sync (all rows on first call).
+
+        The ``SYNC_OVERLAP`` rows below the version stamp are re-read even
+        when the max id has not moved, since that is exactly when a lower id
+        committed late would otherwise never be seen.
+
+        Returns:
+            Number of rows not already in the filter
+        """
+        latest = (await db.execute(select(func.max(TokenBlacklist.id)))).scalar() or 0
+        if self.version is not None:
+            latest = max(latest, self.version)
+
+        query = select(
+            TokenBlacklist.id, TokenBlacklist.token_hash, TokenBlacklist.user_id,
+            TokenBlacklist.blacklisted_at, TokenBlacklist.expires_at
+        ).where(
+            TokenBlacklist.id <= latest,
+            TokenBlacklist.expires_at > datetime.now(timezone.utc)
+        )
+        if self.version is not None:
+            query = query.where(TokenBlacklist.id > self.version - SYNC_OVERLAP)
+
+        rows = (await db.execute(query)).all()
+        added = sum(
+            self.add(row.token_hash, row.user_id, row.blacklisted_at, row.expires_at)
+            for row in rows
+        )
+        self.version = latest
+        self.prune()
+        return added
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "version": self.version,
+            "revoked_tokens": len(self._hashes),
+            "revoked_users": len(self._user_cutoffs),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+def _timestamp(value: datetime) -> float:
+    # SQLite drops tzinfo; stored times are UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+class RevocationFilterSync:
+    """Background poll keeping the filter in step with other replicas."""
+
+    def __init__(self, revocation_filter: RevocationFilter, session_factory, poll_seconds: int):
+        self.filter = revocation_filter
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        async with self.session_factory() as db:
+            loaded = await self.filter.sync(db)
+        logger.info(f"Revocation filter loaded {loaded} blacklist entries")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                async with self.session_factory() as db:
+                    added = await self.filter.sync(db)
+                if added:
+                    logger.debug(f"Revocation filter synced {added} new entries")
+            except Exception as e:
+                logger.warning(f"Revocation filter sync failed: {e}")
+
+_revocation_filter: Optional[RevocationFilter] = None
+
+def get_revocation_filter() -> RevocationFilter:
+    """Get the process-wide revocation filter."""
+    global _revocation_filter
+    if _revocation_filter is None:
+        _revocation_filter = RevocationFilter()
+    return _revocation_filter
@@ -1,15 +1,19 @@
 """Authentication routes for login, registration, token management."""
 
 from datetime import datetime, timedelta, timezone
-from typing import Dict
+from typing import Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..dependencies import get_audit_repository, get_user_repository, get_client_ip
 from ..dependencies import get_current_user, get_optional_current_user
+from ..dependencies import get_token_blacklist_repository, security
 from ..repositories.user_repository import UserRepository
 from ..repositories.audit_repository import AuditRepository
+from ..repositories.token_blacklist_repository import TokenBlacklistRepository
+from ..revocation_filter import USER_CUTOFF_PREFIX
 from ..models.user import User
 from ..security import (
     hash_password, verify_password, create_access_token, create_refresh_token,
@@ -17,7 +21,7 @@ from ..security import (
 )
 from ..schemas import (
     UserCreate, UserLogin, UserResponse, Token, TokenRefresh, 
-    SuccessResponse, SessionCleanupResponse
+    SuccessResponse, SessionCleanupResponse, RevocationFeedResponse, RevokedToken, RevokedUser
 )
 from ..config import get_auth_settings
 import logging
@@ -354,13 +358,18 @@ async def refresh_token(
 async def logout(
     request: Request,
     current_user: User = Depends(get_current_user),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db),
     user_repo: UserRepository = Depends(get_user_repository),
-    audit_repo: AuditRepository = Depends(get_audit_repository)
+    audit_repo: AuditRepository = Depends(get_audit_repository),
+    blacklist_repo: TokenBlacklistRepository = Depends(get_token_blacklist_repository)
 ):
     """
     Logout user and invalidate all sessions.
     
+    The presented access token is blacklisted so services verifying
+    tokens locally drop it via the revocation feed.
+    
     Requires valid JWT token in Authorization header.
     """
     client_ip = get_client_ip(request)
@@ -370,6 +379,16 @@ async def logout(
         # Delete all user sessions
         deleted_count = await user_repo.delete_all_user_sessions(current_user.id)
         
+        # Revoke the access token used for this request
+        payload = verify_token(credentials.credentials, token_type="access") if credentials else None
+        if payload and payload.get("exp"):
+            await blacklist_repo.blacklist_token(
+                credentials.credentials,
+                user_id=current_user.id,
+                expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+                reason="logout"
+            )
+        
         # Log logout
         await audit_repo.log_action(
             entity_type="user",
@@ -449,7 +468,8 @@ async def cleanup_expired_sessions(
 async def verify_user_token(
     token_data: Dict[str, str],
     db: AsyncSession = Depends(get_db),
-    user_repo: UserRepository = Depends(get_user_repository)
+    user_repo: UserRepository = Depends(get_user_repository),
+    blacklist_repo: TokenBlacklistRepository = Depends(get_token_blacklist_repository)
 ):
     """
     Verify JWT token and return user data.
@@ -465,7 +485,7 @@ async def verify_user_token(
             )
         
         payload = verify_token(token, token_type="access")
-        if not payload:
+        if not payload or await blacklist_repo.is_token_blacklisted(token, payload):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or expired token"
@@ -489,4 +509,42 @@ async def verify_user_token(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during token verification"
-        )
\ No newline at end of file
+        )
+
+# Revocation feed for services that verify tokens locally
+@router.get("/revocations", response_model=RevocationFeedResponse)
+async def get_token_revocations(
+    after_id: Optional[int] = None,
+    blacklist_repo: TokenBlacklistRepository = Depends(get_token_blacklist_repository)
+):
+    """
+    List unexpired revoked access tokens by SHA256 hash.
+    
+    Callers poll with ``after_id`` a little below the previous response's
+    ``version`` so rows whose transactions committed out of id order are
+    not missed; entries are idempotent, so the overlap is harmless.
+    """
+    try:
+        as_of = datetime.now(timezone.utc)
+        version = await blacklist_repo.get_revocation_version()
+        entries = await blacklist_repo.get_revoked_after(after_id, up_to=version)
+        return RevocationFeedResponse(
+            revoked=[
+                RevokedToken(token_hash=entry.token_hash, expires_at=entry.expires_at)
+                for entry in entries
+                if not entry.token_hash.startswith(USER_CUTOFF_PREFIX)
+            ],
+            revoked_users=[
+                RevokedUser(user_id=entry.user_id, issued_before=entry.blacklisted_at, expires_at=entry.expires_at)
+                for entry in entries
+                if entry.token_hash.startswith(USER_CUTOFF_PREFIX)
+            ],
+            version=version,
+            as_of=as_of
+        )
+    except Exception as e:
+        logger.error(f"Revocation feed error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error reading revocations"
+        )
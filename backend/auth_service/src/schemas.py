@@ -99,6 +99,24 @@ class TokenVerify(BaseModel):
     """Schema for token verification."""
     token: str
 
+class RevokedToken(BaseModel):
+    """Schema for a revoked (blacklisted) access token."""
+    token_hash: str
+    expires_at: datetime
+
+class RevokedUser(BaseModel):
+    """Schema for a user whose tokens issued before a time are revoked."""
+    user_id: int
+    issued_before: datetime
+    expires_at: datetime
+
+class RevocationFeedResponse(BaseModel):
+    """Schema for the token revocation feed polled by other services."""
+    revoked: List[RevokedToken]
+    revoked_users: List[RevokedUser] = []
+    version: int
+    as_of: datetime
+
 class PasswordChange(BaseModel):
     """Schema for password change request."""
     current_password: str
@@ -0,0 +1,177 @@
+"""Tests for the in-memory token revocation filter."""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-for-testing-only-32-chars")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# Import as the auth_service.src package so relative imports resolve
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from auth_service.src.models.base import Base
+from auth_service.src.models.token_blacklist import TokenBlacklist
+from auth_service.src.repositories.token_blacklist_repository import TokenBlacklistRepository
+from auth_service.src.revocation_filter import RevocationFilter
+from auth_service.src.security import create_access_token, verify_token
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+def count_queries(session):
+    """Count statements executed on the session's engine."""
+    counter = {"queries": 0}
+
+    def record(*args):
+        counter["queries"] += 1
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", record)
+    return counter
+
+def issue_token(user_id: int, age: int = 0) -> tuple[str, dict]:
+    token = create_access_token({"sub": str(user_id), "email": "t@example.com", "role": "teacher"})
+    payload = verify_token(token)
+    # Backdate iat so the token predates a cutoff taken in the same second
+    payload["iat"] -= age
+    return token, payload
+
+@pytest.mark.asyncio
+async def test_unrevoked_tokens_skip_database(session_factory):
+    """Once loaded, checks for unrevoked tokens do not query the database."""
+    revocation_filter = RevocationFilter()
+    async with session_factory() as db:
+        await revocation_filter.sync(db)
+        repo = TokenBlacklistRepository(db, revocation_filter)
+        token, payload = issue_token(1)
+
+        counter = count_queries(db)
+        for _ in range(50):
+            assert not await repo.is_token_blacklisted(token, payload)
+        assert counter["queries"] == 0
+
+        await repo.blacklist_token(token, 1, datetime.now(timezone.utc) + timedelta(hours=1))
+        assert await repo.is_token_blacklisted(token, payload)
+
+@pytest.mark.asyncio
+async def test_user_wide_revocation(session_factory):
+    """blacklist_all_user_tokens revokes tokens issued before it, for that user only."""
+    revocation_filter = RevocationFilter()
+    async with session_factory() as db:
+        await revocation_filter.sync(db)
+        repo = TokenBlacklistRepository(db, revocation_filter)
+        token, payload = issue_token(7, age=1)
+        other, other_payload = issue_token(8, age=1)
+
+        await repo.blacklist_all_user_tokens(7)
+
+        assert await repo.is_token_blacklisted(token, payload)
+        assert not await repo.is_token_blacklisted(other, other_payload)
+
+@pytest.mark.asyncio
+async def test_same_second_relogin_not_revoked(session_factory):
+    """A token issued in the cutoff's second survives logout-all, in the filter and the database."""
+    revocation_filter = RevocationFilter()
+    async with session_factory() as db:
+        repo = TokenBlacklistRepository(db, revocation_filter)
+        await revocation_filter.sync(db)
+        old, old_payload = issue_token(7, age=1)
+
+        await repo.blacklist_all_user_tokens(7)
+        new, new_payload = issue_token(7)
+
+        assert not revocation_filter.might_be_revoked("unused", new_payload)
+        assert not await repo.is_token_blacklisted(new, new_payload)
+        assert await repo.is_token_blacklisted(old, old_payload)
+
+        # A replica loading the row from the database agrees
+        replica = RevocationFilter()
+        await replica.sync(db)
+        assert not await TokenBlacklistRepository(db, replica).is_token_blacklisted(new, new_payload)
+        assert replica.might_be_revoked("unused", old_payload)
+
+@pytest.mark.asyncio
+async def test_replicas_sync_by_version(session_factory):
+    """A second replica picks up revocations on its next sync."""
+    writer, reader = RevocationFilter(), RevocationFilter()
+    async with session_factory() as db:
+        await writer.sync(db)
+        await reader.sync(db)
+        token, payload = issue_token(3)
+
+        await TokenBlacklistRepository(db, writer).blacklist_token(
+            token, 3, datetime.now(timezone.utc) + timedelta(hours=1)
+        )
+        replica = TokenBlacklistRepository(db, reader)
+        assert not await replica.is_token_blacklisted(token, payload)
+
+        assert await reader.sync(db) == 1
+        assert await reader.sync(db) == 0
+        assert await replica.is_token_blacklisted(token, payload)
+
+def test_expired_entries_pruned():
+    """Entries whose tokens have expired drop out of the filter."""
+    revocation_filter = RevocationFilter()
+    now = datetime.now(timezone.utc)
+    revocation_filter.add("a" * 64, 1, now, now + timedelta(hours=1))
+    revocation_filter.add("b" * 64, 1, now, now - timedelta(seconds=1))
+    revocation_filter.prune()
+
+    assert revocation_filter.get_stats()["revoked_tokens"] == 1
+    assert revocation_filter.might_be_revoked("a" * 64)
+    assert not revocation_filter.might_be_revoked("b" * 64)
+
+@pytest.mark.asyncio
+async def test_revocation_feed_pages_by_id(session_factory):
+    """A row committed with a lower id after a poll is returned in the overlap window."""
+    async with session_factory() as db:
+        repo = TokenBlacklistRepository(db, RevocationFilter())
+        expires = datetime.now(timezone.utc) + timedelta(hours=1)
+        await repo.blacklist_token(issue_token(1)[0], 1, expires)
+        # Simulate a slower transaction: id 1 is taken, the row above commits first
+        db.add(TokenBlacklist(id=3, token_hash="c" * 64, user_id=2, expires_at=expires))
+        await db.commit()
+
+        version = await repo.get_revocation_version()
+        assert version == 3
+        assert [row.id for row in await repo.get_revoked_after(None, up_to=version)] == [1, 3]
+
+        db.add(TokenBlacklist(id=2, token_hash="b" * 64, user_id=2, expires_at=expires))
+        await db.commit()
+
+        assert [row.id for row in await repo.get_revoked_after(version, up_to=version)] == []
+        assert [row.id for row in await repo.get_revoked_after(max(version - 100, 0), up_to=version)] == [1, 2, 3]
+
+@pytest.mark.asyncio
+async def test_sync_rereads_overlap_when_version_unchanged(session_factory):
+    """A lower id committed after a sync is loaded even though the max id did not move."""
+    revocation_filter = RevocationFilter()
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    async with session_factory() as db:
+        # id 1 is held by a slower transaction; id 2 commits first
+        db.add(TokenBlacklist(id=2, token_hash="b" * 64, user_id=2, expires_at=expires))
+        await db.commit()
+        assert await revocation_filter.sync(db) == 1
+        assert revocation_filter.version == 2
+
+        db.add(TokenBlacklist(id=1, token_hash="a" * 64, user_id=1, expires_at=expires))
+        await db.commit()
+
+        assert await revocation_filter.sync(db) == 1
+        assert revocation_filter.version == 2
+        assert revocation_filter.might_be_revoked("a" * 64)
+        assert await revocation_filter.sync(db) == 0
@@ -28,6 +28,13 @@ class Settings(BaseSettings):
     jwt_algorithm: str = Field(default="HS256")
     jwt_access_token_expire_minutes: int = Field(default=30)
     
+    # Service-side token verification (verify JWTs locally, cache claims,
+    # poll the auth service revocation feed)
+    auth_local_verification: bool = Field(default=True)
+    auth_claims_cache_ttl: int = Field(default=300, ge=0)
+    auth_claims_cache_size: int = Field(default=10000, ge=1)
+    auth_revocation_poll_seconds: int = Field(default=15, ge=1)
+    
     # GCP Configuration
     gcp_project_id: str = Field(env="GCP_PROJECT_ID")
     gcp_region: str = Field(default="us-central1")
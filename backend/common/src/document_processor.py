@@ -1,9 +1,12 @@
 """Process and chunk documents from GCS"""
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
 import datetime
+import random
+import time
 import traceback
 
 from google.cloud import storage
@@ -17,13 +20,27 @@ from langchain_community.document_loaders import (
 import vertexai
 from vertexai.language_models import TextEmbeddingModel
 
+from .embedding_cache import EmbeddingCache, content_hash
+from .index_manifest import IndexManifest, ManifestEntry
+
 DEBUG_LOG_PATH = "/tmp/document_processor_debug.log"
 def log_debug(msg):
     with open(DEBUG_LOG_PATH, "a") as f:
         f.write(f"[{datetime.datetime.now()}] {msg}\n")
 
 class DocumentProcessor:
-    def __init__(self, project_id: str, bucket_name: str):
+    def __init__(
+        self,
+        project_id: str,
+        bucket_name: str,
+        embedding_model_name: str = "text-embedding-004",
+        embedding_batch_size: int = 5,
+        max_concurrent_batches: int = 4,
+        max_concurrent_documents: int = 4,
+        max_embedding_retries: int = 5,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        use_embedding_cache: bool = True
+    ):
         self.project_id = project_id
         self.bucket_name = bucket_name
         self.storage_client = storage.Client(project=project_id)
@@ -31,7 +48,19 @@ class DocumentProcessor:
         
         # Initialize Vertex AI
         vertexai.init(project=project_id, location="us-central1")
-        self.embedding_model = TextEmbeddingModel.from_pretrained("text-embedding-004")
+        self.embedding_model_name = embedding_model_name
+        self.embedding_model = TextEmbeddingModel.from_pretrained(embedding_model_name)
+        
+        # Embedding pipeline limits (batch size is the API's per-request limit)
+        self.embedding_batch_size = embedding_batch_size
+        self.max_concurrent_batches = max_concurrent_batches
+        self.max_concurrent_documents = max_concurrent_documents
+        self.max_embedding_retries = max_embedding_retries
+        
+        # Unchanged chunks are not re-embedded across ingestion runs
+        if embedding_cache is None and use_embedding_cache:
+            embedding_cache = EmbeddingCache()
+        self.embedding_cache = embedding_cache
         
         # Text splitter for chunking
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -46,6 +75,21 @@ class DocumentProcessor:
         blobs = self.bucket.list_blobs(prefix=prefix)
         return [blob.name for blob in blobs if self._is_supported_file(blob.name)]
     
+    def list_document_entries(self, prefix: str = "") -> Dict[str, ManifestEntry]:
+        """List supported blobs with the version fields used for change detection"""
+        entries = {}
+        for blob in self.bucket.list_blobs(prefix=prefix):
+            if not self._is_supported_file(blob.name):
+                continue
+            entries[blob.name] = ManifestEntry(
+                blob_name=blob.name,
+                generation=str(blob.generation) if blob.generation is not None else None,
+                etag=blob.etag,
+                # Composite objects have no MD5; CRC32C is always present
+                content_hash=blob.md5_hash or blob.crc32c
+            )
+        return entries
+    
     def _is_supported_file(self, filename: str) -> bool:
         """Check if file type is supported"""
         supported_extensions = ['.pdf', '.docx', '.txt', '.md']
@@ -72,8 +116,13 @@ class DocumentProcessor:
         
         return loader.load()
     
-    def process_document(self, blob_name: str) -> List[Dict[str, Any]]:
-        """Process a single document from GCS"""
+    def process_document(self, blob_name: str, raise_errors: bool = False) -> List[Dict[str, Any]]:
+        """Process a single document from GCS
+        
+        Download, load and split failures are logged and the chunks gathered
+        so far are returned, unless ``raise_errors`` is set, in which case
+        they propagate so the caller can tell a failure from an empty file.
+        """
         chunks = []
         
         # Download to temp file
@@ -94,6 +143,8 @@ class DocumentProcessor:
             except Exception as e:
                 log_debug(f"ERROR loading document {blob_name}: {str(e)}")
                 log_debug(traceback.format_exc())
+                if raise_errors:
+                    raise
                 return chunks
             for doc in documents:
                 try:
@@ -102,6 +153,8 @@ class DocumentProcessor:
                 except Exception as e:
                     log_debug(f"ERROR splitting document {blob_name}: {str(e)}")
                     log_debug(traceback.format_exc())
+                    if raise_errors:
+                        raise
                     continue
                 for i, chunk_text in enumerate(doc_chunks):
                     # Merge metadata but ensure source is always the blob name
@@ -114,6 +167,8 @@ class DocumentProcessor:
                         "page": doc.metadata.get("page", 0)
                     }
                     chunk = {
+                        # Stable per-blob id so re-indexing can upsert/delete it
+                        "id": f"{blob_name}_chunk_{len(chunks)}",
                         "content": chunk_text,
                         "metadata": metadata
                     }
@@ -121,6 +176,8 @@ class DocumentProcessor:
         except Exception as e:
             log_debug(f"ERROR processing document {blob_name}: {str(e)}")
             log_debug(traceback.format_exc())
+            if raise_errors:
+                raise
         finally:
             # Clean up temp file
             os.unlink(tmp_path)
@@ -129,16 +186,53 @@ class DocumentProcessor:
         return chunks
     
     def create_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Create embeddings using Vertex AI"""
-        # Process in batches of 5 (API limit)
-        embeddings = []
+        """Create embeddings using Vertex AI
+        
+        Cached embeddings are reused; the remaining unique texts are sent in
+        batches with up to ``max_concurrent_batches`` requests in flight.
+        """
+        hashes = [content_hash(text) for text in texts]
+        cached = {}
+        if self.embedding_cache is not None:
+            cached = self.embedding_cache.get_many(self.embedding_model_name, hashes)
+        
+        # Embed each distinct uncached text once
+        pending = {}
+        for hash_, text in zip(hashes, texts):
+            if hash_ not in cached and hash_ not in pending:
+                pending[hash_] = text
         
-        for i in range(0, len(texts), 5):
-            batch = texts[i:i+5]
-            batch_embeddings = self.embedding_model.get_embeddings(batch)
-            embeddings.extend([emb.values for emb in batch_embeddings])
+        log_debug(f"Embeddings: {len(texts)} requested, {len(texts) - len(pending)} cached, {len(pending)} to embed")
+        if pending:
+            pending_hashes = list(pending)
+            batches = [
+                pending_hashes[i:i + self.embedding_batch_size]
+                for i in range(0, len(pending_hashes), self.embedding_batch_size)
+            ]
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_batches) as executor:
+                batch_results = executor.map(
+                    lambda batch: self._embed_batch([pending[h] for h in batch]),
+                    batches
+                )
+                for batch, batch_embeddings in zip(batches, batch_results):
+                    new_embeddings = dict(zip(batch, batch_embeddings))
+                    cached.update(new_embeddings)
+                    if self.embedding_cache is not None:
+                        self.embedding_cache.put_many(self.embedding_model_name, new_embeddings)
         
-        return embeddings
+        return [cached[hash_] for hash_ in hashes]
+    
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed one batch, retrying with exponential backoff and jitter"""
+        for attempt in range(self.max_embedding_retries):
+            try:
+                return [emb.values for emb in self.embedding_model.get_embeddings(batch)]
+            except Exception as e:
+                if attempt == self.max_embedding_retries - 1:
+                    raise
+                delay = min(2 ** attempt, 30) + random.uniform(0, 1)
+                log_debug(f"Embedding batch failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
     
     def process_all_documents(self) -> Dict[str, Any]:
         """Process all documents in the bucket"""
@@ -148,15 +242,21 @@ class DocumentProcessor:
         documents = self.list_documents()
         print(f"Found {len(documents)} documents to process")
         
-        # Process each document
-        for doc_name in documents:
-            print(f"Processing: {doc_name}")
+        def process(doc_name):
             try:
-                chunks = self.process_document(doc_name)
+                return self.process_document(doc_name), None
+            except Exception as e:
+                return [], e
+        
+        # Download, load and chunk documents concurrently (results keep listing order)
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_documents) as executor:
+            for doc_name, (chunks, error) in zip(documents, executor.map(process, documents)):
+                print(f"Processing: {doc_name}")
+                if error is not None:
+                    print(f"  Error processing {doc_name}: {str(error)}")
+                    continue
                 all_chunks.extend(chunks)
                 print(f"  Created {len(chunks)} chunks")
-            except Exception as e:
-                print(f"  Error processing {doc_name}: {str(e)}")
         
         # Create embeddings for all chunks
         print(f"\nCreating embeddings for {len(all_chunks)} chunks...")
@@ -171,4 +271,98 @@ class DocumentProcessor:
             "chunks": all_chunks,
             "total_documents": len(documents),
             "total_chunks": len(all_chunks)
-        } 
\ No newline at end of file
+        }
+    
+    def reindex_documents(
+        self,
+        vector_store,
+        manifest: IndexManifest,
+        prefix: str = "",
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """Incrementally sync the vector store with the bucket
+        
+        Only new and changed blobs are downloaded, chunked and embedded;
+        their chunks are upserted and chunk ids that no longer exist are
+        deleted. Chunks of blobs removed from the bucket are deleted. Pass
+        ``force=True`` to reprocess every blob. The vector store must
+        provide ``upsert(chunks)``, ``delete(ids)`` and
+        ``delete_legacy_chunks(blob_name, chunks)``.
+        
+        Blobs missing from the manifest may still have chunks indexed by a
+        full ``process_all_documents`` run under the old document-based ids;
+        those are removed when the blob is first indexed here.
+        """
+        current = self.list_document_entries(prefix)
+        diff = manifest.diff(current, force=force)
+        print(
+            f"Reindex: {len(diff.new)} new, {len(diff.changed)} changed, "
+            f"{len(diff.unchanged)} unchanged, {len(diff.deleted)} deleted"
+        )
+        
+        # Same bytes under a new generation: only the manifest needs updating
+        for name in diff.unchanged:
+            entry = current[name]
+            entry.chunk_ids = manifest.entries[name].chunk_ids
+            manifest.entries[name] = entry
+        
+        def process(blob_name):
+            # A failed download must not look like an empty document, which
+            # would delete the blob's indexed chunks
+            try:
+                return self.process_document(blob_name, raise_errors=True), None
+            except Exception as e:
+                return [], e
+        
+        failed = []
+        chunks_upserted = 0
+        chunks_deleted = 0
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_documents) as executor:
+            processed = list(zip(diff.to_process, executor.map(process, diff.to_process)))
+        
+        for blob_name, (chunks, error) in processed:
+            if error is not None:
+                # Keep the previous entry so the blob is retried next run
+                print(f"  Error processing {blob_name}: {str(error)}")
+                failed.append(blob_name)
+                continue
+            
+            if chunks:
+                embeddings = self.create_embeddings([chunk["content"] for chunk in chunks])
+                for chunk, embedding in zip(chunks, embeddings):
+                    chunk["embedding"] = embedding
+                vector_store.upsert(chunks)
+                chunks_upserted += len(chunks)
+            
+            new_ids = [chunk["id"] for chunk in chunks]
+            previous = manifest.entries.get(blob_name)
+            if previous is None:
+                chunks_deleted += vector_store.delete_legacy_chunks(blob_name, chunks)
+            stale_ids = sorted(set(previous.chunk_ids) - set(new_ids)) if previous else []
+            if stale_ids:
+                vector_store.delete(stale_ids)
+                chunks_deleted += len(stale_ids)
+            
+            entry = current[blob_name]
+            entry.chunk_ids = new_ids
+            manifest.entries[blob_name] = entry
+        
+        for blob_name in diff.deleted:
+            chunk_ids = manifest.entries[blob_name].chunk_ids
+            if chunk_ids:
+                vector_store.delete(chunk_ids)
+                chunks_deleted += len(chunk_ids)
+            del manifest.entries[blob_name]
+        
+        manifest.save()
+        
+        return {
+            "total_documents": len(current),
+            "new_documents": len(diff.new),
+            "changed_documents": len(diff.changed),
+            "unchanged_documents": len(diff.unchanged),
+            "deleted_documents": len(diff.deleted),
+            "failed_documents": failed,
+            "chunks_upserted": chunks_upserted,
+            "chunks_deleted": chunks_deleted
+        }
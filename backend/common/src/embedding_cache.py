@@ -0,0 +1,82 @@
+"""Persistent embedding cache keyed by model and chunk content hash"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of the chunk text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed store of embeddings keyed by (model, sha256(text))
+
+    Re-ingesting unchanged chunks is answered from disk instead of calling
+    the embedding API again. Safe to share between threads.
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.db")
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    embedding TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (model, content_hash)
+                )
+            """)
+
+    def get_many(self, model: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """Return the cached embeddings for the given content hashes"""
+        hashes = list(dict.fromkeys(hashes))
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), self._LOOKUP_BATCH):
+                batch = hashes[i:i + self._LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, embedding FROM embeddings "
+                    f"WHERE model = ? AND content_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchall()
+                for hash_, embedding in rows:
+                    found[hash_] = json.loads(embedding)
+        return found
+
+    def put_many(self, model: str, embeddings: Dict[str, List[float]]):
+        """Store embeddings keyed by content hash"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, content_hash, embedding, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(model, hash_, json.dumps(vector), now) for hash_, vector in embeddings.items()]
+            )
+
+    def count(self, model: Optional[str] = None) -> int:
+        """Number of cached embeddings, optionally for a single model"""
+        with self._lock:
+            if model is None:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE model = ?", (model,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,98 @@
+"""Manifest of indexed blobs for incremental re-indexing
+
+Records, per blob, the GCS generation/etag and content hash that were last
+indexed together with the vector store chunk ids they produced. A re-index
+run diffs the bucket listing against the manifest and only processes new,
+changed, or deleted blobs.
+"""
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass
+class ManifestEntry:
+    blob_name: str
+    generation: Optional[str]
+    etag: Optional[str]
+    content_hash: Optional[str]
+    chunk_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ManifestDiff:
+    new: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    @property
+    def to_process(self) -> List[str]:
+        return self.new + self.changed
+
+
+class IndexManifest:
+    """JSON manifest stored alongside the vector store"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("INDEX_MANIFEST_PATH", "./chroma_db/index_manifest.json")
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.load()
+
+    def load(self):
+        """Read the manifest from disk (missing file means empty)"""
+        if not os.path.exists(self.path):
+            self.entries = {}
+            return
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        self.entries = {
+            name: ManifestEntry(blob_name=name, **entry)
+            for name, entry in data.get("blobs", {}).items()
+        }
+
+    def save(self):
+        """Write the manifest atomically"""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": 1,
+            "blobs": {
+                name: {k: v for k, v in asdict(entry).items() if k != "blob_name"}
+                for name, entry in sorted(self.entries.items())
+            }
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def diff(self, current: Dict[str, ManifestEntry], force: bool = False) -> ManifestDiff:
+        """Compare the current bucket listing against the manifest
+
+        A blob is unchanged when its content hash matches; re-uploads with
+        identical bytes get a new generation but are not re-embedded.
+        """
+        result = ManifestDiff()
+        for name, entry in current.items():
+            previous = self.entries.get(name)
+            if previous is None:
+                result.new.append(name)
+            elif force or not self._same_content(previous, entry):
+                result.changed.append(name)
+            else:
+                result.unchanged.append(name)
+        result.deleted = [name for name in self.entries if name not in current]
+        return result
+
+    @staticmethod
+    def _same_content(previous: ManifestEntry, current: ManifestEntry) -> bool:
+        if previous.content_hash and current.content_hash:
+            return previous.content_hash == current.content_hash
+        return (previous.generation, previous.etag) == (current.generation, current.etag)
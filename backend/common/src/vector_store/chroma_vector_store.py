@@ -31,6 +31,9 @@ class VectorStore:
         
         # Create meaningful chunk IDs based on document_id and chunk_index
         for i, chunk in enumerate(chunks):
+            if chunk.get("id"):
+                ids.append(chunk["id"])
+                continue
             doc_id = chunk["metadata"].get("document_id", f"unknown_{i}")
             chunk_idx = chunk["metadata"].get("chunk_index", i)
             chunk_id = f"{doc_id}_chunk_{chunk_idx}"
@@ -45,6 +48,37 @@ class VectorStore:
         )
         print(f"Added {len(chunks)} chunks to ChromaDB")
     
+    def upsert(self, chunks: List[Dict[str, Any]]):
+        """Insert or replace chunks by their ``id``"""
+        if not chunks:
+            return
+        self.collection.upsert(
+            ids=[chunk["id"] for chunk in chunks],
+            embeddings=[chunk["embedding"] for chunk in chunks],
+            metadatas=[chunk["metadata"] for chunk in chunks],
+            documents=[chunk["content"] for chunk in chunks]
+        )
+        print(f"Upserted {len(chunks)} chunks to ChromaDB")
+    
+    def delete(self, ids: List[str]):
+        """Remove chunks by ID"""
+        ids = list(ids)
+        if ids:
+            self.collection.delete(ids=ids)
+            print(f"Deleted {len(ids)} chunks from ChromaDB")
+    
+    def delete_legacy_chunks(self, source: str, chunks: List[Dict[str, Any]]) -> int:
+        """Remove chunks of ``source`` not stored under the given chunk ids
+        
+        Chunks added before ids were derived from the blob name were keyed on
+        their position in the batch, so they are found by source metadata.
+        """
+        keep = {chunk["id"] for chunk in chunks}
+        existing = self.collection.get(where={"source": {"$eq": source}}, include=[])["ids"]
+        stale = [chunk_id for chunk_id in existing if chunk_id not in keep]
+        self.delete(stale)
+        return len(stale)
+    
     def search(self, query_embedding: List[float], top_k: int = 5, filters: Dict = None) -> List[Dict]:
         """Search for similar documents"""
         # ChromaDB search
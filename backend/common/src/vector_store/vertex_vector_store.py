@@ -204,6 +204,20 @@ class VertexVectorStore:
         )
         logger.info("Deleted vectors", count=len(ids))
 
+    def delete_legacy_chunks(self, source: str, chunks: Sequence[Dict[str, Any]]) -> int:
+        """Remove vectors stored under the pre-manifest ``{source}_{chunk_index}`` ids.
+
+        Matching Engine cannot list vectors by metadata, so the legacy ids are
+        rebuilt from the re-chunked document. Returns the number of ids removed.
+        """
+        keep = {c["id"] for c in chunks}
+        legacy = sorted(
+            {f"{source}_{c['metadata']['chunk_index']}" for c in chunks} - keep
+        )
+        if legacy:
+            self.delete(legacy)
+        return len(legacy)
+
     # ------------------------ operational helpers ------------------------
 
     def health_check(self) -> bool:
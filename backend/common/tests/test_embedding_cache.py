@@ -0,0 +1,135 @@
+"""Tests for the persistent embedding cache and batched embedding creation."""
+
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+# Import as the common.src package so relative imports resolve
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from common.src.document_processor import DocumentProcessor
+from common.src.embedding_cache import EmbeddingCache, content_hash
+
+
+def fake_vector(text):
+    """Deterministic per-text embedding"""
+    return [float(int(content_hash(text)[:8], 16)), float(len(text))]
+
+
+class _Embedding:
+    def __init__(self, values):
+        self.values = values
+
+
+class FakeEmbeddingModel:
+    """Records batches; answers out of order when jitter is set"""
+
+    def __init__(self, jitter=0.0):
+        self.jitter = jitter
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def get_embeddings(self, batch):
+        with self._lock:
+            self.batches.append(list(batch))
+        if self.jitter:
+            time.sleep(random.uniform(0, self.jitter))
+        return [_Embedding(fake_vector(text)) for text in batch]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.db"))
+    yield cache
+    cache.close()
+
+
+def make_processor(cache, model, batch_size=5, concurrency=4):
+    # Skip __init__: it connects to GCS and Vertex AI
+    processor = DocumentProcessor.__new__(DocumentProcessor)
+    processor.embedding_model_name = "text-embedding-004"
+    processor.embedding_model = model
+    processor.embedding_batch_size = batch_size
+    processor.max_concurrent_batches = concurrency
+    processor.max_embedding_retries = 1
+    processor.embedding_cache = cache
+    return processor
+
+
+class TestEmbeddingCache:
+    def test_content_hash_is_stable(self):
+        assert content_hash("same chunk") == content_hash("same " + "chunk")
+        assert content_hash("same chunk") != content_hash("same chunk ")
+
+    def test_miss_then_hit(self, cache):
+        key = content_hash("text")
+        assert cache.get_many("m", [key]) == {}
+        cache.put_many("m", {key: [0.5, 1.5]})
+        assert cache.get_many("m", [key]) == {key: [0.5, 1.5]}
+
+    def test_entries_are_per_model(self, cache):
+        key = content_hash("text")
+        cache.put_many("m1", {key: [1.0]})
+        assert cache.get_many("m2", [key]) == {}
+        assert cache.count("m1") == 1
+        assert cache.count("m2") == 0
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "embeddings.db")
+        first = EmbeddingCache(path)
+        first.put_many("m", {content_hash("text"): [2.0]})
+        first.close()
+        second = EmbeddingCache(path)
+        assert second.get_many("m", [content_hash("text")]) == {content_hash("text"): [2.0]}
+        second.close()
+
+
+class TestCreateEmbeddings:
+    def test_miss_embeds_and_populates_cache(self, cache):
+        model = FakeEmbeddingModel()
+        processor = make_processor(cache, model)
+
+        result = processor.create_embeddings(["a", "b"])
+
+        assert result == [fake_vector("a"), fake_vector("b")]
+        assert model.batches == [["a", "b"]]
+        assert cache.count("text-embedding-004") == 2
+
+    def test_hit_skips_the_model(self, cache):
+        model = FakeEmbeddingModel()
+        processor = make_processor(cache, model)
+        processor.create_embeddings(["a", "b"])
+        model.batches.clear()
+
+        assert processor.create_embeddings(["b", "a"]) == [fake_vector("b"), fake_vector("a")]
+        assert model.batches == []
+
+    def test_identical_texts_embedded_once(self, cache):
+        model = FakeEmbeddingModel()
+        processor = make_processor(cache, model)
+
+        result = processor.create_embeddings(["dup", "other", "dup"])
+
+        assert result == [fake_vector("dup"), fake_vector("other"), fake_vector("dup")]
+        assert sorted(text for batch in model.batches for text in batch) == ["dup", "other"]
+
+    def test_order_preserved_with_mixed_hits_and_misses(self, cache):
+        model = FakeEmbeddingModel(jitter=0.01)
+        processor = make_processor(cache, model, batch_size=2, concurrency=4)
+        texts = [f"chunk {i}" for i in range(40)]
+        # Every third chunk was embedded on an earlier run
+        cache.put_many(
+            "text-embedding-004",
+            {content_hash(t): fake_vector(t) for t in texts[::3]}
+        )
+
+        result = processor.create_embeddings(texts)
+
+        assert result == [fake_vector(t) for t in texts]
+        embedded = [text for batch in model.batches for text in batch]
+        assert sorted(embedded) == sorted(set(texts) - set(texts[::3]))
+        assert all(len(batch) <= 2 for batch in model.batches)
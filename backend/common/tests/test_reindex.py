@@ -0,0 +1,256 @@
+"""Tests for manifest diffing and incremental re-indexing."""
+
+import os
+import sys
+
+import pytest
+
+# Import as the common.src package so relative imports resolve
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from common.src.document_processor import DocumentProcessor
+from common.src.index_manifest import IndexManifest, ManifestEntry
+
+
+def entry(name, content_hash, generation="1", chunk_ids=None):
+    return ManifestEntry(
+        blob_name=name,
+        generation=generation,
+        etag=f"etag-{generation}",
+        content_hash=content_hash,
+        chunk_ids=list(chunk_ids or [])
+    )
+
+
+class TestManifestDiff:
+    def test_new_changed_unchanged_deleted(self, tmp_path):
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+        manifest.entries = {
+            "same.pdf": entry("same.pdf", "h1"),
+            "edited.pdf": entry("edited.pdf", "h2"),
+            "removed.pdf": entry("removed.pdf", "h3"),
+        }
+        current = {
+            "same.pdf": entry("same.pdf", "h1"),
+            "edited.pdf": entry("edited.pdf", "h2-new", generation="2"),
+            "added.pdf": entry("added.pdf", "h4"),
+        }
+
+        diff = manifest.diff(current)
+
+        assert diff.new == ["added.pdf"]
+        assert diff.changed == ["edited.pdf"]
+        assert diff.unchanged == ["same.pdf"]
+        assert diff.deleted == ["removed.pdf"]
+        assert diff.to_process == ["added.pdf", "edited.pdf"]
+
+    def test_reupload_with_same_bytes_is_unchanged(self, tmp_path):
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+        manifest.entries = {"a.pdf": entry("a.pdf", "h1", generation="1")}
+
+        diff = manifest.diff({"a.pdf": entry("a.pdf", "h1", generation="7")})
+
+        assert diff.unchanged == ["a.pdf"]
+
+    def test_generation_used_without_content_hash(self, tmp_path):
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+        manifest.entries = {"a.pdf": entry("a.pdf", None, generation="1")}
+
+        assert manifest.diff({"a.pdf": entry("a.pdf", None, generation="1")}).unchanged == ["a.pdf"]
+        assert manifest.diff({"a.pdf": entry("a.pdf", None, generation="2")}).changed == ["a.pdf"]
+
+    def test_force_reprocesses_unchanged(self, tmp_path):
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+        manifest.entries = {"a.pdf": entry("a.pdf", "h1")}
+
+        assert manifest.diff({"a.pdf": entry("a.pdf", "h1")}, force=True).changed == ["a.pdf"]
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = str(tmp_path / "manifest.json")
+        manifest = IndexManifest(path)
+        manifest.entries = {"a.pdf": entry("a.pdf", "h1", chunk_ids=["a.pdf_chunk_0"])}
+        manifest.save()
+
+        assert IndexManifest(path).entries == manifest.entries
+
+
+class FakeVectorStore:
+    def __init__(self, chunks=None):
+        self.chunks = {chunk["id"]: chunk for chunk in chunks or []}
+
+    def upsert(self, chunks):
+        for chunk in chunks:
+            self.chunks[chunk["id"]] = chunk
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            self.chunks.pop(chunk_id, None)
+
+    def delete_legacy_chunks(self, source, chunks):
+        keep = {chunk["id"] for chunk in chunks}
+        stale = [
+            chunk_id for chunk_id, chunk in self.chunks.items()
+            if chunk["metadata"]["source"] == source and chunk_id not in keep
+        ]
+        self.delete(stale)
+        return len(stale)
+
+
+def make_chunks(blob_name, texts):
+    return [
+        {
+            "id": f"{blob_name}_chunk_{i}",
+            "content": text,
+            "metadata": {"source": blob_name, "chunk_index": i}
+        }
+        for i, text in enumerate(texts)
+    ]
+
+
+class FakeBucketProcessor(DocumentProcessor):
+    """DocumentProcessor over an in-memory bucket of {name: (hash, texts)}"""
+
+    def __init__(self, bucket):
+        # Skip DocumentProcessor.__init__: it connects to GCS and Vertex AI
+        self.bucket_contents = bucket
+        self.max_concurrent_documents = 2
+        self.processed = []
+        self.failing_downloads = set()
+
+    def list_document_entries(self, prefix=""):
+        return {name: entry(name, hash_) for name, (hash_, _) in self.bucket_contents.items()}
+
+    def download_document(self, blob_name, local_path):
+        raise IOError(f"GCS unavailable for {blob_name}")
+
+    def process_document(self, blob_name, raise_errors=False):
+        self.processed.append(blob_name)
+        if blob_name in self.failing_downloads:
+            # Run the real error handling around the failing download
+            return DocumentProcessor.process_document(self, blob_name, raise_errors=raise_errors)
+        return make_chunks(blob_name, self.bucket_contents[blob_name][1])
+
+    def create_embeddings(self, texts):
+        return [[float(len(text))] for text in texts]
+
+
+class TestReindexDocuments:
+    def test_first_run_indexes_everything(self, tmp_path):
+        processor = FakeBucketProcessor({"a.pdf": ("h1", ["one", "two"])})
+        store = FakeVectorStore()
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+
+        result = processor.reindex_documents(store, manifest)
+
+        assert result["new_documents"] == 1
+        assert result["chunks_upserted"] == 2
+        assert sorted(store.chunks) == ["a.pdf_chunk_0", "a.pdf_chunk_1"]
+        assert IndexManifest(manifest.path).entries["a.pdf"].chunk_ids == ["a.pdf_chunk_0", "a.pdf_chunk_1"]
+
+    def test_unchanged_blobs_are_skipped(self, tmp_path):
+        processor = FakeBucketProcessor({"a.pdf": ("h1", ["one"]), "b.pdf": ("h2", ["two"])})
+        store = FakeVectorStore()
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+        processor.reindex_documents(store, manifest)
+        processor.processed.clear()
+
+        processor.bucket_contents["b.pdf"] = ("h2-new", ["two", "three"])
+        result = processor.reindex_documents(store, manifest)
+
+        assert processor.processed == ["b.pdf"]
+        assert result["unchanged_documents"] == 1
+        assert result["changed_documents"] == 1
+        assert sorted(store.chunks) == ["a.pdf_chunk_0", "b.pdf_chunk_0", "b.pdf_chunk_1"]
+
+    def test_shrunk_document_drops_stale_chunks(self, tmp_path):
+        processor = FakeBucketProcessor({"a.pdf": ("h1", ["one", "two", "three"])})
+        store = FakeVectorStore()
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+        processor.reindex_documents(store, manifest)
+
+        processor.bucket_contents["a.pdf"] = ("h1-new", ["one"])
+        result = processor.reindex_documents(store, manifest)
+
+        assert result["chunks_deleted"] == 2
+        assert sorted(store.chunks) == ["a.pdf_chunk_0"]
+
+    def test_deleted_blob_removes_its_chunks(self, tmp_path):
+        processor = FakeBucketProcessor({"a.pdf": ("h1", ["one"]), "b.pdf": ("h2", ["two"])})
+        store = FakeVectorStore()
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+        processor.reindex_documents(store, manifest)
+
+        del processor.bucket_contents["b.pdf"]
+        result = processor.reindex_documents(store, manifest)
+
+        assert result["deleted_documents"] == 1
+        assert sorted(store.chunks) == ["a.pdf_chunk_0"]
+        assert "b.pdf" not in manifest.entries
+
+    def test_failed_download_keeps_previous_chunks(self, tmp_path):
+        """A blob that fails to download is retried next run instead of being emptied"""
+        processor = FakeBucketProcessor({"a.pdf": ("h1", ["one", "two"])})
+        store = FakeVectorStore()
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+        processor.reindex_documents(store, manifest)
+
+        processor.bucket_contents["a.pdf"] = ("h1-new", ["one", "two", "three"])
+        processor.failing_downloads.add("a.pdf")
+        result = processor.reindex_documents(store, manifest)
+
+        assert result["failed_documents"] == ["a.pdf"]
+        assert result["chunks_deleted"] == 0
+        assert sorted(store.chunks) == ["a.pdf_chunk_0", "a.pdf_chunk_1"]
+        saved = IndexManifest(manifest.path).entries["a.pdf"]
+        assert saved.content_hash == "h1"
+        assert saved.chunk_ids == ["a.pdf_chunk_0", "a.pdf_chunk_1"]
+
+        processor.failing_downloads.clear()
+        processor.processed.clear()
+        processor.reindex_documents(store, manifest)
+        assert processor.processed == ["a.pdf"]
+        assert sorted(store.chunks) == ["a.pdf_chunk_0", "a.pdf_chunk_1", "a.pdf_chunk_2"]
+
+    def test_process_document_swallows_errors_by_default(self):
+        processor = FakeBucketProcessor({"a.pdf": ("h1", ["one"])})
+        processor.failing_downloads.add("a.pdf")
+
+        assert processor.process_document("a.pdf") == []
+        with pytest.raises(IOError):
+            processor.process_document("a.pdf", raise_errors=True)
+
+    def test_legacy_ids_replaced_on_first_reindex(self, tmp_path):
+        """Chunks from a pre-manifest full load are not duplicated"""
+        legacy = [
+            {"id": f"unknown_{i}_chunk_{i}", "content": text, "metadata": {"source": "a.pdf", "chunk_index": i}}
+            for i, text in enumerate(["one", "two"])
+        ]
+        other = {"id": "unknown_9_chunk_0", "content": "x", "metadata": {"source": "z.pdf", "chunk_index": 0}}
+        store = FakeVectorStore(legacy + [other])
+        processor = FakeBucketProcessor({"a.pdf": ("h1", ["one", "two"])})
+        manifest = IndexManifest(str(tmp_path / "manifest.json"))
+
+        result = processor.reindex_documents(store, manifest)
+
+        assert result["chunks_deleted"] == 2
+        assert sorted(store.chunks) == ["a.pdf_chunk_0", "a.pdf_chunk_1", "unknown_9_chunk_0"]
+
+
+class TestChromaLegacyCleanup:
+    def test_delete_legacy_chunks_by_source(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ENVIRONMENT", "development")
+        monkeypatch.chdir(tmp_path)
+        from common.src.vector_store.chroma_vector_store import VectorStore
+
+        store = VectorStore("test-project", collection_name="legacy_cleanup")
+        store.add_documents([
+            {"content": "one", "embedding": [1.0, 0.0], "metadata": {"source": "a.pdf", "chunk_index": 0}},
+            {"content": "two", "embedding": [0.0, 1.0], "metadata": {"source": "b.pdf", "chunk_index": 0}},
+        ])
+        new_chunks = make_chunks("a.pdf", ["one"])
+        for chunk in new_chunks:
+            chunk["embedding"] = [1.0, 0.0]
+        store.upsert(new_chunks)
+
+        assert store.delete_legacy_chunks("a.pdf", new_chunks) == 1
+        assert sorted(store.collection.get()["ids"]) == ["a.pdf_chunk_0", "unknown_1_chunk_0"]
@@ -1,6 +1,7 @@
 """MCP Server with GCS document retrieval"""
 from __future__ import annotations
 
+import asyncio
 import os
 from typing import Dict, Any, Optional
 from contextlib import asynccontextmanager
@@ -13,6 +14,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import get_settings
 from document_processor import DocumentProcessor
+from common.src.index_manifest import IndexManifest
 from vector_store import VectorStore
 from .middleware.error_handler import ErrorHandlerMiddleware
 
@@ -28,11 +30,12 @@ settings = get_settings()
 vector_store: Optional[VectorStore] = None
 embedding_model: Optional[TextEmbeddingModel] = None
 document_processor: Optional[DocumentProcessor] = None
+index_manifest: Optional[IndexManifest] = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown logic"""
-    global vector_store, embedding_model, document_processor
+    global vector_store, embedding_model, document_processor, index_manifest
     
     # Initialize vector store based on environment
     if os.getenv("ENVIRONMENT") == "development":
@@ -74,6 +77,9 @@ async def lifespan(app: FastAPI):
         bucket_name=os.getenv("GCS_BUCKET_NAME", "your-rag-documents")
     )
     
+    # Blob -> chunk id manifest used for incremental re-indexing
+    index_manifest = IndexManifest()
+    
     print("MCP Server initialized")
     yield
     print("MCP Server shutting down")
@@ -362,22 +368,26 @@ async def health():
 
 # Document management endpoints
 @app.post("/documents/process")
-async def process_documents():
-    """Process all documents in GCS bucket"""
+async def process_documents(full: bool = False):
+    """Index the GCS bucket, touching only new, changed or deleted blobs
+    
+    ``full=true`` reprocesses every blob.
+    """
     if not document_processor:
         raise HTTPException(status_code=500, detail="Document processor not initialized")
     
-    # Process documents
-    result = document_processor.process_all_documents()
-    
-    # Add to vector store
-    if result["chunks"]:
-        vector_store.add_documents(result["chunks"])
+    result = await asyncio.to_thread(
+        document_processor.reindex_documents,
+        vector_store,
+        index_manifest,
+        force=full
+    )
     
     return {
         "status": "success",
-        "documents_processed": result["total_documents"],
-        "chunks_created": result["total_chunks"]
+        "documents_processed": result["new_documents"] + result["changed_documents"],
+        "chunks_created": result["chunks_upserted"],
+        **result
     }
 
 @app.get("/documents/list")
@@ -399,6 +409,12 @@ async def clear_vector_store():
         raise HTTPException(status_code=500, detail="Vector store not initialized")
     
     vector_store.clear()
+    
+    # Nothing is indexed any more; the next /documents/process starts from scratch
+    if index_manifest:
+        index_manifest.entries.clear()
+        index_manifest.save()
+    
     return {
         "status": "success",
         "message": "Vector store cleared successfully"
@@ -0,0 +1,31 @@
+"""Add indexes for dashboard caseload aggregation
+
+Revision ID: 3c9e1f7a2b64
+Revises: 020428c58f08
+Create Date: 2025-08-04 10:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e1f7a2b64'
+down_revision = '020428c58f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index the teacher filters, latest-IEP window and goal aggregates"""
+    op.create_index('ix_student_case_manager', 'students', ['case_manager_auth_id'])
+    op.create_index('ix_student_primary_teacher', 'students', ['primary_teacher_auth_id'])
+    op.create_index('ix_iep_student_created', 'ieps', ['student_id', 'created_at'])
+    op.create_index('ix_goal_iep_status', 'iep_goals', ['iep_id', 'progress_status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_goal_iep_status', table_name='iep_goals')
+    op.drop_index('ix_iep_student_created', table_name='ieps')
+    op.drop_index('ix_student_primary_teacher', table_name='students')
+    op.drop_index('ix_student_case_manager', table_name='students')
@@ -0,0 +1,57 @@
+"""Add materialized dashboard statistics tables
+
+Revision ID: 7d2a4b9c1e05
+Revises: 3c9e1f7a2b64
+Create Date: 2025-08-05 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2a4b9c1e05'
+down_revision = '3c9e1f7a2b64'
+branch_labels = None
+depends_on = None
+
+STAT_COLUMNS = [
+    'total_students', 'active_ieps', 'pending_approvals',
+    'goals_achieved', 'total_goals', 'overdue_reviews'
+]
+
+
+def _stat_columns():
+    return [sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in STAT_COLUMNS]
+
+
+def upgrade() -> None:
+    """Create per-scope statistics and per-student snapshot tables
+
+    Rows are populated by the dashboard statistics reconciler on startup.
+    """
+    op.create_table(
+        'dashboard_statistics',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('scope_type', sa.String(20), nullable=False),
+        sa.Column('scope_key', sa.String(200), nullable=False),
+        *_stat_columns(),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint('scope_type', 'scope_key', name='uq_dashboard_stats_scope')
+    )
+    op.create_table(
+        'student_dashboard_snapshots',
+        sa.Column('student_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('case_manager_auth_id', sa.Integer(), nullable=True),
+        sa.Column('school_district', sa.String(200), nullable=True),
+        *_stat_columns(),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('student_dashboard_snapshots')
+    op.drop_table('dashboard_statistics')
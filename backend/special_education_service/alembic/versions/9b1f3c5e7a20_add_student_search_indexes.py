@@ -0,0 +1,40 @@
+"""Add trigram indexes for student search
+
+Revision ID: 9b1f3c5e7a20
+Revises: 7d2a4b9c1e05
+Create Date: 2025-08-06 14:05:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1f3c5e7a20'
+down_revision = '7d2a4b9c1e05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index lower-cased full name and student ID with pg_trgm
+
+    SQLite databases get their FTS5 table and triggers at service startup.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_student_search_name_trgm ON students "
+        "USING gin (lower(first_name || ' ' || last_name) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_student_search_student_id_trgm ON students "
+        "USING gin (lower(student_id) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_student_search_student_id_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_student_search_name_trgm")
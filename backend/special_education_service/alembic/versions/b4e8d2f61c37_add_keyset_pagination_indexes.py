@@ -0,0 +1,26 @@
+"""Add indexes for keyset pagination
+
+Revision ID: b4e8d2f61c37
+Revises: 9b1f3c5e7a20
+Create Date: 2025-08-07 11:20:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e8d2f61c37'
+down_revision = '9b1f3c5e7a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index the student name ordering and the approval queue ordering"""
+    op.create_index('ix_student_active_name', 'students', ['is_active', 'last_name', 'first_name', 'id'])
+    op.create_index('ix_iep_status_created', 'ieps', ['status', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_iep_status_created', table_name='ieps')
+    op.drop_index('ix_student_active_name', table_name='students')
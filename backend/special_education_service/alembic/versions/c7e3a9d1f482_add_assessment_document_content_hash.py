@@ -0,0 +1,29 @@
+"""Add content hash and size to assessment documents
+
+Revision ID: c7e3a9d1f482
+Revises: b4e8d2f61c37
+Create Date: 2025-08-08 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e3a9d1f482'
+down_revision = 'b4e8d2f61c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Record the SHA-256 and size of uploaded files so re-uploads can reuse extraction results"""
+    op.add_column('assessment_documents', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('assessment_documents', sa.Column('file_size', sa.Integer(), nullable=True))
+    op.create_index('ix_assessment_documents_content_hash', 'assessment_documents', ['content_hash'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assessment_documents_content_hash', table_name='assessment_documents')
+    op.drop_column('assessment_documents', 'file_size')
+    op.drop_column('assessment_documents', 'content_hash')
@@ -0,0 +1,47 @@
+"""Add durable queue for assessment document processing
+
+Revision ID: d2f8b6a4c913
+Revises: c7e3a9d1f482
+Create Date: 2025-08-08 15:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f8b6a4c913'
+down_revision = 'c7e3a9d1f482'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Queue table drained by DocumentProcessingWorker"""
+    op.create_table(
+        'document_processing_jobs',
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('document_id', sa.String(36), nullable=False),
+        sa.Column('file_path', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('claimed_by', sa.String(50), nullable=True),
+        sa.Column('retry_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_retry_at', sa.DateTime(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('failed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_document_processing_jobs_document_id', 'document_processing_jobs', ['document_id'])
+    op.create_index('idx_document_job_claim', 'document_processing_jobs',
+                    ['status', 'next_retry_at', 'priority', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_document_job_claim', table_name='document_processing_jobs')
+    op.drop_index('ix_document_processing_jobs_document_id', table_name='document_processing_jobs')
+    op.drop_table('document_processing_jobs')
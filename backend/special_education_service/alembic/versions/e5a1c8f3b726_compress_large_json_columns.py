@@ -0,0 +1,55 @@
+"""Store large JSON columns as compressed binary
+
+Revision ID: e5a1c8f3b726
+Revises: d2f8b6a4c913
+Create Date: 2025-08-09 10:20:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a1c8f3b726'
+down_revision = 'd2f8b6a4c913'
+branch_labels = None
+depends_on = None
+
+QUANTIFIED_JSON_COLUMNS = [
+    'standardized_plop', 'growth_rate', 'progress_indicators', 'learning_style_profile',
+    'cognitive_processing_profile', 'priority_goals', 'service_recommendations',
+    'accommodation_recommendations', 'secondary_disabilities', 'confidence_metrics',
+    'source_documents',
+]
+
+COMPRESSED_COLUMNS = (
+    [('ieps', 'content', 'json')]
+    + [('quantified_assessment_data', column, 'json') for column in QUANTIFIED_JSON_COLUMNS]
+    + [('iep_generation_jobs', 'gemini_response_raw', 'text')]
+)
+
+
+def upgrade() -> None:
+    """Convert the columns to bytea holding the existing JSON text
+
+    Existing rows keep their plain JSON bytes, which CompressedJSON reads as
+    legacy values; run migrate_compressed_json.py to compress them. SQLite
+    stores BLOBs in any column, so only PostgreSQL needs the type change.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column, _ in COMPRESSED_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea "
+            f"USING convert_to({column}::text, 'UTF8')"
+        )
+
+
+def downgrade() -> None:
+    """Convert back to JSON/text (run migrate_compressed_json.py --decompress first)"""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column, original_type in COMPRESSED_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {original_type} "
+            f"USING convert_from({column}, 'UTF8')::{original_type}"
+        )
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark CompressedJSON storage size and encode/decode latency
+Compares plain JSON text, GeminiClient's previous base64+gzip text and the
+gzip / zstd formats of the column type on IEP-shaped documents
+"""
+
+import base64
+import gzip
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from src.models.type_decorators import (
+    FORMAT_GZIP, FORMAT_ZSTD, decode_compressed_json, encode_compressed_json, zstandard
+)
+
+VOCABULARY = (
+    "reading fluency comprehension decoding phonological awareness working memory processing speed "
+    "verbal reasoning math calculation problem solving written expression spelling attention "
+    "classroom teacher reports observation accommodations intervention progress benchmark "
+    "assessment standard score percentile average below above range grade level peers "
+    "the and of to in with student will when given during demonstrate show"
+).split()
+
+SECTIONS = ["present_levels", "strengths", "needs", "goals", "accommodations", "services", "transition"]
+
+
+def sentence(rng: random.Random, words: int = 14) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+
+def make_document(paragraphs_per_section: int, rng: random.Random) -> dict:
+    """IEP content: narrative sections plus structured goals and scores"""
+    return {
+        name: {
+            "narrative": " ".join(sentence(rng) for _ in range(paragraphs_per_section * 5)),
+            "goals": [
+                {
+                    "domain": rng.choice(VOCABULARY),
+                    "goal_text": sentence(rng, 24),
+                    "baseline": rng.randint(20, 80),
+                    "target": rng.randint(60, 100),
+                    "measurement_method": sentence(rng, 6),
+                }
+                for _ in range(paragraphs_per_section)
+            ],
+            "scores": {f"subtest_{i}": rng.randint(55, 145) for i in range(paragraphs_per_section * 2)},
+        }
+        for name in SECTIONS
+    }
+
+
+def legacy_gemini_text(text: str) -> str:
+    """GeminiClient's former in-memory compression"""
+    return base64.b64encode(gzip.compress(text.encode("utf-8"))).decode("ascii")
+
+
+def time_per_op(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def run(label: str, document: dict, iterations: int):
+    plain = json.dumps(document, ensure_ascii=False)
+    plain_size = len(plain.encode("utf-8"))
+    print(f"\n{label}: {plain_size:,} bytes of JSON")
+    print(f"  {'format':<22}{'stored bytes':>14}{'ratio':>8}{'encode ms':>12}{'decode ms':>12}")
+
+    encode_ms = time_per_op(lambda: json.dumps(document, ensure_ascii=False), iterations)
+    decode_ms = time_per_op(lambda: json.loads(plain), iterations)
+    print(f"  {'plain json':<22}{plain_size:>14,}{1.0:>8.2f}{encode_ms:>12.3f}{decode_ms:>12.3f}")
+
+    legacy = legacy_gemini_text(plain)
+    encode_ms = time_per_op(lambda: legacy_gemini_text(json.dumps(document, ensure_ascii=False)), iterations)
+    decode_ms = time_per_op(
+        lambda: json.loads(gzip.decompress(base64.b64decode(legacy)).decode("utf-8")), iterations
+    )
+    print(f"  {'base64+gzip':<22}{len(legacy):>14,}{plain_size / len(legacy):>8.2f}"
+          f"{encode_ms:>12.3f}{decode_ms:>12.3f}")
+
+    formats = [("gzip", FORMAT_GZIP)] + ([("zstd", FORMAT_ZSTD)] if zstandard is not None else [])
+    for name, fmt in formats:
+        stored = encode_compressed_json(document, compression=fmt)
+        assert decode_compressed_json(stored) == document, f"{name} round trip changed the document"
+        encode_ms = time_per_op(lambda: encode_compressed_json(document, compression=fmt), iterations)
+        decode_ms = time_per_op(lambda: decode_compressed_json(stored), iterations)
+        print(f"  {'CompressedJSON ' + name:<22}{len(stored):>14,}{plain_size / len(stored):>8.2f}"
+              f"{encode_ms:>12.3f}{decode_ms:>12.3f}")
+
+
+def main():
+    rng = random.Random(25)
+    if zstandard is None:
+        print("zstandard not installed: benchmarking the gzip format only")
+    run("Quantified assessment profile", make_document(1, rng), 500)
+    run("Generated IEP content", make_document(8, rng), 100)
+    run("Large Gemini response", make_document(60, rng), 20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Re-encode existing rows of CompressedJSON columns
+
+Alembic revision e5a1c8f3b726 converts the large JSON columns to binary
+but leaves their contents as plain JSON, which CompressedJSON reads as
+legacy values. This script compresses those rows in batches. It also
+unpacks the base64+gzip text GeminiClient used to write into
+``iep_generation_jobs.gemini_response_raw``.
+
+    python migrate_compressed_json.py               # compress legacy rows
+    python migrate_compressed_json.py --recompress  # re-encode every row (e.g. after installing zstandard)
+    python migrate_compressed_json.py --decompress  # write plain JSON back before downgrading
+"""
+
+import argparse
+import asyncio
+import base64
+import gzip
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.database import engine
+from src.models.job_models import IEPGenerationJob
+from src.models.special_education_models import IEP, QuantifiedAssessmentData
+from src.models.type_decorators import (
+    CompressedJSON, CompressedText, compressed_json_format, decode_compressed_json, encode_compressed_json
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MODELS = [IEP, QuantifiedAssessmentData, IEPGenerationJob]
+
+
+def compressed_columns() -> List[Tuple[sa.Table, str]]:
+    """Every (table, column name) stored with CompressedJSON"""
+    return [
+        (model.__table__, column.name)
+        for model in MODELS
+        for column in model.__table__.columns
+        if isinstance(column.type, CompressedJSON)
+    ]
+
+
+def reencode(
+    raw: Any,
+    column_type: CompressedJSON,
+    recompress: bool,
+    decompress: bool,
+    legacy_gemini: bool = False,
+    text_column: bool = False
+) -> Optional[bytes]:
+    """New stored bytes for a value, or None if it should be left as is
+
+    Legacy values of a text column stay strings rather than being parsed
+    as JSON, so CompressedText reads back the text that was stored.
+    """
+    data = raw.encode('utf-8') if isinstance(raw, str) else bytes(raw)
+    if legacy_gemini:
+        # GeminiClient's old base64+gzip text
+        value = decode_compressed_json(gzip.decompress(base64.b64decode(data)), legacy_text=text_column)
+    else:
+        is_legacy = compressed_json_format(data) == "legacy"
+        if decompress and is_legacy:
+            return None
+        if not (is_legacy or recompress or decompress):
+            return None
+        value = decode_compressed_json(data, legacy_text=text_column)
+
+    if decompress:
+        if text_column and isinstance(value, str):
+            return value.encode('utf-8')
+        return json.dumps(value, ensure_ascii=False).encode('utf-8')
+    return encode_compressed_json(value, column_type.threshold, column_type.compression)
+
+
+async def migrate_column(
+    table: sa.Table,
+    column_name: str,
+    batch_size: int,
+    recompress: bool,
+    decompress: bool,
+    dry_run: bool
+) -> Dict[str, int]:
+    """Walk one column in primary key order, rewriting a batch per transaction"""
+    column_type = table.c[column_name].type
+    has_legacy_flag = table.name == 'iep_generation_jobs' and column_name == 'gemini_response_raw'
+    flag_columns = ['gemini_response_compressed'] if has_legacy_flag else []
+
+    # Untyped for reading so values come back exactly as stored (text or bytes)
+    source = sa.table(table.name, sa.column('id'), sa.column(column_name), *map(sa.column, flag_columns))
+    target = sa.table(
+        table.name, sa.column('id'), sa.column(column_name, sa.LargeBinary),
+        *(sa.column(name, sa.Boolean) for name in flag_columns)
+    )
+
+    stats = {"scanned": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0}
+    last_id = None
+    while True:
+        query = (
+            sa.select(source.c.id, source.c[column_name], *(source.c[name] for name in flag_columns))
+            .where(source.c[column_name].is_not(None))
+            .order_by(source.c.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            query = query.where(source.c.id > last_id)
+
+        async with engine.begin() as conn:
+            rows = (await conn.execute(query)).all()
+            if not rows:
+                break
+
+            for row in rows:
+                raw = row[1]
+                stats["scanned"] += 1
+                new_value = reencode(
+                    raw, column_type, recompress, decompress,
+                    legacy_gemini=has_legacy_flag and bool(row[2]),
+                    text_column=isinstance(column_type, CompressedText)
+                )
+                if new_value is None:
+                    continue
+
+                stats["rewritten"] += 1
+                stats["bytes_before"] += len(raw.encode('utf-8') if isinstance(raw, str) else raw)
+                stats["bytes_after"] += len(new_value)
+                if dry_run:
+                    continue
+
+                values = {column_name: new_value, **{name: False for name in flag_columns}}
+                await conn.execute(sa.update(target).where(target.c.id == row[0]).values(**values))
+            last_id = rows[-1][0]
+
+        logger.info(f"   {table.name}.{column_name}: {stats['scanned']} scanned, {stats['rewritten']} rewritten")
+
+    return stats
+
+
+async def main(batch_size: int, recompress: bool, decompress: bool, dry_run: bool) -> bool:
+    """Migrate every CompressedJSON column"""
+    mode = "decompress" if decompress else "recompress" if recompress else "compress legacy rows"
+    logger.info(f"🗜️ Migrating compressed JSON columns ({mode}{', dry run' if dry_run else ''})")
+
+    totals = {"scanned": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0}
+    try:
+        for table, column_name in compressed_columns():
+            stats = await migrate_column(table, column_name, batch_size, recompress, decompress, dry_run)
+            for key in totals:
+                totals[key] += stats[key]
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}", exc_info=True)
+        return False
+    finally:
+        await engine.dispose()
+
+    saved = totals["bytes_before"] - totals["bytes_after"]
+    logger.info(
+        f"✅ {totals['rewritten']} of {totals['scanned']} values rewritten, "
+        f"{totals['bytes_before']:,} -> {totals['bytes_after']:,} bytes ({saved:,} saved)"
+    )
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-encode rows of CompressedJSON columns")
+    parser.add_argument("--batch-size", type=int, default=500)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--recompress", action="store_true", help="Re-encode rows that are already compressed")
+    mode.add_argument("--decompress", action="store_true", help="Write plain JSON (before alembic downgrade)")
+    parser.add_argument("--dry-run", action="store_true", help="Report savings without writing")
+    args = parser.parse_args()
+
+    success = asyncio.run(main(args.batch_size, args.recompress, args.decompress, args.dry_run))
+    sys.exit(0 if success else 1)
@@ -23,6 +23,38 @@ class Settings(BaseModel):
     # AI Configuration
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
     GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY")
+    GEMINI_SECTION_CONCURRENCY: int = int(os.getenv("GEMINI_SECTION_CONCURRENCY", "4"))
+    GEMINI_REQUESTS_PER_SECOND: float = float(os.getenv("GEMINI_REQUESTS_PER_SECOND", "2.0"))
+    GEMINI_RATE_LIMIT_BURST: int = int(os.getenv("GEMINI_RATE_LIMIT_BURST", "4"))
+    GEMINI_SECTION_TIMEOUT_SECONDS: float = float(os.getenv("GEMINI_SECTION_TIMEOUT_SECONDS", "90"))
+    
+    # Gemini response cache (memory, sqlite, redis, or none)
+    GEMINI_CACHE_BACKEND: str = os.getenv("GEMINI_CACHE_BACKEND", "memory")
+    GEMINI_CACHE_TTL_SECONDS: float = float(os.getenv("GEMINI_CACHE_TTL_SECONDS", "86400"))
+    GEMINI_CACHE_MAX_ENTRIES: int = int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", "1000"))
+    GEMINI_CACHE_PATH: str = os.getenv("GEMINI_CACHE_PATH", "./gemini_response_cache.db")
+    GEMINI_CACHE_REDIS_URL: str = os.getenv("GEMINI_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    
+    # Async worker configuration
+    WORKER_MAX_CONCURRENT_JOBS: int = int(os.getenv("WORKER_MAX_CONCURRENT_JOBS", "4"))
+    WORKER_CLAIM_TIMEOUT_SECONDS: int = int(os.getenv("WORKER_CLAIM_TIMEOUT_SECONDS", "300"))
+    
+    # Assessment document processing queue: worker runs inside the API
+    # process unless disabled (then run start_document_worker.py separately)
+    DOCUMENT_WORKER_EMBEDDED: bool = os.getenv("DOCUMENT_WORKER_EMBEDDED", "true").lower() == "true"
+    DOCUMENT_WORKER_CONCURRENCY: int = int(os.getenv("DOCUMENT_WORKER_CONCURRENCY", "2"))
+    DOCUMENT_JOB_MAX_RETRIES: int = int(os.getenv("DOCUMENT_JOB_MAX_RETRIES", "3"))
+    DOCUMENT_JOB_RETRY_BACKOFF_SECONDS: int = int(os.getenv("DOCUMENT_JOB_RETRY_BACKOFF_SECONDS", "30"))
+    
+    # Shared job status poll for waiting clients when workers run in another
+    # process without LISTEN/NOTIFY (one query per interval for all watched jobs)
+    JOB_EVENTS_POLL_SECONDS: float = float(os.getenv("JOB_EVENTS_POLL_SECONDS", "2"))
+    
+    # Largest accepted assessment document upload
+    ASSESSMENT_UPLOAD_MAX_BYTES: int = int(os.getenv("ASSESSMENT_UPLOAD_MAX_BYTES", str(100 * 1024 * 1024)))
+    
+    # Dashboard statistics reconciliation interval (0 disables the job)
+    DASHBOARD_STATS_RECONCILE_SECONDS: int = int(os.getenv("DASHBOARD_STATS_RECONCILE_SECONDS", "3600"))
     
     # Email Configuration
     SMTP_ENABLED: bool = os.getenv("SMTP_ENABLED", "false").lower() == "true"
@@ -54,6 +86,11 @@ class Settings(BaseModel):
         """Get database URL"""
         return self.DATABASE_URL
     
+    @property
+    def is_sqlite(self) -> bool:
+        """Check if the configured database is SQLite"""
+        return self.DATABASE_URL.startswith("sqlite")
+    
     @property
     def gcp_project_id(self) -> str:
         """Get GCP project ID"""
@@ -4,10 +4,11 @@ IMPORTANT: For atomic operations and version constraint safety, use the
 request-scoped session middleware instead of the legacy get_db dependency.
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import text, select
+from sqlalchemy import text, select, event
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 import logging
+import time
 
 from .config import get_settings
 from .models.special_education_models import Base
@@ -40,6 +41,78 @@ async_session_factory = async_sessionmaker(
     expire_on_commit=False  # Prevent expiry after commit to avoid greenlet errors
 )
 
+class PoolMetrics:
+    """Connection pool occupancy and request session usage"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.checkouts = 0
+        self.total_hold_seconds = 0.0
+        self.max_hold_seconds = 0.0
+        self.requests = 0
+        self.requests_with_session = 0
+        self.connection_releases = 0
+    
+    def attach(self, engine):
+        event.listen(engine.sync_engine, "checkout", self._on_checkout)
+        event.listen(engine.sync_engine, "checkin", self._on_checkin)
+    
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.monotonic()
+        self.checkouts += 1
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+    
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is None:
+            return
+        held = time.monotonic() - checked_out_at
+        self.checked_out -= 1
+        self.total_hold_seconds += held
+        self.max_hold_seconds = max(self.max_hold_seconds, held)
+    
+    def record_request(self, used_session: bool):
+        self.requests += 1
+        if used_session:
+            self.requests_with_session += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        pool = engine.pool
+        return {
+            "pool_class": type(pool).__name__,
+            "pool_size": pool.size() if hasattr(pool, "size") else None,
+            "max_overflow": getattr(pool, "_max_overflow", None),
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "avg_hold_ms": round(self.total_hold_seconds / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+            "max_hold_ms": round(self.max_hold_seconds * 1000, 2),
+            "requests": self.requests,
+            "requests_with_session": self.requests_with_session,
+            "connection_releases": self.connection_releases
+        }
+
+pool_metrics = PoolMetrics()
+pool_metrics.attach(engine)
+
+async def release_session_connection(session: AsyncSession):
+    """Return the session's pooled connection before a long external await
+    
+    Ends the current transaction (committing anything already written) so
+    the connection goes back to the pool while an LLM, Document AI or vector
+    search call runs. The session stays usable: its next query checks out a
+    connection again and begins a new transaction. Loaded objects are not
+    expired (``expire_on_commit=False``).
+    """
+    if session.in_transaction():
+        await session.commit()
+        pool_metrics.connection_releases += 1
+
 @asynccontextmanager
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session with automatic cleanup"""
@@ -76,12 +149,13 @@ async def get_request_scoped_db(request) -> AsyncSession:
     
     This ensures all operations within a single HTTP request use the same
     database session, preventing race conditions and ensuring atomicity.
+    The session is opened on first use.
     """
     # Use request state instead of importing to avoid circular dependency
-    db_session = getattr(request.state, 'db_session', None)
-    if db_session is None:
+    db_scope = getattr(request.state, 'db_scope', None)
+    if db_scope is None:
         raise RuntimeError("No database session found in request state. Ensure RequestScopedSessionMiddleware is properly configured.")
-    return db_session
+    return db_scope.get_session()
 
 
 async def get_async_session():
@@ -102,6 +176,10 @@ async def get_async_session():
 
 async def init_db():
     """Initialize database with WAL mode for better concurrency"""
+    if not settings.is_sqlite:
+        # PRAGMA tuning below is SQLite-only
+        return
+    
     async with engine.begin() as conn:
         # Check SQLite compile options
         result = await conn.execute(text("PRAGMA compile_options"))
@@ -75,6 +75,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -141,11 +142,42 @@ async def startup_event():
             # Don't fail startup for schema issues - graceful degradation will handle it
             logger.warning("⚠️ Starting with schema issues - some features may be degraded")
         
+        # Prepare the indexed student search backend
+        from .repositories.student_search_repository import ensure_student_search_index
+        await ensure_student_search_index(engine)
+        
+        # Keep materialized dashboard statistics reconciled
+        if settings.DASHBOARD_STATS_RECONCILE_SECONDS > 0:
+            from .workers.dashboard_stats_reconciler import get_dashboard_stats_reconciler
+            get_dashboard_stats_reconciler().start()
+        
+        # Process queued assessment documents in this process
+        if settings.DOCUMENT_WORKER_EMBEDDED:
+            from .workers.document_processing_worker import start_embedded_document_worker
+            await start_embedded_document_worker()
+        
+        # Deliver job state changes from workers in other processes
+        from .workers.job_events import get_job_event_bus
+        await get_job_event_bus().start(engine)
+        
         logger.info("✅ Startup completed successfully")
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks"""
+    from .workers.job_events import get_job_event_bus
+    await get_job_event_bus().stop()
+    
+    from .workers.document_processing_worker import stop_embedded_document_worker
+    await stop_embedded_document_worker()
+    
+    if settings.DASHBOARD_STATS_RECONCILE_SECONDS > 0:
+        from .workers.dashboard_stats_reconciler import get_dashboard_stats_reconciler
+        await get_dashboard_stats_reconciler().stop()
+
 @app.get("/health", response_model=Dict[str, Any])
 async def health_check():
     """Health check endpoint with database connectivity test"""
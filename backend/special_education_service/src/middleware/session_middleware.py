@@ -9,10 +9,40 @@ from starlette.requests import Request
 from starlette.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import async_session_factory
+from ..database import async_session_factory, pool_metrics
 
 logger = logging.getLogger(__name__)
 
+class RequestSessionScope:
+    """Request-scoped session opened on first use
+    
+    Requests that never touch the database (health checks, cached reads,
+    streaming endpoints with their own session) never check out a pooled
+    connection.
+    """
+    
+    def __init__(self, correlation_id: str):
+        self.correlation_id = correlation_id
+        self.session: Optional[AsyncSession] = None
+    
+    def get_session(self) -> AsyncSession:
+        if self.session is None:
+            self.session = async_session_factory()
+            logger.debug(f"[{self.correlation_id}] Database session opened")
+        return self.session
+    
+    async def commit(self):
+        if self.session is not None:
+            await self.session.commit()
+    
+    async def rollback(self):
+        if self.session is not None:
+            await self.session.rollback()
+    
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
 class RequestScopedSessionMiddleware(BaseHTTPMiddleware):
     """Middleware to provide single database session per HTTP request"""
     
@@ -24,50 +54,50 @@ class RequestScopedSessionMiddleware(BaseHTTPMiddleware):
         # Start timing
         start_time = time.time()
         
-        # Create request-scoped database session
-        async with async_session_factory() as session:
-            # Store session in request state
-            request.state.db_session = session
-            request.state.session_created_at = start_time
+        # Request-scoped database session, created lazily by get_request_session
+        scope = RequestSessionScope(correlation_id)
+        request.state.db_scope = scope
+        request.state.session_created_at = start_time
+        
+        try:
+            # Process the request
+            response = await call_next(request)
             
-            logger.info(f"[{correlation_id}] Database session created for {request.method} {request.url.path}")
+            # If we made it here without exceptions, commit the transaction
+            await scope.commit()
             
-            try:
-                # Process the request
-                response = await call_next(request)
-                
-                # If we made it here without exceptions, commit the transaction
-                await session.commit()
-                
-                duration = time.time() - start_time
-                logger.info(f"[{correlation_id}] Request completed successfully in {duration:.3f}s")
-                
-                return response
-                
-            except Exception as e:
-                # Rollback on any error
-                await session.rollback()
-                
-                duration = time.time() - start_time
-                logger.error(f"[{correlation_id}] Request failed after {duration:.3f}s: {str(e)}")
-                
-                # Re-raise the exception
-                raise
+            duration = time.time() - start_time
+            logger.info(f"[{correlation_id}] {request.method} {request.url.path} completed in {duration:.3f}s"
+                        f"{' (db session)' if scope.session is not None else ''}")
+            
+            return response
+            
+        except Exception as e:
+            # Rollback on any error
+            await scope.rollback()
             
-            finally:
-                # Session is automatically closed by the context manager
+            duration = time.time() - start_time
+            logger.error(f"[{correlation_id}] Request failed after {duration:.3f}s: {str(e)}")
+            
+            # Re-raise the exception
+            raise
+        
+        finally:
+            pool_metrics.record_request(scope.session is not None)
+            await scope.close()
+            if scope.session is not None:
                 duration = time.time() - start_time
                 logger.debug(f"[{correlation_id}] Database session closed after {duration:.3f}s")
 
 
 # Dependency to get the request-scoped session
 async def get_request_session(request: Request) -> AsyncSession:
-    """Get the request-scoped database session"""
-    session = getattr(request.state, 'db_session', None)
-    if session is None:
+    """Get the request-scoped database session, opening it on first use"""
+    scope = getattr(request.state, 'db_scope', None)
+    if scope is None:
         raise RuntimeError("No database session found in request state. "
                          "Ensure RequestScopedSessionMiddleware is installed.")
-    return session
+    return scope.get_session()
 
 
 def get_correlation_id(request: Request) -> str:
@@ -6,6 +6,7 @@ from .job_models import *
 __all__ = [
     # Special education models
     'Base', 'Student', 'DisabilityType', 'IEP', 'IEPGoal', 'IEPTemplate', 'PresentLevel', 'PLAssessmentTemplate', 'WizardSession',
+    'DashboardStatistics', 'StudentDashboardSnapshot',
     # Job models
     'IEPGenerationJob'
 ]
\ No newline at end of file
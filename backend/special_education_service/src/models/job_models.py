@@ -3,6 +3,7 @@
 from sqlalchemy import Column, String, Text, DateTime, Integer, Index, Boolean
 from sqlalchemy.sql import func
 from .special_education_models import Base
+from .type_decorators import CompressedText
 
 
 class IEPGenerationJob(Base):
@@ -28,8 +29,8 @@ class IEPGenerationJob(Base):
     
     # Gemini-specific fields
     gemini_request_id = Column(String(100), nullable=True)
-    gemini_response_raw = Column(Text, nullable=True)  # Consider compression for large responses
-    gemini_response_compressed = Column(Boolean, default=False)
+    gemini_response_raw = Column(CompressedText(), nullable=True)
+    gemini_response_compressed = Column(Boolean, default=False)  # Legacy base64+gzip text, see migrate_compressed_json.py
     gemini_tokens_used = Column(Integer, nullable=True)
     
     # Error handling
@@ -56,4 +57,34 @@ class IEPGenerationJob(Base):
         Index('idx_queue_priority', 'priority', 'created_at'),
         # Index for status queries
         Index('idx_job_status', 'status', 'created_at'),
-    )
\ No newline at end of file
+    )
+
+class DocumentProcessingJob(Base):
+    """Queue entry for Document AI processing of an uploaded assessment document"""
+    __tablename__ = 'document_processing_jobs'
+    
+    id = Column(String(36), primary_key=True)
+    document_id = Column(String(36), nullable=False, index=True)
+    file_path = Column(Text, nullable=False)
+    
+    # Queue fields
+    status = Column(String(20), default="pending", nullable=False)  # pending, processing, completed, failed
+    priority = Column(Integer, default=0, nullable=False)
+    claimed_at = Column(DateTime, nullable=True)  # Lease start, renewed by heartbeat
+    claimed_by = Column(String(50), nullable=True)
+    
+    # Retries
+    retry_count = Column(Integer, default=0, nullable=False)
+    next_retry_at = Column(DateTime, nullable=True)
+    error_message = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    failed_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Claim query: claimable status, ready time, then priority order
+        Index('idx_document_job_claim', 'status', 'next_retry_at', 'priority', 'created_at'),
+    )
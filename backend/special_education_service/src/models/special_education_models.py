@@ -6,7 +6,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import uuid
 from enum import Enum
-from .type_decorators import SafeDate
+from .type_decorators import SafeDate, CompressedJSON
 
 Base = declarative_base()
 
@@ -64,6 +64,13 @@ class Student(Base):
     assessment_documents = relationship("AssessmentDocument", back_populates="student")
     quantified_assessments = relationship("QuantifiedAssessmentData", back_populates="student")
     
+    # Indexes for caseload (dashboard) queries
+    __table_args__ = (
+        Index('ix_student_case_manager', 'case_manager_auth_id'),
+        Index('ix_student_primary_teacher', 'primary_teacher_auth_id'),
+        Index('ix_student_active_name', 'is_active', 'last_name', 'first_name', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Student(id={self.id}, name={self.first_name} {self.last_name}, student_id={self.student_id})>"
 
@@ -113,7 +120,7 @@ class IEP(Base):
     status = Column(String(50), default=IEPStatus.DRAFT.value)
     
     # IEP Content
-    content = Column(JSON, nullable=False, default=dict)
+    content = Column(CompressedJSON(), nullable=False, default=dict)
     meeting_date = Column(SafeDate(), nullable=True)
     effective_date = Column(SafeDate(), nullable=True)
     review_date = Column(SafeDate(), nullable=True)
@@ -139,6 +146,8 @@ class IEP(Base):
     __table_args__ = (
         Index('ix_iep_student_year', 'student_id', 'academic_year'),
         Index('ix_iep_status', 'status'),
+        Index('ix_iep_student_created', 'student_id', 'created_at'),
+        Index('ix_iep_status_created', 'status', 'created_at', 'id'),
         UniqueConstraint('student_id', 'academic_year', 'version', name='uq_student_year_version'),
     )
     
@@ -173,6 +182,11 @@ class IEPGoal(Base):
     
     # Relationships
     iep = relationship("IEP", back_populates="goals")
+    
+    # Goal progress aggregates are grouped per IEP
+    __table_args__ = (
+        Index('ix_goal_iep_status', 'iep_id', 'progress_status'),
+    )
 
 class PLAssessmentTemplate(Base):
     __tablename__ = "pl_assessment_templates"
@@ -252,6 +266,59 @@ class WizardSession(Base):
     def __repr__(self):
         return f"<WizardSession(id={self.id}, student_id={self.student_id}, step={self.current_step}/{self.total_steps})>"
 
+class DashboardStatistics(Base):
+    """Materialized dashboard counts for one scope
+    
+    Scopes are ``case_manager`` (keyed by auth id), ``district`` (keyed by
+    school district) and ``all`` (key ``*``). Rows are adjusted
+    incrementally on student/IEP/goal writes and rebuilt by reconciliation.
+    """
+    __tablename__ = "dashboard_statistics"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    scope_type = Column(String(20), nullable=False)
+    scope_key = Column(String(200), nullable=False)
+    
+    # Counts over each active student's latest IEP
+    total_students = Column(Integer, nullable=False, default=0)
+    active_ieps = Column(Integer, nullable=False, default=0)
+    pending_approvals = Column(Integer, nullable=False, default=0)
+    goals_achieved = Column(Integer, nullable=False, default=0)
+    total_goals = Column(Integer, nullable=False, default=0)
+    overdue_reviews = Column(Integer, nullable=False, default=0)
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    reconciled_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        UniqueConstraint('scope_type', 'scope_key', name='uq_dashboard_stats_scope'),
+    )
+    
+    def __repr__(self):
+        return f"<DashboardStatistics(scope={self.scope_type}:{self.scope_key}, students={self.total_students})>"
+
+class StudentDashboardSnapshot(Base):
+    """A student's last applied contribution to the dashboard statistics
+    
+    Incremental refresh diffs a student's freshly computed contribution
+    against this row and applies the difference to each affected scope.
+    """
+    __tablename__ = "student_dashboard_snapshots"
+    
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    case_manager_auth_id = Column(Integer, nullable=True)
+    school_district = Column(String(200), nullable=True)
+    
+    total_students = Column(Integer, nullable=False, default=0)
+    active_ieps = Column(Integer, nullable=False, default=0)
+    pending_approvals = Column(Integer, nullable=False, default=0)
+    goals_achieved = Column(Integer, nullable=False, default=0)
+    total_goals = Column(Integer, nullable=False, default=0)
+    overdue_reviews = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 
 # =============================================================================
 # ASSESSMENT PIPELINE MODELS - Integrated into shared database
@@ -272,6 +339,8 @@ class AssessmentDocument(Base):
     gcs_path = Column(Text)  # Google Cloud Storage path
     upload_date = Column(DateTime(timezone=True), server_default=func.now())
     processing_status = Column(String(50), default="pending")  # pending, processing, completed, failed
+    content_hash = Column(String(64), index=True)  # SHA-256 of the file, for re-upload dedup
+    file_size = Column(Integer)  # bytes
     
     # Document metadata
     assessment_date = Column(DateTime(timezone=True))
@@ -361,29 +430,29 @@ class QuantifiedAssessmentData(Base):
     language_composite = Column(Float)
     
     # Standardized Present Levels of Performance (PLOP) data
-    standardized_plop = Column(JSON)
+    standardized_plop = Column(CompressedJSON())
     
     # Growth and progress data
-    growth_rate = Column(JSON)  # Domain-specific growth rates
-    progress_indicators = Column(JSON)  # Structured progress data
+    growth_rate = Column(CompressedJSON())  # Domain-specific growth rates
+    progress_indicators = Column(CompressedJSON())  # Structured progress data
     
     # Learning profiles
-    learning_style_profile = Column(JSON)
-    cognitive_processing_profile = Column(JSON)
+    learning_style_profile = Column(CompressedJSON())
+    cognitive_processing_profile = Column(CompressedJSON())
     
     # Goals and recommendations
-    priority_goals = Column(JSON)
-    service_recommendations = Column(JSON)
-    accommodation_recommendations = Column(JSON)
+    priority_goals = Column(CompressedJSON())
+    service_recommendations = Column(CompressedJSON())
+    accommodation_recommendations = Column(CompressedJSON())
     
     # Eligibility determination
     eligibility_category = Column(String(100))
     primary_disability = Column(String(100))
-    secondary_disabilities = Column(JSON)
+    secondary_disabilities = Column(CompressedJSON())
     
     # Confidence and source tracking
-    confidence_metrics = Column(JSON)
-    source_documents = Column(JSON)  # List of source document IDs
+    confidence_metrics = Column(CompressedJSON())
+    source_documents = Column(CompressedJSON())  # List of source document IDs
     
     # Relationships
     student = relationship("Student", back_populates="quantified_assessments")
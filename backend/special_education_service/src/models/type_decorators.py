@@ -1,7 +1,14 @@
 """Custom SQLAlchemy type decorators for safe data type handling"""
-from sqlalchemy import TypeDecorator, Date
+import gzip
+import json
+from sqlalchemy import TypeDecorator, Date, LargeBinary
 from datetime import date, datetime
-from typing import Optional, Union
+from typing import Any, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency; gzip is used instead
+    zstandard = None
 
 
 class SafeDate(TypeDecorator):
@@ -53,4 +60,170 @@ class SafeDate(TypeDecorator):
     
     def process_result_value(self, value: Optional[date], dialect) -> Optional[date]:
         """Process value from database (no conversion needed for dates)."""
-        return value
\ No newline at end of file
+        return value
+
+
+# Header of values written by CompressedJSON: magic bytes and a format byte.
+# JSON text never starts with a NUL byte, so values without the header are
+# legacy plain JSON written before the column was converted.
+COMPRESSED_JSON_MAGIC = b"\x00CJ"
+FORMAT_RAW = 0
+FORMAT_GZIP = 1
+FORMAT_ZSTD = 2
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+FORMAT_NAMES = {FORMAT_RAW: "raw", FORMAT_GZIP: "gzip", FORMAT_ZSTD: "zstd"}
+
+
+def default_compression_format() -> int:
+    """zstd when the ``zstandard`` package is installed, otherwise gzip"""
+    return FORMAT_ZSTD if zstandard is not None else FORMAT_GZIP
+
+
+def encode_compressed_json(
+    value: Any,
+    threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+    compression: Optional[int] = None
+) -> bytes:
+    """Serialize a value to JSON and wrap it in the CompressedJSON header.
+    
+    Payloads smaller than ``threshold`` bytes, or that do not shrink, are
+    stored uncompressed behind the header.
+    
+    Args:
+        value: Any JSON-serializable value
+        threshold: Smallest encoded size in bytes worth compressing
+        compression: FORMAT_GZIP or FORMAT_ZSTD (default: best available)
+        
+    Returns:
+        Header followed by the (possibly compressed) UTF-8 JSON payload
+    """
+    payload = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    fmt = FORMAT_RAW
+    if len(payload) >= threshold:
+        fmt = compression if compression is not None else default_compression_format()
+        if fmt == FORMAT_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstd compression requires the zstandard package")
+            compressed = zstandard.ZstdCompressor(level=3).compress(payload)
+        else:
+            compressed = gzip.compress(payload, compresslevel=6)
+        if len(compressed) < len(payload):
+            payload = compressed
+        else:
+            fmt = FORMAT_RAW
+    return COMPRESSED_JSON_MAGIC + bytes([fmt]) + payload
+
+
+def decode_compressed_json(
+    value: Union[bytes, bytearray, memoryview, str, Any],
+    legacy_text: bool = False
+) -> Any:
+    """Inverse of encode_compressed_json, also reading legacy uncompressed values.
+    
+    Args:
+        value: Stored bytes, or legacy JSON text / an already decoded value
+        legacy_text: Legacy values are plain text rather than JSON
+        
+    Returns:
+        The decoded JSON value. Legacy text that is not valid JSON, or any
+        legacy value when ``legacy_text`` is set, is returned as a string.
+        
+    Raises:
+        ValueError: If the header names an unknown format
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        if not data.startswith(COMPRESSED_JSON_MAGIC):
+            text = data.decode("utf-8")
+            return text if legacy_text else _decode_legacy_json(text)
+        header_size = len(COMPRESSED_JSON_MAGIC) + 1
+        fmt, payload = data[header_size - 1], data[header_size:]
+        if fmt == FORMAT_GZIP:
+            payload = gzip.decompress(payload)
+        elif fmt == FORMAT_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("Reading zstd-compressed values requires the zstandard package")
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        elif fmt != FORMAT_RAW:
+            raise ValueError(f"Unknown CompressedJSON format byte: {fmt}")
+        return json.loads(payload)
+    if isinstance(value, str):
+        return value if legacy_text else _decode_legacy_json(value)
+    return value
+
+
+def compressed_json_format(value: Optional[bytes]) -> Optional[str]:
+    """Name of the format a stored value uses ("legacy" if it has no header)"""
+    if value is None:
+        return None
+    data = bytes(value) if not isinstance(value, str) else value.encode("utf-8")
+    if not data.startswith(COMPRESSED_JSON_MAGIC):
+        return "legacy"
+    return FORMAT_NAMES.get(data[len(COMPRESSED_JSON_MAGIC)], "unknown")
+
+
+def _decode_legacy_json(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class CompressedJSON(TypeDecorator):
+    """A JSON type stored as compressed binary.
+    
+    Values are serialized to JSON and, once they reach ``threshold`` bytes,
+    compressed with zstd (when ``zstandard`` is installed) or gzip. A short
+    header records the format, so the compression choice can change without
+    rewriting existing rows, and rows written before the column was
+    converted (plain JSON text) still load.
+    
+    Usage:
+        content = Column(CompressedJSON(), nullable=False, default=dict)
+    """
+    impl = LargeBinary
+    cache_ok = True  # SQLAlchemy 2.x performance optimization
+    
+    def __init__(self, threshold: int = DEFAULT_COMPRESSION_THRESHOLD, compression: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.threshold = threshold
+        self.compression = compression
+    
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        """Serialize and compress a value before database binding.
+        
+        Args:
+            value: Any JSON-serializable value, or None
+            dialect: The SQL dialect in use
+            
+        Returns:
+            Encoded bytes or None
+        """
+        if value is None:
+            return None
+        return encode_compressed_json(value, self.threshold, self.compression)
+    
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        """Decompress and parse a value read from the database."""
+        if value is None:
+            return None
+        return decode_compressed_json(value)
+
+
+class CompressedText(CompressedJSON):
+    """A text column stored with the CompressedJSON encoding.
+    
+    For columns converted from ``text``: rows written before the conversion
+    are returned as the string they hold, even when that string happens to
+    be valid JSON.
+    
+    Usage:
+        gemini_response_raw = Column(CompressedText(), nullable=True)
+    """
+    cache_ok = True
+    
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        """Decompress a value read from the database, keeping legacy text as is."""
+        if value is None:
+            return None
+        return decode_compressed_json(value, legacy_text=True)
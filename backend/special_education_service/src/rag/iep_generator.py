@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 import asyncio
 import os
@@ -6,6 +6,17 @@ import google.generativeai as genai
 import logging
 
 from ..vector_store import VectorStore
+from ..utils.rate_limiter import get_gemini_rate_limiter
+from ..utils.response_cache import GeminiResponseCache, get_response_cache
+from .section_scheduler import SectionCallback, SectionScheduler
+
+class CachedModelResponse:
+    """Stand-in for a Gemini response served from the response cache"""
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.candidates = []
+
 
 class IEPGenerator:
     def __init__(self, vector_store: VectorStore, settings):
@@ -38,17 +49,61 @@ class IEPGenerator:
             }
         )
         
+        # Sections are generated concurrently; the shared token bucket keeps
+        # the aggregate request rate within the API quota
+        self.rate_limiter = get_gemini_rate_limiter()
+        self.response_cache = get_response_cache()
+        self.section_scheduler = SectionScheduler(
+            max_concurrency=getattr(settings, "GEMINI_SECTION_CONCURRENCY", 4),
+            section_timeout=getattr(settings, "GEMINI_SECTION_TIMEOUT_SECONDS", 90.0)
+        )
+        
         self.logger.info("✅ IEP Generator initialized with Google AI Studio API key authentication")
     
+    async def _call_model(self, prompt: str, use_cache: bool = True, **kwargs):
+        """Call Gemini off the event loop, subject to the process-wide rate limit
+        
+        Non-empty responses are cached by prompt hash; a byte-identical prompt
+        is answered from the cache without an API call.
+        """
+        cache = self.response_cache if use_cache else None
+        cache_key = None
+        if cache:
+            cache_key = GeminiResponseCache.make_key(
+                prompt, model=getattr(self.model, "model_name", None), grounding=bool(kwargs.get("tools"))
+            )
+            cached_text = await cache.get(cache_key)
+            if cached_text is not None:
+                return CachedModelResponse(cached_text)
+        
+        await self.rate_limiter.acquire()
+        response = await asyncio.to_thread(self.model.generate_content, prompt, **kwargs)
+        
+        if cache:
+            try:
+                text = response.text
+            except Exception:
+                text = None  # Blocked or empty candidates have no text
+            if text:
+                await cache.set(cache_key, text)
+        return response
+    
     async def generate_iep(
         self,
         template: Dict[str, Any],
         student_data: Dict[str, Any],
         previous_ieps: List[Dict[str, Any]],
         previous_assessments: List[Dict[str, Any]],
-        enable_google_search_grounding: bool = False
+        enable_google_search_grounding: bool = False,
+        use_cache: bool = True,
+        on_section: Optional[SectionCallback] = None
     ) -> Dict[str, Any]:
-        """Generate IEP content using RAG and Gemini"""
+        """Generate IEP content using RAG and Gemini
+        
+        Set ``use_cache=False`` to force fresh model calls (e.g. an explicit
+        regenerate request). ``on_section(name, content)`` is awaited as each
+        section finishes, for streaming responses.
+        """
         
         import logging
         logger = logging.getLogger(__name__)
@@ -75,42 +130,19 @@ class IEPGenerator:
             logger.error(f"[DEBUG] Context keys: {list(context.keys())}")
             logger.error(f"[DEBUG] Context disability_type: {context.get('disability_type')}")
             
-            # 3. Generate each section with error handling
-            generated_content = {}
+            # 3. Generate sections (and goals) concurrently
             sections = template.get("sections", {})
             logger.info(f"Generating {len(sections)} sections")
             
-            for section_name, section_template in sections.items():
-                try:
-                    logger.info(f"Generating section: {section_name}")
-                    section_content = await self._generate_section(
-                        section_name, section_template, context, enable_google_search_grounding
-                    )
-                    generated_content[section_name] = section_content
-                    logger.info(f"Section {section_name} generated successfully")
-                    
-                    # Add small delay between sections to avoid overwhelming API
-                    await asyncio.sleep(0.5)
-                except Exception as e:
-                    logger.error(f"Failed to generate section {section_name}: {e}")
-                    # Provide fallback content
-                    generated_content[section_name] = {
-                        "content": f"Generated content for {section_name}",
-                        "error": f"Generation failed: {str(e)}"
-                    }
+            def make_section_job(section_name, section_template):
+                return lambda: self._generate_section(
+                    section_name, section_template, context, enable_google_search_grounding,
+                    use_cache=use_cache
+                )
             
-            # 4. Generate goals based on assessment data
-            if "goals" in sections:
-                try:
-                    logger.info("Generating goals")
-                    goals = await self._generate_goals(
-                        student_data, previous_assessments, context
-                    )
-                    generated_content["goals"] = goals
-                    logger.info("Goals generated successfully")
-                except Exception as e:
-                    logger.error(f"Failed to generate goals: {e}")
-                    generated_content["goals"] = [
+            def section_fallback(section_name, error):
+                if section_name == "goals":
+                    return [
                         {
                             "domain": "academic",
                             "goal_text": "Student will demonstrate academic progress",
@@ -119,6 +151,24 @@ class IEPGenerator:
                             "measurement_method": "Regular assessments"
                         }
                     ]
+                return {
+                    "content": f"Generated content for {section_name}",
+                    "error": f"Generation failed: {str(error) or type(error).__name__}"
+                }
+            
+            jobs = []
+            for section_name, section_template in sections.items():
+                if section_name == "goals":
+                    # 4. Goals come from the dedicated SMART-goal prompt based on assessment data
+                    jobs.append((section_name, lambda: self._generate_goals(
+                        student_data, previous_assessments, context, use_cache=use_cache
+                    )))
+                else:
+                    jobs.append((section_name, make_section_job(section_name, section_template)))
+            
+            generated_content = await self.section_scheduler.run(
+                jobs, section_fallback, on_result=on_section
+            )
             
             logger.info("IEP generation completed successfully")
             return generated_content
@@ -169,7 +219,8 @@ class IEPGenerator:
         section_name: str, 
         section_template: Dict,
         context: Dict,
-        enable_google_search_grounding: bool = False
+        enable_google_search_grounding: bool = False,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """Generate individual IEP section"""
         
@@ -269,16 +320,9 @@ Generate content that:
                     )
                 ]
                 
-                response = await asyncio.to_thread(
-                    self.model.generate_content,
-                    prompt,
-                    tools=grounding_tools
-                )
+                response = await self._call_model(prompt, use_cache=use_cache, tools=grounding_tools)
             else:
-                response = await asyncio.to_thread(
-                    self.model.generate_content,
-                    prompt
-                )
+                response = await self._call_model(prompt, use_cache=use_cache)
             
             logger.info(f"Gemini response received for section {section_name}")
             logger.info(f"Response object type: {type(response)}")
@@ -319,11 +363,7 @@ Generate content that:
                 """
                 
                 try:
-                    await asyncio.sleep(1)  # Brief delay before retry
-                    retry_response = await asyncio.to_thread(
-                        self.model.generate_content,
-                        retry_prompt
-                    )
+                    retry_response = await self._call_model(retry_prompt, use_cache=use_cache)
                     
                     if retry_response.text:
                         logger.info(f"Retry successful for section {section_name}")
@@ -379,7 +419,8 @@ Generate content that:
         self,
         student_data: Dict,
         assessments: List[Dict],
-        context: Dict
+        context: Dict,
+        use_cache: bool = True
     ) -> List[Dict]:
         """Generate SMART goals based on assessments"""
         prompt = f"""
@@ -420,10 +461,7 @@ Generate content that:
         Return as a JSON array of goal objects.
         """
         
-        response = await asyncio.to_thread(
-            self.model.generate_content,
-            prompt
-        )
+        response = await self._call_model(prompt, use_cache=use_cache)
         
         import logging
         logger = logging.getLogger(__name__)
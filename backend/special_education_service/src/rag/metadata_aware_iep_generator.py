@@ -23,7 +23,9 @@ from ..schemas.rag_metadata_schemas import (
 )
 from ..vector_store_enhanced import EnhancedVectorStore
 from ..utils.gemini_client import GeminiClient
+from ..utils.response_cache import GeminiResponseCache
 from ..schemas.gemini_schemas import GeminiIEPResponse
+from .section_scheduler import SectionCallback
 
 
 logger = logging.getLogger(__name__)
@@ -93,7 +95,9 @@ class MetadataAwareIEPGenerator:
         student_data: Dict[str, Any],
         template_data: Dict[str, Any],
         generation_context: Optional[Dict[str, Any]] = None,
-        enable_google_search_grounding: bool = False
+        enable_google_search_grounding: bool = False,
+        on_section: Optional[SectionCallback] = None,
+        use_cache: bool = True
     ) -> Tuple[Any, Dict[str, Any]]:
         """
         Generate IEP with metadata-aware content retrieval and evidence tracking
@@ -102,6 +106,9 @@ class MetadataAwareIEPGenerator:
             student_data: Student information and context
             template_data: IEP template structure
             generation_context: Additional context for generation
+            on_section: Awaited with (section_name, content) as each top-level
+                section of the model response is streamed
+            use_cache: False to bypass the response cache (e.g. a regenerate)
             
         Returns:
             Tuple[IEPResponse, Dict]: Generated IEP (PLOP or standard format) and evidence metadata
@@ -124,7 +131,8 @@ class MetadataAwareIEPGenerator:
             
             # Phase 3: Generate IEP content with Gemini
             iep_response, grounding_metadata = await self._generate_iep_with_evidence(
-                student_data, template_data, enhanced_context, enable_google_search_grounding
+                student_data, template_data, enhanced_context, enable_google_search_grounding,
+                on_section=on_section, use_cache=use_cache
             )
             logger.info("🤖 IEP content generated with Gemini")
             
@@ -169,12 +177,12 @@ class MetadataAwareIEPGenerator:
         
         logger.info("📚 Collecting section-specific evidence...")
         
-        evidence_collection = {}
         student_id = student_data.get('student_id')
         
+        # Build every (section, search term) query up front
+        queries = []
+        query_sections = []
         for section, strategy in self.section_strategies.items():
-            logger.debug(f"🔍 Collecting evidence for {section.value}...")
-            
             # Build search context for this section
             search_context = SearchContext(
                 target_iep_section=section,
@@ -184,29 +192,34 @@ class MetadataAwareIEPGenerator:
                 student_context={'student_id': student_id} if student_id else {},
                 boost_recent=True
             )
+            for search_term in strategy['search_terms']:
+                queries.append((search_term, search_context, strategy['max_chunks']))
+                query_sections.append(section)
+        
+        # One batched retrieval round-trip for all sections
+        try:
+            batch_results = await self.vector_store.batch_enhanced_search(queries)
+        except Exception as e:
+            logger.warning(f"⚠️ Batch evidence search failed: {e}")
+            batch_results = [[] for _ in queries]
+        
+        results_by_section = {section: [] for section in self.section_strategies}
+        for (search_term, _, _), section, results in zip(queries, query_sections, batch_results):
+            results_by_section[section].append((search_term, results))
+        
+        async def rank_section(section: IEPSection) -> List[EnhancedSearchResult]:
+            strategy = self.section_strategies[section]
             
-            # Search for each strategy term
             section_results = []
-            for search_term in strategy['search_terms']:
-                try:
-                    results = await self.vector_store.enhanced_search(
-                        query_text=search_term,
-                        search_context=search_context,
-                        n_results=strategy['max_chunks']
-                    )
-                    
-                    # Filter by relevance threshold
-                    relevant_results = [
-                        r for r in results 
-                        if r.relevance_score >= strategy['relevance_threshold']
-                    ]
-                    
-                    section_results.extend(relevant_results)
-                    logger.debug(f"  🔍 '{search_term}': {len(relevant_results)} relevant results")
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ Search failed for '{search_term}': {e}")
-                    continue
+            for search_term, results in results_by_section[section]:
+                # Filter by relevance threshold
+                relevant_results = [
+                    r for r in results 
+                    if r.relevance_score >= strategy['relevance_threshold']
+                ]
+                
+                section_results.extend(relevant_results)
+                logger.debug(f"  🔍 {section.value} '{search_term}': {len(relevant_results)} relevant results")
             
             # Deduplicate and rank results
             unique_results = self._deduplicate_results(section_results)
@@ -216,8 +229,12 @@ class MetadataAwareIEPGenerator:
                 reverse=True
             )[:strategy['max_chunks']]
             
-            evidence_collection[section] = ranked_results
             logger.info(f"📋 {section.value}: {len(ranked_results)} evidence chunks collected")
+            return ranked_results
+        
+        sections = list(self.section_strategies)
+        ranked = await asyncio.gather(*(rank_section(section) for section in sections))
+        evidence_collection = dict(zip(sections, ranked))
         
         return evidence_collection
 
@@ -308,7 +325,9 @@ class MetadataAwareIEPGenerator:
         student_data: Dict[str, Any],
         template_data: Dict[str, Any],
         enhanced_context: Dict[str, Any],
-        enable_google_search_grounding: bool = False
+        enable_google_search_grounding: bool = False,
+        on_section: Optional[SectionCallback] = None,
+        use_cache: bool = True
     ) -> Tuple[Any, Optional[Dict[str, Any]]]:
         """Generate IEP content using enhanced context and evidence"""
         
@@ -337,15 +356,42 @@ class MetadataAwareIEPGenerator:
             'source_count': len(enhanced_context['sources'])
         }
         
+        # The prompt embeds retrieval output, so key cached responses on the
+        # template version and the student inputs that produced it
+        cache_key = None
+        if template_data.get('version') is not None:
+            cache_key = GeminiResponseCache.make_content_key(
+                template_data.get('id'), template_data['version'], enhanced_student_data,
+                model=self.gemini_client.model_name, grounding=enable_google_search_grounding
+            )
+        
         # Generate IEP content with Gemini
         try:
-            generation_result = await self.gemini_client.generate_iep_content(
-                student_data=enhanced_student_data,
-                template_data=template_data,
-                previous_ieps=None,  # Could be enhanced with metadata-aware previous IEP retrieval
-                previous_assessments=None,
-                enable_google_search_grounding=enable_google_search_grounding
-            )
+            if on_section is not None:
+                generation_result = None
+                async for event in self.gemini_client.stream_iep_content(
+                    student_data=enhanced_student_data,
+                    template_data=template_data,
+                    previous_ieps=None,
+                    previous_assessments=None,
+                    enable_google_search_grounding=enable_google_search_grounding,
+                    use_cache=use_cache,
+                    cache_key=cache_key
+                ):
+                    if event["type"] == "section":
+                        await on_section(event["section"], event["content"])
+                    else:
+                        generation_result = event["result"]
+            else:
+                generation_result = await self.gemini_client.generate_iep_content(
+                    student_data=enhanced_student_data,
+                    template_data=template_data,
+                    previous_ieps=None,  # Could be enhanced with metadata-aware previous IEP retrieval
+                    previous_assessments=None,
+                    enable_google_search_grounding=enable_google_search_grounding,
+                    use_cache=use_cache,
+                    cache_key=cache_key
+                )
             
             # Parse the response
             raw_response = generation_result['raw_text']
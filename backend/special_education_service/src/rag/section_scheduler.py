@@ -0,0 +1,66 @@
+"""Bounded-concurrency scheduler for generating IEP sections in parallel"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SectionJob = Callable[[], Awaitable[Any]]
+FallbackFactory = Callable[[str, Exception], Any]
+SectionCallback = Callable[[str, Any], Awaitable[None]]
+
+
+class SectionScheduler:
+    """
+    Run section generation jobs concurrently with a concurrency cap and a
+    per-section timeout.
+
+    Jobs are supplied as ``(name, job)`` pairs where ``job`` is a zero-argument
+    coroutine factory. Results are returned in the order the jobs were given
+    (i.e. template section order), regardless of completion order. A job that
+    raises or times out is replaced by ``fallback(name, error)``. If
+    ``on_result`` is given it is awaited with ``(name, result)`` as each
+    section finishes, in completion order.
+    """
+
+    def __init__(self, max_concurrency: int = 4, section_timeout: Optional[float] = 90.0):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.section_timeout = section_timeout
+
+    async def run(
+        self,
+        jobs: List[Tuple[str, SectionJob]],
+        fallback: FallbackFactory,
+        on_result: Optional[SectionCallback] = None
+    ) -> Dict[str, Any]:
+        """Run all jobs and return ``{name: result}`` in submission order"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(name: str, job: SectionJob) -> Any:
+            result = await generate_one(name, job)
+            if on_result is not None:
+                await on_result(name, result)
+            return result
+
+        async def generate_one(name: str, job: SectionJob) -> Any:
+            async with semaphore:
+                started_at = time.monotonic()
+                try:
+                    if self.section_timeout:
+                        result = await asyncio.wait_for(job(), timeout=self.section_timeout)
+                    else:
+                        result = await job()
+                    logger.info(f"Section {name} generated in {time.monotonic() - started_at:.2f}s")
+                    return result
+                except asyncio.TimeoutError as e:
+                    logger.error(f"Section {name} timed out after {self.section_timeout}s")
+                    return fallback(name, e)
+                except Exception as e:
+                    logger.error(f"Failed to generate section {name}: {e}")
+                    return fallback(name, e)
+
+        results = await asyncio.gather(*(run_one(name, job) for name, job in jobs))
+        return {name: result for (name, _), result in zip(jobs, results)}
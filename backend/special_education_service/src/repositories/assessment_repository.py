@@ -127,6 +127,87 @@ class AssessmentRepository:
             logger.error(f"Error getting student assessment documents for {student_id}: {e}")
             raise
     
+    async def delete_assessment_document(self, document_id: UUID) -> bool:
+        """Delete an assessment document with its scores and extracted data"""
+        try:
+            document = await self.db.get(AssessmentDocument, document_id)
+            if not document:
+                return False
+            await self.db.delete(document)
+            await self.db.commit()
+            return True
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error deleting assessment document {document_id}: {e}")
+            raise
+    
+    async def find_processed_document_by_hash(
+        self, 
+        content_hash: str, 
+        exclude_id: Optional[UUID] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Most recent successfully processed document with identical file content"""
+        try:
+            stmt = (
+                select(AssessmentDocument)
+                .where(
+                    AssessmentDocument.content_hash == content_hash,
+                    AssessmentDocument.processing_status == "completed"
+                )
+                .order_by(desc(AssessmentDocument.created_at))
+                .limit(1)
+            )
+            if exclude_id is not None:
+                stmt = stmt.where(AssessmentDocument.id != exclude_id)
+            result = await self.db.execute(stmt)
+            document = result.scalar_one_or_none()
+            
+            return self._assessment_document_to_dict(document) if document else None
+        except Exception as e:
+            logger.error(f"Error finding document by hash {content_hash}: {e}")
+            raise
+    
+    async def copy_processing_results(self, source_id: UUID, target_id: UUID) -> int:
+        """Copy extracted data and scores from one document to another
+        
+        Returns the number of scores copied.
+        """
+        try:
+            scores = (await self.db.execute(
+                select(PsychoedScore).where(PsychoedScore.document_id == source_id)
+            )).scalars().all()
+            extracted = (await self.db.execute(
+                select(ExtractedAssessmentData).where(ExtractedAssessmentData.document_id == source_id)
+            )).scalars().all()
+            
+            for row in [*scores, *extracted]:
+                self.db.add(self._copy_for_document(row, target_id))
+            await self.db.commit()
+            return len(scores)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error copying processing results from {source_id} to {target_id}: {e}")
+            raise
+    
+    async def delete_processing_results(self, document_id: UUID) -> int:
+        """Delete a document's scores and extracted data so it can be reprocessed
+        
+        Returns the number of scores deleted.
+        """
+        try:
+            result = await self.db.execute(
+                delete(PsychoedScore).where(PsychoedScore.document_id == document_id)
+            )
+            await self.db.execute(
+                delete(ExtractedAssessmentData).where(ExtractedAssessmentData.document_id == document_id)
+            )
+            await self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error deleting processing results for {document_id}: {e}")
+            raise
+    
     # Psychoeducational Score operations
     async def create_psychoed_score(self, score_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a single psychoeducational score"""
@@ -308,6 +389,17 @@ class AssessmentRepository:
             logger.error(f"Error getting quantified assessment data {data_id}: {e}")
             raise
     
+    @staticmethod
+    def _copy_for_document(row, document_id: UUID):
+        """New instance of a per-document row attached to another document"""
+        model = type(row)
+        values = {
+            column.key: getattr(row, column.key)
+            for column in model.__table__.columns
+            if column.key not in ("id", "document_id", "created_at")
+        }
+        return model(document_id=document_id, **values)
+    
     # Helper methods for converting models to dictionaries
     def _assessment_document_to_dict(self, document: AssessmentDocument) -> Dict[str, Any]:
         """Convert AssessmentDocument model to dictionary"""
@@ -320,6 +412,8 @@ class AssessmentRepository:
             "gcs_path": document.gcs_path,
             "upload_date": document.upload_date,
             "processing_status": document.processing_status,
+            "content_hash": document.content_hash,
+            "file_size": document.file_size,
             "assessment_date": document.assessment_date,
             "assessor_name": document.assessor_name,
             "assessor_title": document.assessor_title,
@@ -0,0 +1,246 @@
+"""Repository layer for materialized dashboard statistics"""
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, and_, func, case, desc
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime, date, timezone
+import logging
+
+from ..models.special_education_models import (
+    Student, IEP, IEPGoal, IEPStatus, GoalStatus,
+    DashboardStatistics, StudentDashboardSnapshot
+)
+
+# IEP statuses that do not count as a student's current IEP
+INACTIVE_IEP_STATUSES = (IEPStatus.EXPIRED.value, "deleted")
+
+STAT_FIELDS = (
+    "total_students", "active_ieps", "pending_approvals",
+    "goals_achieved", "total_goals", "overdue_reviews"
+)
+
+SCOPE_ALL = ("all", "*")
+
+Scope = Tuple[str, str]
+
+
+def latest_iep_subquery(student_ids: Optional[List[UUID]] = None):
+    """Each student's most recent IEP (rank 1 by created_at, then version)"""
+    query = select(
+        IEP.id,
+        IEP.student_id,
+        IEP.status,
+        IEP.academic_year,
+        IEP.review_date,
+        IEP.created_at,
+        func.row_number().over(
+            partition_by=IEP.student_id,
+            order_by=(desc(IEP.created_at), desc(IEP.version))
+        ).label("rank")
+    )
+    if student_ids is not None:
+        query = query.where(IEP.student_id.in_(student_ids))
+    return query.subquery("latest_iep")
+
+
+def goal_progress_subquery(student_ids: Optional[List[UUID]] = None):
+    """Goal counts per IEP by progress status"""
+    query = select(
+        IEPGoal.iep_id,
+        func.count(IEPGoal.id).label("goal_count"),
+        func.sum(case((IEPGoal.progress_status == GoalStatus.MASTERED.value, 1), else_=0)).label("goals_mastered"),
+        func.sum(case((IEPGoal.progress_status == GoalStatus.IN_PROGRESS.value, 1), else_=0)).label("goals_in_progress")
+    )
+    if student_ids is not None:
+        query = query.join(IEP, IEP.id == IEPGoal.iep_id).where(IEP.student_id.in_(student_ids))
+    return query.group_by(IEPGoal.iep_id).subquery("goal_progress")
+
+
+def student_scopes(case_manager_auth_id: Optional[int], school_district: Optional[str]) -> List[Scope]:
+    """Every statistics scope a student counts towards"""
+    scopes = [SCOPE_ALL]
+    if case_manager_auth_id is not None:
+        scopes.append(("case_manager", str(case_manager_auth_id)))
+    if school_district:
+        scopes.append(("district", school_district))
+    return scopes
+
+
+class DashboardStatsRepository:
+    """Per-scope dashboard counts maintained incrementally
+
+    Each write that can change a student's dashboard contribution calls
+    ``refresh_students`` in the same transaction. The student's contribution
+    is recomputed from their latest IEP only, diffed against the stored
+    snapshot, and the difference is added to every affected scope row.
+    ``reconcile`` rebuilds all rows from the base tables; it also picks up
+    reviews that became overdue with the passage of time.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.logger = logging.getLogger(__name__)
+
+    async def get_stats(self, scope_type: str, scope_key: str) -> dict:
+        """Read one scope's counts (zeros when the scope has no students)"""
+        result = await self.session.execute(
+            select(DashboardStatistics).where(and_(
+                DashboardStatistics.scope_type == scope_type,
+                DashboardStatistics.scope_key == scope_key
+            ))
+        )
+        row = result.scalar_one_or_none()
+
+        stats = {field: getattr(row, field) if row else 0 for field in STAT_FIELDS}
+        active = stats["active_ieps"]
+        stats["compliance_rate"] = round((active - stats["overdue_reviews"]) / active * 100, 1) if active else 100.0
+        stats["updated_at"] = row.updated_at.isoformat() if row and row.updated_at else None
+        stats["reconciled_at"] = row.reconciled_at.isoformat() if row and row.reconciled_at else None
+        return stats
+
+    async def refresh_students(self, student_ids: Iterable[UUID]):
+        """Apply the change in these students' contributions (caller commits)"""
+        student_ids = list(dict.fromkeys(student_ids))
+        if not student_ids:
+            return
+
+        current = await self._compute_contributions(student_ids)
+        result = await self.session.execute(
+            select(StudentDashboardSnapshot).where(StudentDashboardSnapshot.student_id.in_(student_ids))
+        )
+        snapshots = {snapshot.student_id: snapshot for snapshot in result.scalars()}
+
+        deltas: Dict[Scope, Counter] = defaultdict(Counter)
+        for student_id in student_ids:
+            snapshot = snapshots.get(student_id)
+            if snapshot is not None:
+                for scope in student_scopes(snapshot.case_manager_auth_id, snapshot.school_district):
+                    deltas[scope].subtract({field: getattr(snapshot, field) for field in STAT_FIELDS})
+
+            contribution = current.get(student_id)
+            if contribution is None:
+                # Student row is gone
+                if snapshot is not None:
+                    await self.session.delete(snapshot)
+                continue
+
+            case_manager_auth_id, school_district, counts = contribution
+            for scope in student_scopes(case_manager_auth_id, school_district):
+                deltas[scope].update(counts)
+
+            if snapshot is None:
+                snapshot = StudentDashboardSnapshot(student_id=student_id)
+                self.session.add(snapshot)
+            snapshot.case_manager_auth_id = case_manager_auth_id
+            snapshot.school_district = school_district
+            for field in STAT_FIELDS:
+                setattr(snapshot, field, counts[field])
+
+        await self._apply_deltas(deltas)
+
+    async def reconcile(self) -> int:
+        """Rebuild every snapshot and scope row from the base tables
+
+        Returns:
+            Number of scope rows written
+        """
+        contributions = await self._compute_contributions()
+
+        totals: Dict[Scope, Counter] = defaultdict(Counter)
+        snapshots = []
+        for student_id, (case_manager_auth_id, school_district, counts) in contributions.items():
+            for scope in student_scopes(case_manager_auth_id, school_district):
+                totals[scope].update(counts)
+            snapshots.append(StudentDashboardSnapshot(
+                student_id=student_id,
+                case_manager_auth_id=case_manager_auth_id,
+                school_district=school_district,
+                **counts
+            ))
+
+        now = datetime.now(timezone.utc)
+        await self.session.execute(delete(StudentDashboardSnapshot))
+        await self.session.execute(delete(DashboardStatistics))
+        self.session.add_all(snapshots)
+        self.session.add_all([
+            DashboardStatistics(
+                scope_type=scope_type,
+                scope_key=scope_key,
+                reconciled_at=now,
+                **{field: counts[field] for field in STAT_FIELDS}
+            )
+            for (scope_type, scope_key), counts in totals.items()
+        ])
+        await self.session.commit()
+
+        self.logger.info(f"📊 Reconciled dashboard statistics: {len(contributions)} students, {len(totals)} scopes")
+        return len(totals)
+
+    async def _compute_contributions(
+        self,
+        student_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, Tuple[Optional[int], Optional[str], Dict[str, int]]]:
+        """Each student's scope keys and counts from their latest IEP"""
+        latest = latest_iep_subquery(student_ids)
+        goals = goal_progress_subquery(student_ids)
+
+        query = select(
+            Student.id,
+            Student.is_active,
+            Student.case_manager_auth_id,
+            Student.school_district,
+            latest.c.id.label("iep_id"),
+            latest.c.status,
+            latest.c.review_date,
+            goals.c.goal_count,
+            goals.c.goals_mastered
+        ).outerjoin(
+            latest, and_(latest.c.student_id == Student.id, latest.c.rank == 1)
+        ).outerjoin(
+            goals, goals.c.iep_id == latest.c.id
+        )
+        if student_ids is not None:
+            query = query.where(Student.id.in_(student_ids))
+
+        today = date.today()
+        contributions = {}
+        for row in await self.session.execute(query):
+            counts = dict.fromkeys(STAT_FIELDS, 0)
+            if row.is_active:
+                has_iep = row.iep_id is not None and row.status not in INACTIVE_IEP_STATUSES
+                counts["total_students"] = 1
+                counts["active_ieps"] = int(has_iep)
+                counts["pending_approvals"] = int(row.status == IEPStatus.UNDER_REVIEW.value)
+                counts["goals_achieved"] = int(row.goals_mastered or 0)
+                counts["total_goals"] = int(row.goal_count or 0)
+                counts["overdue_reviews"] = int(
+                    row.status == IEPStatus.ACTIVE.value
+                    and row.review_date is not None
+                    and row.review_date < today
+                )
+            contributions[row.id] = (row.case_manager_auth_id, row.school_district, counts)
+        return contributions
+
+    async def _apply_deltas(self, deltas: Dict[Scope, Counter]):
+        """Add count deltas to scope rows, creating rows as needed"""
+        dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        table = DashboardStatistics.__table__
+
+        for (scope_type, scope_key), delta in deltas.items():
+            values = {field: delta.get(field, 0) for field in STAT_FIELDS}
+            if not any(values.values()):
+                continue
+
+            stmt = dialect.insert(table).values(
+                id=uuid4(), scope_type=scope_type, scope_key=scope_key, **values
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.scope_type, table.c.scope_key],
+                set_={
+                    **{field: table.c[field] + stmt.excluded[field] for field in STAT_FIELDS},
+                    "updated_at": func.now()
+                }
+            )
+            await self.session.execute(stmt)
@@ -10,6 +10,12 @@ import logging
 from ..models.special_education_models import (
     IEP, IEPGoal, IEPTemplate, IEPStatus, GoalStatus
 )
+from .dashboard_stats_repository import DashboardStatsRepository
+from ..utils.pagination import Keyset
+
+# Newest first within a student; oldest first in the approval queue
+STUDENT_IEP_KEYSET = Keyset((IEP.created_at, True), (IEP.id, True))
+APPROVAL_KEYSET = Keyset((IEP.created_at, False), (IEP.id, False))
 
 class IEPRepository:
     def __init__(self, session: AsyncSession):
@@ -143,6 +149,8 @@ class IEPRepository:
             
             await self.session.flush()  # Flush goals to database
         
+        await self._refresh_dashboard_stats([iep.student_id])
+        
         # CRITICAL: Refresh with relationships BEFORE commit while greenlet is active
         await self.session.refresh(iep, ['goals'])
         
@@ -185,6 +193,8 @@ class IEPRepository:
             if hasattr(iep, field) and field not in ["id", "created_at"]:
                 setattr(iep, field, value)
         
+        await self._refresh_dashboard_stats([iep.student_id])
+        
         # Refresh with relationships before commit
         await self.session.refresh(iep, ['goals'])
         
@@ -203,6 +213,7 @@ class IEPRepository:
             .where(IEP.id == iep_id)
             .values(status="deleted")
         )
+        await self._refresh_dashboard_stats([await self._student_id_for_iep(iep_id)])
         await self.session.commit()
         return result.rowcount > 0
     
@@ -230,6 +241,33 @@ class IEPRepository:
         
         return [self._iep_to_dict(iep) for iep in ieps]
     
+    async def get_student_ieps_page(
+        self,
+        student_id: UUID,
+        academic_year: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> dict:
+        """Keyset page of a student's IEPs, newest first
+        
+        Raises:
+            InvalidCursorError: if ``cursor`` was not issued by this listing
+        """
+        query = select(IEP).where(IEP.student_id == student_id)
+        
+        if academic_year:
+            query = query.where(IEP.academic_year == academic_year)
+        
+        if status:
+            query = query.where(IEP.status == status)
+        
+        query = STUDENT_IEP_KEYSET.paginate(query, cursor, limit).options(selectinload(IEP.goals))
+        result = await self.session.execute(query)
+        ieps, next_cursor = STUDENT_IEP_KEYSET.page(result.scalars().all(), limit)
+        
+        return {"items": [self._iep_to_dict(iep) for iep in ieps], "next_cursor": next_cursor}
+    
     async def get_iep_version_history(
         self, 
         student_id: UUID, 
@@ -255,6 +293,7 @@ class IEPRepository:
             .where(IEP.id == iep_id)
             .values(status=new_status)
         )
+        await self._refresh_dashboard_stats([await self._student_id_for_iep(iep_id)])
         await self.session.commit()
         return result.rowcount > 0
     
@@ -335,6 +374,7 @@ class IEPRepository:
         
         self.session.add(goal)
         await self.session.flush()
+        await self._refresh_dashboard_stats([await self._student_id_for_iep(goal.iep_id)])
         
         # Commit the transaction
         await self.session.commit()
@@ -374,6 +414,7 @@ class IEPRepository:
             })
             goal.progress_notes = progress_notes
         
+        await self._refresh_dashboard_stats([await self._student_id_for_iep(goal.iep_id)])
         await self.session.commit()
         return True
     
@@ -395,6 +436,47 @@ class IEPRepository:
         
         return [self._iep_to_dict(iep) for iep in ieps]
     
+    async def get_ieps_for_approval_page(
+        self,
+        status: str = "under_review",
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> dict:
+        """Keyset page of IEPs pending approval, oldest first
+        
+        Raises:
+            InvalidCursorError: if ``cursor`` was not issued by this listing
+        """
+        query = select(IEP).where(IEP.status == status)
+        query = APPROVAL_KEYSET.paginate(query, cursor, limit).options(
+            joinedload(IEP.student),
+            selectinload(IEP.goals)
+        )
+        result = await self.session.execute(query)
+        ieps, next_cursor = APPROVAL_KEYSET.page(result.unique().scalars().all(), limit)
+        
+        return {"items": [self._iep_to_dict(iep) for iep in ieps], "next_cursor": next_cursor}
+    
+    async def _student_id_for_iep(self, iep_id: UUID) -> Optional[UUID]:
+        """Look up the student an IEP belongs to"""
+        result = await self.session.execute(select(IEP.student_id).where(IEP.id == iep_id))
+        return result.scalar_one_or_none()
+
+    async def _refresh_dashboard_stats(self, student_ids: List[Optional[UUID]]):
+        """Update materialized dashboard statistics within this transaction
+
+        Failures are contained in a savepoint so the IEP write still commits;
+        the next reconciliation corrects the counts.
+        """
+        student_ids = [student_id for student_id in student_ids if student_id is not None]
+        if not student_ids:
+            return
+        try:
+            async with self.session.begin_nested():
+                await DashboardStatsRepository(self.session).refresh_students(student_ids)
+        except Exception as e:
+            self.logger.warning(f"Dashboard statistics refresh failed for students {student_ids}: {e}")
+
     def _iep_to_dict(self, iep: IEP, include_goals: bool = True) -> dict:
         """Convert IEP model to dictionary"""
         data = {
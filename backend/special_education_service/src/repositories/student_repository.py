@@ -5,8 +5,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, and_, or_, func
 from sqlalchemy.orm import selectinload
 from datetime import datetime, date
+import logging
 
 from ..models.special_education_models import Student, IEP
+from .dashboard_stats_repository import (
+    DashboardStatsRepository, latest_iep_subquery, goal_progress_subquery
+)
+from .student_search_repository import StudentSearchRepository
+from ..utils.pagination import Keyset
+
+logger = logging.getLogger(__name__)
+
+STUDENT_KEYSET = Keyset((Student.last_name, False), (Student.first_name, False), (Student.id, False))
+
 
 class StudentRepository:
     def __init__(self, session: AsyncSession):
@@ -31,6 +42,8 @@ class StudentRepository:
         )
         
         self.session.add(student)
+        await self.session.flush()
+        await self._refresh_dashboard_stats(student.id)
         await self.session.commit()
         await self.session.refresh(student)
         
@@ -74,6 +87,7 @@ class StudentRepository:
             if hasattr(student, field) and field not in ["id", "created_at"]:
                 setattr(student, field, value)
         
+        await self._refresh_dashboard_stats(student_id)
         await self.session.commit()
         await self.session.refresh(student)
         
@@ -86,6 +100,7 @@ class StudentRepository:
             .where(Student.id == student_id)
             .values(is_active=False)
         )
+        await self._refresh_dashboard_stats(student_id)
         await self.session.commit()
         return result.rowcount > 0
     
@@ -99,18 +114,10 @@ class StudentRepository:
         offset: int = 0
     ) -> List[dict]:
         """List students with filtering"""
-        query = select(Student).where(Student.is_active == is_active)
-        
-        if grade_level:
-            query = query.where(Student.grade_level == grade_level)
-        
-        if disability_code:
-            query = query.where(Student.disability_codes.contains([disability_code]))
-        
-        if case_manager_auth_id:
-            query = query.where(Student.case_manager_auth_id == case_manager_auth_id)
-        
-        query = query.order_by(Student.last_name, Student.first_name)
+        query = select(Student).where(and_(*self._list_filters(
+            grade_level, disability_code, case_manager_auth_id, is_active
+        )))
+        query = query.order_by(Student.last_name, Student.first_name, Student.id)
         query = query.offset(offset).limit(limit)
         
         result = await self.session.execute(query)
@@ -118,27 +125,72 @@ class StudentRepository:
         
         return [await self._student_to_dict(student) for student in students]
     
-    async def search_students(self, search_term: str, limit: int = 50) -> List[dict]:
-        """Search students by name or student ID"""
-        search_pattern = f"%{search_term}%"
-        
-        query = select(Student).where(
-            and_(
-                Student.is_active == True,
-                or_(
-                    Student.first_name.ilike(search_pattern),
-                    Student.last_name.ilike(search_pattern),
-                    Student.student_id.ilike(search_pattern),
-                    func.concat(Student.first_name, ' ', Student.last_name).ilike(search_pattern)
-                )
-            )
-        ).order_by(Student.last_name, Student.first_name).limit(limit)
-        
-        result = await self.session.execute(query)
-        students = result.scalars().all()
+    async def list_students_page(
+        self,
+        grade_level: Optional[str] = None,
+        disability_code: Optional[str] = None,
+        case_manager_auth_id: Optional[int] = None,
+        is_active: bool = True,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> dict:
+        """Keyset page of students ordered by (last_name, first_name, id)
+        
+        Raises:
+            InvalidCursorError: if ``cursor`` was not issued by this listing
+        """
+        query = select(Student).where(and_(*self._list_filters(
+            grade_level, disability_code, case_manager_auth_id, is_active
+        )))
+        result = await self.session.execute(STUDENT_KEYSET.paginate(query, cursor, limit))
+        students, next_cursor = STUDENT_KEYSET.page(result.scalars().all(), limit)
         
+        return {
+            "items": [await self._student_to_dict(student) for student in students],
+            "next_cursor": next_cursor
+        }
+    
+    async def count_students(
+        self,
+        grade_level: Optional[str] = None,
+        disability_code: Optional[str] = None,
+        case_manager_auth_id: Optional[int] = None,
+        is_active: bool = True
+    ) -> int:
+        """Count students matching the listing filters"""
+        result = await self.session.execute(
+            select(func.count(Student.id)).where(and_(*self._list_filters(
+                grade_level, disability_code, case_manager_auth_id, is_active
+            )))
+        )
+        return result.scalar_one()
+    
+    def _list_filters(
+        self,
+        grade_level: Optional[str],
+        disability_code: Optional[str],
+        case_manager_auth_id: Optional[int],
+        is_active: bool
+    ) -> list:
+        """WHERE clauses shared by the student listing, page and count"""
+        filters = [Student.is_active == is_active]
+        if grade_level:
+            filters.append(Student.grade_level == grade_level)
+        if disability_code:
+            filters.append(Student.disability_codes.contains([disability_code]))
+        if case_manager_auth_id:
+            filters.append(Student.case_manager_auth_id == case_manager_auth_id)
+        return filters
+    
+    async def search_students(self, search_term: str, limit: int = 50) -> List[dict]:
+        """Search students by name or student ID (ranked, index-backed)"""
+        students = await StudentSearchRepository(self.session).search(search_term, limit=limit)
         return [await self._student_to_dict(student) for student in students]
     
+    async def typeahead_students(self, prefix: str, limit: int = 10) -> List[dict]:
+        """Name / student ID suggestions for a partially typed search"""
+        return await StudentSearchRepository(self.session).typeahead(prefix, limit=limit)
+    
     async def get_students_by_teacher(self, teacher_auth_id: int) -> List[dict]:
         """Get all students assigned to a teacher"""
         query = select(Student).where(
@@ -191,16 +243,16 @@ class StudentRepository:
         return result.rowcount > 0
     
     async def get_student_caseload_summary(self, case_manager_auth_id: int) -> dict:
-        """Get caseload summary for a case manager"""
-        # Get total students
-        total_students_query = select(func.count(Student.id)).where(
-            and_(
-                Student.case_manager_auth_id == case_manager_auth_id,
-                Student.is_active == True
-            )
+        """Get caseload summary for a case manager
+        
+        ``active_ieps`` counts IEPs with status "active". This is narrower than
+        the dashboard statistic of the same name, which counts each student's
+        latest non-expired IEP, drafts included.
+        """
+        # Student total comes from the materialized statistics row
+        stats = await DashboardStatsRepository(self.session).get_stats(
+            "case_manager", str(case_manager_auth_id)
         )
-        total_result = await self.session.execute(total_students_query)
-        total_students = total_result.scalar()
         
         # Get students by grade level
         grade_query = select(
@@ -217,7 +269,7 @@ class StudentRepository:
         grades = {row.grade_level: row.count for row in grade_result}
         
         # Get active IEPs count
-        active_ieps_query = select(func.count(IEP.id)).join(Student).where(
+        active_ieps_query = select(func.count(IEP.id)).join(Student, IEP.student_id == Student.id).where(
             and_(
                 Student.case_manager_auth_id == case_manager_auth_id,
                 Student.is_active == True,
@@ -228,7 +280,7 @@ class StudentRepository:
         active_ieps = active_ieps_result.scalar()
         
         return {
-            "total_students": total_students,
+            "total_students": stats["total_students"],
             "active_ieps": active_ieps,
             "students_by_grade": grades,
             "case_manager_auth_id": case_manager_auth_id
@@ -251,6 +303,98 @@ class StudentRepository:
         
         return [await self._student_to_dict(student) for student in students]
     
+    def _caseload_filters(self, teacher_auth_id: Optional[int]) -> list:
+        filters = [Student.is_active == True]
+        if teacher_auth_id is not None:
+            filters.append(or_(
+                Student.case_manager_auth_id == teacher_auth_id,
+                Student.primary_teacher_auth_id == teacher_auth_id
+            ))
+        return filters
+    
+    async def get_dashboard_caseload(
+        self,
+        teacher_auth_id: Optional[int] = None,
+        limit: int = 25,
+        offset: int = 0
+    ) -> dict:
+        """Page of students with their latest IEP and goal progress in one query
+        
+        Args:
+            teacher_auth_id: Restrict to students this teacher case-manages or teaches
+            limit: Page size
+            offset: Page offset
+            
+        Returns:
+            {"students": [...], "total": int}; each student dict carries
+            ``latest_iep`` (or None) and ``goal_progress`` counts
+        """
+        latest = latest_iep_subquery()
+        goals = goal_progress_subquery()
+        
+        query = select(
+            Student,
+            latest.c.id.label("latest_iep_id"),
+            latest.c.status.label("latest_iep_status"),
+            latest.c.academic_year.label("latest_iep_academic_year"),
+            latest.c.created_at.label("latest_iep_created_at"),
+            goals.c.goal_count,
+            goals.c.goals_mastered,
+            goals.c.goals_in_progress,
+            func.count().over().label("total")
+        ).outerjoin(
+            latest, and_(latest.c.student_id == Student.id, latest.c.rank == 1)
+        ).outerjoin(
+            goals, goals.c.iep_id == latest.c.id
+        ).where(
+            and_(*self._caseload_filters(teacher_auth_id))
+        ).order_by(
+            Student.last_name, Student.first_name, Student.id
+        ).offset(offset).limit(limit)
+        
+        result = await self.session.execute(query)
+        rows = result.all()
+        
+        if rows:
+            total = rows[0].total
+        elif offset > 0:
+            # Past the last page: the window count has no row to ride on
+            total = (await self.session.execute(
+                select(func.count(Student.id)).where(and_(*self._caseload_filters(teacher_auth_id)))
+            )).scalar()
+        else:
+            total = 0
+        
+        students = []
+        for row in rows:
+            student_dict = await self._student_to_dict(row.Student)
+            student_dict["latest_iep"] = {
+                "id": str(row.latest_iep_id),
+                "status": row.latest_iep_status,
+                "academic_year": row.latest_iep_academic_year,
+                "created_at": row.latest_iep_created_at.isoformat() if row.latest_iep_created_at else None
+            } if row.latest_iep_id else None
+            student_dict["goal_progress"] = {
+                "total": row.goal_count or 0,
+                "mastered": row.goals_mastered or 0,
+                "in_progress": row.goals_in_progress or 0
+            }
+            students.append(student_dict)
+        
+        return {"students": students, "total": total}
+    
+    async def _refresh_dashboard_stats(self, student_id: UUID):
+        """Update materialized dashboard statistics within this transaction
+        
+        Failures are contained in a savepoint so the student write still
+        commits; the next reconciliation corrects the counts.
+        """
+        try:
+            async with self.session.begin_nested():
+                await DashboardStatsRepository(self.session).refresh_students([student_id])
+        except Exception as e:
+            logger.warning(f"Dashboard statistics refresh failed for student {student_id}: {e}")
+    
     async def _student_to_dict(self, student: Student) -> dict:
         """Convert Student model to dictionary"""
         return {
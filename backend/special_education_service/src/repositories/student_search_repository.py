@@ -0,0 +1,263 @@
+"""Repository layer for indexed student search
+
+PostgreSQL uses pg_trgm GIN indexes on the lower-cased full name and
+student ID (created by migration). SQLite uses an FTS5 table of active students
+kept in sync with ``students`` by triggers. ``ensure_student_search_index`` runs at
+startup and records which backend is available on the engine dialect;
+without one, search falls back to the ILIKE scan.
+"""
+import re
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy import select, and_, or_, func, case, text, column, literal_column
+import logging
+
+from ..models.special_education_models import Student
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "student_search_fts"
+
+SQLITE_SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        student_pk, student_id, first_name, last_name, prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS students_search_insert AFTER INSERT ON students
+    WHEN new.is_active BEGIN
+        INSERT INTO {FTS_TABLE} (student_pk, student_id, first_name, last_name)
+        VALUES (new.id, new.student_id, new.first_name, new.last_name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS students_search_update
+    AFTER UPDATE OF id, student_id, first_name, last_name, is_active ON students BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid IN (
+            SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH 'student_pk:"' || old.id || '"'
+        );
+        INSERT INTO {FTS_TABLE} (student_pk, student_id, first_name, last_name)
+        SELECT new.id, new.student_id, new.first_name, new.last_name WHERE new.is_active;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS students_search_delete AFTER DELETE ON students BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid IN (
+            SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH 'student_pk:"' || old.id || '"'
+        );
+    END
+    """,
+]
+
+# bm25 column weights: student_pk, student_id, first_name, last_name
+FTS_WEIGHTS = (0.0, 4.0, 2.0, 3.0)
+
+# Matches ranked per query. Short prefixes can match a large share of a
+# district; bm25 is only computed for this many of them (in index order)
+# so typeahead latency stays flat.
+FTS_RANK_WINDOW = 1000
+
+# Score offset placing whole-token matches ahead of prefix-only matches
+FTS_EXACT_BOOST = 1000.0
+
+_BM25 = f"bm25({FTS_TABLE}, {', '.join(str(w) for w in FTS_WEIGHTS)})"
+
+FTS_CANDIDATES_SQL = f"""
+    SELECT student_pk, MIN(score) AS score FROM (
+        SELECT * FROM (
+            SELECT student_pk, {_BM25} - {FTS_EXACT_BOOST} AS score FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH :exact LIMIT {FTS_RANK_WINDOW}
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT student_pk, {_BM25} AS score FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH :prefix LIMIT {FTS_RANK_WINDOW}
+        )
+    )
+    GROUP BY student_pk
+    ORDER BY score
+    LIMIT :limit
+"""
+
+
+async def ensure_student_search_index(engine: AsyncEngine) -> Optional[str]:
+    """Prepare the search index and record the backend on the engine dialect
+
+    On SQLite this creates the FTS5 table and sync triggers, backfilling the
+    table the first time. On PostgreSQL it checks pg_trgm is installed (the
+    indexes themselves come from the migration).
+
+    Returns:
+        "fts5", "trigram" or None when only the ILIKE scan is available
+    """
+    backend = None
+    try:
+        async with engine.begin() as conn:
+            if conn.dialect.name == "sqlite":
+                result = await conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": FTS_TABLE}
+                )
+                exists = result.scalar() is not None
+                for statement in SQLITE_SEARCH_DDL:
+                    await conn.execute(text(statement))
+                if not exists:
+                    await conn.execute(text(
+                        f"INSERT INTO {FTS_TABLE} (student_pk, student_id, first_name, last_name) "
+                        "SELECT id, student_id, first_name, last_name FROM students WHERE is_active"
+                    ))
+                backend = "fts5"
+            elif conn.dialect.name == "postgresql":
+                result = await conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+                if result.scalar() is not None:
+                    backend = "trigram"
+    except Exception as e:
+        logger.warning(f"⚠️ Student search index unavailable, using ILIKE scan: {e}")
+        backend = None
+
+    engine.dialect.student_search_backend = backend
+    logger.info(f"🔎 Student search backend: {backend or 'scan'}")
+    return backend
+
+
+def search_words(search_term: str) -> List[str]:
+    """Lower-cased whitespace-separated words of a search term"""
+    return [word for word in search_term.lower().split() if word]
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def fts_match_expression(search_term: str, prefix: bool = True) -> Optional[str]:
+    """FTS5 query requiring every word as a phrase (prefix) in a searchable column
+
+    Each word is split on non-word characters into a phrase, so "S-001"
+    becomes ``"s 001"*`` and matches the student ID tokens in order.
+    """
+    phrases = []
+    for word in search_words(search_term):
+        tokens = re.findall(r"\w+", word)
+        if tokens:
+            phrases.append(f'"{" ".join(tokens)}"' + ("*" if prefix else ""))
+    if not phrases:
+        return None
+    return "{student_id first_name last_name} : (" + " ".join(phrases) + ")"
+
+
+class StudentSearchRepository:
+    """Ranked name / student ID search over active students"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @property
+    def backend(self) -> Optional[str]:
+        return getattr(self.session.bind.dialect, "student_search_backend", None)
+
+    async def search(self, search_term: str, limit: int = 50) -> List[Student]:
+        """Active students matching every word, best matches first"""
+        query = self._ranked_query([Student], search_term, limit)
+        if query is None:
+            return []
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def typeahead(self, prefix: str, limit: int = 10) -> List[dict]:
+        """Lightweight suggestions for a partially typed name or student ID"""
+        columns = [Student.id, Student.student_id, Student.first_name, Student.last_name, Student.grade_level]
+        query = self._ranked_query(columns, prefix, limit)
+        if query is None:
+            return []
+        result = await self.session.execute(query)
+        return [
+            {
+                "id": str(row.id),
+                "student_id": row.student_id,
+                "first_name": row.first_name,
+                "last_name": row.last_name,
+                "full_name": f"{row.first_name} {row.last_name}",
+                "grade_level": row.grade_level,
+            }
+            for row in result
+        ]
+
+    def _ranked_query(self, columns: list, search_term: str, limit: int):
+        words = search_words(search_term)
+        if not words:
+            return None
+
+        backend = self.backend
+        if backend == "fts5":
+            query = self._fts_query(columns, search_term, limit)
+        elif backend == "trigram":
+            query = self._trigram_query(columns, words)
+        else:
+            query = self._scan_query(columns, search_term)
+        if query is None:
+            return None
+        return query.where(Student.is_active == True).limit(limit)
+
+    def _fts_query(self, columns: list, search_term: str, limit: int):
+        """FTS5 prefix match; whole-token matches first, then weighted bm25
+
+        The top ``limit`` candidates are chosen inside FTS5 so only those
+        rows are joined to ``students``.
+        """
+        prefix = fts_match_expression(search_term)
+        if prefix is None:
+            return None
+        candidates = text(FTS_CANDIDATES_SQL).bindparams(
+            exact=fts_match_expression(search_term, prefix=False),
+            prefix=prefix,
+            limit=limit
+        ).columns(column("student_pk"), column("score")).subquery("candidates")
+        return (
+            select(*columns)
+            .join(candidates, candidates.c.student_pk == Student.id)
+            .order_by(candidates.c.score, Student.last_name, Student.first_name)
+        )
+
+    def _trigram_query(self, columns: list, words: List[str]):
+        """pg_trgm-indexed substring match; prefix hits first, then similarity"""
+        # Must match the migration's index expressions exactly
+        full_name = func.lower(Student.first_name + literal_column("' '") + Student.last_name)
+        student_id = func.lower(Student.student_id)
+
+        conditions = []
+        for word in words:
+            pattern = f"%{_like_escape(word)}%"
+            conditions.append(or_(
+                full_name.like(pattern, escape="\\"),
+                student_id.like(pattern, escape="\\")
+            ))
+
+        term = " ".join(words)
+        prefix = f"{_like_escape(words[0])}%"
+        is_prefix = case(
+            (or_(
+                func.lower(Student.first_name).like(prefix, escape="\\"),
+                func.lower(Student.last_name).like(prefix, escape="\\"),
+                student_id.like(prefix, escape="\\")
+            ), 0),
+            else_=1
+        )
+        similarity = func.greatest(func.similarity(full_name, term), func.similarity(student_id, term))
+        return (
+            select(*columns)
+            .where(and_(*conditions))
+            .order_by(is_prefix, similarity.desc(), Student.last_name, Student.first_name)
+        )
+
+    def _scan_query(self, columns: list, search_term: str):
+        """Unindexed ILIKE scan used when no search index is available"""
+        search_pattern = f"%{search_term}%"
+        return select(*columns).where(
+            or_(
+                Student.first_name.ilike(search_pattern),
+                Student.last_name.ilike(search_pattern),
+                Student.student_id.ilike(search_pattern),
+                (Student.first_name + literal_column("' '") + Student.last_name).ilike(search_pattern)
+            )
+        ).order_by(Student.last_name, Student.first_name)
@@ -1,12 +1,14 @@
 """Advanced IEP operations with RAG integration"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
+import asyncio
 import logging
 
-from ..database import get_db, get_request_scoped_db
+from ..database import get_db, get_request_scoped_db, async_session_factory
 from ..middleware.session_middleware import get_request_session
 from ..repositories.iep_repository import IEPRepository
 from ..repositories.pl_repository import PLRepository
@@ -19,6 +21,7 @@ from ..schemas.iep_schemas import (
     IEPCreate, IEPCreateWithRAG, IEPResponse, IEPGenerateSection
 )
 from ..config import get_settings
+from ..utils.sse import sse_event
 from ..vector_store_enhanced import EnhancedVectorStore
 
 logger = logging.getLogger(__name__)
@@ -85,6 +88,10 @@ except Exception as e:
 async def get_iep_service(request: Request) -> IEPService:
     """Dependency to get IEP service with request-scoped session"""
     db = await get_request_session(request)
+    return _build_iep_service(db)
+
+def _build_iep_service(db: AsyncSession) -> IEPService:
+    """Build an IEP service bound to the given session"""
     iep_repo = IEPRepository(db)
     pl_repo = PLRepository(db)
     student_repo = StudentRepository(db)
@@ -194,16 +201,7 @@ async def create_iep_with_rag(
         logger.info(f"✅ [BACKEND-ROUTER] IEP service initialized successfully")
         
         # Prepare initial data from request
-        initial_data = {
-            "content": iep_data.content if iep_data.content else {},
-            "meeting_date": iep_data.meeting_date,
-            "effective_date": iep_data.effective_date,
-            "review_date": iep_data.review_date
-        }
-        
-        # Add goals if provided
-        if iep_data.goals:
-            initial_data["goals"] = [goal.model_dump() for goal in iep_data.goals]
+        initial_data = _build_initial_data(iep_data)
         
         # Create IEP with RAG
         logger.info(f"📞 [BACKEND-ROUTER] Calling IEP service create_iep_with_rag...")
@@ -217,34 +215,16 @@ async def create_iep_with_rag(
             initial_data=initial_data,
             user_id=current_user_id,
             user_role=current_user_role,
-            enable_google_search_grounding=iep_data.enable_google_search_grounding
+            enable_google_search_grounding=iep_data.enable_google_search_grounding,
+            use_cache=iep_data.use_cache
         )
         
         elapsed_time = time.time() - start_time
         logger.info(f"✅ [BACKEND-ROUTER] IEP created successfully in {elapsed_time:.2f}s: {created_iep.get('id')}")
         
-        # Ensure the response is JSON serializable
-        # Convert any UUID objects to strings
-        import json
-        from uuid import UUID
-        from ..utils.response_flattener import SimpleIEPFlattener
-        
-        def make_json_serializable(obj):
-            if isinstance(obj, dict):
-                return {k: make_json_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [make_json_serializable(item) for item in obj]
-            elif isinstance(obj, UUID):
-                return str(obj)
-            else:
-                return obj
-        
-        # Step 1: Make JSON serializable
-        serializable_iep = make_json_serializable(created_iep)
-        
-        # Step 2: Apply flattening to prevent [object Object] errors
+        # Make JSON serializable and flatten for the frontend
         logger.info(f"🔧 [BACKEND-ROUTER] Applying response flattening for frontend compatibility")
-        flattened_iep = SimpleIEPFlattener.flatten_for_frontend(serializable_iep)
+        flattened_iep = _prepare_iep_response(created_iep)
         
         final_elapsed = time.time() - start_time
         logger.info(f"🎉 [BACKEND-ROUTER] RAG IEP creation completed successfully in {final_elapsed:.2f}s")
@@ -269,6 +249,104 @@ async def create_iep_with_rag(
             detail=f"Failed to create IEP with RAG: {str(e)}"
         )
 
+@router.post("/create-with-rag/stream")
+async def create_iep_with_rag_stream(
+    iep_data: IEPCreateWithRAG,
+    current_user_id: int = Query(..., description="Current user's auth ID"),
+    current_user_role: str = Query("teacher", description="Current user's role")
+):
+    """Create IEP using RAG-powered generation, streamed as server-sent events
+    
+    Emits a ``started`` event, a ``section`` event as each generated section
+    completes, then ``complete`` with the persisted IEP (same body as
+    ``/create-with-rag``) or ``error``.
+    """
+    logger.info(f"📡 [BACKEND-ROUTER] Streaming RAG IEP creation started: student_id={iep_data.student_id}, user_id={current_user_id}")
+    initial_data = _build_initial_data(iep_data)
+    
+    async def event_stream():
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def on_section(section_name: str, content: Any):
+            await queue.put(sse_event("section", {"section": section_name, "content": content}))
+        
+        async def create():
+            # The request-scoped session is closed as soon as the response
+            # starts, so the stream owns its session
+            async with async_session_factory() as session:
+                return await _build_iep_service(session).create_iep_with_rag(
+                    student_id=iep_data.student_id,
+                    template_id=iep_data.template_id,
+                    academic_year=iep_data.academic_year,
+                    initial_data=initial_data,
+                    user_id=current_user_id,
+                    user_role=current_user_role,
+                    enable_google_search_grounding=iep_data.enable_google_search_grounding,
+                    use_cache=iep_data.use_cache,
+                    on_section=on_section
+                )
+        
+        task = asyncio.create_task(create())
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            yield sse_event("started", {"student_id": str(iep_data.student_id)})
+            while (event := await queue.get()) is not None:
+                yield event
+            
+            try:
+                created_iep = task.result()
+            except ValueError as e:
+                logger.error(f"❌ [BACKEND-ROUTER] ValueError in streaming IEP creation: {e}")
+                yield sse_event("error", {"status_code": status.HTTP_400_BAD_REQUEST, "detail": str(e)})
+            except Exception as e:
+                logger.error(f"💥 [BACKEND-ROUTER] Streaming IEP creation failed: {e}")
+                yield sse_event("error", {
+                    "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    "detail": f"Failed to create IEP with RAG: {str(e)}"
+                })
+            else:
+                logger.info(f"✅ [BACKEND-ROUTER] Streamed IEP created: {created_iep.get('id')}")
+                yield sse_event("complete", _prepare_iep_response(created_iep))
+        finally:
+            if not task.done():
+                # Client disconnected mid-generation
+                task.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _build_initial_data(iep_data: IEPCreateWithRAG) -> Dict[str, Any]:
+    """Initial IEP data from a create-with-rag request"""
+    initial_data = {
+        "content": iep_data.content if iep_data.content else {},
+        "meeting_date": iep_data.meeting_date,
+        "effective_date": iep_data.effective_date,
+        "review_date": iep_data.review_date
+    }
+    
+    # Add goals if provided
+    if iep_data.goals:
+        initial_data["goals"] = [goal.model_dump() for goal in iep_data.goals]
+    return initial_data
+
+def _make_json_serializable(obj):
+    if isinstance(obj, dict):
+        return {k: _make_json_serializable(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_make_json_serializable(item) for item in obj]
+    elif isinstance(obj, UUID):
+        return str(obj)
+    else:
+        return obj
+
+def _prepare_iep_response(created_iep: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert UUIDs to strings and flatten to prevent [object Object] errors"""
+    from ..utils.response_flattener import SimpleIEPFlattener
+    return SimpleIEPFlattener.flatten_for_frontend(_make_json_serializable(created_iep))
+
 @router.post("/{iep_id}/generate-section", response_model=Dict[str, Any])
 async def generate_iep_section(
     iep_id: UUID,
@@ -283,7 +361,8 @@ async def generate_iep_section(
             section_name=section_request.section_name,
             additional_context=section_request.additional_context,
             user_id=current_user_id,
-            enable_google_search_grounding=section_request.enable_google_search_grounding
+            enable_google_search_grounding=section_request.enable_google_search_grounding,
+            use_cache=section_request.use_cache
         )
         
         return {
@@ -1,16 +1,13 @@
 """Assessment data management API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile, Form, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 import logging
-import asyncio
-import os
-import time
-import aiofiles
 from pathlib import Path
 
-from ..database import get_db, get_engine
+from ..config import get_settings
+from ..database import get_db
 from ..repositories.assessment_repository import AssessmentRepository
 from ..schemas.assessment_schemas import (
     AssessmentDocumentCreate, AssessmentDocumentUpdate, AssessmentDocumentResponse,
@@ -19,7 +16,9 @@ from ..schemas.assessment_schemas import (
     QuantifiedAssessmentDataCreate, QuantifiedAssessmentDataResponse
 )
 from ..schemas.common_schemas import PaginatedResponse, SuccessResponse
-from ..services.document_ai_service import document_ai_service
+from ..services.document_job_service import DocumentJobService
+from ..workers.document_processing_worker import get_embedded_document_worker
+from ..utils.upload_storage import StoredUpload, UploadTooLargeError, store_upload
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/assessments", tags=["Assessments"])
@@ -32,390 +31,39 @@ async def get_assessment_repository(db: AsyncSession = Depends(get_db)) -> Asses
 UPLOAD_DIR = Path("uploads/assessments")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-def _make_serializable(data: Any) -> Any:
-    """Convert Document AI objects to JSON-serializable format"""
-    if hasattr(data, '__dict__'):
-        # Handle Document AI objects with attributes
-        if hasattr(data, 'text') and hasattr(data, 'confidence'):
-            return {
-                "text": str(data.text) if data.text else "",
-                "confidence": float(data.confidence) if data.confidence else 0.0
-            }
-        elif hasattr(data, 'normalized_value') and data.normalized_value:
-            # Handle NormalizedValue objects
-            return {
-                "text": str(data.text) if hasattr(data, 'text') and data.text else "",
-                "normalized_value": _make_serializable(data.normalized_value)
-            }
-        else:
-            # Generic object conversion
-            return {key: _make_serializable(value) for key, value in data.__dict__.items()}
-    elif isinstance(data, list):
-        return [_make_serializable(item) for item in data]
-    elif isinstance(data, dict):
-        return {key: _make_serializable(value) for key, value in data.items()}
-    elif hasattr(data, '__iter__') and not isinstance(data, (str, bytes)):
-        return [_make_serializable(item) for item in data]
-    else:
-        # Handle primitive types and convert to JSON-serializable
-        try:
-            # Try to convert to basic types
-            if isinstance(data, (int, float, str, bool, type(None))):
-                return data
-            else:
-                return str(data)
-        except Exception:
-            return str(data)
-
-async def save_uploaded_file(file: UploadFile, document_id: str) -> str:
-    """Save uploaded file to local storage and return file path with validation"""
-    try:
-        # Create safe filename with document ID
-        file_extension = Path(file.filename).suffix if file.filename else '.pdf'
-        safe_filename = f"{document_id}{file_extension}"
-        file_path = UPLOAD_DIR / safe_filename
-        
-        # Save file to disk
-        async with aiofiles.open(file_path, 'wb') as buffer:
-            content = await file.read()
-            await buffer.write(content)
-        
-        # Validate file was actually saved
-        if not file_path.exists():
-            raise IOError(f"File save failed: {file_path} does not exist after write")
-        
-        # Validate file size
-        actual_size = file_path.stat().st_size
-        if actual_size == 0:
-            raise IOError(f"File save failed: {file_path} is empty")
-        
-        logger.info(f"📁 File saved and validated: {file_path} ({actual_size} bytes)")
-        return str(file_path)
-        
-    except Exception as e:
-        logger.error(f"❌ File save failed for document {document_id}: {e}")
-        # Clean up any partially created file
-        if 'file_path' in locals() and file_path.exists():
-            try:
-                file_path.unlink()
-                logger.info(f"🗑️ Cleaned up failed file: {file_path}")
-            except Exception as cleanup_error:
-                logger.error(f"Failed to cleanup file {file_path}: {cleanup_error}")
-        raise
-
-async def process_uploaded_document(document_id: str, file_path: str, assessment_repo: AssessmentRepository):
-    """Process uploaded document with Document AI and store results"""
-    processing_start = time.time()
-    
-    # Initialize timing variables
-    ai_time = 0.0
-    score_storage_time = 0.0
-    raw_storage_time = 0.0
-    
-    try:
-        logger.info(f"🔄 [PIPELINE] Starting processing for document {document_id}")
-        logger.info(f"📁 [PIPELINE] File path: {file_path}")
-        
-        # IMMEDIATE FIX: Validate file exists before processing
-        file_path_obj = Path(file_path)
-        if not file_path_obj.exists():
-            raise FileNotFoundError(f"Document file not found: {file_path}")
-        
-        file_size = file_path_obj.stat().st_size
-        if file_size == 0:
-            raise IOError(f"Document file is empty: {file_path}")
-        
-        logger.info(f"📊 [PIPELINE] File validation passed: {file_size} bytes")
-        
-        # Update status to processing
-        status_update_start = time.time()
-        await assessment_repo.update_assessment_document(
-            UUID(document_id),
-            {"processing_status": "processing"}
-        )
-        logger.info(f"📊 [PIPELINE] Status updated to 'processing' in {time.time() - status_update_start:.3f}s")
-        
-        # Process with Document AI
-        ai_start = time.time()
-        logger.info(f"🤖 [PIPELINE] Invoking Document AI service...")
-        extracted_data = await document_ai_service.process_document(file_path, document_id)
-        ai_time = time.time() - ai_start
-        logger.info(f"⏱️ [PIPELINE] Document AI completed in {ai_time:.2f}s")
-        
-        # Log extraction results
-        scores_found = extracted_data.get("extracted_scores", [])
-        confidence = extracted_data.get("confidence", 0.0)
-        logger.info(f"📈 [PIPELINE] Extracted {len(scores_found)} scores with confidence {confidence:.2f}")
-        
-        # Group scores by test type for logging
-        by_test = {}
-        for score in scores_found:
-            test_name = score.get("test_name", "Unknown")
-            if test_name not in by_test:
-                by_test[test_name] = 0
-            by_test[test_name] += 1
-        
-        for test_name, count in by_test.items():
-            logger.info(f"🧪 [PIPELINE] {test_name}: {count} scores")
-        
-        # Update status to extracting
-        await assessment_repo.update_assessment_document(
-            UUID(document_id),
-            {
-                "processing_status": "extracting",
-                "extraction_confidence": confidence
-            }
-        )
-        logger.info(f"📊 [PIPELINE] Status updated to 'extracting'")
-        
-        # Store extracted scores
-        score_storage_start = time.time()
-        scores_stored = 0
-        scores_failed = 0
-        
-        for score_data in scores_found:
-            try:
-                score_dict = {
-                    "document_id": UUID(document_id),
-                    "test_name": score_data.get("test_name", "Unknown"),
-                    "subtest_name": score_data.get("subtest_name", "Unknown"),
-                    "score_type": "standard_score",
-                    "standard_score": score_data.get("standard_score"),
-                    "extraction_confidence": score_data.get("extraction_confidence", 0.0)
-                }
-                await assessment_repo.create_psychoed_score(score_dict)
-                scores_stored += 1
-                
-                # Log individual score storage
-                test_name = score_data.get("test_name")
-                subtest = score_data.get("subtest_name")
-                value = score_data.get("standard_score")
-                logger.debug(f"💾 [PIPELINE] Stored: {test_name} - {subtest}: {value}")
-                
-            except Exception as e:
-                scores_failed += 1
-                logger.error(f"❌ [PIPELINE] Failed to store score for {document_id}: {e}")
-        
-        score_storage_time = time.time() - score_storage_start
-        logger.info(f"💾 [PIPELINE] Score storage: {scores_stored} stored, {scores_failed} failed in {score_storage_time:.2f}s")
-        
-        # Store raw extracted data
-        raw_storage_start = time.time()
-        try:
-            text_length = len(extracted_data.get("text_content", ""))
-            logger.info(f"📄 [PIPELINE] Storing raw extracted data ({text_length} chars)")
-            
-            # Convert Document AI response to JSON-serializable format
-            serializable_data = _make_serializable(extracted_data)
-            
-            extracted_data_dict = {
-                "document_id": UUID(document_id),
-                "raw_text": extracted_data.get("text_content", ""),
-                "structured_data": serializable_data,
-                "extraction_method": "google_document_ai",
-                "extraction_confidence": confidence
-            }
-            await assessment_repo.create_extracted_assessment_data(extracted_data_dict)
-            
-            raw_storage_time = time.time() - raw_storage_start
-            logger.info(f"💾 [PIPELINE] Raw data stored in {raw_storage_time:.2f}s")
-            
-        except Exception as e:
-            logger.error(f"❌ [PIPELINE] Failed to store extracted data for {document_id}: {e}")
-        
-        # Final status update
-        final_update_start = time.time()
-        await assessment_repo.update_assessment_document(
-            UUID(document_id),
-            {
-                "processing_status": "completed",
-                "extraction_confidence": confidence,
-                "processing_duration": time.time() - processing_start
-            }
-        )
-        
-        total_time = time.time() - processing_start
-        logger.info(f"📊 [PIPELINE] Final status update completed")
-        logger.info(f"🎉 [PIPELINE] Processing completed for document {document_id}")
-        logger.info(f"⏱️ [PIPELINE] Total processing time: {total_time:.2f}s")
-        logger.info(f"📊 [PIPELINE] Performance breakdown:")
-        logger.info(f"   🤖 Document AI: {ai_time:.2f}s ({ai_time/total_time*100:.1f}%)")
-        logger.info(f"   💾 Score storage: {score_storage_time:.2f}s ({score_storage_time/total_time*100:.1f}%)")
-        logger.info(f"   📄 Raw storage: {raw_storage_time:.2f}s ({raw_storage_time/total_time*100:.1f}%)")
-        
-    except Exception as e:
-        total_time = time.time() - processing_start
-        logger.error(f"❌ [PIPELINE] Processing failed for document {document_id} after {total_time:.2f}s: {e}", exc_info=True)
-        
-        # Update status to failed
-        try:
-            await assessment_repo.update_assessment_document(
-                UUID(document_id),
-                {
-                    "processing_status": "failed",
-                    "error_message": str(e),
-                    "processing_duration": total_time
-                }
-            )
-            logger.info(f"📊 [PIPELINE] Status updated to 'failed'")
-        except Exception as update_error:
-            logger.error(f"❌ [PIPELINE] Failed to update error status: {update_error}")
-
-def process_uploaded_document_background_sync(document_id: str, file_path: str, engine):
-    """Background task wrapper for document processing - FIXED: Sync wrapper with new event loop"""
-    import asyncio
-    from sqlalchemy.ext.asyncio import async_sessionmaker
-    
-    logger.info(f"🚀🚀🚀 BACKGROUND TASK STARTED for document {document_id}")
-    logger.info(f"🚀 Function called with parameters:")
-    logger.info(f"🚀   document_id: {document_id}")
-    logger.info(f"🚀   file_path: {file_path}")
-    logger.info(f"🚀   engine: {type(engine)}")
-    logger.info(f"🚀 Current working directory: {os.getcwd()}")
-    logger.info(f"🚀 File exists check: {Path(file_path).exists()}")
-    if Path(file_path).exists():
-        logger.info(f"🚀 File size: {Path(file_path).stat().st_size} bytes")
-    logger.info(f"🚀 Entering sync background task for document {document_id}")
+async def save_uploaded_file(file: UploadFile, document_id: str) -> StoredUpload:
+    """Stream uploaded file into content-addressed storage with size and hash validation"""
+    file_extension = Path(file.filename).suffix if file.filename else '.pdf'
+    stored = await store_upload(
+        file,
+        UPLOAD_DIR,
+        max_bytes=get_settings().ASSESSMENT_UPLOAD_MAX_BYTES,
+        suffix=file_extension
+    )
     
-    async def async_process():
-        """Async processing function that runs in new event loop"""
-        logger.info(f"🚀 Starting async background processing for document {document_id}")
-        logger.info(f"📁 Background task file path: {file_path}")
-        
-        # Create independent session factory and session
-        async_session = async_sessionmaker(engine, expire_on_commit=False)
-        async with async_session() as db:
-            if db is None:
-                raise ValueError("Failed to create database session")
-                
-            assessment_repo = AssessmentRepository(db)
-            
-            # Call the async processing function directly
-            await process_uploaded_document(document_id, file_path, assessment_repo)
-            
-        logger.info(f"✅ Background processing completed for document {document_id}")
-    
-    async def update_status_failed(error_message: str):
-        """Update document status to failed using async session"""
-        try:
-            async_session = async_sessionmaker(engine, expire_on_commit=False)
-            async with async_session() as db:
-                if db is None:
-                    logger.error("Failed to create session for error update")
-                    return
-                    
-                assessment_repo = AssessmentRepository(db)
-                await assessment_repo.update_assessment_document(
-                    UUID(document_id),
-                    {
-                        "processing_status": "failed",
-                        "error_message": error_message
-                    }
-                )
-                logger.info(f"📊 Updated document {document_id} status to 'failed'")
-                
-        except Exception as update_error:
-            logger.error(f"Failed to update error status for {document_id}: {update_error}")
-    
-    # Run in new event loop with comprehensive error handling
-    loop = None
-    try:
-        # Check if we're already in an event loop
-        try:
-            current_loop = asyncio.get_running_loop()
-            logger.info(f"🔄 Detected running event loop, using thread executor for document {document_id}")
-            
-            # If we're in an event loop, run in thread executor
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, async_process())
-                result = [future.result()]
-            
-        except RuntimeError:
-            # No running loop, create a new one
-            logger.info(f"🆕 No running event loop detected, creating new loop for document {document_id}")
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Use asyncio.gather for better error collection as suggested
-            result = loop.run_until_complete(
-                asyncio.gather(async_process(), return_exceptions=True)
-            )
-        
-        # Check if any tasks failed
-        for task_result in result:
-            if isinstance(task_result, Exception):
-                raise task_result
-                
-        logger.info(f"✅ Sync background processing completed for document {document_id}")
-        
-    except Exception as e:
-        logger.error(f"❌ Sync background processing failed for document {document_id}: {e}", exc_info=True)
-        
-        # Try to update status to failed
-        try:
-            if loop and not loop.is_closed():
-                loop.run_until_complete(
-                    asyncio.gather(update_status_failed(str(e)), return_exceptions=True)
-                )
-            else:
-                # Fallback: create new loop for error update or use thread executor
-                try:
-                    current_loop = asyncio.get_running_loop()
-                    # If we're in an event loop, use thread executor
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(asyncio.run, update_status_failed(str(e)))
-                        future.result()
-                except RuntimeError:
-                    # No running loop, create new loop for error update
-                    error_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(error_loop)
-                    try:
-                        error_loop.run_until_complete(update_status_failed(str(e)))
-                    finally:
-                        error_loop.close()
-                    
-        except Exception as update_error:
-            logger.error(f"Failed to update error status for {document_id}: {update_error}")
-            
-    finally:
-        # Ensure loop is properly closed
-        if loop:
-            try:
-                # Cancel any pending tasks
-                pending_tasks = asyncio.all_tasks(loop)
-                for task in pending_tasks:
-                    task.cancel()
-                
-                # Wait for cancelled tasks to complete
-                if pending_tasks:
-                    loop.run_until_complete(
-                        asyncio.gather(*pending_tasks, return_exceptions=True)
-                    )
-                    
-            except Exception as cleanup_error:
-                logger.error(f"Error during loop cleanup for {document_id}: {cleanup_error}")
-            finally:
-                if not loop.is_closed():
-                    loop.close()
-                    logger.debug(f"Event loop closed for document {document_id}")
+    logger.info(
+        f"📁 File saved for document {document_id}: {stored.path} ({stored.size} bytes, "
+        f"sha256 {stored.sha256[:12]}{', already stored' if stored.already_stored else ''})"
+    )
+    return stored
 
 # Assessment Document endpoints
 @router.post("/documents/upload", response_model=AssessmentDocumentResponse, status_code=status.HTTP_201_CREATED)
 async def upload_assessment_document(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     student_id: str = Form(...),
     assessment_type: str = Form(...),
     assessor_name: str = Form(None),
     assessment_date: str = Form(None),
-    assessment_repo: AssessmentRepository = Depends(get_assessment_repository),
-    engine = Depends(get_engine)  # NEW: Inject engine for background tasks
+    assessment_repo: AssessmentRepository = Depends(get_assessment_repository)
 ):
-    """Upload assessment document file and create database record with atomic operations"""
+    """Upload assessment document file and create database record with atomic operations
+    
+    Document AI processing is queued for the document processing worker.
+    """
     document_id = None
     file_path = None
+    stored = None
     
     try:
         # Validate file type
@@ -441,13 +89,18 @@ async def upload_assessment_document(
         
         # ATOMIC OPERATION: Save file to storage with validation
         try:
-            file_path = await save_uploaded_file(file, document_id)
-            logger.info(f"📁 File saved successfully: {file_path}")
+            stored = await save_uploaded_file(file, document_id)
+            file_path = str(stored.path)
         except Exception as file_error:
             logger.error(f"❌ File save failed for document {document_id}: {file_error}")
             # ROLLBACK: Delete database record if file save fails
             await assessment_repo.delete_assessment_document(UUID(document_id))
             logger.info(f"🗑️ Database record rolled back for failed upload: {document_id}")
+            if isinstance(file_error, UploadTooLargeError):
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=str(file_error)
+                )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"File upload failed: {str(file_error)}"
@@ -456,26 +109,39 @@ async def upload_assessment_document(
         # ATOMIC OPERATION: Update document with real file path only after successful save
         updated_document = await assessment_repo.update_assessment_document(
             UUID(document_id),
-            {"file_path": file_path, "processing_status": "uploaded"}
+            {
+                "file_path": file_path,
+                "content_hash": stored.sha256,
+                "file_size": stored.size,
+                "processing_status": "uploaded"
+            }
         )
         
         logger.info(f"📄 Document {document_id} uploaded and saved successfully")
         
-        # SAFE OPERATION: Only trigger background processing if file exists
+        # DEDUP: Identical content already processed - reuse its extraction instead of OCR
+        processed = await assessment_repo.find_processed_document_by_hash(stored.sha256, exclude_id=UUID(document_id))
+        if processed:
+            scores_copied = await assessment_repo.copy_processing_results(UUID(processed["id"]), UUID(document_id))
+            updated_document = await assessment_repo.update_assessment_document(
+                UUID(document_id),
+                {
+                    "processing_status": "completed",
+                    "extraction_confidence": processed["extraction_confidence"],
+                    "processing_duration": 0.0
+                }
+            )
+            logger.info(f"♻️ Reused extraction of document {processed['id']} for {document_id} ({scores_copied} scores)")
+            return AssessmentDocumentResponse(**updated_document)
+        
+        # SAFE OPERATION: Only queue processing if file exists
         if Path(file_path).exists():
-            file_size = Path(file_path).stat().st_size
-            logger.info(f"🔄 File validation PASSED: {file_path} ({file_size} bytes)")
-            logger.info(f"🔄 Adding background task: process_uploaded_document_background_sync")
-            logger.info(f"🔄 Task parameters: document_id={document_id}, file_path={file_path}")
-            
-            background_tasks.add_task(
-                process_uploaded_document_background_sync,
-                document_id, 
-                file_path,
-                engine  # Pass engine to background task
+            job_id = await DocumentJobService(assessment_repo.db).enqueue(document_id, file_path)
+            updated_document = await assessment_repo.update_assessment_document(
+                UUID(document_id),
+                {"processing_status": "queued"}
             )
-            logger.info(f"🔄 Sync background processing queued for document {document_id}")
-            logger.info(f"🔄 Background task added successfully to FastAPI BackgroundTasks")
+            logger.info(f"🔄 Document {document_id} queued for processing (job {job_id})")
         else:
             logger.error(f"❌ File validation failed after save: {file_path}")
             logger.error(f"❌ File does not exist, updating status to failed")
@@ -502,8 +168,8 @@ async def upload_assessment_document(
             except Exception as rollback_error:
                 logger.error(f"❌ Emergency rollback failed for document {document_id}: {rollback_error}")
         
-        # Clean up any orphaned files
-        if file_path and Path(file_path).exists():
+        # Clean up any orphaned files (stored content may be shared by earlier uploads)
+        if file_path and not stored.already_stored and Path(file_path).exists():
             try:
                 Path(file_path).unlink()
                 logger.info(f"🗑️ Cleaned up orphaned file: {file_path}")
@@ -515,6 +181,14 @@ async def upload_assessment_document(
             detail="Failed to upload assessment document"
         )
 
+@router.get("/processing-queue", response_model=Dict[str, Any])
+async def get_processing_queue_stats(db: AsyncSession = Depends(get_db)):
+    """Document processing queue depth and embedded worker activity"""
+    stats = await DocumentJobService(db).get_queue_stats()
+    worker = get_embedded_document_worker()
+    stats["embedded_worker"] = worker.get_stats() if worker else None
+    return stats
+
 @router.post("/documents", response_model=AssessmentDocumentResponse, status_code=status.HTTP_201_CREATED)
 async def create_assessment_document(
     document_data: AssessmentDocumentCreate,
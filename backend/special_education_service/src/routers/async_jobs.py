@@ -1,9 +1,11 @@
 """API routes for async job management"""
 
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
+import asyncio
 import logging
 
 from ..services.async_job_service import (
@@ -13,14 +15,20 @@ from ..services.async_job_service import (
     SectionGenerationRequest, 
     JobStatus
 )
+from ..database import async_session_factory, release_session_connection
 from ..middleware.session_middleware import get_request_session
+from ..workers.job_events import get_job_event_bus, job_snapshot, wait_for_terminal, TERMINAL_STATUSES
 from ..utils.safe_json import safe_json_response
+from ..utils.sse import sse_event
 from fastapi import Request
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/jobs", tags=["Async Jobs"])
 
+# Comment line sent on idle event streams so proxies keep them open
+SSE_KEEPALIVE_SECONDS = 15
+
 
 @router.post("/iep-generation", response_model=Dict[str, Any])
 async def submit_iep_generation_job(
@@ -267,6 +275,7 @@ async def job_health_check(
             "status": health_status,
             "timestamp": str(datetime.utcnow()),
             "queue_stats": stats,
+            "event_bus": get_job_event_bus().get_stats(),
             "issues": issues
         })
         
@@ -279,7 +288,7 @@ async def job_health_check(
         }, status_code=500)
 
 
-# Polling endpoint for job completion
+# Long-poll endpoint for job completion
 @router.get("/{job_id}/poll", response_class=None)
 async def poll_job_completion(
     job_id: str,
@@ -287,33 +296,37 @@ async def poll_job_completion(
     timeout_seconds: int = Query(30, ge=1, le=300, description="Polling timeout"),
     current_user_id: int = Query(..., description="Current user's auth ID")
 ):
-    """Poll for job completion with timeout"""
-    import asyncio
-    from datetime import datetime, timedelta
+    """Wait for job completion with timeout
     
+    Returns as soon as the job completes, fails or is cancelled. The wait is
+    driven by the job event bus; the database connection is released while
+    waiting.
+    """
     try:
         db = await get_request_session(request)
         service = AsyncJobService(db)
-        start_time = datetime.utcnow()
-        timeout = timedelta(seconds=timeout_seconds)
         
-        while datetime.utcnow() - start_time < timeout:
+        async with get_job_event_bus().watch(job_id) as events:
             job_status = await service.get_job_status(job_id)
-            
             if not job_status:
                 raise HTTPException(status_code=404, detail="Job not found")
             
-            # Return if job is completed, failed, or cancelled
-            if job_status.status in ['completed', 'failed', 'cancelled']:
+            if job_status.status in TERMINAL_STATUSES:
                 return safe_json_response(job_status.model_dump())
             
-            # Wait before next poll
-            await asyncio.sleep(2)
+            latest = _status_snapshot(job_status)
+            get_job_event_bus().seed(latest)
+            await release_session_connection(db)
+            latest = await wait_for_terminal(events, latest, timeout_seconds)
         
-        # Timeout reached, return current status
-        job_status = await service.get_job_status(job_id)
+        if latest["status"] in TERMINAL_STATUSES:
+            job_status = await service.get_job_status(job_id)
+            return safe_json_response(job_status.model_dump())
+        
+        # Timeout reached, return the last known status
         return safe_json_response({
             **job_status.model_dump(),
+            **latest,
             "polling_timeout": True,
             "message": f"Polling timeout after {timeout_seconds} seconds"
         }, status_code=202)
@@ -322,4 +335,70 @@ async def poll_job_completion(
         raise
     except Exception as e:
         logger.error(f"Error polling job: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to poll job")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to poll job")
+
+
+@router.get("/{job_id}/events", response_class=None)
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    current_user_id: int = Query(..., description="Current user's auth ID")
+):
+    """Stream job progress as server-sent events
+    
+    Sends a ``status`` event with the current state, ``progress`` events as
+    the worker reports them, and finally a ``completed``, ``failed`` or
+    ``cancelled`` event carrying the full job status.
+    """
+    db = await get_request_session(request)
+    if not await AsyncJobService(db).get_job_status(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def event_stream():
+        # The request-scoped session is closed once the response starts;
+        # the stream reads the job with short-lived sessions of its own
+        async with get_job_event_bus().watch(job_id) as events:
+            job_status = await _read_job_status(job_id)
+            if not job_status:
+                yield sse_event("error", {"status_code": 404, "detail": "Job not found"})
+                return
+            latest = _status_snapshot(job_status)
+            get_job_event_bus().seed(latest)
+            yield sse_event("status", job_status.model_dump())
+            
+            while latest["status"] not in TERMINAL_STATUSES:
+                try:
+                    latest = await asyncio.wait_for(events.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if latest["status"] not in TERMINAL_STATUSES:
+                    yield sse_event("progress", latest)
+        
+        job_status = await _read_job_status(job_id)
+        if job_status:
+            yield sse_event(job_status.status, job_status.model_dump())
+        else:
+            # Deleted after finishing (e.g. by cleanup); the last snapshot is all there is
+            yield sse_event(latest["status"], latest)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _read_job_status(job_id: str) -> Optional[JobStatus]:
+    async with async_session_factory() as session:
+        return await AsyncJobService(session).get_job_status(job_id)
+
+
+def _status_snapshot(job_status: JobStatus) -> Dict[str, Any]:
+    return job_snapshot(
+        job_status.job_id,
+        job_status.status,
+        job_status.progress_percentage,
+        job_status.status_message
+    )
+
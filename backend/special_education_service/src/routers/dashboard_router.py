@@ -3,17 +3,17 @@ Dashboard BFF (Backend for Frontend) API endpoints
 Optimized endpoints that return aggregated data for dashboard views
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 import logging
 from datetime import datetime, timedelta
-import asyncio
 
 from ..database import get_db
 from ..repositories.student_repository import StudentRepository
 from ..repositories.iep_repository import IEPRepository
+from ..repositories.dashboard_stats_repository import DashboardStatsRepository, SCOPE_ALL
 from ..services.user_adapter import UserAdapter
 from ..schemas.student_schemas import StudentResponse
 from ..schemas.iep_schemas import IEPResponse
@@ -34,7 +34,8 @@ async def get_repositories(db: AsyncSession = Depends(get_db)):
     """Dependency to get repositories"""
     return {
         'student': StudentRepository(db),
-        'iep': IEPRepository(db)
+        'iep': IEPRepository(db),
+        'stats': DashboardStatsRepository(db)
     }
 
 # Response schemas for BFF endpoints
@@ -115,9 +116,18 @@ class AdminDashboardResponse(BaseModel):
     security_alerts: List[Dict[str, Any]]
     last_updated: datetime
 
+def _teacher_auth_id(user_id: str, teacher_auth_id: Optional[int]) -> Optional[int]:
+    """Caseload filter: explicit teacher_auth_id, else a numeric auth user id"""
+    if teacher_auth_id is not None:
+        return teacher_auth_id
+    return int(user_id) if user_id.isdigit() else None
+
 @router.get("/teacher/{user_id}", response_model=TeacherDashboardResponse)
 async def get_teacher_dashboard(
     user_id: str,
+    teacher_auth_id: Optional[int] = Query(None, description="Caseload owner; defaults to a numeric user_id"),
+    limit: int = Query(25, ge=1, le=200),
+    offset: int = Query(0, ge=0),
     repositories = Depends(get_repositories),
     x_request_id: Optional[str] = Header(None),
     x_client_session_id: Optional[str] = Header(None)
@@ -135,52 +145,40 @@ async def get_teacher_dashboard(
     try:
         # Get repositories
         student_repo = repositories['student']
-        iep_repo = repositories['iep']
-        
-        # Fetch teacher's students (for now, get all students - will filter by teacher later)
-        students_data = await student_repo.list_students()
         
-        # Parallel data fetching for better performance
-        async def fetch_dashboard_data():
-            # Get all students assigned to this teacher
-            # TODO: Add teacher assignment logic when user relationships are implemented
-            students = students_data[:25]  # Limit for demo
-            
-            # Get IEP data for students
-            student_ids = [student['id'] for student in students]
-            ieps_data = await asyncio.gather(*[
-                iep_repo.get_student_ieps(student_id) for student_id in student_ids
-            ], return_exceptions=True)
-            
-            return students, ieps_data
+        caseload_owner = _teacher_auth_id(user_id, teacher_auth_id)
         
-        students, ieps_data = await fetch_dashboard_data()
+        # Students with latest IEP and goal progress in one query; caseload
+        # counts come from the materialized statistics row
+        caseload = await student_repo.get_dashboard_caseload(
+            teacher_auth_id=caseload_owner, limit=limit, offset=offset
+        )
+        scope = ("case_manager", str(caseload_owner)) if caseload_owner is not None else SCOPE_ALL
+        caseload_stats = await repositories['stats'].get_stats(*scope)
         
         # Process student cards
         student_cards = []
-        active_ieps_count = 0
-        goals_achieved = 0
         
-        for i, student in enumerate(students):
+        for i, student in enumerate(caseload["students"]):
             try:
-                student_ieps = ieps_data[i] if not isinstance(ieps_data[i], Exception) else []
-                current_iep = student_ieps[0] if student_ieps else None
+                current_iep = student["latest_iep"]
+                goal_progress = student["goal_progress"]
                 
-                # Calculate progress and status
-                progress_percentage = 75.0 if current_iep else 0.0  # Mock calculation
+                # Progress is the share of the current IEP's goals mastered
+                progress_percentage = (
+                    round(goal_progress["mastered"] / goal_progress["total"] * 100, 1)
+                    if goal_progress["total"] else 0.0
+                )
                 alert_status = None
                 alert_message = None
                 
                 if current_iep:
-                    active_ieps_count += 1
-                    # Mock some goal achievements
-                    if i % 3 == 0:
-                        goals_achieved += 1
-                        alert_status = "success"
-                        alert_message = "Goal achieved this week!"
-                    elif hasattr(current_iep, 'status') and current_iep.status == 'under_review':
+                    if current_iep["status"] == "under_review":
                         alert_status = "warning"
                         alert_message = "IEP review due"
+                    elif goal_progress["mastered"]:
+                        alert_status = "success"
+                        alert_message = f"{goal_progress['mastered']} of {goal_progress['total']} goals mastered"
                 
                 disability_codes = student.get('disability_codes', [])
                 primary_disability = disability_codes[0] if disability_codes else "Not specified"
@@ -191,25 +189,27 @@ async def get_teacher_dashboard(
                     last_name=student['last_name'],
                     grade=student.get('grade_level') or "N/A",
                     primary_disability=primary_disability,
-                    current_iep_status=current_iep.status if current_iep and hasattr(current_iep, 'status') else "No IEP",
+                    current_iep_status=current_iep["status"] if current_iep else "No IEP",
                     progress_percentage=progress_percentage,
                     alert_status=alert_status,
                     alert_message=alert_message,
-                    last_activity=current_iep.updated_at if current_iep and hasattr(current_iep, 'updated_at') else student.get('updated_at')
+                    last_activity=(current_iep["created_at"] if current_iep else None) or student.get('updated_at')
                 ))
             except Exception as e:
                 logger.warning(f"Error processing student {i}: {e}", exc_info=True)
                 continue
         
+        active_ieps_count = caseload_stats["active_ieps"]
+        
         # Calculate dashboard stats
         stats = DashboardStats(
-            total_students=len(students),
+            total_students=caseload_stats["total_students"],
             active_ieps=active_ieps_count,
-            goals_achieved=goals_achieved,
+            goals_achieved=caseload_stats["goals_achieved"],
             tasks_due=5,  # Mock data
             pending_approvals=0,  # Teachers don't typically approve
-            compliance_rate=94.5,  # Mock data
-            overdue_items=2  # Mock data
+            compliance_rate=caseload_stats["compliance_rate"],
+            overdue_items=caseload_stats["overdue_reviews"]
         )
         
         # Generate mock recent activities
@@ -318,15 +318,16 @@ async def get_coordinator_dashboard(
     })
     
     try:
-        # Mock data for coordinator dashboard
+        # District-wide counts from the materialized statistics
+        caseload_stats = await repositories['stats'].get_stats(*SCOPE_ALL)
         stats = DashboardStats(
-            total_students=156,
-            active_ieps=134,
-            goals_achieved=89,
-            tasks_due=23,
-            pending_approvals=8,
-            compliance_rate=94.2,
-            overdue_items=3
+            total_students=caseload_stats["total_students"],
+            active_ieps=caseload_stats["active_ieps"],
+            goals_achieved=caseload_stats["goals_achieved"],
+            tasks_due=23,  # Mock data
+            pending_approvals=caseload_stats["pending_approvals"],
+            compliance_rate=caseload_stats["compliance_rate"],
+            overdue_items=caseload_stats["overdue_reviews"]
         )
         
         # Mock pending approvals
@@ -424,15 +425,16 @@ async def get_admin_dashboard(
     logger.info(f"Fetching admin dashboard for user {user_id}")
     
     try:
-        # Mock data for admin dashboard
+        # System-wide counts from the materialized statistics
+        caseload_stats = await repositories['stats'].get_stats(*SCOPE_ALL)
         stats = DashboardStats(
-            total_students=1245,
-            active_ieps=1089,
-            goals_achieved=2341,
-            tasks_due=67,
-            pending_approvals=23,
-            compliance_rate=93.8,
-            overdue_items=15
+            total_students=caseload_stats["total_students"],
+            active_ieps=caseload_stats["active_ieps"],
+            goals_achieved=caseload_stats["goals_achieved"],
+            tasks_due=67,  # Mock data
+            pending_approvals=caseload_stats["pending_approvals"],
+            compliance_rate=caseload_stats["compliance_rate"],
+            overdue_items=caseload_stats["overdue_reviews"]
         )
         
         # Mock system metrics
@@ -1,5 +1,5 @@
 """IEP management API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
@@ -20,6 +20,7 @@ from ..schemas.iep_schemas import (
     IEPGoalCreate, IEPGoalResponse
 )
 from ..schemas.common_schemas import SuccessResponse
+from ..utils.pagination import InvalidCursorError
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -116,6 +117,11 @@ async def enrich_iep_response(iep_data: dict) -> IEPResponse:
         # Always return a valid response even if enrichment fails
         return IEPResponse(**iep_data)
 
+def _set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """Expose the keyset cursor for list endpoints that return a bare list"""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
 @router.post("", response_model=IEPResponse, status_code=status.HTTP_201_CREATED)
 async def create_iep(
     iep_data: IEPCreate,
@@ -167,6 +173,33 @@ async def create_iep(
             detail="Failed to create IEP"
         )
 
+# Registered before /{iep_id} so the path is not matched as an IEP ID
+@router.get("/pending-approval", response_model=List[IEPResponse])
+async def get_pending_approvals(
+    response: Response,
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of IEPs to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    iep_repo: IEPRepository = Depends(get_iep_repository)
+):
+    """Get IEPs pending approval, oldest first (paged via X-Next-Cursor)"""
+    try:
+        page = await iep_repo.get_ieps_for_approval_page(
+            status="under_review",
+            limit=limit,
+            cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    _set_next_cursor(response, page["next_cursor"])
+    
+    # Enrich responses
+    enriched_ieps = []
+    for iep in page["items"]:
+        enriched_iep = await enrich_iep_response(iep)
+        enriched_ieps.append(enriched_iep)
+    
+    return enriched_ieps
+
 @router.get("/{iep_id}", response_model=IEPResponse)
 async def get_iep(
     iep_id: UUID,
@@ -237,13 +270,19 @@ async def delete_iep(
 @router.get("/student/{student_id}", response_model=List[IEPResponse])
 async def get_student_ieps(
     student_id: UUID,
+    response: Response,
     academic_year: Optional[str] = Query(None, description="Filter by academic year"),
-    status: Optional[str] = Query(None, description="Filter by IEP status"),
+    iep_status: Optional[str] = Query(None, alias="status", description="Filter by IEP status"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of IEPs to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     student_repo: StudentRepository = Depends(get_student_repository),
     iep_repo: IEPRepository = Depends(get_iep_repository)
 ):
-    """Get all IEPs for a student"""
+    """Get a student's IEPs, newest first
+    
+    When more IEPs exist the ``X-Next-Cursor`` response header carries the
+    cursor for the next page.
+    """
     # Verify student exists
     student = await student_repo.get_student(student_id)
     if not student:
@@ -253,16 +292,21 @@ async def get_student_ieps(
         )
     
     # Get IEPs
-    ieps = await iep_repo.get_student_ieps(
-        student_id=student_id,
-        academic_year=academic_year,
-        status=status,
-        limit=limit
-    )
+    try:
+        page = await iep_repo.get_student_ieps_page(
+            student_id=student_id,
+            academic_year=academic_year,
+            status=iep_status,
+            limit=limit,
+            cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    _set_next_cursor(response, page["next_cursor"])
     
     # Enrich responses
     enriched_ieps = []
-    for iep in ieps:
+    for iep in page["items"]:
         enriched_iep = await enrich_iep_response(iep)
         enriched_ieps.append(enriched_iep)
     
@@ -417,22 +461,3 @@ async def get_iep_version_history(
         enriched_versions.append(enriched_version)
     
     return enriched_versions
-
-@router.get("/pending-approval", response_model=List[IEPResponse])
-async def get_pending_approvals(
-    limit: int = Query(50, ge=1, le=100, description="Maximum number of IEPs to return"),
-    iep_repo: IEPRepository = Depends(get_iep_repository)
-):
-    """Get IEPs pending approval"""
-    ieps = await iep_repo.get_ieps_for_approval(
-        status="under_review",
-        limit=limit
-    )
-    
-    # Enrich responses
-    enriched_ieps = []
-    for iep in ieps:
-        enriched_iep = await enrich_iep_response(iep)
-        enriched_ieps.append(enriched_iep)
-    
-    return enriched_ieps
\ No newline at end of file
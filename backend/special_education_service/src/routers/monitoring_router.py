@@ -7,6 +7,8 @@ from pathlib import Path
 
 from ..monitoring.metrics_collector import metrics_collector
 from ..monitoring.health_monitor import health_monitor
+from ..utils.response_cache import get_response_cache
+from ..database import pool_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +97,29 @@ async def get_performance_metrics(
         raise HTTPException(status_code=500, detail="Failed to retrieve performance metrics")
 
 
+@router.get("/metrics/gemini-cache", response_model=Dict[str, Any])
+async def get_gemini_cache_metrics():
+    """Get Gemini response cache hit/miss statistics"""
+    try:
+        cache = get_response_cache()
+        if cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **await cache.get_stats()}
+    except Exception as e:
+        logger.error(f"Failed to get Gemini cache metrics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve Gemini cache metrics")
+
+
+@router.get("/metrics/db-pool", response_model=Dict[str, Any])
+async def get_db_pool_metrics():
+    """Get database connection pool occupancy and request session usage"""
+    try:
+        return pool_metrics.get_stats()
+    except Exception as e:
+        logger.error(f"Failed to get database pool metrics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve database pool metrics")
+
+
 @router.get("/alerts", response_model=Dict[str, Any])
 async def get_alerts():
     """Get current system alerts"""
@@ -10,9 +10,11 @@ from ..database import get_db
 from ..repositories.student_repository import StudentRepository
 from ..services.user_adapter import UserAdapter
 from ..schemas.student_schemas import (
-    StudentCreate, StudentUpdate, StudentResponse, StudentCaseloadSummary
+    StudentCreate, StudentUpdate, StudentResponse, StudentCaseloadSummary,
+    StudentTypeaheadItem
 )
 from ..schemas.common_schemas import PaginatedResponse, SuccessResponse
+from ..utils.pagination import InvalidCursorError
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -90,6 +92,48 @@ async def create_student(
             detail="Failed to create student"
         )
 
+# Static paths are registered before /{student_id} so they are not matched as IDs
+@router.get("/search", response_model=List[StudentResponse])
+async def search_students(
+    q: str = Query(..., min_length=1, description="Search term (name or student ID)"),
+    limit: int = Query(50, ge=1, le=100, description="Maximum results"),
+    student_repo: StudentRepository = Depends(get_student_repository)
+):
+    """Search students by name or student ID, best matches first"""
+    try:
+        students = await student_repo.search_students(q, limit=limit)
+        
+        # Enrich responses
+        enriched_students = []
+        for student in students:
+            enriched_student = await enrich_student_response(student)
+            enriched_students.append(enriched_student)
+        
+        return enriched_students
+        
+    except Exception as e:
+        logger.error(f"Error searching students: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Search failed"
+        )
+
+@router.get("/typeahead", response_model=List[StudentTypeaheadItem])
+async def typeahead_students(
+    q: str = Query(..., min_length=1, description="Partial name or student ID"),
+    limit: int = Query(10, ge=1, le=25, description="Maximum suggestions"),
+    student_repo: StudentRepository = Depends(get_student_repository)
+):
+    """Search-as-you-type suggestions (no user enrichment)"""
+    try:
+        return await student_repo.typeahead_students(q, limit=limit)
+    except Exception as e:
+        logger.error(f"Error in student typeahead: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Typeahead failed"
+        )
+
 @router.get("/{student_id}", response_model=StudentResponse)
 async def get_student(
     student_id: UUID,
@@ -180,35 +224,32 @@ async def list_students(
     disability_code: Optional[str] = Query(None, description="Filter by disability code"),
     case_manager_auth_id: Optional[int] = Query(None, description="Filter by case manager"),
     is_active: bool = Query(True, description="Filter by active status"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     student_repo: StudentRepository = Depends(get_student_repository)
 ):
-    """List students with filtering and pagination"""
+    """List students with filtering and pagination
+    
+    Follow ``next_cursor`` for keyset pagination; every page then costs the
+    same as the first. ``page`` numbers still work through OFFSET for
+    existing clients.
+    """
+    filters = dict(
+        grade_level=grade_level,
+        disability_code=disability_code,
+        case_manager_auth_id=case_manager_auth_id,
+        is_active=is_active
+    )
     try:
-        # Calculate offset
-        offset = (page - 1) * size
-        
-        # Get students
-        students = await student_repo.list_students(
-            grade_level=grade_level,
-            disability_code=disability_code,
-            case_manager_auth_id=case_manager_auth_id,
-            is_active=is_active,
-            limit=size,
-            offset=offset
-        )
+        if cursor or page == 1:
+            result = await student_repo.list_students_page(**filters, limit=size, cursor=cursor)
+            students, next_cursor = result["items"], result["next_cursor"]
+        else:
+            students = await student_repo.list_students(**filters, limit=size, offset=(page - 1) * size)
+            next_cursor = None
         
-        # For pagination, we need total count (simplified approach)
-        total_students = await student_repo.list_students(
-            grade_level=grade_level,
-            disability_code=disability_code,
-            case_manager_auth_id=case_manager_auth_id,
-            is_active=is_active,
-            limit=1000,  # Large number to get total
-            offset=0
-        )
-        total = len(total_students)
+        total = await student_repo.count_students(**filters)
         
         # Enrich responses
         enriched_students = []
@@ -218,8 +259,12 @@ async def list_students(
         
         # Calculate pagination info
         pages = math.ceil(total / size) if total > 0 else 1
-        has_next = page < pages
-        has_prev = page > 1
+        if cursor or page == 1:
+            has_next = next_cursor is not None
+            has_prev = cursor is not None
+        else:
+            has_next = page < pages
+            has_prev = True
         
         return PaginatedResponse[StudentResponse](
             items=enriched_students,
@@ -228,9 +273,12 @@ async def list_students(
             size=size,
             pages=pages,
             has_next=has_next,
-            has_prev=has_prev
+            has_prev=has_prev,
+            next_cursor=next_cursor
         )
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing students: {e}")
         raise HTTPException(
@@ -238,31 +286,6 @@ async def list_students(
             detail="Failed to retrieve students"
         )
 
-@router.get("/search", response_model=List[StudentResponse])
-async def search_students(
-    q: str = Query(..., min_length=1, description="Search term (name or student ID)"),
-    limit: int = Query(50, ge=1, le=100, description="Maximum results"),
-    student_repo: StudentRepository = Depends(get_student_repository)
-):
-    """Search students by name or student ID"""
-    try:
-        students = await student_repo.search_students(q, limit=limit)
-        
-        # Enrich responses
-        enriched_students = []
-        for student in students:
-            enriched_student = await enrich_student_response(student)
-            enriched_students.append(enriched_student)
-        
-        return enriched_students
-        
-    except Exception as e:
-        logger.error(f"Error searching students: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Search failed"
-        )
-
 @router.get("/teacher/{teacher_auth_id}/caseload", response_model=List[StudentResponse])
 async def get_teacher_caseload(
     teacher_auth_id: int,
@@ -44,6 +44,8 @@ class AssessmentDocumentResponse(AssessmentDocumentBase):
     id: UUID
     upload_date: Optional[datetime] = None
     processing_status: str
+    content_hash: Optional[str] = None
+    file_size: Optional[int] = None
     extraction_confidence: Optional[float] = None
     processing_duration: Optional[float] = None
     error_message: Optional[str] = None
@@ -29,6 +29,7 @@ class PaginatedResponse(BaseModel, Generic[T]):
     pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, when keyset paging")
     metadata: ResponseMetadata = Field(default_factory=ResponseMetadata)
 
 class ErrorDetail(BaseModel):
@@ -101,6 +101,10 @@ class IEPCreateWithRAG(IEPBase):
         default=False, 
         description="Enable Google Search grounding for enhanced IEP generation with current research and best practices"
     )
+    use_cache: bool = Field(
+        default=True,
+        description="Serve an identical earlier generation from the response cache; set false to regenerate"
+    )
     
     @validator('goals')
     def validate_goals_not_empty_if_provided(cls, v):
@@ -156,6 +160,10 @@ class IEPGenerateSection(BaseModel):
         default=False, 
         description="Enable Google Search grounding for enhanced section generation with current research"
     )
+    use_cache: bool = Field(
+        default=True,
+        description="Serve an identical earlier generation from the response cache; set false to regenerate"
+    )
 
 class IEPVersionHistory(BaseModel):
     """IEP version history entry"""
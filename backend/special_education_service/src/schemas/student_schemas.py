@@ -85,6 +85,15 @@ class StudentSearch(BaseModel):
     page: int = Field(1, ge=1)
     size: int = Field(20, ge=1, le=100)
 
+class StudentTypeaheadItem(BaseModel):
+    """Lightweight student suggestion for search-as-you-type"""
+    id: UUID
+    student_id: str
+    first_name: str
+    last_name: str
+    full_name: str
+    grade_level: Optional[str] = None
+
 class StudentCaseloadSummary(BaseModel):
     """Caseload summary for a case manager"""
     total_students: int
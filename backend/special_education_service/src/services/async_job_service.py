@@ -15,6 +15,8 @@ from ..repositories.student_repository import StudentRepository
 from ..repositories.iep_repository import IEPRepository
 from ..repositories.template_repository import TemplateRepository
 from ..utils.json_helpers import ensure_json_serializable
+from ..workers.job_notifier import get_job_notifier
+from ..workers.job_events import get_job_event_bus, job_snapshot
 from pydantic import BaseModel, Field
 from typing import Union
 
@@ -36,6 +38,7 @@ class IEPGenerationRequest(JobRequest):
     academic_year: str = Field(..., pattern=r"^\d{4}-\d{4}$")
     include_previous_ieps: bool = Field(default=True)
     include_assessments: bool = Field(default=True)
+    use_cache: bool = Field(default=True)  # False regenerates instead of reusing a cached response
 
 
 class SectionGenerationRequest(JobRequest):
@@ -110,6 +113,7 @@ class AsyncJobService:
                 'previous_ieps': previous_ieps,
                 'previous_assessments': previous_assessments,
                 'academic_year': request.academic_year,
+                'use_cache': request.use_cache,
                 'created_by_auth_id': created_by_auth_id
             }
             
@@ -127,6 +131,7 @@ class AsyncJobService:
             
             self.session.add(job)
             await self.session.commit()
+            await get_job_notifier().job_submitted(self.session, job.id)
             
             logger.info(f"Submitted IEP generation job {job.id} for student {request.student_id}")
             return job.id
@@ -176,6 +181,7 @@ class AsyncJobService:
             
             self.session.add(job)
             await self.session.commit()
+            await get_job_notifier().job_submitted(self.session, job.id)
             
             logger.info(f"Submitted section generation job {job.id} for IEP {request.iep_id}")
             return job.id
@@ -273,6 +279,9 @@ class AsyncJobService:
             success = result.rowcount > 0
             if success:
                 await self.session.commit()
+                await get_job_event_bus().job_updated(
+                    self.session, job_snapshot(job_id, 'cancelled', None, 'Cancelled by user')
+                )
                 logger.info(f"Cancelled job {job_id} by user {user_auth_id}")
             else:
                 logger.warning(f"Could not cancel job {job_id} - not found or not owned by {user_auth_id}")
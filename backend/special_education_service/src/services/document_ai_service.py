@@ -3,8 +3,10 @@ Google Document AI integration for assessment document processing
 """
 import asyncio
 import logging
+import os
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import json
 
@@ -12,12 +14,101 @@ from google.cloud import documentai
 from google.cloud.documentai import Document
 from google.api_core.exceptions import GoogleAPIError
 
+from ..utils.pattern_scanner import ScorePatternScanner
+
 logger = logging.getLogger(__name__)
 
+# Score patterns per assessment family: (pattern, subtest name, confidence).
+# Each pattern is ``label.*?marker[:\s]*(\d{2,3})`` and is matched
+# case-insensitively across line breaks.
+SCORE_PATTERNS: Dict[str, List[Tuple[str, str, float]]] = {
+    "WISC-V": [
+        (r"Full Scale IQ.*?(?:SS|Standard Score)[:\s]*(\d{2,3})", "Full Scale IQ", 0.90),
+        (r"Verbal Comprehension.*?(?:Index|VCI)[:\s]*(\d{2,3})", "Verbal Comprehension Index", 0.85),
+        (r"Perceptual Reasoning.*?(?:Index|PRI)[:\s]*(\d{2,3})", "Perceptual Reasoning Index", 0.85),
+        (r"Working Memory.*?(?:Index|WMI)[:\s]*(\d{2,3})", "Working Memory Index", 0.85),
+        (r"Processing Speed.*?(?:Index|PSI)[:\s]*(\d{2,3})", "Processing Speed Index", 0.85),
+        (r"General Ability.*?(?:Index|GAI)[:\s]*(\d{2,3})", "General Ability Index", 0.80),
+        (r"Cognitive Proficiency.*?(?:Index|CPI)[:\s]*(\d{2,3})", "Cognitive Proficiency Index", 0.80)
+    ],
+    "WIAT-IV": [
+        (r"(?:Total|Overall|Composite).*?Achievement.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Total Achievement", 0.85),
+        (r"(?:Basic|Word) Reading.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Basic Reading", 0.80),
+        (r"Reading Comprehension.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Reading Comprehension", 0.80),
+        (r"Spelling.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Spelling", 0.80),
+        (r"Written Expression.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Written Expression", 0.80),
+        (r"Numerical Operations.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Numerical Operations", 0.80),
+        (r"Math Problem Solving.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Math Problem Solving", 0.80),
+        (r"Academic Skills.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Academic Skills", 0.75),
+        (r"Academic Fluency.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Academic Fluency", 0.75)
+    ],
+    "BASC-3": [
+        (r"Behavioral Symptoms.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Behavioral Symptoms Index", 0.80),
+        (r"Externalizing.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Externalizing Problems", 0.80),
+        (r"Internalizing.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Internalizing Problems", 0.80),
+        (r"School Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "School Problems", 0.80),
+        (r"Adaptive Skills.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Adaptive Skills", 0.80),
+        (r"Attention Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Attention Problems", 0.75),
+        (r"Hyperactivity.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Hyperactivity", 0.75),
+        (r"Aggression.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Aggression", 0.75),
+        (r"Conduct Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Conduct Problems", 0.75),
+        (r"Anxiety.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Anxiety", 0.75),
+        (r"Depression.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Depression", 0.75),
+        (r"Learning Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Learning Problems", 0.75)
+    ],
+    "KTEA-3": [
+        (r"Comprehensive Achievement.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Comprehensive Achievement", 0.85),
+        (r"Reading.*?Composite.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Reading Composite", 0.80),
+        (r"Math.*?Composite.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Math Composite", 0.80),
+        (r"Written Language.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Written Language", 0.80),
+        (r"Oral Language.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Oral Language", 0.80),
+        (r"Letter.*?Word Recognition.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Letter & Word Recognition", 0.75),
+        (r"Reading Comprehension.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Reading Comprehension", 0.75),
+        (r"Math Concepts.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Math Concepts & Applications", 0.75),
+        (r"Math Computation.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Math Computation", 0.75)
+    ],
+    "CONNERS-3": [
+        (r"Conners.*?Global.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Conners Global Index", 0.80),
+        (r"Inattention.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Inattention", 0.80),
+        (r"Hyperactivity.*?Impulsivity.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Hyperactivity/Impulsivity", 0.80),
+        (r"Learning Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Learning Problems", 0.75),
+        (r"Executive Functioning.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Executive Functioning", 0.75),
+        (r"Aggression.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Aggression", 0.75),
+        (r"Peer Relations.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Peer Relations", 0.70)
+    ],
+    "WJ-IV": [
+        (r"General Intellectual Ability.*?(?:SS|Standard)[:\s]*(\d{2,3})", "General Intellectual Ability", 0.85),
+        (r"Brief Intellectual Ability.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Brief Intellectual Ability", 0.80),
+        (r"Comprehension-Knowledge.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Comprehension-Knowledge", 0.80),
+        (r"Fluid Reasoning.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Fluid Reasoning", 0.80),
+        (r"Processing Speed.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Processing Speed", 0.80),
+        (r"Short-Term Working Memory.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Short-Term Working Memory", 0.80),
+        (r"Academic Achievement.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Broad Achievement", 0.75)
+    ],
+    "DAS-II": [
+        (r"General Conceptual Ability.*?(?:GCA|Standard)[:\s]*(\d{2,3})", "General Conceptual Ability", 0.85),
+        (r"Verbal.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Verbal", 0.80),
+        (r"Nonverbal.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Nonverbal", 0.80),
+        (r"Spatial.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Spatial", 0.80),
+        (r"Working Memory.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Working Memory", 0.80),
+        (r"Processing Speed.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Processing Speed", 0.80)
+    ]
+}
+
+# Compiled once; scans all families in a single pass per document
+SCORE_SCANNER = ScorePatternScanner(SCORE_PATTERNS)
+
+
 class DocumentAIService:
     """Service for processing assessment documents using Google Document AI"""
     
-    def __init__(self, project_id: str = "thela002", location: str = "us", processor_id: str = "8ea662491b6ff80d"):
+    def __init__(
+        self,
+        project_id: str = "thela002",
+        location: str = "us",
+        processor_id: str = "8ea662491b6ff80d",
+        max_concurrent_requests: Optional[int] = None
+    ):
         """
         Initialize Document AI service
         
@@ -25,6 +116,7 @@ class DocumentAIService:
             project_id: GCP project ID
             location: Processor location (us, eu, asia)
             processor_id: Document AI processor ID for form parsing
+            max_concurrent_requests: Cap on in-flight Document AI calls
         """
         self.project_id = project_id
         self.location = location 
@@ -32,6 +124,17 @@ class DocumentAIService:
         self.client = None
         self.processor_name = f"projects/{project_id}/locations/{location}/processors/{processor_id}"
         
+        # The client is blocking; calls run on this pool so the event loop stays
+        # free. The pool size bounds concurrent API calls across all callers
+        # (including background processing on other event loops).
+        self.max_concurrent_requests = max_concurrent_requests or int(
+            os.getenv("DOCUMENT_AI_MAX_CONCURRENT_REQUESTS", "4")
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_requests,
+            thread_name_prefix="document-ai"
+        )
+        
     async def _get_client(self) -> documentai.DocumentProcessorServiceClient:
         """Get or create Document AI client"""
         if self.client is None:
@@ -62,8 +165,8 @@ class DocumentAIService:
             file_size = file_path_obj.stat().st_size
             logger.info(f"📊 [DOC-AI] File size: {file_size} bytes ({file_size/1024:.1f} KB)")
             
-            with open(file_path_obj, 'rb') as file:
-                document_content = file.read()
+            loop = asyncio.get_running_loop()
+            document_content = await loop.run_in_executor(self._executor, file_path_obj.read_bytes)
             
             # Determine MIME type
             mime_type = self._get_mime_type(file_path_obj.suffix)
@@ -86,7 +189,10 @@ class DocumentAIService:
             logger.info(f"📋 [DOC-AI] Sending document to Google Document AI...")
             logger.info(f"🌐 [DOC-AI] Processor: {self.processor_name}")
             
-            result = client.process_document(request=request)
+            result = await loop.run_in_executor(
+                self._executor,
+                lambda: client.process_document(request=request)
+            )
             document = result.document
             
             api_time = time.time() - api_start
@@ -774,117 +880,19 @@ class DocumentAIService:
         Enhanced with comprehensive score patterns for multiple assessment types
         """
         scores = []
-        import re
         
-        # Enhanced assessment score patterns
-        score_patterns = {
-            "WISC-V": {
-                "patterns": [
-                    (r"Full Scale IQ.*?(?:SS|Standard Score)[:\s]*(\d{2,3})", "Full Scale IQ", 0.90),
-                    (r"Verbal Comprehension.*?(?:Index|VCI)[:\s]*(\d{2,3})", "Verbal Comprehension Index", 0.85),
-                    (r"Perceptual Reasoning.*?(?:Index|PRI)[:\s]*(\d{2,3})", "Perceptual Reasoning Index", 0.85),
-                    (r"Working Memory.*?(?:Index|WMI)[:\s]*(\d{2,3})", "Working Memory Index", 0.85),
-                    (r"Processing Speed.*?(?:Index|PSI)[:\s]*(\d{2,3})", "Processing Speed Index", 0.85),
-                    (r"General Ability.*?(?:Index|GAI)[:\s]*(\d{2,3})", "General Ability Index", 0.80),
-                    (r"Cognitive Proficiency.*?(?:Index|CPI)[:\s]*(\d{2,3})", "Cognitive Proficiency Index", 0.80)
-                ]
-            },
-            "WIAT-IV": {
-                "patterns": [
-                    (r"(?:Total|Overall|Composite).*?Achievement.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Total Achievement", 0.85),
-                    (r"(?:Basic|Word) Reading.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Basic Reading", 0.80),
-                    (r"Reading Comprehension.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Reading Comprehension", 0.80),
-                    (r"Spelling.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Spelling", 0.80),
-                    (r"Written Expression.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Written Expression", 0.80),
-                    (r"Numerical Operations.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Numerical Operations", 0.80),
-                    (r"Math Problem Solving.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Math Problem Solving", 0.80),
-                    (r"Academic Skills.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Academic Skills", 0.75),
-                    (r"Academic Fluency.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Academic Fluency", 0.75)
-                ]
-            },
-            "BASC-3": {
-                "patterns": [
-                    (r"Behavioral Symptoms.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Behavioral Symptoms Index", 0.80),
-                    (r"Externalizing.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Externalizing Problems", 0.80),
-                    (r"Internalizing.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Internalizing Problems", 0.80),
-                    (r"School Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "School Problems", 0.80),
-                    (r"Adaptive Skills.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Adaptive Skills", 0.80),
-                    (r"Attention Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Attention Problems", 0.75),
-                    (r"Hyperactivity.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Hyperactivity", 0.75),
-                    (r"Aggression.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Aggression", 0.75),
-                    (r"Conduct Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Conduct Problems", 0.75),
-                    (r"Anxiety.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Anxiety", 0.75),
-                    (r"Depression.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Depression", 0.75),
-                    (r"Learning Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Learning Problems", 0.75)
-                ]
-            },
-            "KTEA-3": {
-                "patterns": [
-                    (r"Comprehensive Achievement.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Comprehensive Achievement", 0.85),
-                    (r"Reading.*?Composite.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Reading Composite", 0.80),
-                    (r"Math.*?Composite.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Math Composite", 0.80),
-                    (r"Written Language.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Written Language", 0.80),
-                    (r"Oral Language.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Oral Language", 0.80),
-                    (r"Letter.*?Word Recognition.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Letter & Word Recognition", 0.75),
-                    (r"Reading Comprehension.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Reading Comprehension", 0.75),
-                    (r"Math Concepts.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Math Concepts & Applications", 0.75),
-                    (r"Math Computation.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Math Computation", 0.75)
-                ]
-            },
-            "CONNERS-3": {
-                "patterns": [
-                    (r"Conners.*?Global.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Conners Global Index", 0.80),
-                    (r"Inattention.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Inattention", 0.80),
-                    (r"Hyperactivity.*?Impulsivity.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Hyperactivity/Impulsivity", 0.80),
-                    (r"Learning Problems.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Learning Problems", 0.75),
-                    (r"Executive Functioning.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Executive Functioning", 0.75),
-                    (r"Aggression.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Aggression", 0.75),
-                    (r"Peer Relations.*?(?:T-Score|T Score)[:\s]*(\d{2,3})", "Peer Relations", 0.70)
-                ]
-            },
-            "WJ-IV": {
-                "patterns": [
-                    (r"General Intellectual Ability.*?(?:SS|Standard)[:\s]*(\d{2,3})", "General Intellectual Ability", 0.85),
-                    (r"Brief Intellectual Ability.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Brief Intellectual Ability", 0.80),
-                    (r"Comprehension-Knowledge.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Comprehension-Knowledge", 0.80),
-                    (r"Fluid Reasoning.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Fluid Reasoning", 0.80),
-                    (r"Processing Speed.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Processing Speed", 0.80),
-                    (r"Short-Term Working Memory.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Short-Term Working Memory", 0.80),
-                    (r"Academic Achievement.*?(?:SS|Standard)[:\s]*(\d{2,3})", "Broad Achievement", 0.75)
-                ]
-            },
-            "DAS-II": {
-                "patterns": [
-                    (r"General Conceptual Ability.*?(?:GCA|Standard)[:\s]*(\d{2,3})", "General Conceptual Ability", 0.85),
-                    (r"Verbal.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Verbal", 0.80),
-                    (r"Nonverbal.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Nonverbal", 0.80),
-                    (r"Spatial.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Spatial", 0.80),
-                    (r"Working Memory.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Working Memory", 0.80),
-                    (r"Processing Speed.*?(?:Cluster|Standard)[:\s]*(\d{2,3})", "Processing Speed", 0.80)
-                ]
-            }
-        }
-        
-        # Search for scores using enhanced patterns
-        for test_name, test_data in score_patterns.items():
-            for pattern, subtest_name, confidence in test_data["patterns"]:
-                matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-                for match in matches:
-                    try:
-                        score_value = int(match.group(1))
-                        
-                        # Validate score ranges
-                        if self._is_valid_score(score_value, test_name, subtest_name):
-                            scores.append({
-                                "test_name": test_name,
-                                "subtest_name": subtest_name,
-                                "standard_score": score_value,
-                                "extraction_confidence": confidence,
-                                "source": "enhanced_pattern",
-                                "raw_match": match.group(0)[:100]  # First 100 chars of match
-                            })
-                    except ValueError:
-                        continue
+        # Search for scores using the precompiled pattern registry
+        for match in SCORE_SCANNER.scan(text):
+            # Validate score ranges
+            if self._is_valid_score(match.value, match.test_name, match.subtest_name):
+                scores.append({
+                    "test_name": match.test_name,
+                    "subtest_name": match.subtest_name,
+                    "standard_score": match.value,
+                    "extraction_confidence": match.confidence,
+                    "source": "enhanced_pattern",
+                    "raw_match": text[match.start:match.end][:100]  # First 100 chars of match
+                })
         
         # Extract scores from tables with enhanced logic
         for table in tables:
@@ -894,7 +902,7 @@ class DocumentAIService:
         # Remove duplicates (keep highest confidence)
         scores = self._deduplicate_scores(scores)
         
-        logger.info(f"📊 Enhanced extraction found {len(scores)} scores across {len(score_patterns)} assessment types")
+        logger.info(f"📊 Enhanced extraction found {len(scores)} scores across {len(SCORE_PATTERNS)} assessment types")
         return scores
     
     def _is_valid_score(self, score: int, test_name: str, subtest_name: str) -> bool:
@@ -0,0 +1,69 @@
+"""Queue of assessment documents awaiting Document AI processing"""
+
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.job_models import DocumentProcessingJob
+from ..workers.job_notifier import get_document_job_notifier
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentJobService:
+    """Submit document processing jobs and report on the queue"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(self, document_id: str, file_path: str, priority: int = 0) -> str:
+        """Queue a stored document for processing and wake the workers"""
+        try:
+            job = DocumentProcessingJob(
+                id=str(uuid.uuid4()),
+                document_id=str(document_id),
+                file_path=file_path,
+                status='pending',
+                priority=priority,
+                retry_count=0,
+                created_at=datetime.utcnow()
+            )
+            self.session.add(job)
+            await self.session.commit()
+
+            await get_document_job_notifier().job_submitted(self.session, job.id)
+
+            logger.info(f"Queued document {document_id} for processing as job {job.id}")
+            return job.id
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error queueing document {document_id}: {e}", exc_info=True)
+            raise
+
+    async def get_queue_stats(self) -> Dict[str, Any]:
+        """Queue depth by status and the age of the oldest pending job"""
+        result = await self.session.execute(
+            select(DocumentProcessingJob.status, func.count(DocumentProcessingJob.id))
+            .group_by(DocumentProcessingJob.status)
+        )
+        counts = {status: count for status, count in result.all()}
+
+        oldest_pending = (await self.session.execute(
+            select(func.min(DocumentProcessingJob.created_at))
+            .where(DocumentProcessingJob.status == 'pending')
+        )).scalar()
+
+        return {
+            "pending_jobs": counts.get('pending', 0),
+            "processing_jobs": counts.get('processing', 0),
+            "completed_jobs": counts.get('completed', 0),
+            "failed_jobs": counts.get('failed', 0),
+            "oldest_pending_wait_seconds": (
+                round((datetime.utcnow() - oldest_pending).total_seconds(), 1) if oldest_pending else None
+            )
+        }
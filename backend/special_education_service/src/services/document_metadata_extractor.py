@@ -26,10 +26,81 @@ from ..schemas.rag_metadata_schemas import (
     DocumentType, AssessmentType, DocumentLevelMetadata, 
     QualityMetrics, TemporalMetadata, SemanticMetadata
 )
+from ..utils.pattern_scanner import PatternCounter
 
 
 logger = logging.getLogger(__name__)
 
+# Document type patterns
+DOCUMENT_TYPE_PATTERNS = {
+    DocumentType.IEP: [
+        r'individualized.?education.?program',
+        r'\biep\b',
+        r'annual.?goals',
+        r'present.?levels?.?performance',
+        r'transition.?services'
+    ],
+    DocumentType.ASSESSMENT_REPORT: [
+        r'assessment.?report',
+        r'evaluation.?report', 
+        r'psychoeducational.?evaluation',
+        r'cognitive.?assessment',
+        r'achievement.?test'
+    ],
+    DocumentType.PROGRESS_REPORT: [
+        r'progress.?report',
+        r'quarterly.?report',
+        r'progress.?monitoring',
+        r'goal.?progress'
+    ],
+    DocumentType.BEHAVIORAL_ASSESSMENT: [
+        r'behavioral.?assessment',
+        r'functional.?behavior.?assessment',
+        r'\bfba\b',
+        r'behavior.?intervention.?plan',
+        r'\bbip\b'
+    ],
+    DocumentType.SPEECH_LANGUAGE_EVAL: [
+        r'speech.?language.?evaluation',
+        r'speech.?therapy.?evaluation',
+        r'language.?assessment',
+        r'articulation.?assessment'
+    ]
+}
+
+# Assessment type patterns
+ASSESSMENT_TYPE_PATTERNS = {
+    AssessmentType.WISC_V: [
+        r'wisc.?v\b',
+        r'wechsler.?intelligence.?scale.?children.?fifth',
+        r'wisc.?5'
+    ],
+    AssessmentType.WIAT_IV: [
+        r'wiat.?iv\b',
+        r'wechsler.?individual.?achievement.?test.?fourth',
+        r'wiat.?4'
+    ],
+    AssessmentType.WJ_IV: [
+        r'wj.?iv\b',
+        r'woodcock.?johnson.?iv',
+        r'woodcock.?johnson.?fourth'
+    ],
+    AssessmentType.BASC_3: [
+        r'basc.?3\b',
+        r'behavior.?assessment.?system.?children.?third',
+        r'basc.?iii'
+    ],
+    AssessmentType.CONNERS_3: [
+        r'conners.?3\b',
+        r'conners.?third.?edition',
+        r'conners.?iii'
+    ]
+}
+
+# Precompiled single-pass classifiers over the patterns above
+DOCUMENT_TYPE_COUNTER = PatternCounter(DOCUMENT_TYPE_PATTERNS)
+ASSESSMENT_TYPE_COUNTER = PatternCounter(ASSESSMENT_TYPE_PATTERNS)
+
 
 class DocumentMetadataExtractor:
     """
@@ -47,71 +118,8 @@ class DocumentMetadataExtractor:
     def __init__(self):
         """Initialize the metadata extractor with pattern libraries"""
         
-        # Document type patterns
-        self.document_patterns = {
-            DocumentType.IEP: [
-                r'individualized.?education.?program',
-                r'\biep\b',
-                r'annual.?goals',
-                r'present.?levels?.?performance',
-                r'transition.?services'
-            ],
-            DocumentType.ASSESSMENT_REPORT: [
-                r'assessment.?report',
-                r'evaluation.?report', 
-                r'psychoeducational.?evaluation',
-                r'cognitive.?assessment',
-                r'achievement.?test'
-            ],
-            DocumentType.PROGRESS_REPORT: [
-                r'progress.?report',
-                r'quarterly.?report',
-                r'progress.?monitoring',
-                r'goal.?progress'
-            ],
-            DocumentType.BEHAVIORAL_ASSESSMENT: [
-                r'behavioral.?assessment',
-                r'functional.?behavior.?assessment',
-                r'\bfba\b',
-                r'behavior.?intervention.?plan',
-                r'\bbip\b'
-            ],
-            DocumentType.SPEECH_LANGUAGE_EVAL: [
-                r'speech.?language.?evaluation',
-                r'speech.?therapy.?evaluation',
-                r'language.?assessment',
-                r'articulation.?assessment'
-            ]
-        }
-        
-        # Assessment type patterns
-        self.assessment_patterns = {
-            AssessmentType.WISC_V: [
-                r'wisc.?v\b',
-                r'wechsler.?intelligence.?scale.?children.?fifth',
-                r'wisc.?5'
-            ],
-            AssessmentType.WIAT_IV: [
-                r'wiat.?iv\b',
-                r'wechsler.?individual.?achievement.?test.?fourth',
-                r'wiat.?4'
-            ],
-            AssessmentType.WJ_IV: [
-                r'wj.?iv\b',
-                r'woodcock.?johnson.?iv',
-                r'woodcock.?johnson.?fourth'
-            ],
-            AssessmentType.BASC_3: [
-                r'basc.?3\b',
-                r'behavior.?assessment.?system.?children.?third',
-                r'basc.?iii'
-            ],
-            AssessmentType.CONNERS_3: [
-                r'conners.?3\b',
-                r'conners.?third.?edition',
-                r'conners.?iii'
-            ]
-        }
+        self.document_patterns = DOCUMENT_TYPE_PATTERNS
+        self.assessment_patterns = ASSESSMENT_TYPE_PATTERNS
         
         # Quality indicators
         self.quality_indicators = {
@@ -281,14 +289,11 @@ class DocumentMetadataExtractor:
         content_lower = content.lower()
         
         # Score document types
-        doc_type_scores = {}
-        for doc_type, patterns in self.document_patterns.items():
-            score = sum(
-                len(re.findall(pattern, content_lower, re.IGNORECASE))
-                for pattern in patterns
-            )
-            if score > 0:
-                doc_type_scores[doc_type] = score
+        doc_type_scores = {
+            doc_type: score
+            for doc_type, score in DOCUMENT_TYPE_COUNTER.count(content_lower).items()
+            if score > 0
+        }
         
         # Determine primary document type
         if doc_type_scores:
@@ -300,14 +305,11 @@ class DocumentMetadataExtractor:
         
         # Score assessment types
         assessment_type = None
-        assessment_scores = {}
-        for assess_type, patterns in self.assessment_patterns.items():
-            score = sum(
-                len(re.findall(pattern, content_lower, re.IGNORECASE))
-                for pattern in patterns
-            )
-            if score > 0:
-                assessment_scores[assess_type] = score
+        assessment_scores = {
+            assess_type: score
+            for assess_type, score in ASSESSMENT_TYPE_COUNTER.count(content_lower).items()
+            if score > 0
+        }
         
         if assessment_scores:
             assessment_type = max(assessment_scores, key=assessment_scores.get)
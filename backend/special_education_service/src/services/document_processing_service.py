@@ -0,0 +1,223 @@
+"""Document AI processing pipeline for uploaded assessment documents
+
+Runs a stored upload through Document AI and stores the extracted scores and
+raw data. Invoked by the document processing queue worker.
+"""
+import logging
+import time
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from ..database import async_session_factory
+from ..repositories.assessment_repository import AssessmentRepository
+from .document_ai_service import document_ai_service
+
+logger = logging.getLogger(__name__)
+
+def _make_serializable(data: Any) -> Any:
+    """Convert Document AI objects to JSON-serializable format"""
+    if hasattr(data, '__dict__'):
+        # Handle Document AI objects with attributes
+        if hasattr(data, 'text') and hasattr(data, 'confidence'):
+            return {
+                "text": str(data.text) if data.text else "",
+                "confidence": float(data.confidence) if data.confidence else 0.0
+            }
+        elif hasattr(data, 'normalized_value') and data.normalized_value:
+            # Handle NormalizedValue objects
+            return {
+                "text": str(data.text) if hasattr(data, 'text') and data.text else "",
+                "normalized_value": _make_serializable(data.normalized_value)
+            }
+        else:
+            # Generic object conversion
+            return {key: _make_serializable(value) for key, value in data.__dict__.items()}
+    elif isinstance(data, list):
+        return [_make_serializable(item) for item in data]
+    elif isinstance(data, dict):
+        return {key: _make_serializable(value) for key, value in data.items()}
+    elif hasattr(data, '__iter__') and not isinstance(data, (str, bytes)):
+        return [_make_serializable(item) for item in data]
+    else:
+        # Handle primitive types and convert to JSON-serializable
+        try:
+            # Try to convert to basic types
+            if isinstance(data, (int, float, str, bool, type(None))):
+                return data
+            else:
+                return str(data)
+        except Exception:
+            return str(data)
+
+async def process_uploaded_document(document_id: str, file_path: str, assessment_repo: AssessmentRepository):
+    """Process uploaded document with Document AI and store results"""
+    processing_start = time.time()
+    
+    # Initialize timing variables
+    ai_time = 0.0
+    score_storage_time = 0.0
+    raw_storage_time = 0.0
+    
+    try:
+        logger.info(f"🔄 [PIPELINE] Starting processing for document {document_id}")
+        logger.info(f"📁 [PIPELINE] File path: {file_path}")
+        
+        # IMMEDIATE FIX: Validate file exists before processing
+        file_path_obj = Path(file_path)
+        if not file_path_obj.exists():
+            raise FileNotFoundError(f"Document file not found: {file_path}")
+        
+        file_size = file_path_obj.stat().st_size
+        if file_size == 0:
+            raise IOError(f"Document file is empty: {file_path}")
+        
+        logger.info(f"📊 [PIPELINE] File validation passed: {file_size} bytes")
+        
+        # Update status to processing
+        status_update_start = time.time()
+        await assessment_repo.update_assessment_document(
+            UUID(document_id),
+            {"processing_status": "processing"}
+        )
+        logger.info(f"📊 [PIPELINE] Status updated to 'processing' in {time.time() - status_update_start:.3f}s")
+        
+        # Process with Document AI
+        ai_start = time.time()
+        logger.info(f"🤖 [PIPELINE] Invoking Document AI service...")
+        extracted_data = await document_ai_service.process_document(file_path, document_id)
+        ai_time = time.time() - ai_start
+        logger.info(f"⏱️ [PIPELINE] Document AI completed in {ai_time:.2f}s")
+        
+        # Log extraction results
+        scores_found = extracted_data.get("extracted_scores", [])
+        confidence = extracted_data.get("confidence", 0.0)
+        logger.info(f"📈 [PIPELINE] Extracted {len(scores_found)} scores with confidence {confidence:.2f}")
+        
+        # Group scores by test type for logging
+        by_test = {}
+        for score in scores_found:
+            test_name = score.get("test_name", "Unknown")
+            if test_name not in by_test:
+                by_test[test_name] = 0
+            by_test[test_name] += 1
+        
+        for test_name, count in by_test.items():
+            logger.info(f"🧪 [PIPELINE] {test_name}: {count} scores")
+        
+        # Update status to extracting
+        await assessment_repo.update_assessment_document(
+            UUID(document_id),
+            {
+                "processing_status": "extracting",
+                "extraction_confidence": confidence
+            }
+        )
+        logger.info(f"📊 [PIPELINE] Status updated to 'extracting'")
+        
+        # Clear rows left by an earlier attempt that failed part-way, so a
+        # retried job does not store its scores twice
+        removed = await assessment_repo.delete_processing_results(UUID(document_id))
+        if removed:
+            logger.info(f"🧹 [PIPELINE] Removed {removed} scores from a previous attempt")
+        
+        # Store extracted scores
+        score_storage_start = time.time()
+        scores_stored = 0
+        scores_failed = 0
+        
+        for score_data in scores_found:
+            try:
+                score_dict = {
+                    "document_id": UUID(document_id),
+                    "test_name": score_data.get("test_name", "Unknown"),
+                    "subtest_name": score_data.get("subtest_name", "Unknown"),
+                    "score_type": "standard_score",
+                    "standard_score": score_data.get("standard_score"),
+                    "extraction_confidence": score_data.get("extraction_confidence", 0.0)
+                }
+                await assessment_repo.create_psychoed_score(score_dict)
+                scores_stored += 1
+                
+                # Log individual score storage
+                test_name = score_data.get("test_name")
+                subtest = score_data.get("subtest_name")
+                value = score_data.get("standard_score")
+                logger.debug(f"💾 [PIPELINE] Stored: {test_name} - {subtest}: {value}")
+                
+            except Exception as e:
+                scores_failed += 1
+                logger.error(f"❌ [PIPELINE] Failed to store score for {document_id}: {e}")
+        
+        score_storage_time = time.time() - score_storage_start
+        logger.info(f"💾 [PIPELINE] Score storage: {scores_stored} stored, {scores_failed} failed in {score_storage_time:.2f}s")
+        
+        # Store raw extracted data
+        raw_storage_start = time.time()
+        try:
+            text_length = len(extracted_data.get("text_content", ""))
+            logger.info(f"📄 [PIPELINE] Storing raw extracted data ({text_length} chars)")
+            
+            # Convert Document AI response to JSON-serializable format
+            serializable_data = _make_serializable(extracted_data)
+            
+            extracted_data_dict = {
+                "document_id": UUID(document_id),
+                "raw_text": extracted_data.get("text_content", ""),
+                "structured_data": serializable_data,
+                "extraction_method": "google_document_ai",
+                "extraction_confidence": confidence
+            }
+            await assessment_repo.create_extracted_assessment_data(extracted_data_dict)
+            
+            raw_storage_time = time.time() - raw_storage_start
+            logger.info(f"💾 [PIPELINE] Raw data stored in {raw_storage_time:.2f}s")
+            
+        except Exception as e:
+            logger.error(f"❌ [PIPELINE] Failed to store extracted data for {document_id}: {e}")
+        
+        # Final status update
+        final_update_start = time.time()
+        await assessment_repo.update_assessment_document(
+            UUID(document_id),
+            {
+                "processing_status": "completed",
+                "extraction_confidence": confidence,
+                "processing_duration": time.time() - processing_start
+            }
+        )
+        
+        total_time = time.time() - processing_start
+        logger.info(f"📊 [PIPELINE] Final status update completed")
+        logger.info(f"🎉 [PIPELINE] Processing completed for document {document_id}")
+        logger.info(f"⏱️ [PIPELINE] Total processing time: {total_time:.2f}s")
+        logger.info(f"📊 [PIPELINE] Performance breakdown:")
+        logger.info(f"   🤖 Document AI: {ai_time:.2f}s ({ai_time/total_time*100:.1f}%)")
+        logger.info(f"   💾 Score storage: {score_storage_time:.2f}s ({score_storage_time/total_time*100:.1f}%)")
+        logger.info(f"   📄 Raw storage: {raw_storage_time:.2f}s ({raw_storage_time/total_time*100:.1f}%)")
+        
+    except Exception as e:
+        total_time = time.time() - processing_start
+        logger.error(f"❌ [PIPELINE] Processing failed for document {document_id} after {total_time:.2f}s: {e}", exc_info=True)
+        
+        # Update status to failed
+        try:
+            await assessment_repo.update_assessment_document(
+                UUID(document_id),
+                {
+                    "processing_status": "failed",
+                    "error_message": str(e),
+                    "processing_duration": total_time
+                }
+            )
+            logger.info(f"📊 [PIPELINE] Status updated to 'failed'")
+        except Exception as update_error:
+            logger.error(f"❌ [PIPELINE] Failed to update error status: {update_error}")
+        
+        # Let the queue decide whether to retry
+        raise
+
+async def process_document_job(document_id: str, file_path: str, session_factory=async_session_factory):
+    """Process one queued document in its own session; raises if processing failed"""
+    async with session_factory() as db:
+        await process_uploaded_document(document_id, file_path, AssessmentRepository(db))
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, Callable, Awaitable
 from uuid import UUID
 import json
 import logging
@@ -12,6 +12,7 @@ from ..repositories.pl_repository import PLRepository
 from ..repositories.student_repository import StudentRepository
 from ..rag.metadata_aware_iep_generator import MetadataAwareIEPGenerator
 from ..utils.retry import retry_iep_operation, ConflictDetector
+from ..database import release_session_connection
 
 # Legacy import for backward compatibility
 from ..vector_store import VectorStore
@@ -52,9 +53,16 @@ class IEPService:
         initial_data: Dict[str, Any],
         user_id: UUID,
         user_role: str,
-        enable_google_search_grounding: bool = False
+        enable_google_search_grounding: bool = False,
+        on_section: Optional[Callable[[str, Any], Awaitable[None]]] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
-        """Create new IEP using template and RAG generation"""
+        """Create new IEP using template and RAG generation
+        
+        ``on_section(name, content)`` is awaited as each generated section
+        becomes available, before the IEP is persisted. ``use_cache=False``
+        bypasses the Gemini response cache (regenerate requests).
+        """
         
         import time
         start_time = time.time()
@@ -131,8 +139,8 @@ class IEPService:
         logger.info(f"📊 [BACKEND-SERVICE] Historical data collected: {len(previous_ieps)} previous IEPs, {len(previous_pls)} assessments")
         logger.info(f"👤 [BACKEND-SERVICE] Student record: {student_record.get('first_name', '')} {student_record.get('last_name', '')}, Grade: {student_record.get('grade_level', '')}")
         
-        # STEP 2: Disconnect from database session and generate content with RAG
-        # This ensures no active DB session during external API calls
+        # STEP 2: Generate content with RAG
+        # The DB connection is released before the external API calls
         step1_time = time.time()
         logger.info(f"🤖 [BACKEND-SERVICE] STEP 2: Starting RAG generation (external API calls) after {step1_time - start_time:.2f}s")
         
@@ -140,6 +148,7 @@ class IEPService:
         template_data = {
             "id": str(template["id"]),
             "name": template.get("name", ""),
+            "version": template.get("version"),
             "sections": template.get("sections", {}),
             "default_goals": template.get("default_goals", [])
         }
@@ -238,6 +247,10 @@ class IEPService:
         logger.info(f"📄 [BACKEND-SERVICE] Extracted student data for RAG: {student_data}")
         logger.info(f"📋 [BACKEND-SERVICE] Content data received keys: {list(content_data.keys()) if content_data else []}")
         
+        # Hand the pooled connection back for the 30-90s generation; the
+        # write phase below re-attaches
+        await release_session_connection(self.repository.session)
+        
         # Generate IEP content using Enhanced RAG system or legacy fallback
         try:
             rag_start = time.time()
@@ -256,7 +269,9 @@ class IEPService:
                         "academic_year": academic_year,
                         "user_context": {"user_id": user_id, "user_role": user_role}
                     },
-                    enable_google_search_grounding=enable_google_search_grounding
+                    enable_google_search_grounding=enable_google_search_grounding,
+                    on_section=on_section,
+                    use_cache=use_cache
                 )
                 
                 # Convert enhanced response to legacy format
@@ -314,7 +329,9 @@ class IEPService:
                     student_data=student_data,
                     previous_ieps=previous_ieps_data,
                     previous_assessments=previous_pls_data,
-                    enable_google_search_grounding=enable_google_search_grounding
+                    enable_google_search_grounding=enable_google_search_grounding,
+                    use_cache=use_cache,
+                    on_section=on_section
                 )
                 
                 # Add basic metadata
@@ -766,9 +783,14 @@ class IEPService:
         section_name: str,
         additional_context: Optional[Dict[str, Any]] = None,
         user_id: UUID = None,
-        enable_google_search_grounding: bool = False
+        enable_google_search_grounding: bool = False,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
-        """Generate specific IEP section using RAG"""
+        """Generate specific IEP section using RAG
+        
+        Pass ``use_cache=False`` to regenerate instead of returning the cached
+        output for an identical prompt.
+        """
         # Get IEP and template
         iep = await self.repository.get_iep(iep_id)
         if not iep:
@@ -791,7 +813,8 @@ class IEPService:
             section_name,
             section_template,
             context,
-            enable_google_search_grounding
+            enable_google_search_grounding,
+            use_cache=use_cache
         )
         
         # Log generation
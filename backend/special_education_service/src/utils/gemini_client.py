@@ -4,20 +4,33 @@ import google.generativeai as genai
 import google.ai.generativelanguage as glm
 from google import genai as new_genai
 from google.genai import types
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import AsyncRetrying, retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from pybreaker import CircuitBreaker
 import json
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 import asyncio
+import threading
 from datetime import datetime
 import os
 import hashlib
 import gzip
 import base64
 
+from .rate_limiter import get_gemini_rate_limiter
+from .response_cache import GeminiResponseCache, get_response_cache
+from .streaming_json import IncrementalJSONObjectParser
+
 logger = logging.getLogger(__name__)
 
+# Retry policy shared by the blocking and streaming generation paths
+GEMINI_RETRY_POLICY = dict(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=60),
+    retry=retry_if_exception_type((Exception,)),
+    reraise=True
+)
+
 
 class GeminiClient:
     """Production-ready Gemini client for IEP generation"""
@@ -53,9 +66,10 @@ class GeminiClient:
             exclude=[ValueError, json.JSONDecodeError]  # Don't trip on validation errors
         )
         
-        # Model configuration for Gemini 2.5 Flash
+        # Model configuration (Gemini 2.5 Flash unless GEMINI_MODEL overrides it)
+        self.model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
         self.model = genai.GenerativeModel(
-            model_name="gemini-2.5-flash",
+            model_name=self.model_name,
             generation_config={
                 "temperature": 0.8,  # INCREASED from 0.7 to 0.8 for more creative grounding
                 "top_p": 0.95,
@@ -93,23 +107,31 @@ class GeminiClient:
         
         # Response size limits - INCREASED for comprehensive IEP content
         self.max_response_size = 500000  # 500KB uncompressed (increased from 100KB)
-        self.compress_threshold = 200000  # Compress if > 200KB (increased from 50KB)
+        
+        # Identical prompts are served from the response cache (None if disabled)
+        self.response_cache = get_response_cache()
+        
+        # Process-wide token bucket shared with the RAG IEP generator
+        self.rate_limiter = get_gemini_rate_limiter()
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=60),
-        retry=retry_if_exception_type((Exception,)),
-        reraise=True
-    )
+    @retry(**GEMINI_RETRY_POLICY)
     async def generate_iep_content(
         self, 
         student_data: Dict[str, Any],
         template_data: Dict[str, Any],
         previous_ieps: Optional[List[Dict]] = None,
         previous_assessments: Optional[List[Dict]] = None,
-        enable_google_search_grounding: bool = False
+        enable_google_search_grounding: bool = False,
+        use_cache: bool = True,
+        cache_key: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Generate IEP content with Gemini"""
+        """Generate IEP content with Gemini
+        
+        Responses are cached by a hash of the prompt and configured model
+        unless ``use_cache`` is False (e.g. an explicit regenerate). Pass
+        ``cache_key`` (e.g. from ``GeminiResponseCache.make_content_key``) to
+        key on template version and student data instead of the prompt text.
+        """
         
         # Build structured prompt
         prompt = self._build_iep_prompt(
@@ -125,9 +147,17 @@ class GeminiClient:
             f"{student_data.get('student_id')}:{datetime.utcnow().isoformat()}".encode()
         ).hexdigest()
         
+        cache = self.response_cache if use_cache else None
+        if cache:
+            cache_key = cache_key or self._cache_key(prompt, enable_google_search_grounding)
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Gemini response served from cache - Request: {request_id}")
+                return {**cached, "request_id": request_id, "cached": True}
+        
         # Call Gemini with circuit breaker or test mode
-        @self.circuit_breaker
         async def _generate():
+            await self.rate_limiter.acquire()
             start_time = datetime.utcnow()
             
             # Real Gemini API call
@@ -193,7 +223,7 @@ Example format:
                     
                     def generate_with_grounding():
                         return self.new_genai_client.models.generate_content(
-                            model="gemini-2.5-flash",
+                            model=self.model_name,
                             contents=grounded_prompt,
                             config=config
                         )
@@ -283,129 +313,302 @@ Example format:
                         traceback.print_exc()
                         grounding_metadata = None
                 
-                # Two-Path JSON Processing: Enhanced extraction for grounded responses
-                raw_text = raw_text.strip()
-                
-                if enable_google_search_grounding and self.new_genai_client:
-                    # GROUNDED PATH: Parse text response to extract JSON
-                    logger.info("🌐 Processing grounded text response for JSON extraction")
-                    
-                    # Step 1: Remove markdown code blocks
-                    if "```json" in raw_text and "```" in raw_text:
-                        json_start_marker = raw_text.find("```json")
-                        if json_start_marker != -1:
-                            json_start = json_start_marker + 7  # Skip "```json"
-                            json_end_marker = raw_text.find("```", json_start)
-                            if json_end_marker != -1:
-                                raw_text = raw_text[json_start:json_end_marker].strip()
-                                logger.info("🌐 Extracted JSON from markdown code block")
-                    
-                    # Step 2: Extract JSON from within explanatory text
-                    if not raw_text.startswith('{'):
-                        json_start = raw_text.find('{')
-                        json_end = raw_text.rfind('}') + 1
-                        if json_start != -1 and json_end > json_start:
-                            potential_json = raw_text[json_start:json_end]
-                            try:
-                                # Validate the extracted JSON
-                                json.loads(potential_json)
-                                raw_text = potential_json
-                                logger.info("🌐 Successfully extracted JSON from grounded response text")
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"⚠️ JSON extraction failed from grounded response: {e}")
-                                # Keep original text and try parsing anyway
-                    
-                else:
-                    # NON-GROUNDED PATH: Standard JSON processing (already in JSON format)
-                    logger.info("📝 Processing standard JSON response (non-grounded)")
-                    
-                    # Remove markdown code blocks if present (defensive)
-                    if raw_text.startswith("```json"):
-                        raw_text = raw_text[7:]
-                    if raw_text.endswith("```"):
-                        raw_text = raw_text[:-3]
-                    raw_text = raw_text.strip()
-                
-                # Check response size
-                response_size = len(raw_text.encode('utf-8'))
-                if response_size > self.max_response_size:
-                    logger.warning(f"Gemini response too large ({response_size} bytes), truncating")
-                    # Truncate at JSON boundary if possible
-                    raw_text = self._truncate_json_safely(raw_text, self.max_response_size)
-                
-                # Parse and enhance JSON with grounding metadata
-                try:
-                    parsed_json = json.loads(raw_text)
-                    
-                    # Inject grounding metadata into the parsed JSON if available
-                    if grounding_metadata and isinstance(parsed_json, dict):
-                        parsed_json["google_search_grounding"] = grounding_metadata
-                        logger.info(f"🌐 Injected grounding metadata into JSON response with {len(grounding_metadata.get('grounding_chunks', []))} sources")
-                        # Convert back to string for the response
-                        raw_text = json.dumps(parsed_json, ensure_ascii=False, indent=2)
-                    
-                except json.JSONDecodeError as e:
-                    logger.error(f"Gemini returned invalid JSON: {e}")
-                    logger.error(f"Raw response (first 500 chars): {raw_text[:500]}")
-                    
-                    # For grounded responses, this might be expected - log but don't fail
-                    if enable_google_search_grounding and self.new_genai_client:
-                        logger.warning("⚠️ Grounded response contains non-JSON content, which may be expected with Google Search")
-                        logger.error(f"Full grounded response: {raw_text}")
-                    
-                    raise ValueError(f"Invalid JSON from Gemini: {e}")
-                
-                # Compress if needed
-                compressed = False
-                if response_size > self.compress_threshold:
-                    compressed_data = gzip.compress(raw_text.encode('utf-8'))
-                    if len(compressed_data) < response_size * 0.8:  # Only if significant savings
-                        raw_text = base64.b64encode(compressed_data).decode('ascii')
-                        compressed = True
-                        logger.info(f"Compressed response from {response_size} to {len(compressed_data)} bytes")
-                
-                # Get usage metadata
-                usage = None
-                if hasattr(response, 'usage_metadata'):
-                    usage = {
-                        "prompt_tokens": getattr(response.usage_metadata, 'prompt_token_count', None),
-                        "completion_tokens": getattr(response.usage_metadata, 'candidates_token_count', None),
-                        "total_tokens": getattr(response.usage_metadata, 'total_token_count', None),
-                    }
-                
-                duration = (datetime.utcnow() - start_time).total_seconds()
-                
-                result = {
-                    "request_id": request_id,
-                    "raw_text": raw_text,
-                    "compressed": compressed,
-                    "usage": usage or {"total_tokens": len(raw_text) // 4},  # Rough estimate
-                    "duration_seconds": duration
-                }
-                
-                # Add grounding metadata if available
-                if grounding_metadata:
-                    result["grounding_metadata"] = grounding_metadata
-                    logger.info(f"🌐 Google Search grounding successful: {len(grounding_metadata.get('web_search_queries', []))} queries, {len(grounding_metadata.get('grounding_chunks', []))} sources")
-                
-                return result
+                return self._package_result(
+                    request_id,
+                    raw_text,
+                    response,
+                    start_time,
+                    grounded=bool(enable_google_search_grounding and self.new_genai_client),
+                    grounding_metadata=grounding_metadata
+                )
                 
             except Exception as e:
                 duration = (datetime.utcnow() - start_time).total_seconds()
                 logger.error(f"Gemini API error after {duration:.2f}s: {e}")
                 raise
         
-        result = await _generate()
+        with self.circuit_breaker.calling():
+            result = await _generate()
+        
+        if cache:
+            await cache.set(cache_key, result)
         
         logger.info(
             f"Gemini generation completed - Request: {request_id}, "
             f"Duration: {result['duration_seconds']:.2f}s, "
-            f"Tokens: {result['usage']['total_tokens']}, "
-            f"Compressed: {result['compressed']}"
+            f"Tokens: {result['usage']['total_tokens']}"
         )
         
         return result
     
+    async def stream_iep_content(
+        self,
+        student_data: Dict[str, Any],
+        template_data: Dict[str, Any],
+        previous_ieps: Optional[List[Dict]] = None,
+        previous_assessments: Optional[List[Dict]] = None,
+        enable_google_search_grounding: bool = False,
+        use_cache: bool = True,
+        cache_key: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate IEP content with Gemini's streaming API
+        
+        Yields ``{"type": "section", "section": name, "content": value}`` as
+        each top-level section of the JSON response completes, then a single
+        ``{"type": "result", "result": ...}`` whose payload matches
+        ``generate_iep_content``. Grounded requests and cache hits are not
+        streamed by the model; their sections are emitted once the full
+        response is available. ``use_cache`` and ``cache_key`` behave as in
+        ``generate_iep_content``.
+        """
+        
+        if enable_google_search_grounding:
+            result = await self.generate_iep_content(
+                student_data,
+                template_data,
+                previous_ieps,
+                previous_assessments,
+                enable_google_search_grounding=True,
+                use_cache=use_cache,
+                cache_key=cache_key
+            )
+            for section, content in self._decode_result(result).items():
+                yield {"type": "section", "section": section, "content": content}
+            yield {"type": "result", "result": result}
+            return
+        
+        prompt = self._build_iep_prompt(
+            student_data,
+            template_data,
+            previous_ieps,
+            previous_assessments,
+            enable_google_search_grounding
+        )
+        request_id = hashlib.md5(
+            f"{student_data.get('student_id')}:{datetime.utcnow().isoformat()}".encode()
+        ).hexdigest()
+        
+        cache = self.response_cache if use_cache else None
+        if cache:
+            cache_key = cache_key or self._cache_key(prompt, grounding=False)
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Gemini response served from cache - Request: {request_id}")
+                result = {**cached, "request_id": request_id, "cached": True}
+                for section, content in self._decode_result(result).items():
+                    yield {"type": "section", "section": section, "content": content}
+                yield {"type": "result", "result": result}
+                return
+        
+        logger.info(f"📡 Streaming Gemini generation - Request: {request_id}")
+        
+        # Failures before the first section reaches the caller are retried
+        # like generate_iep_content; once output has been streamed they propagate
+        async for attempt in AsyncRetrying(**GEMINI_RETRY_POLICY):
+            with attempt:
+                stream = self._stream_attempt(prompt, request_id)
+                first_event = await stream.__anext__()
+        
+        try:
+            event = first_event
+            while True:
+                if event["type"] == "result":
+                    result = event["result"]
+                    break
+                yield event
+                event = await stream.__anext__()
+        finally:
+            await stream.aclose()
+        
+        if cache:
+            await cache.set(cache_key, result)
+        
+        logger.info(
+            f"Gemini streaming generation completed - Request: {request_id}, "
+            f"Duration: {result['duration_seconds']:.2f}s"
+        )
+        yield {"type": "result", "result": result}
+    
+    async def _stream_attempt(self, prompt: str, request_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Run one streamed model call under the rate limiter and circuit breaker
+        
+        Yields section events as they complete, then the packaged result.
+        """
+        await self.rate_limiter.acquire()
+        start_time = datetime.utcnow()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+        
+        def read_stream():
+            response = self.model.generate_content(prompt, stream=True)
+            for chunk in response:
+                if cancelled.is_set():
+                    break
+                try:
+                    text = chunk.text
+                except ValueError:
+                    continue  # Chunk without text parts (e.g. finish reason only)
+                loop.call_soon_threadsafe(queue.put_nowait, ("chunk", text))
+            return response
+        
+        def produce():
+            # Runs in a worker thread; the SDK's stream iterator is blocking
+            try:
+                response = self.circuit_breaker.call(read_stream)
+                loop.call_soon_threadsafe(queue.put_nowait, ("done", response))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, ("error", e))
+        
+        producer = loop.run_in_executor(None, produce)
+        parser = IncrementalJSONObjectParser()
+        try:
+            while True:
+                kind, payload = await queue.get()
+                if kind == "error":
+                    raise payload
+                if kind == "done":
+                    response = payload
+                    break
+                try:
+                    completed = parser.feed(payload)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON from Gemini: {e}")
+                for section, content in completed:
+                    yield {"type": "section", "section": section, "content": content}
+        finally:
+            # Stop reading the stream if the consumer went away
+            cancelled.set()
+        await producer
+        
+        yield {
+            "type": "result",
+            "result": self._package_result(request_id, parser.buffer, response, start_time)
+        }
+    
+    def _package_result(
+        self,
+        request_id: str,
+        raw_text: str,
+        response: Any,
+        start_time: datetime,
+        grounded: bool = False,
+        grounding_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Validate and size-limit raw model text into a result dict
+        
+        Shared by the blocking and streaming paths. Grounded responses are
+        free text, so their JSON is extracted from fences or surrounding prose.
+        """
+        # Two-Path JSON Processing: Enhanced extraction for grounded responses
+        raw_text = raw_text.strip()
+        
+        if grounded:
+            # GROUNDED PATH: Parse text response to extract JSON
+            logger.info("🌐 Processing grounded text response for JSON extraction")
+            
+            # Step 1: Remove markdown code blocks
+            if "```json" in raw_text and "```" in raw_text:
+                json_start_marker = raw_text.find("```json")
+                if json_start_marker != -1:
+                    json_start = json_start_marker + 7  # Skip "```json"
+                    json_end_marker = raw_text.find("```", json_start)
+                    if json_end_marker != -1:
+                        raw_text = raw_text[json_start:json_end_marker].strip()
+                        logger.info("🌐 Extracted JSON from markdown code block")
+            
+            # Step 2: Extract JSON from within explanatory text
+            if not raw_text.startswith('{'):
+                json_start = raw_text.find('{')
+                json_end = raw_text.rfind('}') + 1
+                if json_start != -1 and json_end > json_start:
+                    potential_json = raw_text[json_start:json_end]
+                    try:
+                        # Validate the extracted JSON
+                        json.loads(potential_json)
+                        raw_text = potential_json
+                        logger.info("🌐 Successfully extracted JSON from grounded response text")
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"⚠️ JSON extraction failed from grounded response: {e}")
+                        # Keep original text and try parsing anyway
+        else:
+            # NON-GROUNDED PATH: Standard JSON processing (already in JSON format)
+            logger.info("📝 Processing standard JSON response (non-grounded)")
+            
+            # Remove markdown code blocks if present (defensive)
+            if raw_text.startswith("```json"):
+                raw_text = raw_text[7:]
+            if raw_text.endswith("```"):
+                raw_text = raw_text[:-3]
+            raw_text = raw_text.strip()
+        
+        # Check response size
+        response_size = len(raw_text.encode('utf-8'))
+        if response_size > self.max_response_size:
+            logger.warning(f"Gemini response too large ({response_size} bytes), truncating")
+            # Truncate at JSON boundary if possible
+            raw_text = self._truncate_json_safely(raw_text, self.max_response_size)
+        
+        # Parse and enhance JSON with grounding metadata
+        try:
+            parsed_json = json.loads(raw_text)
+            
+            # Inject grounding metadata into the parsed JSON if available
+            if grounding_metadata and isinstance(parsed_json, dict):
+                parsed_json["google_search_grounding"] = grounding_metadata
+                logger.info(f"🌐 Injected grounding metadata into JSON response with {len(grounding_metadata.get('grounding_chunks', []))} sources")
+                # Convert back to string for the response
+                raw_text = json.dumps(parsed_json, ensure_ascii=False, indent=2)
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Gemini returned invalid JSON: {e}")
+            logger.error(f"Raw response (first 500 chars): {raw_text[:500]}")
+            
+            # For grounded responses, this might be expected - log but don't fail
+            if grounded:
+                logger.warning("⚠️ Grounded response contains non-JSON content, which may be expected with Google Search")
+                logger.error(f"Full grounded response: {raw_text}")
+            
+            raise ValueError(f"Invalid JSON from Gemini: {e}")
+        
+        # Get usage metadata
+        usage = None
+        usage_metadata = getattr(response, 'usage_metadata', None)
+        if usage_metadata is not None:
+            usage = {
+                "prompt_tokens": getattr(usage_metadata, 'prompt_token_count', None),
+                "completion_tokens": getattr(usage_metadata, 'candidates_token_count', None),
+                "total_tokens": getattr(usage_metadata, 'total_token_count', None),
+            }
+        
+        result = {
+            "request_id": request_id,
+            "raw_text": raw_text,
+            "compressed": False,  # Stored compressed by the CompressedJSON column type
+            "usage": usage or {"total_tokens": len(raw_text) // 4},  # Rough estimate
+            "duration_seconds": (datetime.utcnow() - start_time).total_seconds()
+        }
+        
+        # Add grounding metadata if available
+        if grounding_metadata:
+            result["grounding_metadata"] = grounding_metadata
+            logger.info(f"🌐 Google Search grounding successful: {len(grounding_metadata.get('web_search_queries', []))} queries, {len(grounding_metadata.get('grounding_chunks', []))} sources")
+        
+        return result
+    
+    def _cache_key(self, prompt: str, grounding: bool) -> str:
+        """Response cache key for a prompt on the configured model"""
+        return GeminiResponseCache.make_key(prompt, model=self.model_name, grounding=grounding)
+    
+    @staticmethod
+    def _decode_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse the JSON payload of a generation result"""
+        raw_text = result["raw_text"]
+        if result.get("compressed", False):  # Results cached before compression moved to storage
+            raw_text = gzip.decompress(base64.b64decode(raw_text.encode('ascii'))).decode('utf-8')
+        parsed = json.loads(raw_text)
+        return parsed if isinstance(parsed, dict) else {}
+    
     def _truncate_json_safely(self, json_str: str, max_bytes: int) -> str:
         """Truncate JSON string at a safe boundary"""
         # Simple approach: truncate and try to close open structures
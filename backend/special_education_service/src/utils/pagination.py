@@ -0,0 +1,148 @@
+"""Opaque-cursor keyset pagination
+
+Pages are selected with a WHERE on the sort key of the last row already
+returned instead of OFFSET, so with an index on the sort key every page is
+a single range scan and page 500 costs the same as page 1. Cursors are
+URL-safe base64 JSON of that sort key; clients must treat them as opaque.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import DateTime, and_, func, literal, or_, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "u" in value:
+            return UUID(value["u"])
+        raise InvalidCursorError("Unknown cursor value")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a sort key as an opaque cursor"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by ``encode_cursor``"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+        if not isinstance(values, list):
+            raise InvalidCursorError("Malformed cursor")
+        return [_decode_value(v) for v in values]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError, ValueError) as e:
+        if isinstance(e, InvalidCursorError):
+            raise
+        raise InvalidCursorError("Malformed cursor") from e
+
+
+class sortable_timestamp(FunctionElement):
+    """A timestamp compared in one canonical form
+
+    SQLite keeps timestamps as text in whatever form they were written:
+    ``server_default=func.now()`` stores ``YYYY-MM-DD HH:MM:SS`` while bound
+    datetimes are ``YYYY-MM-DD HH:MM:SS.ffffff``, so a cursor sorts after
+    rows of its own second. There both sides are rewritten to millisecond
+    text; other dialects use the column unchanged (and its index).
+    """
+    name = "sortable_timestamp"
+    inherit_cache = True
+
+
+@compiles(sortable_timestamp)
+def _compile_sortable_timestamp(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(sortable_timestamp, "sqlite")
+def _compile_sortable_timestamp_sqlite(element, compiler, **kw):
+    return compiler.process(func.strftime("%Y-%m-%d %H:%M:%f", *element.clauses), **kw)
+
+
+class Keyset:
+    """Sort key for keyset pagination
+
+    Built from ``(column, descending)`` pairs of mapped attributes; the
+    last column must make the key unique (normally the primary key).
+    Sort columns are assumed non-null. Timestamp columns are sorted and
+    compared through ``sortable_timestamp``.
+    """
+
+    def __init__(self, *columns: Tuple[Any, bool]):
+        self.columns = columns
+        self.keys = [column.key for column, _ in columns]
+        self.sort_keys = [
+            sortable_timestamp(column) if isinstance(column.type, DateTime) else column
+            for column, _ in columns
+        ]
+
+    def paginate(self, query, cursor: Optional[str], limit: int):
+        """Order, filter past the cursor and fetch one extra row to detect more pages"""
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(self.columns):
+                raise InvalidCursorError("Cursor does not match this listing")
+            query = query.where(self._after(values))
+        ordering = [
+            key.desc() if descending else key.asc()
+            for key, (_, descending) in zip(self.sort_keys, self.columns)
+        ]
+        return query.order_by(*ordering).limit(limit + 1)
+
+    def page(self, rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+        """Trim the look-ahead row and build the cursor for the next page"""
+        rows = list(rows)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor([getattr(rows[-1], key) for key in self.keys])
+
+    def _bind(self, values: List[Any]) -> List[Any]:
+        """Cursor values in the same form as ``sort_keys``"""
+        return [
+            sortable_timestamp(literal(value, column.type)) if isinstance(column.type, DateTime) else value
+            for (column, _), value in zip(self.columns, values)
+        ]
+
+    def _after(self, values: List[Any]):
+        """Rows strictly after ``values`` in sort order"""
+        values = self._bind(values)
+        directions = {descending for _, descending in self.columns}
+        if len(directions) == 1:
+            # Uniform direction: one row-value comparison the index can range-scan
+            key = tuple_(*self.sort_keys)
+            return key < tuple_(*values) if directions.pop() else key > tuple_(*values)
+
+        clauses = []
+        for i, ((_, descending), key) in enumerate(zip(self.columns, self.sort_keys)):
+            equal = [k == v for k, v in zip(self.sort_keys[:i], values[:i])]
+            clauses.append(and_(*equal, key < values[i] if descending else key > values[i]))
+        return or_(*clauses)
@@ -0,0 +1,143 @@
+"""Precompiled single-pass regex scanners for assessment documents
+
+Score extraction and document classification used to run dozens of
+uncompiled regexes over the full document text, one pass per pattern, with
+``label.*?marker`` patterns rescanning to the end of the document for every
+label occurrence that had no score after it. These scanners compile a
+registry once and find every label and marker position with one zero-width
+alternation pass, then resolve the ``.*?`` gaps with binary search.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Sequence, Tuple
+
+# (pattern, subtest name, confidence) where pattern is ``part.*?part.*?terminal``
+# and the terminal captures the score in group 1
+ScorePatternSpec = Tuple[str, str, float]
+
+
+class ScoreMatch(NamedTuple):
+    test_name: str
+    subtest_name: str
+    value: int
+    confidence: float
+    start: int
+    end: int
+
+
+def _lookahead_scanner(fragments: Iterable[str], flags: int) -> "re.Pattern":
+    """Zero-width alternation that stops at every position any fragment matches"""
+    return re.compile("(?=" + "|".join(f"(?:{fragment})" for fragment in fragments) + ")", flags)
+
+
+def _positions(text: str, scanner: "re.Pattern", compiled: Dict[str, "re.Pattern"]) -> Dict[str, List[re.Match]]:
+    """All matches of each fragment, including overlapping ones, in text order"""
+    found = {fragment: [] for fragment in compiled}
+    for hit in scanner.finditer(text):
+        pos = hit.start()
+        for fragment, pattern in compiled.items():
+            match = pattern.match(text, pos)
+            if match:
+                found[fragment].append(match)
+    return found
+
+
+class PatternCounter:
+    """Count matches of many keyed regexes in one pass over the text
+
+    Equivalent to summing ``len(re.findall(p, text))`` over each key's
+    patterns, provided no pattern can match twice at overlapping positions
+    and no two patterns match at the same position (true for the
+    phrase-style classification patterns this is used with).
+    """
+
+    def __init__(self, patterns: Dict[Hashable, Sequence[str]], flags: int = re.IGNORECASE):
+        self.keys = list(patterns)
+        self._group_keys: Dict[str, Hashable] = {}
+        alternatives = []
+        for key, key_patterns in patterns.items():
+            for pattern in key_patterns:
+                name = f"p{len(alternatives)}"
+                self._group_keys[name] = key
+                alternatives.append(f"(?P<{name}>{pattern})")
+        self._scanner = re.compile("(?=" + "|".join(alternatives) + ")", flags)
+
+    def count(self, text: str) -> Dict[Hashable, int]:
+        """Match counts per key (keys with no matches are 0)"""
+        counts = dict.fromkeys(self.keys, 0)
+        for match in self._scanner.finditer(text):
+            counts[self._group_keys[match.lastgroup]] += 1
+        return counts
+
+
+class ScorePatternScanner:
+    """Extract scores for every assessment family in a registry
+
+    Produces the same matches, in the same order, as running
+    ``re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)`` for each
+    pattern in registry order. Each pattern is split on ``.*?`` into label
+    parts and a score terminal; all label and terminal positions are found
+    once, and each lazy gap resolves to the nearest following occurrence.
+    """
+
+    GAP = ".*?"
+
+    def __init__(self, registry: Dict[str, Sequence[ScorePatternSpec]], flags: int = re.IGNORECASE):
+        self.families: List[Tuple[str, List[Tuple[List[str], str, str, float]]]] = []
+        label_parts: Dict[str, None] = {}
+        terminals: Dict[str, None] = {}
+
+        for test_name, specs in registry.items():
+            family = []
+            for pattern, subtest_name, confidence in specs:
+                *labels, terminal = pattern.split(self.GAP)
+                if not labels:
+                    raise ValueError(f"Score pattern needs a label before the score: {pattern}")
+                family.append((labels, terminal, subtest_name, confidence))
+                label_parts.update(dict.fromkeys(labels))
+                terminals[terminal] = None
+            self.families.append((test_name, family))
+
+        self._labels = {part: re.compile(part, flags) for part in label_parts}
+        self._terminals = {terminal: re.compile(terminal, flags) for terminal in terminals}
+        self._label_scanner = _lookahead_scanner(self._labels, flags)
+        self._terminal_scanner = _lookahead_scanner(self._terminals, flags)
+
+    def scan(self, text: str) -> List[ScoreMatch]:
+        """Return every score match in registry order"""
+        labels = _positions(text, self._label_scanner, self._labels)
+        terminals = _positions(text, self._terminal_scanner, self._terminals)
+        label_starts = {part: [m.start() for m in matches] for part, matches in labels.items()}
+        terminal_starts = {t: [m.start() for m in matches] for t, matches in terminals.items()}
+
+        results = []
+        for test_name, family in self.families:
+            for parts, terminal, subtest_name, confidence in family:
+                last_end = 0
+                for first in labels[parts[0]]:
+                    if first.start() < last_end:
+                        continue  # Inside the previous match; finditer resumes after it
+                    pos = first.end()
+                    for part in parts[1:]:
+                        index = bisect_left(label_starts[part], pos)
+                        if index == len(label_starts[part]):
+                            pos = None
+                            break
+                        pos = labels[part][index].end()
+                    if pos is None:
+                        break
+                    index = bisect_left(terminal_starts[terminal], pos)
+                    if index == len(terminal_starts[terminal]):
+                        break  # No score after this label, nor after any later one
+                    score = terminals[terminal][index]
+                    results.append(ScoreMatch(
+                        test_name=test_name,
+                        subtest_name=subtest_name,
+                        value=int(score.group(1)),
+                        confidence=confidence,
+                        start=first.start(),
+                        end=score.end()
+                    ))
+                    last_end = score.end()
+        return results
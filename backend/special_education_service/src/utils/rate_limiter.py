@@ -0,0 +1,82 @@
+"""Token-bucket rate limiting for outbound Gemini API calls"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketRateLimiter:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each ``acquire()`` consumes one token, waiting until one is available.
+    This replaces fixed ``asyncio.sleep`` delays between API calls: bursts up
+    to ``capacity`` go out immediately and sustained load is capped at ``rate``.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it"""
+        # The lock serialises waiters so tokens are handed out in FIFO order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+                await asyncio.sleep(wait_time)
+
+    @property
+    def available_tokens(self) -> float:
+        """Current token count (refilled to now)"""
+        self._refill()
+        return self._tokens
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+# Per-process limiter shared by every Gemini caller
+_gemini_rate_limiter: Optional[TokenBucketRateLimiter] = None
+
+
+def get_gemini_rate_limiter() -> TokenBucketRateLimiter:
+    """Get the process-wide Gemini rate limiter (singleton)"""
+    global _gemini_rate_limiter
+    if _gemini_rate_limiter is None:
+        from ..config import get_settings
+        settings = get_settings()
+        _gemini_rate_limiter = TokenBucketRateLimiter(
+            rate=settings.GEMINI_REQUESTS_PER_SECOND,
+            capacity=settings.GEMINI_RATE_LIMIT_BURST
+        )
+        logger.info(
+            f"Gemini rate limiter initialized: {settings.GEMINI_REQUESTS_PER_SECOND} req/s, "
+            f"burst {settings.GEMINI_RATE_LIMIT_BURST}"
+        )
+    return _gemini_rate_limiter
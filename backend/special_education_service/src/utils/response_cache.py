@@ -0,0 +1,326 @@
+"""Content-addressed cache for Gemini responses
+
+Identical prompts (retries, re-submits) are answered from the cache instead
+of calling the model again; explicit regenerate requests pass
+``use_cache=False``. Keys are SHA-256 hashes of the prompt and the
+generation parameters that affect the output, or of the template version
+and student data (``make_content_key``), so a changed prompt, model, or
+template version is a cache miss.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheBackend(ABC):
+    """Storage backend for cached responses (JSON-serializable values)"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl_seconds: float):
+        """Store a value with a time-to-live"""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove a single entry"""
+
+    @abstractmethod
+    async def clear(self):
+        """Remove every entry"""
+
+    @abstractmethod
+    async def size(self) -> int:
+        """Number of stored entries"""
+
+
+class MemoryCacheBackend(ResponseCacheBackend):
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: float):
+        self._entries[key] = (time.time() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(ResponseCacheBackend):
+    """File-backed LRU cache shared by every process on the host"""
+
+    def __init__(self, path: str = "./gemini_response_cache.db", max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_response_cache_lru ON response_cache (last_accessed)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE response_cache SET last_accessed = ? WHERE key = ?", (now, key)
+            )
+            return json.loads(row[0])
+
+    def _set(self, key: str, value: Any, ttl_seconds: float):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at, last_accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl_seconds, now)
+            )
+            conn.execute("DELETE FROM response_cache WHERE expires_at < ?", (now,))
+            conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def _delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+
+    def _clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM response_cache")
+
+    def _size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl_seconds: float):
+        await asyncio.to_thread(self._set, key, value, ttl_seconds)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._delete, key)
+
+    async def clear(self):
+        await asyncio.to_thread(self._clear)
+
+    async def size(self) -> int:
+        return await asyncio.to_thread(self._size)
+
+
+class RedisCacheBackend(ResponseCacheBackend):
+    """Redis (or Redis-compatible) cache shared across hosts
+
+    Size is bounded by the server's ``maxmemory`` policy (use
+    ``allkeys-lru``); entries expire via Redis TTLs.
+    """
+
+    def __init__(self, url: str, namespace: str = "gemini_cache:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise ImportError("redis package is required for the Redis cache backend") from e
+        self.namespace = namespace
+        self._client = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self._client.get(self.namespace + key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any, ttl_seconds: float):
+        await self._client.set(self.namespace + key, json.dumps(value), ex=max(int(ttl_seconds), 1))
+
+    async def delete(self, key: str):
+        await self._client.delete(self.namespace + key)
+
+    async def clear(self):
+        async for key in self._client.scan_iter(match=self.namespace + "*"):
+            await self._client.delete(key)
+
+    async def size(self) -> int:
+        count = 0
+        async for _ in self._client.scan_iter(match=self.namespace + "*"):
+            count += 1
+        return count
+
+
+class GeminiResponseCache:
+    """Prompt-hash keyed response cache with hit/miss metrics"""
+
+    def __init__(self, backend: ResponseCacheBackend, ttl_seconds: float = 86400):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(prompt: str, **params: Any) -> str:
+        """Key on the exact prompt plus any generation parameters"""
+        payload = json.dumps({"prompt": prompt, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_content_key(
+        template_id: Optional[str],
+        template_version: Optional[Any],
+        student_data: Dict[str, Any],
+        **params: Any
+    ) -> str:
+        """Key on template version and a hash of the student data
+
+        Use when the prompt text embeds volatile values (timestamps, request
+        IDs) but the output only depends on the template and student inputs.
+        """
+        student_hash = hashlib.sha256(
+            json.dumps(student_data, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        payload = json.dumps(
+            {
+                "template_id": template_id,
+                "template_version": template_version,
+                "student_hash": student_hash,
+                "params": params
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Look up a key, counting the hit or miss"""
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            # A broken cache must never break generation
+            self.errors += 1
+            logger.warning(f"Response cache read failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value, ignoring backend failures"""
+        try:
+            await self.backend.set(key, value, ttl_seconds or self.ttl_seconds)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Response cache write failed: {e}")
+
+    async def get_or_generate(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[Any]],
+        use_cache: bool = True
+    ) -> Any:
+        """Return the cached value or call ``generate`` and cache its result"""
+        if not use_cache:
+            return await generate()
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        value = await generate()
+        if value is not None:
+            await self.set(key, value)
+        return value
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        total = self.hits + self.misses
+        try:
+            entries = await self.backend.size()
+        except Exception:
+            entries = None
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": entries,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+_response_cache: Optional[GeminiResponseCache] = None
+
+
+def get_response_cache() -> Optional[GeminiResponseCache]:
+    """Get the process-wide Gemini response cache, or None if disabled"""
+    global _response_cache
+    if _response_cache is None:
+        from ..config import get_settings
+        settings = get_settings()
+        backend_name = settings.GEMINI_CACHE_BACKEND.lower()
+
+        if backend_name in ("none", "off", "disabled"):
+            return None
+        if backend_name == "sqlite":
+            backend = SQLiteCacheBackend(settings.GEMINI_CACHE_PATH, settings.GEMINI_CACHE_MAX_ENTRIES)
+        elif backend_name == "redis":
+            backend = RedisCacheBackend(settings.GEMINI_CACHE_REDIS_URL)
+        else:
+            backend = MemoryCacheBackend(settings.GEMINI_CACHE_MAX_ENTRIES)
+
+        _response_cache = GeminiResponseCache(backend, ttl_seconds=settings.GEMINI_CACHE_TTL_SECONDS)
+        logger.info(f"Gemini response cache initialized with {type(backend).__name__}")
+    return _response_cache
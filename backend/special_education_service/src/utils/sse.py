@@ -0,0 +1,9 @@
+"""Server-sent event formatting shared by the streaming endpoints"""
+
+import json
+from typing import Any
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format a server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -0,0 +1,92 @@
+"""Incremental parser for a streamed top-level JSON object
+
+Gemini streams a JSON response in arbitrary text chunks. The parser tracks
+nesting depth and string state across chunks and emits each top-level
+``key: value`` member as soon as its value is complete, so callers can
+forward finished IEP sections before the rest of the object has arrived.
+"""
+
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONObjectParser:
+    """Emit the members of a top-level JSON object as they complete
+
+    Text before the opening ``{`` (markdown fences, preamble) is ignored.
+    Members are decoded with ``json.loads``, so emitted values are exactly
+    what parsing the full document would produce.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = None
+        self.emitted_keys: List[str] = []
+
+    @property
+    def finished(self) -> bool:
+        """True once the closing brace of the top-level object was seen"""
+        return self._finished
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add a chunk and return the ``(key, value)`` members it completed"""
+        self.buffer += chunk
+        completed = []
+        buffer = self.buffer
+
+        while self._pos < len(buffer) and not self._finished:
+            char = buffer[self._pos]
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit_member(buffer[self._member_start:self._pos], completed)
+                    self._finished = True
+            elif char == "," and self._depth == 1:
+                self._emit_member(buffer[self._member_start:self._pos], completed)
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+        return completed
+
+    def _emit_member(self, text: str, completed: List[Tuple[str, Any]]):
+        if not text.strip():
+            return
+        member = json.loads("{" + text + "}")
+        for key, value in member.items():
+            self.emitted_keys.append(key)
+            completed.append((key, value))
+
+    def result(self) -> Any:
+        """Parse the full buffered document"""
+        start = self.buffer.find("{")
+        end = self.buffer.rfind("}") + 1
+        if start == -1 or end <= start:
+            raise json.JSONDecodeError("No JSON object in response", self.buffer, 0)
+        return json.loads(self.buffer[start:end])
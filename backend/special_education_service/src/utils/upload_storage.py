@@ -0,0 +1,93 @@
+"""Content-addressed storage for uploaded files
+
+Uploads are streamed to disk in chunks while their SHA-256 is computed, so
+a large scanned PDF is never held in memory and the size limit is enforced
+as soon as it is exceeded. Files are stored under their hash; uploading the
+same bytes again reuses the stored file.
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiofiles
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """The upload exceeded the configured size limit"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class StoredUpload:
+    """A file written to content-addressed storage"""
+    path: Path
+    sha256: str
+    size: int
+    already_stored: bool  # Identical bytes were stored by an earlier upload
+
+
+def content_path(root: Path, digest: str, suffix: str) -> Path:
+    """Location of the file with the given hash (fanned out by hash prefix)"""
+    return root / digest[:2] / f"{digest}{suffix.lower()}"
+
+
+async def store_upload(
+    file: UploadFile,
+    root: Path,
+    max_bytes: int,
+    suffix: str = "",
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> StoredUpload:
+    """Stream an upload into content-addressed storage
+
+    Raises:
+        UploadTooLargeError: more than ``max_bytes`` were received
+        IOError: the upload was empty
+    """
+    incoming = root / ".incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    temp_path = incoming / f"{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, 'wb') as buffer:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                await buffer.write(chunk)
+
+        if size == 0:
+            raise IOError("Uploaded file is empty")
+
+        final_path = content_path(root, digest.hexdigest(), suffix)
+        already_stored = final_path.exists()
+        if already_stored:
+            temp_path.unlink()
+        else:
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, final_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return StoredUpload(
+        path=final_path,
+        sha256=digest.hexdigest(),
+        size=size,
+        already_stored=already_stored
+    )
@@ -12,14 +12,16 @@ Dependencies: TASK-001 (Metadata Schemas), TASK-002 (Metadata Extractor)
 
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
 import logging
 from typing import Dict, Any, List, Optional, Union, Tuple
 import json
 import asyncio
+import threading
 from datetime import datetime
 import numpy as np
 import re
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict
 
 from .schemas.rag_metadata_schemas import (
     ChunkLevelMetadata, DocumentLevelMetadata, SearchContext,
@@ -30,6 +32,48 @@ from .schemas.rag_metadata_schemas import (
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _epoch_days(value: datetime) -> float:
+    """Fractional days since the Unix epoch for a naive datetime"""
+    return (value - _EPOCH).total_seconds() / 86400
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU of query text -> embedding"""
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_many(self, texts: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for text in texts:
+                embedding = self._entries.get(text)
+                if embedding is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(text)
+                found[text] = embedding
+                self.hits += 1
+        return found
+    
+    def put_many(self, embeddings: Dict[str, List[float]]):
+        with self._lock:
+            for text, embedding in embeddings.items():
+                self._entries[text] = embedding
+                self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class EnhancedVectorStore:
     """
@@ -46,13 +90,20 @@ class EnhancedVectorStore:
     def __init__(
         self, 
         persist_directory: str = "./chromadb",
-        collection_name: str = "enhanced_educational_docs"
+        collection_name: str = "enhanced_educational_docs",
+        embedding_function=None,
+        query_cache_size: int = 1024
     ):
         """Initialize enhanced vector store"""
         
         self.persist_directory = persist_directory
         self.collection_name = collection_name
         
+        # Queries are embedded here rather than inside collection.query so
+        # repeated query texts can be served from the LRU cache
+        self.embedding_function = embedding_function or embedding_functions.DefaultEmbeddingFunction()
+        self._query_embedding_cache = QueryEmbeddingCache(query_cache_size)
+        
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(
             path=persist_directory,
@@ -64,12 +115,15 @@ class EnhancedVectorStore:
         
         # Get or create collection
         try:
-            self.collection = self.client.get_collection(collection_name)
+            self.collection = self.client.get_collection(
+                collection_name, embedding_function=self.embedding_function
+            )
             logger.info(f"📚 Loaded existing collection: {collection_name}")
         except:
             self.collection = self.client.create_collection(
                 name=collection_name,
-                metadata={"description": "Enhanced educational documents with metadata"}
+                metadata={"description": "Enhanced educational documents with metadata"},
+                embedding_function=self.embedding_function
             )
             logger.info(f"🆕 Created new collection: {collection_name}")
         
@@ -179,8 +233,9 @@ class EnhancedVectorStore:
             logger.debug(f"🔧 Applied filters: {where_filters}")
             
             # Perform vector search with filters
+            query_embeddings = await self._embed_queries([query_text])
             results = self.collection.query(
-                query_texts=[query_text],
+                query_embeddings=[query_embeddings[query_text]],
                 n_results=min(n_results * 2, 50),  # Get extra for re-ranking
                 where=where_filters if where_filters else None,
                 include=['documents', 'metadatas', 'distances']
@@ -190,24 +245,10 @@ class EnhancedVectorStore:
                 logger.info("🔍 No results found matching criteria")
                 return []
             
-            # Convert to enhanced results
-            enhanced_results = await self._convert_to_enhanced_results(
-                results, query_text, search_context
+            final_results = await self._finalize_results(
+                results, query_text, search_context, n_results
             )
             
-            # Apply quality filtering
-            filtered_results = await self._apply_quality_filtering(
-                enhanced_results, search_context
-            )
-            
-            # Re-rank by combined scoring
-            ranked_results = await self._rerank_results(
-                filtered_results, search_context
-            )
-            
-            # Limit to requested number
-            final_results = ranked_results[:n_results]
-            
             duration = (datetime.now() - start_time).total_seconds()
             logger.info(f"✅ Search completed in {duration:.2f}s")
             logger.info(f"📊 Found {len(final_results)} results from {len(results['ids'][0])} candidates")
@@ -222,6 +263,138 @@ class EnhancedVectorStore:
             logger.error(f"❌ Enhanced search failed: {e}")
             return []
 
+    async def batch_enhanced_search(
+        self,
+        queries: List[Tuple[str, SearchContext, int]]
+    ) -> List[List[EnhancedSearchResult]]:
+        """
+        Run many enhanced searches with one ChromaDB query per filter group
+        
+        Queries whose search contexts produce the same metadata filter are
+        sent as a single ``collection.query`` call, so their embeddings are
+        computed in one batch. Each query is then converted, filtered and
+        re-ranked exactly as ``enhanced_search`` would.
+        
+        Args:
+            queries: (query_text, search_context, n_results) tuples
+            
+        Returns:
+            List[List[EnhancedSearchResult]]: Results for each query, in input order
+        """
+        
+        start_time = datetime.now()
+        logger.info(f"🔍 Batch enhanced search: {len(queries)} queries")
+        
+        # Group queries by their metadata filter
+        groups: Dict[str, Dict[str, Any]] = {}
+        for index, (query_text, search_context, n_results) in enumerate(queries):
+            where_filters = await self._build_metadata_filters(search_context)
+            group_key = json.dumps(where_filters, sort_keys=True, default=str)
+            group = groups.setdefault(group_key, {"where": where_filters, "texts": {}, "members": []})
+            group["texts"].setdefault(query_text, len(group["texts"]))
+            group["members"].append(index)
+        
+        # One embedding batch for every query text not already cached
+        query_embeddings = await self._embed_queries([query[0] for query in queries])
+        
+        def run_group(group: Dict[str, Any]) -> Dict:
+            n_candidates = max(min(queries[i][2] * 2, 50) for i in group["members"])
+            return self.collection.query(
+                query_embeddings=[query_embeddings[text] for text in group["texts"]],
+                n_results=n_candidates,
+                where=group["where"] if group["where"] else None,
+                include=['documents', 'metadatas', 'distances']
+            )
+        
+        group_list = list(groups.values())
+        group_results = await asyncio.gather(
+            *(asyncio.to_thread(run_group, group) for group in group_list),
+            return_exceptions=True
+        )
+        
+        async def finalize(index: int, group: Dict[str, Any], results: Dict) -> List[EnhancedSearchResult]:
+            query_text, search_context, n_results = queries[index]
+            row = group["texts"][query_text]
+            limit = min(n_results * 2, 50)
+            single = {
+                key: [results[key][row][:limit]]
+                for key in ('ids', 'documents', 'metadatas', 'distances')
+            }
+            if not single['ids'][0]:
+                return []
+            try:
+                return await self._finalize_results(single, query_text, search_context, n_results)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not process results for '{query_text}': {e}")
+                return []
+        
+        indices, tasks = [], []
+        for group, results in zip(group_list, group_results):
+            if isinstance(results, Exception):
+                logger.error(f"❌ Batch search group failed: {results}")
+                continue
+            for index in group["members"]:
+                indices.append(index)
+                tasks.append(finalize(index, group, results))
+        
+        batch_results: List[List[EnhancedSearchResult]] = [[] for _ in queries]
+        for index, final_results in zip(indices, await asyncio.gather(*tasks)):
+            batch_results[index] = final_results
+        
+        duration = (datetime.now() - start_time).total_seconds()
+        logger.info(f"✅ Batch search completed in {duration:.2f}s: {len(queries)} queries in {len(group_list)} ChromaDB calls")
+        
+        self._search_metrics['batch_query_time'].append(duration)
+        self._search_metrics['batch_size'].append(len(queries))
+        
+        return batch_results
+
+    async def _embed_queries(self, texts: List[str]) -> Dict[str, List[float]]:
+        """Embed query texts, serving repeats from the LRU cache"""
+        
+        unique_texts = list(dict.fromkeys(texts))
+        embeddings = self._query_embedding_cache.get_many(unique_texts)
+        missing = [text for text in unique_texts if text not in embeddings]
+        
+        if missing:
+            vectors = await asyncio.to_thread(self.embedding_function, missing)
+            computed = {
+                text: [float(x) for x in vector]
+                for text, vector in zip(missing, vectors)
+            }
+            self._query_embedding_cache.put_many(computed)
+            embeddings.update(computed)
+            logger.debug(f"🧮 Embedded {len(missing)} queries ({len(unique_texts) - len(missing)} cached)")
+        
+        return embeddings
+
+    async def _finalize_results(
+        self,
+        results: Dict,
+        query_text: str,
+        search_context: SearchContext,
+        n_results: int
+    ) -> List[EnhancedSearchResult]:
+        """Convert, quality-filter and re-rank the raw results of one query"""
+        
+        # Convert to enhanced results
+        enhanced_results = await self._convert_to_enhanced_results(
+            results, query_text, search_context
+        )
+        
+        # Apply quality filtering
+        filtered_results = await self._apply_quality_filtering(
+            enhanced_results, search_context
+        )
+        
+        # Re-rank by combined scoring
+        ranked_results = await self._rerank_results(
+            filtered_results, search_context
+        )
+        
+        # Limit to requested number
+        return ranked_results[:n_results]
+
     async def _build_metadata_filters(self, search_context: SearchContext) -> Optional[Dict]:
         """Build ChromaDB where filters from search context"""
         
@@ -303,6 +476,7 @@ class EnhancedVectorStore:
             
             # Temporal information
             "document_date": document_metadata.temporal_metadata.document_date.isoformat() if document_metadata.temporal_metadata.document_date else None,
+            "document_date_days": self._document_date_days(document_metadata.temporal_metadata.document_date),
             "processing_date": chunk_metadata.processing_timestamp.isoformat(),
             "school_year": document_metadata.temporal_metadata.school_year,
             
@@ -354,36 +528,21 @@ class EnhancedVectorStore:
         metadatas = chromadb_results['metadatas'][0]
         distances = chromadb_results['distances'][0]
         
-        for i, (chunk_id, content, metadata, distance) in enumerate(
-            zip(ids, documents, metadatas, distances)
-        ):
+        # Score the whole candidate set at once
+        similarity_scores, relevance_scores, quality_scores, final_scores = self._score_candidates(
+            metadatas, distances, search_context
+        )
+        
+        for i, (chunk_id, content, metadata) in enumerate(zip(ids, documents, metadatas)):
             try:
-                # Convert distance to similarity score
-                similarity_score = max(0.0, 1.0 - distance)
-                
-                # Calculate relevance score
-                relevance_score = await self._calculate_relevance_score(
-                    metadata, search_context
-                )
-                
-                # Get quality score
-                quality_score = metadata.get('overall_quality', 0.5)
-                
-                # Calculate final score (weighted combination)
-                final_score = (
-                    similarity_score * 0.4 +
-                    relevance_score * 0.4 +
-                    quality_score * 0.2
-                )
-                
                 # Create enhanced result
                 enhanced_result = EnhancedSearchResult(
                     chunk_id=chunk_id,
                     content=content,
-                    similarity_score=similarity_score,
-                    relevance_score=relevance_score,
-                    quality_score=quality_score,
-                    final_score=final_score,
+                    similarity_score=float(similarity_scores[i]),
+                    relevance_score=float(relevance_scores[i]),
+                    quality_score=float(quality_scores[i]),
+                    final_score=float(final_scores[i]),
                     chunk_metadata=await self._reconstruct_chunk_metadata(metadata),
                     match_highlights=self._generate_match_highlights(content, query_text),
                     relevance_explanation=self._generate_relevance_explanation(
@@ -400,44 +559,90 @@ class EnhancedVectorStore:
         
         return enhanced_results
 
-    async def _calculate_relevance_score(
+    def _score_candidates(
         self,
-        metadata: Dict[str, Any],
+        metadatas: List[Dict[str, Any]],
+        distances: List[float],
         search_context: SearchContext
-    ) -> float:
-        """Calculate relevance score based on search context"""
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute similarity, relevance, quality and final scores for all candidates
         
-        relevance_score = 0.5  # Base score
+        Returns:
+            Tuple of arrays aligned with the candidates
+        """
+        
+        count = len(metadatas)
+        
+        # Convert distance to similarity score
+        similarity = np.maximum(0.0, 1.0 - np.asarray(distances, dtype=float))
+        
+        relevance = np.full(count, 0.5)  # Base score
         
         # IEP section relevance boost
         if search_context.target_iep_section:
             section_field = f"relevance_{search_context.target_iep_section.value}"
-            section_relevance = metadata.get(section_field, 0.0)
-            relevance_score += section_relevance * 0.3
+            relevance += np.array([m.get(section_field, 0.0) for m in metadatas], dtype=float) * 0.3
         
         # Document type relevance
         if search_context.document_types:
-            doc_type = metadata.get('document_type')
-            if doc_type in [dt.value for dt in search_context.document_types]:
-                relevance_score += 0.2
+            wanted_types = {dt.value for dt in search_context.document_types}
+            relevance += np.array([m.get('document_type') in wanted_types for m in metadatas]) * 0.2
         
-        # Recency boost
-        if search_context.boost_recent and metadata.get('document_date'):
-            try:
-                doc_date = datetime.fromisoformat(metadata['document_date'])
-                days_old = (datetime.now() - doc_date).days
-                if days_old < 365:  # Recent documents get boost
-                    recency_boost = max(0, 0.1 - (days_old / 3650))
-                    relevance_score += recency_boost
-            except:
-                pass
+        # Recency boost for documents under a year old
+        if search_context.boost_recent:
+            days_old = np.floor(_epoch_days(datetime.now()) - self._candidate_date_days(metadatas))
+            recent = days_old < 365  # NaN (no or unparseable date) compares False
+            relevance += np.where(recent, np.maximum(0, 0.1 - days_old / 3650), 0.0)
         
         # Student context relevance
-        if (search_context.student_context and 
-            search_context.student_context.get('student_id') == metadata.get('student_id')):
-            relevance_score += 0.15
+        if search_context.student_context:
+            student_id = search_context.student_context.get('student_id')
+            relevance += np.array([m.get('student_id') == student_id for m in metadatas]) * 0.15
+        
+        relevance = np.minimum(relevance, 1.0)
         
-        return min(relevance_score, 1.0)
+        # Get quality score
+        quality = np.array([m.get('overall_quality', 0.5) for m in metadatas], dtype=float)
+        
+        # Calculate final score (weighted combination)
+        final = similarity * 0.4 + relevance * 0.4 + quality * 0.2
+        
+        return similarity, relevance, quality, final
+
+    def _candidate_date_days(self, metadatas: List[Dict[str, Any]]) -> np.ndarray:
+        """Document dates as epoch days, NaN where missing
+        
+        Chunks ingested before ``document_date_days`` was stored fall back to
+        parsing ``document_date``.
+        """
+        
+        days = np.full(len(metadatas), np.nan)
+        for i, metadata in enumerate(metadatas):
+            value = metadata.get('document_date_days')
+            if value is None and metadata.get('document_date'):
+                value = self._document_date_days(metadata['document_date'])
+            if value is not None:
+                days[i] = value
+        return days
+
+    @staticmethod
+    def _document_date_days(document_date: Union[datetime, str, None]) -> Optional[float]:
+        """Epoch days for a document date, None when missing or not comparable"""
+        
+        if not document_date:
+            return None
+        try:
+            if isinstance(document_date, str):
+                document_date = datetime.fromisoformat(document_date)
+            elif not isinstance(document_date, datetime):
+                # Plain dates
+                document_date = datetime(document_date.year, document_date.month, document_date.day)
+            if document_date.tzinfo is not None:
+                return None  # Never compared against naive now()
+            return _epoch_days(document_date)
+        except (TypeError, ValueError, AttributeError):
+            return None
 
     async def _apply_quality_filtering(
         self,
@@ -627,7 +832,12 @@ class EnhancedVectorStore:
                 "metadata_fields": sorted(list(metadata_fields)),
                 "search_metrics": {
                     "avg_query_time": np.mean(self._search_metrics['query_time']) if self._search_metrics['query_time'] else 0,
-                    "total_searches": len(self._search_metrics['query_time'])
+                    "total_searches": len(self._search_metrics['query_time']),
+                    "query_embedding_cache": {
+                        "size": len(self._query_embedding_cache),
+                        "hits": self._query_embedding_cache.hits,
+                        "misses": self._query_embedding_cache.misses
+                    }
                 }
             }
             
@@ -0,0 +1,66 @@
+"""Periodic reconciliation of materialized dashboard statistics
+
+Writes keep ``dashboard_statistics`` current incrementally; this job rebuilds
+the rows from the base tables on an interval to correct any drift and to
+pick up IEP reviews that became overdue without a write.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from ..config import get_settings
+from ..database import async_session_factory
+from ..repositories.dashboard_stats_repository import DashboardStatsRepository
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardStatsReconciler:
+    """Background task that reconciles dashboard statistics on an interval"""
+
+    def __init__(self, interval_seconds: int):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def reconcile_once(self) -> int:
+        """Rebuild all statistics rows now"""
+        async with async_session_factory() as session:
+            return await DashboardStatsRepository(session).reconcile()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.reconcile_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Dashboard statistics reconciliation failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        """Reconcile immediately, then every interval"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"📊 Dashboard statistics reconciler started (every {self.interval_seconds}s)")
+
+    async def stop(self):
+        """Cancel the background task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_reconciler: Optional[DashboardStatsReconciler] = None
+
+
+def get_dashboard_stats_reconciler() -> DashboardStatsReconciler:
+    """Get the process-wide reconciler (singleton)"""
+    global _reconciler
+    if _reconciler is None:
+        _reconciler = DashboardStatsReconciler(get_settings().DASHBOARD_STATS_RECONCILE_SECONDS)
+    return _reconciler
@@ -0,0 +1,348 @@
+"""Queue worker for Document AI processing of uploaded assessment documents"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import select, update, or_, and_
+
+from ..config import get_settings
+from ..database import async_session_factory, engine
+from ..models.job_models import DocumentProcessingJob
+from ..models.special_education_models import AssessmentDocument
+from ..services.document_processing_service import process_document_job
+from .job_notifier import get_document_job_notifier, PostgresJobListener, DOCUMENT_JOB_CHANNEL
+from .worker_ids import make_worker_id
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentProcessingWorker:
+    """Drain the document processing queue with a bounded number of jobs in flight
+
+    Jobs are claimed as leases (``FOR UPDATE SKIP LOCKED`` on PostgreSQL, a
+    conditional UPDATE everywhere) and kept alive by a heartbeat, so a job
+    whose worker crashed is picked up again once its lease expires. Failed
+    jobs, including reclaimed ones, are retried with exponential backoff
+    before the document is marked failed. Results are only recorded while
+    the worker still holds the lease. Like the IEP worker, SQLite runs one
+    job at a time.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        poll_interval: int = 5,
+        max_concurrent_jobs: Optional[int] = None,
+        session_factory=async_session_factory
+    ):
+        settings = get_settings()
+        # Leases are fenced on this id, so it must be unique per worker
+        self.worker_id = worker_id or make_worker_id("document-worker")
+        self.poll_interval = poll_interval
+        self.session_factory = session_factory
+        self.is_sqlite = settings.is_sqlite
+
+        if self.is_sqlite:
+            self.max_concurrent_jobs = 1  # SQLite limitation
+        else:
+            self.max_concurrent_jobs = max_concurrent_jobs or settings.DOCUMENT_WORKER_CONCURRENCY
+        self.claim_timeout = settings.WORKER_CLAIM_TIMEOUT_SECONDS
+        self.heartbeat_interval = max(self.claim_timeout / 3, 1)
+        self.max_retries = settings.DOCUMENT_JOB_MAX_RETRIES
+        self.retry_backoff = settings.DOCUMENT_JOB_RETRY_BACKOFF_SECONDS
+
+        self.running = False
+        self.job_slots = asyncio.Semaphore(self.max_concurrent_jobs)
+        self.active_jobs: Set[asyncio.Task] = set()
+        self.notifier = get_document_job_notifier()
+        self.wake_event = self.notifier.subscribe()
+        self.listener: Optional[PostgresJobListener] = None
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+
+    async def start(self):
+        """Run until stopped, then wait for in-flight jobs"""
+        self.running = True
+        logger.info(
+            f"📄 Document worker {self.worker_id} started "
+            f"({self.max_concurrent_jobs} concurrent job(s))"
+        )
+
+        if not self.is_sqlite:
+            try:
+                self.listener = PostgresJobListener(engine, self.notifier, DOCUMENT_JOB_CHANNEL)
+                await self.listener.start()
+            except Exception as e:
+                logger.warning(f"Document job LISTEN unavailable, relying on polling: {e}")
+                self.listener = None
+
+        try:
+            while self.running:
+                self.wake_event.clear()
+                try:
+                    await self._fill_job_slots()
+                except Exception as e:
+                    logger.error(f"Error claiming document jobs: {e}", exc_info=True)
+                try:
+                    await asyncio.wait_for(self.wake_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self.active_jobs:
+                await asyncio.gather(*self.active_jobs, return_exceptions=True)
+            if self.listener:
+                await self.listener.stop()
+            self.notifier.unsubscribe(self.wake_event)
+            logger.info(f"Document worker {self.worker_id} stopped")
+
+    async def stop(self):
+        """Stop claiming new jobs"""
+        self.running = False
+        self.wake_event.set()
+
+    async def _fill_job_slots(self) -> int:
+        """Claim jobs until the queue is empty or all job slots are busy"""
+        claimed = 0
+        while self.running and not self.job_slots.locked():
+            await self.job_slots.acquire()
+            try:
+                job = await self._claim_job()
+            except Exception:
+                self.job_slots.release()
+                raise
+
+            if not job:
+                self.job_slots.release()
+                break
+
+            task = asyncio.create_task(self._run_claimed_job(job))
+            self.active_jobs.add(task)
+            task.add_done_callback(self.active_jobs.discard)
+            claimed += 1
+        return claimed
+
+    def _claimable(self, now: datetime):
+        return or_(
+            and_(
+                DocumentProcessingJob.status == 'pending',
+                or_(DocumentProcessingJob.next_retry_at.is_(None), DocumentProcessingJob.next_retry_at <= now)
+            ),
+            and_(
+                DocumentProcessingJob.status == 'processing',
+                DocumentProcessingJob.claimed_at < now - timedelta(seconds=self.claim_timeout)
+            )
+        )
+
+    def _owned(self, job_id: str):
+        return and_(
+            DocumentProcessingJob.id == job_id,
+            DocumentProcessingJob.claimed_by == self.worker_id,
+            DocumentProcessingJob.status == 'processing'
+        )
+
+    async def _claim_job(self) -> Optional[Dict[str, Any]]:
+        """Lease the highest-priority ready job
+
+        Reclaiming an expired lease counts as a failed attempt, so a job that
+        keeps killing its worker is failed once its retries are exhausted
+        rather than reclaimed forever.
+        """
+        while True:
+            async with self.session_factory() as session:
+                now = datetime.utcnow()
+                candidate = (await session.execute(
+                    select(DocumentProcessingJob)
+                    .where(self._claimable(now))
+                    .order_by(DocumentProcessingJob.priority.desc(), DocumentProcessingJob.created_at)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )).scalar_one_or_none()
+                if candidate is None:
+                    return None
+
+                job = {
+                    "id": candidate.id,
+                    "document_id": candidate.document_id,
+                    "file_path": candidate.file_path,
+                    "retry_count": candidate.retry_count
+                }
+                abandoned_by = candidate.claimed_by if candidate.status == 'processing' else None
+                if abandoned_by:
+                    job["retry_count"] += 1
+                    logger.warning(f"Document job {job['id']} lease held by {abandoned_by} expired")
+
+                exhausted = job["retry_count"] >= self.max_retries
+                if exhausted:
+                    error_message = f"Lease held by {abandoned_by} expired"
+                    values = {
+                        "status": 'failed', "failed_at": now, "error_message": error_message,
+                        "claimed_by": None, "claimed_at": None
+                    }
+                else:
+                    values = {"status": 'processing', "claimed_by": self.worker_id, "claimed_at": now, "started_at": now}
+                result = await session.execute(
+                    update(DocumentProcessingJob)
+                    .where(DocumentProcessingJob.id == job["id"], self._claimable(now))
+                    .values(retry_count=job["retry_count"], **values)
+                )
+                if result.rowcount == 0:
+                    # Claimed by another worker in between
+                    await session.rollback()
+                    return None
+                if not exhausted:
+                    await session.commit()
+                    return job
+
+                await session.execute(
+                    update(AssessmentDocument)
+                    .where(AssessmentDocument.id == UUID(job["document_id"]))
+                    .values(
+                        processing_status="failed",
+                        error_message=f"Failed after {job['retry_count']} attempts: {error_message}"
+                    )
+                )
+                await session.commit()
+                self.failed += 1
+                logger.error(f"❌ Document job {job['id']} failed: retries exhausted after expired leases")
+
+    async def _run_claimed_job(self, job: Dict[str, Any]):
+        """Process a claimed job while a heartbeat keeps its lease, then free the slot"""
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            await self._process_document(job)
+        except Exception as e:
+            logger.error(f"❌ Document job {job['id']} failed: {e}")
+            await self._record_failure(job, str(e))
+        else:
+            await self._record_success(job)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            self.job_slots.release()
+            self.wake_event.set()
+
+    async def _process_document(self, job: Dict[str, Any]):
+        await process_document_job(job["document_id"], job["file_path"], self.session_factory)
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(
+                        update(DocumentProcessingJob)
+                        .where(self._owned(job_id))
+                        .values(claimed_at=datetime.utcnow())
+                    )
+                    await session.commit()
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for document job {job_id}: {e}")
+
+    async def _record_success(self, job: Dict[str, Any]):
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(DocumentProcessingJob)
+                .where(self._owned(job["id"]))
+                .values(status='completed', completed_at=datetime.utcnow(), claimed_by=None, claimed_at=None)
+            )
+            if result.rowcount == 0:
+                await session.rollback()
+                logger.warning(f"Document job {job['id']} lease was lost; dropping its result")
+                return
+            await session.commit()
+        self.completed += 1
+
+    async def _record_failure(self, job: Dict[str, Any], error_message: str):
+        """Reschedule with backoff, or fail the job once retries are exhausted"""
+        retry_count = job["retry_count"] + 1
+        now = datetime.utcnow()
+        exhausted = retry_count >= self.max_retries
+        if not exhausted:
+            values = {
+                "status": 'pending',
+                "next_retry_at": now + timedelta(seconds=self.retry_backoff * 2 ** (retry_count - 1))
+            }
+            document_values = {
+                "processing_status": "queued",
+                "error_message": f"Retry {retry_count}/{self.max_retries}: {error_message}"
+            }
+        else:
+            values = {"status": 'failed', "failed_at": now}
+            document_values = {
+                "processing_status": "failed",
+                "error_message": f"Failed after {retry_count} attempts: {error_message}"
+            }
+
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    update(DocumentProcessingJob)
+                    .where(self._owned(job["id"]))
+                    .values(
+                        retry_count=retry_count,
+                        error_message=error_message,
+                        claimed_by=None,
+                        claimed_at=None,
+                        **values
+                    )
+                )
+                if result.rowcount == 0:
+                    await session.rollback()
+                    logger.warning(f"Document job {job['id']} lease was lost; dropping its failure")
+                    return
+                await session.execute(
+                    update(AssessmentDocument)
+                    .where(AssessmentDocument.id == UUID(job["document_id"]))
+                    .values(**document_values)
+                )
+                await session.commit()
+            if exhausted:
+                self.failed += 1
+            else:
+                self.retried += 1
+        except Exception as e:
+            logger.error(f"Error recording failure of document job {job['id']}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "running": self.running,
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "active_jobs": len(self.active_jobs),
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed
+        }
+
+
+# Worker embedded in the API process (see DOCUMENT_WORKER_EMBEDDED)
+_embedded_worker: Optional[DocumentProcessingWorker] = None
+_embedded_task: Optional[asyncio.Task] = None
+
+
+def get_embedded_document_worker() -> Optional[DocumentProcessingWorker]:
+    """The in-process worker, if one was started"""
+    return _embedded_worker
+
+
+async def start_embedded_document_worker() -> DocumentProcessingWorker:
+    """Start the document worker as a background task of the API process"""
+    global _embedded_worker, _embedded_task
+    if _embedded_worker is None:
+        _embedded_worker = DocumentProcessingWorker(worker_id=make_worker_id("document-embedded"))
+        _embedded_task = asyncio.create_task(_embedded_worker.start())
+    return _embedded_worker
+
+
+async def stop_embedded_document_worker():
+    """Stop the in-process worker and wait for in-flight jobs"""
+    global _embedded_worker, _embedded_task
+    if _embedded_worker is not None:
+        await _embedded_worker.stop()
+        await asyncio.gather(_embedded_task, return_exceptions=True)
+        _embedded_worker = None
+        _embedded_task = None
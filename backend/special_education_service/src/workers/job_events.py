@@ -0,0 +1,245 @@
+"""Job state change events for clients waiting on async jobs
+
+Workers publish a small snapshot (status, progress, message) whenever they
+commit a job state change. Long-poll and SSE endpoints watch a job through
+the process-wide ``JobEventBus`` instead of re-querying the jobs table, so a
+waiting client holds no database connection.
+
+Events published in the same process reach watchers directly. Workers in
+other processes reach them through ``NOTIFY`` on PostgreSQL; on SQLite (or if
+``LISTEN`` is unavailable) one shared query per poll interval covers every
+watched job, however many clients are watching.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ..config import get_settings
+from ..database import async_session_factory
+from ..models.job_models import IEPGenerationJob
+from .job_notifier import PostgresJobListener
+
+logger = logging.getLogger(__name__)
+
+JOB_EVENTS_CHANNEL = "iep_generation_job_events"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+# Safety-net poll while LISTEN is active (missed notifications only)
+LISTEN_FALLBACK_POLL_SECONDS = 30
+
+# Events buffered per watcher before the oldest are dropped
+WATCHER_QUEUE_SIZE = 100
+
+# NOTIFY payloads are limited to 8000 bytes
+MAX_MESSAGE_LENGTH = 500
+
+
+def job_snapshot(
+    job_id: str,
+    status: str,
+    progress_percentage: Optional[int],
+    status_message: Optional[str]
+) -> Dict[str, Any]:
+    """Event payload describing a job's current state"""
+    if status_message and len(status_message) > MAX_MESSAGE_LENGTH:
+        status_message = status_message[:MAX_MESSAGE_LENGTH]
+    return {
+        "job_id": str(job_id),
+        "status": status,
+        "progress_percentage": progress_percentage or 0,
+        "status_message": status_message
+    }
+
+
+async def wait_for_terminal(
+    events: asyncio.Queue,
+    latest: Dict[str, Any],
+    timeout_seconds: float
+) -> Dict[str, Any]:
+    """Consume a watcher's events until a terminal status or the timeout
+
+    Returns the last snapshot seen (``latest`` if nothing arrived).
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+    while latest["status"] not in TERMINAL_STATUSES:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            latest = await asyncio.wait_for(events.get(), timeout=remaining)
+        except asyncio.TimeoutError:
+            break
+    return latest
+
+
+class JobEventBus:
+    """In-process fan-out of job state changes to watchers"""
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._watchers: Dict[str, Set[asyncio.Queue]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._poll_task: Optional[asyncio.Task] = None
+        self.listener: Optional["PostgresJobEventListener"] = None
+        self.published = 0
+        self.poll_queries = 0
+
+    @property
+    def watcher_count(self) -> int:
+        return sum(len(queues) for queues in self._watchers.values())
+
+    def publish(self, snapshot: Dict[str, Any]):
+        """Deliver a snapshot to the job's watchers (duplicates are dropped)"""
+        job_id = snapshot["job_id"]
+        queues = self._watchers.get(job_id)
+        if not queues or self._latest.get(job_id) == snapshot:
+            return
+        self._latest[job_id] = snapshot
+        self.published += 1
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+    async def job_updated(self, session: AsyncSession, snapshot: Dict[str, Any]):
+        """Announce a committed state change locally and (on PostgreSQL) to other processes"""
+        self.publish(snapshot)
+
+        if session.bind.dialect.name != "postgresql":
+            return
+        try:
+            await session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": JOB_EVENTS_CHANNEL, "payload": json.dumps(snapshot)}
+            )
+            await session.commit()
+        except Exception as e:
+            # Watchers still see the change on the next fallback poll
+            logger.warning(f"Failed to publish NOTIFY for job {snapshot['job_id']}: {e}")
+            await session.rollback()
+
+    @asynccontextmanager
+    async def watch(self, job_id: str):
+        """Yield a queue receiving the job's state changes until the block exits
+
+        Subscribe before reading the job's initial state so no change is
+        missed in between.
+        """
+        job_id = str(job_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=WATCHER_QUEUE_SIZE)
+        self._watchers.setdefault(job_id, set()).add(queue)
+        self._ensure_polling()
+        try:
+            yield queue
+        finally:
+            queues = self._watchers.get(job_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._watchers[job_id]
+                    self._latest.pop(job_id, None)
+
+    def seed(self, snapshot: Dict[str, Any]):
+        """Record the state a watcher already read, so it is not re-sent"""
+        if snapshot["job_id"] in self._watchers:
+            self._latest.setdefault(snapshot["job_id"], snapshot)
+
+    def _ensure_polling(self):
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self):
+        """Refresh every watched job with one query per interval while anyone is watching
+
+        Only status transitions are detected this way; progress detail
+        arrives through published events.
+        """
+        while self._watchers:
+            interval = self.poll_interval if self.listener is None else LISTEN_FALLBACK_POLL_SECONDS
+            await asyncio.sleep(interval)
+            job_ids = list(self._watchers)
+            if not job_ids:
+                break
+            try:
+                statuses = await self._fetch_statuses(job_ids)
+            except Exception as e:
+                logger.warning(f"Job event fallback poll failed: {e}")
+                continue
+            for job_id, status in statuses.items():
+                latest = self._latest.get(job_id)
+                if latest is None:
+                    self.publish(job_snapshot(job_id, status, None, None))
+                elif latest["status"] != status:
+                    self.publish({**latest, "status": status})
+
+    async def _fetch_statuses(self, job_ids: List[str]) -> Dict[str, str]:
+        self.poll_queries += 1
+        async with async_session_factory() as session:
+            rows = (await session.execute(
+                select(IEPGenerationJob.id, IEPGenerationJob.status)
+                .where(IEPGenerationJob.id.in_(job_ids))
+            )).all()
+        return {str(job_id): status for job_id, status in rows}
+
+    async def start(self, engine: AsyncEngine):
+        """Listen for events from workers in other processes (PostgreSQL only)"""
+        if engine.dialect.name != "postgresql":
+            return
+        try:
+            self.listener = PostgresJobEventListener(engine, self)
+            await self.listener.start()
+        except Exception as e:
+            logger.warning(f"Job event LISTEN unavailable, relying on polling: {e}")
+            self.listener = None
+
+    async def stop(self):
+        """Stop listening and polling"""
+        if self.listener is not None:
+            await self.listener.stop()
+            self.listener = None
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            await asyncio.gather(self._poll_task, return_exceptions=True)
+            self._poll_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "watched_jobs": len(self._watchers),
+            "watchers": self.watcher_count,
+            "events_published": self.published,
+            "fallback_poll_queries": self.poll_queries,
+            "listening": self.listener is not None
+        }
+
+
+class PostgresJobEventListener(PostgresJobListener):
+    """Forward job event ``NOTIFY`` payloads to the local bus"""
+
+    def __init__(self, engine: AsyncEngine, bus: JobEventBus):
+        super().__init__(engine, notifier=None, channel=JOB_EVENTS_CHANNEL)
+        self.bus = bus
+
+    def _on_notification(self, connection, pid, channel, payload):
+        try:
+            self.bus.publish(json.loads(payload))
+        except (TypeError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed job event on {channel}: {e}")
+
+
+# Process-wide bus shared by workers and job endpoints
+_job_event_bus: Optional[JobEventBus] = None
+
+
+def get_job_event_bus() -> JobEventBus:
+    """Get the process-wide job event bus (singleton)"""
+    global _job_event_bus
+    if _job_event_bus is None:
+        _job_event_bus = JobEventBus(get_settings().JOB_EVENTS_POLL_SECONDS)
+    return _job_event_bus
@@ -0,0 +1,119 @@
+"""Wake-up channel between job submission and async workers
+
+Workers subscribe to the in-process ``JobNotifier`` and wait on its event
+instead of sleeping for a full poll interval. Submissions in the same
+process wake them directly; on PostgreSQL submissions also issue
+``pg_notify`` so workers in other processes are woken through
+``LISTEN``/``NOTIFY``.
+"""
+
+import asyncio
+import logging
+from typing import Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+logger = logging.getLogger(__name__)
+
+JOB_CHANNEL = "iep_generation_jobs"
+DOCUMENT_JOB_CHANNEL = "document_processing_jobs"
+
+
+class JobNotifier:
+    """In-process fan-out of "new job available" signals to workers"""
+
+    def __init__(self, channel: str = JOB_CHANNEL):
+        self.channel = channel
+        self._subscribers: Set[asyncio.Event] = set()
+
+    def subscribe(self) -> asyncio.Event:
+        """Register a worker and return the event it should wait on"""
+        event = asyncio.Event()
+        self._subscribers.add(event)
+        return event
+
+    def unsubscribe(self, event: asyncio.Event):
+        """Remove a worker's event"""
+        self._subscribers.discard(event)
+
+    def notify(self):
+        """Wake every subscribed worker"""
+        for event in self._subscribers:
+            event.set()
+
+    async def job_submitted(self, session: AsyncSession, job_id: str):
+        """Announce a committed job to local and (on PostgreSQL) remote workers"""
+        self.notify()
+
+        if session.bind.dialect.name != "postgresql":
+            return
+        try:
+            await session.execute(
+                text("SELECT pg_notify(:channel, :job_id)"),
+                {"channel": self.channel, "job_id": job_id}
+            )
+            await session.commit()
+        except Exception as e:
+            # Workers still pick the job up on their next poll
+            logger.warning(f"Failed to publish NOTIFY for job {job_id}: {e}")
+            await session.rollback()
+
+
+class PostgresJobListener:
+    """Forward PostgreSQL ``NOTIFY`` messages on the job channel to a notifier
+
+    Holds one dedicated asyncpg connection for the lifetime of the worker.
+    """
+
+    def __init__(self, engine: AsyncEngine, notifier: JobNotifier, channel: str = JOB_CHANNEL):
+        self.engine = engine
+        self.notifier = notifier
+        self.channel = channel
+        self._connection = None
+        self._driver_connection = None
+
+    def _on_notification(self, connection, pid, channel, payload):
+        logger.debug(f"Received job notification on {channel}: {payload}")
+        self.notifier.notify()
+
+    async def start(self):
+        """Open the listening connection"""
+        self._connection = await self.engine.connect()
+        raw_connection = await self._connection.get_raw_connection()
+        self._driver_connection = raw_connection.driver_connection
+        await self._driver_connection.add_listener(self.channel, self._on_notification)
+        logger.info(f"Listening for job notifications on channel {self.channel}")
+
+    async def stop(self):
+        """Stop listening and release the connection"""
+        if self._driver_connection is not None:
+            try:
+                await self._driver_connection.remove_listener(self.channel, self._on_notification)
+            except Exception as e:
+                logger.warning(f"Error removing job listener: {e}")
+            self._driver_connection = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+# Process-wide notifiers shared by job submission and embedded workers
+_job_notifier: Optional[JobNotifier] = None
+_document_job_notifier: Optional[JobNotifier] = None
+
+
+def get_job_notifier() -> JobNotifier:
+    """Get the process-wide job notifier (singleton)"""
+    global _job_notifier
+    if _job_notifier is None:
+        _job_notifier = JobNotifier()
+    return _job_notifier
+
+
+def get_document_job_notifier() -> JobNotifier:
+    """Get the process-wide document processing job notifier (singleton)"""
+    global _document_job_notifier
+    if _document_job_notifier is None:
+        _document_job_notifier = JobNotifier(DOCUMENT_JOB_CHANNEL)
+    return _document_job_notifier
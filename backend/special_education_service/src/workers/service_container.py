@@ -0,0 +1,90 @@
+"""Process-scoped RAG service graph for async workers"""
+
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings, Settings
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerServiceContainer:
+    """Builds the heavy RAG dependencies once and hands out per-job services
+
+    The vector store (Chroma client or Vertex index) and the IEP generator
+    (``genai.configure`` plus a ``GenerativeModel``) are created lazily on
+    first use and reused for every job in the process. Only the repositories
+    and the ``IEPService`` wrapping them are created per job, bound to that
+    job's database session.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings or get_settings()
+        self._vector_store = None
+        self._iep_generator = None
+
+    @property
+    def vector_store(self):
+        """Shared vector store"""
+        if self._vector_store is None:
+            self._vector_store = self._build_vector_store()
+        return self._vector_store
+
+    @property
+    def iep_generator(self):
+        """Shared IEP generator"""
+        if self._iep_generator is None:
+            from ..rag.iep_generator import IEPGenerator
+            self._iep_generator = IEPGenerator(
+                vector_store=self.vector_store,
+                settings=self.settings
+            )
+            logger.info("Worker IEP generator initialized")
+        return self._iep_generator
+
+    def _build_vector_store(self):
+        from ..vector_store import VectorStore
+
+        project_id = getattr(self.settings, 'gcp_project_id', 'default-project')
+        if os.getenv("ENVIRONMENT") == "development":
+            vector_store = VectorStore(project_id=project_id, collection_name="rag_documents")
+        else:
+            try:
+                from common.src.vector_store.vertex_vector_store import VertexVectorStore
+                vector_store = VertexVectorStore.from_settings(self.settings)
+            except (ValueError, AttributeError) as e:
+                logger.warning(f"Vertex AI not configured ({e}), falling back to ChromaDB")
+                vector_store = VectorStore(project_id=project_id, collection_name="rag_documents")
+        logger.info(f"Worker vector store initialized: {type(vector_store).__name__}")
+        return vector_store
+
+    def create_iep_service(self, session: AsyncSession):
+        """Create an IEPService bound to a job's session"""
+        from ..repositories.iep_repository import IEPRepository
+        from ..repositories.pl_repository import PLRepository
+        from ..repositories.student_repository import StudentRepository
+        from ..services.iep_service import IEPService
+
+        return IEPService(
+            repository=IEPRepository(session),
+            pl_repository=PLRepository(session),
+            student_repository=StudentRepository(session),
+            vector_store=self.vector_store,
+            iep_generator=self.iep_generator,
+            workflow_client=None,  # Not needed for async processing
+            audit_client=None      # Not needed for async processing
+        )
+
+
+_worker_services: Optional[WorkerServiceContainer] = None
+
+
+def get_worker_services() -> WorkerServiceContainer:
+    """Get the process-wide worker service container (singleton)"""
+    global _worker_services
+    if _worker_services is None:
+        _worker_services = WorkerServiceContainer()
+    return _worker_services
@@ -5,44 +5,96 @@ import logging
 import json
 import signal
 import sys
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Tuple
 from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
 from sqlalchemy import text, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_async_session
+from ..config import get_settings
+from ..database import get_async_session, engine
 from ..models.job_models import IEPGenerationJob
 from ..utils.gemini_client import GeminiClient
 from ..schemas.gemini_schemas import GeminiIEPResponse
 from ..utils.json_helpers import ensure_json_serializable
+from .job_notifier import get_job_notifier, PostgresJobListener
+from .job_events import get_job_event_bus, job_snapshot
+from .service_container import get_worker_services
+from .worker_ids import make_worker_id
 import gzip
 import base64
 
 logger = logging.getLogger(__name__)
 
+# Writes to a job only apply while this worker still holds its lease
+OWNED_JOB = "id = :job_id AND claimed_by = :worker_id AND status = 'processing'"
+
 
 class SQLiteAsyncWorker:
-    """SQLite-compatible async worker for processing IEP generation jobs"""
+    """Async worker for processing IEP generation jobs
+    
+    On SQLite the worker keeps the single-writer path: one job at a time,
+    claimed with an atomic UPDATE. On PostgreSQL jobs are claimed with
+    ``FOR UPDATE SKIP LOCKED`` so any number of workers can drain the queue,
+    and each worker runs up to ``max_concurrent_jobs`` jobs at once. Claims
+    are leases: a heartbeat refreshes ``claimed_at`` while a job is running,
+    and a job whose lease is older than ``claim_timeout`` is reclaimable.
+    Progress, completion and failure writes only apply while this worker
+    still holds the lease, so a worker that lost its job cannot overwrite
+    the new owner's state.
+    
+    Workers are woken as soon as a job is submitted (in-process event, plus
+    ``LISTEN``/``NOTIFY`` on PostgreSQL) or a job slot frees up;
+    ``poll_interval`` is only a safety net for missed notifications and
+    expired leases.
     
-    def __init__(self, worker_id: str = "worker-1", poll_interval: int = 5):
-        self.worker_id = worker_id
+    Every committed progress, completion and failure update is published to
+    the job event bus for clients waiting on the job.
+    """
+    
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        poll_interval: int = 5,
+        max_concurrent_jobs: Optional[int] = None
+    ):
+        self.worker_id = worker_id or make_worker_id("iep-worker")
         self.poll_interval = poll_interval
         self.running = False
         self.shutdown_event = asyncio.Event()
         self.gemini_client = GeminiClient()
         
-        # SQLite concurrency settings
-        self.max_concurrent_jobs = 1  # SQLite limitation
-        self.claim_timeout = 300  # 5 minutes to process a job
+        settings = get_settings()
+        self.is_sqlite = settings.is_sqlite
+        
+        if self.is_sqlite:
+            self.max_concurrent_jobs = 1  # SQLite limitation
+        else:
+            self.max_concurrent_jobs = max_concurrent_jobs or settings.WORKER_MAX_CONCURRENT_JOBS
+        self.claim_timeout = settings.WORKER_CLAIM_TIMEOUT_SECONDS
+        self.heartbeat_interval = max(self.claim_timeout / 3, 1)
         self.max_retries = 3
         
-        logger.info(f"Initialized SQLite worker {worker_id} with {poll_interval}s poll interval")
+        self.job_slots = asyncio.Semaphore(self.max_concurrent_jobs)
+        self.active_jobs: Set[asyncio.Task] = set()
+        
+        self.notifier = get_job_notifier()
+        self.wake_event = self.notifier.subscribe()
+        self.listener: Optional[PostgresJobListener] = None
+        self.events = get_job_event_bus()
+        
+        # Vector store and generator are shared across jobs (built on first use)
+        self.services = get_worker_services()
+        
+        logger.info(
+            f"Initialized {'SQLite' if self.is_sqlite else 'PostgreSQL'} worker {self.worker_id} "
+            f"with {poll_interval}s poll interval and {self.max_concurrent_jobs} concurrent job(s)"
+        )
     
     async def start(self):
         """Start the worker main loop"""
         self.running = True
-        logger.info(f"Starting SQLite async worker {self.worker_id}")
+        logger.info(f"Starting async worker {self.worker_id}")
         
         # Register signal handlers for graceful shutdown
         if sys.platform != 'win32':
@@ -50,64 +102,172 @@ class SQLiteAsyncWorker:
             loop.add_signal_handler(signal.SIGTERM, self._signal_handler)
             loop.add_signal_handler(signal.SIGINT, self._signal_handler)
         
+        if not self.is_sqlite:
+            await self._start_listener()
+        
         try:
             await self._worker_loop()
         except Exception as e:
             logger.error(f"Worker {self.worker_id} crashed: {e}", exc_info=True)
         finally:
+            await self._drain_active_jobs()
+            if self.listener:
+                await self.listener.stop()
+            self.notifier.unsubscribe(self.wake_event)
             logger.info(f"Worker {self.worker_id} stopped")
     
+    async def _start_listener(self):
+        """Listen for PostgreSQL job notifications from other processes"""
+        try:
+            self.listener = PostgresJobListener(engine, self.notifier)
+            await self.listener.start()
+        except Exception as e:
+            logger.warning(f"Job LISTEN unavailable, relying on polling: {e}")
+            self.listener = None
+    
     def _signal_handler(self):
         """Handle shutdown signals"""
         logger.info(f"Worker {self.worker_id} received shutdown signal")
         self.shutdown_event.set()
+        self.wake_event.set()
     
     async def stop(self):
         """Stop the worker gracefully"""
         logger.info(f"Stopping worker {self.worker_id}")
         self.running = False
         self.shutdown_event.set()
+        self.wake_event.set()
     
     async def _worker_loop(self):
         """Main worker loop"""
         while self.running and not self.shutdown_event.is_set():
             try:
-                # Claim and process one job
-                await self._process_next_job()
+                # Clear before claiming so a submission that lands while we
+                # are claiming still wakes the next iteration
+                self.wake_event.clear()
+                
+                # Claim back-to-back until the queue is empty or all slots are busy
+                await self._fill_job_slots()
                 
-                # Wait for next poll or shutdown
+                # Wait for a new job, a free slot, shutdown, or the fallback poll
                 try:
                     await asyncio.wait_for(
-                        self.shutdown_event.wait(), 
+                        self.wake_event.wait(), 
                         timeout=self.poll_interval
                     )
-                    break  # Shutdown requested
                 except asyncio.TimeoutError:
-                    continue  # Normal poll interval
+                    continue  # Fallback poll interval
                     
             except Exception as e:
                 logger.error(f"Error in worker loop: {e}", exc_info=True)
                 await asyncio.sleep(min(self.poll_interval, 30))
     
-    async def _process_next_job(self):
-        """Claim and process the next available job"""
-        async with self._get_session() as session:
+    async def _fill_job_slots(self) -> int:
+        """Claim jobs until the queue is empty or all job slots are busy
+        
+        Returns the number of jobs claimed.
+        """
+        claimed = 0
+        while not self.shutdown_event.is_set() and not self.job_slots.locked():
+            await self.job_slots.acquire()
             try:
-                # Try to claim a job using SQLite-safe approach
-                job_id = await self._claim_next_job(session)
-                if not job_id:
-                    return  # No jobs available
-                
-                logger.info(f"Worker {self.worker_id} claimed job {job_id}")
-                
-                # Process the job
+                job_id = await self._claim_job()
+            except Exception:
+                self.job_slots.release()
+                raise
+            
+            if not job_id:
+                self.job_slots.release()
+                break
+            
+            logger.info(f"Worker {self.worker_id} claimed job {job_id}")
+            task = asyncio.create_task(self._run_claimed_job(job_id))
+            self.active_jobs.add(task)
+            task.add_done_callback(self.active_jobs.discard)
+            claimed += 1
+        return claimed
+    
+    async def _drain_active_jobs(self):
+        """Wait for in-flight jobs to finish before the worker exits"""
+        if self.active_jobs:
+            logger.info(f"Worker {self.worker_id} waiting for {len(self.active_jobs)} in-flight job(s)")
+            await asyncio.gather(*self.active_jobs, return_exceptions=True)
+    
+    async def _claim_job(self) -> Optional[str]:
+        """Claim the next available job in its own short-lived session"""
+        async with self._get_session() as session:
+            return await self._claim_next_job(session)
+    
+    async def _run_claimed_job(self, job_id: str):
+        """Process a claimed job and free its slot when done"""
+        try:
+            await self._process_claimed_job(job_id)
+        finally:
+            self.job_slots.release()
+            self.wake_event.set()  # A slot is free; look for more work
+    
+    async def _process_claimed_job(self, job_id: str):
+        """Process a claimed job while a heartbeat keeps its lease alive"""
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            async with self._get_session() as session:
                 await self._process_job(session, job_id)
-                
+        except Exception as e:
+            logger.error(f"Error processing job: {e}", exc_info=True)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+    
+    async def _heartbeat(self, job_id: str):
+        """Periodically renew the claim lease on a running job"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                renewed = await self._renew_lease(job_id)
             except Exception as e:
-                logger.error(f"Error processing job: {e}", exc_info=True)
+                logger.warning(f"Heartbeat failed for job {job_id}: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"Worker {self.worker_id} lost lease on job {job_id}")
+                return
+    
+    async def _renew_lease(self, job_id: str) -> bool:
+        """Refresh ``claimed_at`` for a job this worker still owns"""
+        async with self._get_session() as session:
+            now = datetime.utcnow()
+            result = await session.execute(
+                text(f"""
+                    UPDATE iep_generation_jobs 
+                    SET claimed_at = :now, updated_at = :now
+                    WHERE {OWNED_JOB}
+                """),
+                {"now": now, "job_id": job_id, "worker_id": self.worker_id}
+            )
+            await session.commit()
+            return result.rowcount > 0
     
     async def _claim_next_job(self, session: AsyncSession) -> Optional[str]:
-        """Claim the next available job using SQLite-compatible UPDATE"""
+        """Claim the next available job
+        
+        Reclaiming an expired lease counts as a failed attempt, so a job that
+        keeps killing its worker is failed once its retries are exhausted
+        rather than reclaimed forever.
+        """
+        while True:
+            if self.is_sqlite:
+                claimed = await self._claim_job_returning(session)
+            else:
+                claimed = await self._claim_job_skip_locked(session)
+            if not claimed:
+                return None
+            
+            job_id, retry_count = claimed
+            if retry_count < self.max_retries:
+                return job_id
+            await self._fail_abandoned_job(session, job_id, retry_count)
+    
+    async def _claim_job_returning(self, session: AsyncSession) -> Optional[Tuple[str, int]]:
+        """Claim the next available job on SQLite"""
         try:
             # SQLite UPDATE with ORDER BY and LIMIT - check if supported
             claim_time = datetime.utcnow()
@@ -122,7 +282,8 @@ class SQLiteAsyncWorker:
                         status = 'processing',
                         claimed_by = :worker_id,
                         claimed_at = :claim_time,
-                        updated_at = :claim_time
+                        updated_at = :claim_time,
+                        retry_count = retry_count + CASE WHEN status = 'processing' THEN 1 ELSE 0 END
                     WHERE id = (
                         SELECT id FROM iep_generation_jobs 
                         WHERE (status = 'pending' 
@@ -130,7 +291,7 @@ class SQLiteAsyncWorker:
                         ORDER BY priority DESC, created_at ASC 
                         LIMIT 1
                     )
-                    RETURNING id
+                    RETURNING id, retry_count
                 """),
                 {
                     "worker_id": self.worker_id,
@@ -142,7 +303,7 @@ class SQLiteAsyncWorker:
             row = result.fetchone()
             if row:
                 await session.commit()
-                return str(row[0])
+                return str(row[0]), row[1]
             
             return None
             
@@ -152,7 +313,52 @@ class SQLiteAsyncWorker:
             await session.rollback()
             return await self._claim_job_fallback(session)
     
-    async def _claim_job_fallback(self, session: AsyncSession) -> Optional[str]:
+    async def _claim_job_skip_locked(self, session: AsyncSession) -> Optional[Tuple[str, int]]:
+        """Claim the next available job on PostgreSQL
+        
+        ``FOR UPDATE SKIP LOCKED`` lets concurrent workers each lock a
+        different candidate row instead of queueing behind the same one.
+        """
+        try:
+            claim_time = datetime.utcnow()
+            timeout_threshold = claim_time - timedelta(seconds=self.claim_timeout)
+            
+            result = await session.execute(
+                text("""
+                    UPDATE iep_generation_jobs 
+                    SET 
+                        status = 'processing',
+                        claimed_by = :worker_id,
+                        claimed_at = :claim_time,
+                        updated_at = :claim_time,
+                        retry_count = retry_count + CASE WHEN status = 'processing' THEN 1 ELSE 0 END
+                    WHERE id = (
+                        SELECT id FROM iep_generation_jobs 
+                        WHERE (status = 'pending' 
+                               OR (status = 'processing' AND claimed_at < :timeout_threshold))
+                        ORDER BY priority DESC, created_at ASC 
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, retry_count
+                """),
+                {
+                    "worker_id": self.worker_id,
+                    "claim_time": claim_time,
+                    "timeout_threshold": timeout_threshold
+                }
+            )
+            
+            row = result.fetchone()
+            await session.commit()
+            return (str(row[0]), row[1]) if row else None
+            
+        except Exception as e:
+            logger.error(f"Error claiming job with SKIP LOCKED: {e}")
+            await session.rollback()
+            return None
+    
+    async def _claim_job_fallback(self, session: AsyncSession) -> Optional[Tuple[str, int]]:
         """Fallback job claiming for older SQLite versions"""
         try:
             claim_time = datetime.utcnow()
@@ -160,7 +366,7 @@ class SQLiteAsyncWorker:
             
             # Find a job to claim
             result = await session.execute(
-                select(IEPGenerationJob.id)
+                select(IEPGenerationJob.id, IEPGenerationJob.status, IEPGenerationJob.retry_count)
                 .where(
                     (IEPGenerationJob.status == 'pending') |
                     ((IEPGenerationJob.status == 'processing') & 
@@ -174,7 +380,9 @@ class SQLiteAsyncWorker:
             if not row:
                 return None
             
-            job_id = row[0]
+            job_id, status, retry_count = row
+            if status == 'processing':
+                retry_count += 1  # Reclaiming an expired lease
             
             # Try to claim it
             result = await session.execute(
@@ -189,13 +397,14 @@ class SQLiteAsyncWorker:
                     status='processing',
                     claimed_by=self.worker_id,
                     claimed_at=claim_time,
-                    updated_at=claim_time
+                    updated_at=claim_time,
+                    retry_count=retry_count
                 )
             )
             
             if result.rowcount > 0:
                 await session.commit()
-                return str(job_id)
+                return str(job_id), retry_count
             else:
                 # Job was claimed by another worker
                 await session.rollback()
@@ -249,55 +458,8 @@ class SQLiteAsyncWorker:
             # Update progress
             await self._update_job_progress(session, job.id, 10, "Initializing RAG system")
             
-            # Initialize the full RAG system (same as the synchronous path)
-            from ..repositories.iep_repository import IEPRepository
-            from ..repositories.pl_repository import PLRepository
-            from ..services.iep_service import IEPService
-            from ..rag.iep_generator import IEPGenerator
-            from ..vector_store import VectorStore
-            from ..config import get_settings
-            
-            settings = get_settings()
-            
-            # Initialize vector store
-            import os
-            if os.getenv("ENVIRONMENT") == "development":
-                vector_store = VectorStore(
-                    project_id=getattr(settings, 'gcp_project_id', 'default-project'),
-                    collection_name="rag_documents"
-                )
-            else:
-                try:
-                    from common.src.vector_store.vertex_vector_store import VertexVectorStore
-                    vector_store = VertexVectorStore.from_settings(settings)
-                except (ValueError, AttributeError) as e:
-                    logger.warning(f"Vertex AI not configured ({e}), falling back to ChromaDB")
-                    vector_store = VectorStore(
-                        project_id=getattr(settings, 'gcp_project_id', 'default-project'),
-                        collection_name="rag_documents"
-                    )
-            
-            # Initialize repositories and services
-            iep_repo = IEPRepository(session)
-            pl_repo = PLRepository(session)
-            
-            # Initialize IEP generator with vector store
-            iep_generator = IEPGenerator(
-                vector_store=vector_store,
-                project_id=getattr(settings, 'gcp_project_id', 'default-project'),
-                bucket_name=getattr(settings, 'gcs_bucket_name', 'default-bucket'),
-                model_name=getattr(settings, 'gemini_model', 'gemini-2.5-flash')
-            )
-            
-            # Initialize IEP service
-            iep_service = IEPService(
-                repository=iep_repo,
-                pl_repository=pl_repo,
-                vector_store=vector_store,
-                iep_generator=iep_generator,
-                workflow_client=None,  # Not needed for async processing
-                audit_client=None      # Not needed for async processing
-            )
+            # Reuse the worker's RAG services; only repositories are per job
+            iep_service = self.services.create_iep_service(session)
             
             # Update progress
             await self._update_job_progress(session, job.id, 25, "Generating IEP with RAG")
@@ -325,7 +487,8 @@ class SQLiteAsyncWorker:
                 academic_year=academic_year,
                 initial_data=initial_data,
                 user_id=int(created_by_auth_id),
-                user_role="system"  # Background job
+                user_role="system",  # Background job
+                use_cache=params.get('use_cache', True)
             )
             
             # Update progress
@@ -391,16 +554,22 @@ Return only the section content as JSON."""
     async def _update_job_progress(self, session: AsyncSession, job_id: str, progress: int, status_message: str):
         """Update job progress"""
         try:
-            await session.execute(
-                update(IEPGenerationJob)
-                .where(IEPGenerationJob.id == job_id)
-                .values(
-                    progress_percentage=progress,
-                    status_message=status_message,
-                    updated_at=datetime.utcnow()
-                )
+            result = await session.execute(
+                text(f"""
+                    UPDATE iep_generation_jobs 
+                    SET progress_percentage = :progress, status_message = :status_message, updated_at = :now
+                    WHERE {OWNED_JOB}
+                """),
+                {
+                    "progress": progress, "status_message": status_message, "now": datetime.utcnow(),
+                    "job_id": job_id, "worker_id": self.worker_id
+                }
+            )
+            if not await self._commit_owned(session, job_id, result):
+                return
+            await self.events.job_updated(
+                session, job_snapshot(job_id, 'processing', progress, status_message)
             )
-            await session.commit()
         except Exception as e:
             logger.error(f"Error updating job progress: {e}")
             await session.rollback()
@@ -408,19 +577,26 @@ Return only the section content as JSON."""
     async def _mark_job_completed(self, session: AsyncSession, job_id: str, result: Dict[str, Any]):
         """Mark job as completed with results"""
         try:
-            await session.execute(
-                update(IEPGenerationJob)
-                .where(IEPGenerationJob.id == job_id)
-                .values(
-                    status='completed',
-                    progress_percentage=100,
-                    status_message='Generation completed successfully',
-                    result=result,
-                    completed_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
+            now = datetime.utcnow()
+            update_result = await session.execute(
+                text(f"""
+                    UPDATE iep_generation_jobs 
+                    SET 
+                        status = 'completed',
+                        progress_percentage = 100,
+                        status_message = 'Generation completed successfully',
+                        result = :result,
+                        completed_at = :now,
+                        updated_at = :now
+                    WHERE {OWNED_JOB}
+                """),
+                {"result": json.dumps(result), "now": now, "job_id": job_id, "worker_id": self.worker_id}
+            )
+            if not await self._commit_owned(session, job_id, update_result):
+                return
+            await self.events.job_updated(
+                session, job_snapshot(job_id, 'completed', 100, 'Generation completed successfully')
             )
-            await session.commit()
         except Exception as e:
             logger.error(f"Error marking job completed: {e}")
             await session.rollback()
@@ -429,8 +605,12 @@ Return only the section content as JSON."""
         """Mark job as failed"""
         try:
             # Increment retry count and decide whether to retry
-            job = await session.get(IEPGenerationJob, job_id)
+            job = (await session.execute(
+                text(f"SELECT retry_count, progress_percentage FROM iep_generation_jobs WHERE {OWNED_JOB}"),
+                {"job_id": job_id, "worker_id": self.worker_id}
+            )).fetchone()
             if not job:
+                logger.warning(f"Worker {self.worker_id} lost lease on job {job_id}; dropping its failure")
                 return
             
             retry_count = (job.retry_count or 0) + 1
@@ -446,26 +626,83 @@ Return only the section content as JSON."""
                 status_message = f"Failed after {retry_count} attempts: {error_message}"
                 failed_at = datetime.utcnow()
             
-            await session.execute(
-                update(IEPGenerationJob)
-                .where(IEPGenerationJob.id == job_id)
-                .values(
-                    status=status,
-                    status_message=status_message,
-                    retry_count=retry_count,
-                    error_details={'error': error_message, 'worker_id': self.worker_id},
-                    failed_at=failed_at,
-                    claimed_by=None,  # Release claim for retry
-                    claimed_at=None,
-                    updated_at=datetime.utcnow()
-                )
+            result = await self._release_job(
+                session, job_id, status, status_message, retry_count, error_message, failed_at
+            )
+            if not await self._commit_owned(session, job_id, result):
+                return
+            await self.events.job_updated(
+                session, job_snapshot(job_id, status, job.progress_percentage, status_message)
             )
-            await session.commit()
             
         except Exception as e:
             logger.error(f"Error marking job failed: {e}")
             await session.rollback()
     
+    async def _fail_abandoned_job(self, session: AsyncSession, job_id: str, retry_count: int):
+        """Fail a reclaimed job whose expired leases used up its retries"""
+        error_message = "Lease expired before the job finished"
+        status_message = f"Failed after {retry_count} attempts: {error_message}"
+        try:
+            result = await self._release_job(
+                session, job_id, 'failed', status_message, retry_count, error_message, datetime.utcnow()
+            )
+            if not await self._commit_owned(session, job_id, result):
+                return
+            logger.error(f"Job {job_id} failed: retries exhausted after expired leases")
+            await self.events.job_updated(
+                session, job_snapshot(job_id, 'failed', None, status_message)
+            )
+        except Exception as e:
+            logger.error(f"Error failing abandoned job {job_id}: {e}")
+            await session.rollback()
+    
+    async def _release_job(
+        self,
+        session: AsyncSession,
+        job_id: str,
+        status: str,
+        status_message: str,
+        retry_count: int,
+        error_message: str,
+        failed_at: Optional[datetime]
+    ):
+        """Give up this worker's lease, leaving the job pending or failed"""
+        return await session.execute(
+            text(f"""
+                UPDATE iep_generation_jobs 
+                SET 
+                    status = :status,
+                    status_message = :status_message,
+                    retry_count = :retry_count,
+                    error_details = :error_details,
+                    failed_at = :failed_at,
+                    claimed_by = NULL,
+                    claimed_at = NULL,
+                    updated_at = :now
+                WHERE {OWNED_JOB}
+            """),
+            {
+                "status": status,
+                "status_message": status_message,
+                "retry_count": retry_count,
+                "error_details": json.dumps({'error': error_message, 'worker_id': self.worker_id}),
+                "failed_at": failed_at,
+                "now": datetime.utcnow(),
+                "job_id": job_id,
+                "worker_id": self.worker_id
+            }
+        )
+    
+    async def _commit_owned(self, session: AsyncSession, job_id: str, result) -> bool:
+        """Commit a lease-guarded write, or roll it back if the lease was lost"""
+        if result.rowcount == 0:
+            await session.rollback()
+            logger.warning(f"Worker {self.worker_id} lost lease on job {job_id}; dropping its result")
+            return False
+        await session.commit()
+        return True
+    
     @asynccontextmanager
     async def _get_session(self):
         """Get database session with proper cleanup"""
@@ -480,25 +717,32 @@ Return only the section content as JSON."""
 
 
 # Worker management functions
-async def start_worker(worker_id: str = "worker-1", poll_interval: int = 5):
+async def start_worker(
+    worker_id: Optional[str] = None,
+    poll_interval: int = 5,
+    max_concurrent_jobs: Optional[int] = None
+):
     """Start a single worker instance"""
-    worker = SQLiteAsyncWorker(worker_id, poll_interval)
+    worker = SQLiteAsyncWorker(worker_id, poll_interval, max_concurrent_jobs)
     await worker.start()
 
 
-async def start_worker_pool(num_workers: int = 1, poll_interval: int = 5):
-    """Start a pool of workers (limited for SQLite)"""
+async def start_worker_pool(
+    num_workers: int = 1,
+    poll_interval: int = 5,
+    max_concurrent_jobs: Optional[int] = None
+):
+    """Start a pool of workers (limited to one for SQLite)"""
     # SQLite limitation: only 1 concurrent writer
-    if num_workers > 1:
+    if num_workers > 1 and get_settings().is_sqlite:
         logger.warning("SQLite detected: limiting to 1 worker for write safety")
         num_workers = 1
     
     workers = []
     tasks = []
     
-    for i in range(num_workers):
-        worker_id = f"worker-{i+1}"
-        worker = SQLiteAsyncWorker(worker_id, poll_interval)
+    for _ in range(num_workers):
+        worker = SQLiteAsyncWorker(None, poll_interval, max_concurrent_jobs)
         workers.append(worker)
         tasks.append(asyncio.create_task(worker.start()))
     
@@ -521,6 +765,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="SQLite Async Worker")
     parser.add_argument("--workers", type=int, default=1, help="Number of workers")
     parser.add_argument("--poll-interval", type=int, default=5, help="Poll interval in seconds")
+    parser.add_argument("--concurrency", type=int, help="Concurrent jobs per worker (PostgreSQL only)")
     parser.add_argument("--worker-id", type=str, help="Single worker ID")
     
     args = parser.parse_args()
@@ -531,6 +776,6 @@ if __name__ == "__main__":
     )
     
     if args.worker_id:
-        asyncio.run(start_worker(args.worker_id, args.poll_interval))
+        asyncio.run(start_worker(args.worker_id, args.poll_interval, args.concurrency))
     else:
-        asyncio.run(start_worker_pool(args.workers, args.poll_interval))
\ No newline at end of file
+        asyncio.run(start_worker_pool(args.workers, args.poll_interval, args.concurrency))
\ No newline at end of file
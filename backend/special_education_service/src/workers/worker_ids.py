@@ -0,0 +1,20 @@
+"""Unique worker identities for job leases"""
+
+import os
+import socket
+import uuid
+
+# Lease owner columns (claimed_by) are VARCHAR(50)
+MAX_WORKER_ID_LENGTH = 50
+
+
+def make_worker_id(prefix: str) -> str:
+    """``<prefix>-<host>-<pid>-<random>``, distinct across replicas, processes and restarts
+
+    Leases are fenced on the owner id, so two workers must never share one.
+    The hostname is shortened to keep the id within the lease column.
+    """
+    suffix = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    room = MAX_WORKER_ID_LENGTH - len(prefix) - len(suffix) - 2
+    host = socket.gethostname().split(".")[0][:max(room - 1, 0)]
+    return f"{prefix}-{host}-{suffix}" if host else f"{prefix}-{suffix}"
@@ -41,16 +41,22 @@ async def main():
     # Configuration
     num_workers = int(os.getenv("NUM_WORKERS", "1"))
     poll_interval = int(os.getenv("POLL_INTERVAL", "5"))
+    max_concurrent_jobs = int(os.getenv("WORKER_MAX_CONCURRENT_JOBS", "4"))
     
     logger.info(f"Configuration:")
     logger.info(f"  Workers: {num_workers}")
     logger.info(f"  Poll Interval: {poll_interval}s")
+    logger.info(f"  Concurrent jobs per worker: {max_concurrent_jobs} (PostgreSQL only)")
     logger.info(f"  Database: {os.getenv('DATABASE_URL', 'default SQLite')}")
     
     # Start worker pool
     try:
         logger.info("🏃‍♂️ Starting worker pool...")
-        await start_worker_pool(num_workers=num_workers, poll_interval=poll_interval)
+        await start_worker_pool(
+            num_workers=num_workers,
+            poll_interval=poll_interval,
+            max_concurrent_jobs=max_concurrent_jobs
+        )
     except KeyboardInterrupt:
         logger.info("👋 Shutdown requested by user")
         return True
@@ -65,6 +71,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Async IEP Generation Worker")
     parser.add_argument("--workers", type=int, default=1, help="Number of workers (1 for SQLite)")
     parser.add_argument("--poll-interval", type=int, default=5, help="Poll interval in seconds")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent jobs per worker (PostgreSQL only)")
     parser.add_argument("--test", action="store_true", help="Run in test mode with sample job")
     
     args = parser.parse_args()
@@ -72,6 +79,7 @@ if __name__ == "__main__":
     # Set environment variables from args
     os.environ["NUM_WORKERS"] = str(args.workers)
     os.environ["POLL_INTERVAL"] = str(args.poll_interval)
+    os.environ["WORKER_MAX_CONCURRENT_JOBS"] = str(args.concurrency)
     
     # Set default environment for development
     os.environ.setdefault("ENVIRONMENT", "development")
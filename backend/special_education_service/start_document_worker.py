@@ -0,0 +1,64 @@
+"""Startup script for the assessment document processing worker
+
+Run this as its own process (with DOCUMENT_WORKER_EMBEDDED=false on the API)
+so Document AI processing during upload bursts does not share the API's
+event loop.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.workers.document_processing_worker import DocumentProcessingWorker
+from src.database import init_db
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def main(worker_id: Optional[str], poll_interval: int, concurrency: int) -> bool:
+    """Run one document worker until SIGINT/SIGTERM"""
+    logger.info("🚀 Starting assessment document processing worker")
+    
+    try:
+        await init_db()
+    except Exception as e:
+        logger.error(f"❌ Database initialization failed: {e}")
+        return False
+    
+    worker = DocumentProcessingWorker(worker_id, poll_interval, concurrency)
+    
+    if sys.platform != 'win32':
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, lambda: asyncio.ensure_future(worker.stop()))
+    
+    await worker.start()
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Assessment Document Processing Worker")
+    parser.add_argument("--worker-id", type=str, help="Worker ID, unique per worker (default: derived from host, pid and a random suffix)")
+    parser.add_argument("--poll-interval", type=int, default=5, help="Poll interval in seconds")
+    parser.add_argument("--concurrency", type=int, help="Concurrent documents (PostgreSQL only)")
+    
+    args = parser.parse_args()
+    
+    os.environ.setdefault("ENVIRONMENT", "development")
+    os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./special_ed.db")
+    
+    success = asyncio.run(main(args.worker_id, args.poll_interval, args.concurrency))
+    sys.exit(0 if success else 1)
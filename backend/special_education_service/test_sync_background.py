@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Test the sync background task processing directly"""
+"""Test queued document processing directly"""
 
 import asyncio
 import logging
@@ -10,19 +10,16 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from database import get_engine, async_session_factory
+from database import async_session_factory
 from repositories.assessment_repository import AssessmentRepository
-from routers.assessment_router import process_uploaded_document_background_sync
+from services.document_processing_service import process_document_job
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 async def test_sync_background_task():
-    """Test the sync background task directly"""
-    
-    # Get engine for background task
-    engine = await get_engine()
+    """Run a document through the queue worker's processing step directly"""
     
     # Test document info (use the uploaded document)
     document_id = "9e210eb4-bef9-43a7-8f88-0099484e9292"
@@ -40,8 +37,8 @@ async def test_sync_background_task():
     try:
         logger.info(f"🚀 Starting sync background task test...")
         
-        # Call the sync background task function directly
-        process_uploaded_document_background_sync(document_id, file_path, engine)
+        # Call the worker's processing step directly
+        await process_document_job(document_id, file_path)
         
         logger.info(f"✅ Sync background task completed successfully")
         
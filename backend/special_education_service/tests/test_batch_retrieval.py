@@ -0,0 +1,230 @@
+"""Test batched multi-query retrieval on the enhanced vector store"""
+import pytest
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from src.vector_store_enhanced import EnhancedVectorStore, QueryEmbeddingCache
+from src.rag.metadata_aware_iep_generator import MetadataAwareIEPGenerator
+from src.schemas.rag_metadata_schemas import DocumentType, IEPSection, SearchContext
+
+CHUNKS = [
+    ("c1", "Reading fluency is below grade level", "assessment_report", 0.9),
+    ("c2", "Math calculation strengths noted", "assessment_report", 0.7),
+    ("c3", "Progress toward reading goals", "progress_report", 0.8),
+    ("c4", "Accommodations include extended time", "iep", 0.6),
+    ("c5", "Baseline working memory needs support", "assessment_report", 0.5),
+]
+
+
+def embed(text):
+    return [float(sum(ord(ch) for ch in text))]
+
+
+class FakeEmbeddingFunction:
+    """Records which texts were embedded"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input):
+        self.calls.append(list(input))
+        return [embed(text) for text in input]
+
+
+class FakeCollection:
+    """Deterministic stand-in for a ChromaDB collection that records calls"""
+
+    def __init__(self):
+        self.calls = []
+
+    def query(self, query_embeddings, n_results, where=None, include=None):
+        self.calls.append([embedding[0] for embedding in query_embeddings])
+        allowed = set(where["$and"][0]["document_type"]["$in"]) if where else None
+        out = defaultdict(list)
+        for embedding in query_embeddings:
+            rows = [
+                ((embedding[0] + embed(chunk_id)[0]) % 100 / 100, chunk_id, content, doc_type, quality)
+                for chunk_id, content, doc_type, quality in CHUNKS
+                if allowed is None or doc_type in allowed
+            ]
+            rows.sort()
+            rows = rows[:n_results]
+            out["ids"].append([r[1] for r in rows])
+            out["documents"].append([r[2] for r in rows])
+            out["distances"].append([r[0] for r in rows])
+            out["metadatas"].append([
+                {"chunk_id": r[1], "document_id": "doc", "document_type": r[3],
+                 "overall_quality": r[4], "relevance_present_levels": 0.6,
+                 "relevance_annual_goals": 0.4, "relevance_accommodations": 0.5}
+                for r in rows
+            ])
+        return dict(out)
+
+
+@pytest.fixture
+def store():
+    store = EnhancedVectorStore.__new__(EnhancedVectorStore)
+    store.collection = FakeCollection()
+    store.embedding_function = FakeEmbeddingFunction()
+    store._query_embedding_cache = QueryEmbeddingCache()
+    store._search_metrics = defaultdict(list)
+    return store
+
+
+def summarize(results):
+    return [(r.chunk_id, round(r.final_score, 6)) for r in results]
+
+
+class TestBatchEnhancedSearch:
+    """Test batch retrieval matches one-at-a-time search"""
+
+    @pytest.mark.asyncio
+    async def test_matches_individual_searches(self, store):
+        """Each query gets the results enhanced_search would return"""
+        reports = SearchContext(
+            target_iep_section=IEPSection.PRESENT_LEVELS,
+            document_types=[DocumentType.ASSESSMENT_REPORT, DocumentType.PROGRESS_REPORT],
+            quality_threshold=0.3,
+        )
+        ieps = SearchContext(
+            target_iep_section=IEPSection.ACCOMMODATIONS,
+            document_types=[DocumentType.IEP],
+            quality_threshold=0.3,
+        )
+        queries = [
+            ("reading", reports, 2),
+            ("baseline", reports, 4),
+            ("extended time", ieps, 3),
+            ("reading", reports, 2),
+        ]
+
+        expected = [summarize(await store.enhanced_search(q, c, n)) for q, c, n in queries]
+        store.collection.calls.clear()
+        batch = await store.batch_enhanced_search(queries)
+
+        assert [summarize(results) for results in batch] == expected
+        # One query per filter group, duplicate texts embedded once
+        assert sorted(store.collection.calls) == sorted(
+            [[embed("extended time")[0]], [embed("reading")[0], embed("baseline")[0]]]
+        )
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, store):
+        """No queries means no ChromaDB calls"""
+        assert await store.batch_enhanced_search([]) == []
+        assert store.collection.calls == []
+
+
+class TestSectionEvidenceCollection:
+    """Test the generator collects evidence in one round-trip"""
+
+    @pytest.mark.asyncio
+    async def test_single_batch_call(self, store):
+        """All sections and search terms go through one batch call"""
+        calls = []
+        original = store.batch_enhanced_search
+
+        async def counting_batch(queries):
+            calls.append(len(queries))
+            return await original(queries)
+
+        store.batch_enhanced_search = counting_batch
+        generator = MetadataAwareIEPGenerator.__new__(MetadataAwareIEPGenerator)
+        generator.vector_store = store
+        generator.section_strategies = {
+            IEPSection.PRESENT_LEVELS: {
+                'search_terms': ['baseline', 'reading'],
+                'document_types': [DocumentType.ASSESSMENT_REPORT],
+                'max_chunks': 2,
+                'relevance_threshold': 0.0,
+            },
+            IEPSection.ACCOMMODATIONS: {
+                'search_terms': ['extended time'],
+                'document_types': [DocumentType.IEP],
+                'max_chunks': 3,
+                'relevance_threshold': 0.0,
+            },
+        }
+        generator.quality_thresholds = {'minimum_chunk_quality': 0.3}
+
+        evidence = await generator._collect_section_evidence({'student_id': None})
+
+        assert calls == [3]
+        assert set(evidence) == {IEPSection.PRESENT_LEVELS, IEPSection.ACCOMMODATIONS}
+        assert len(evidence[IEPSection.PRESENT_LEVELS]) <= 2
+        assert [r.chunk_id for r in evidence[IEPSection.ACCOMMODATIONS]] == ["c4"]
+
+
+class TestQueryEmbeddingCache:
+    """Test repeated queries skip embedding"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_queries_are_cached(self, store):
+        """Only unseen query texts reach the embedding function"""
+        context = SearchContext(document_types=[DocumentType.IEP])
+        await store.enhanced_search("extended time", context)
+        await store.enhanced_search("extended time", context)
+        await store.batch_enhanced_search([("extended time", context, 5), ("reading", context, 5)])
+
+        assert store.embedding_function.calls == [["extended time"], ["reading"]]
+        assert store._query_embedding_cache.hits == 2
+
+    def test_lru_eviction(self):
+        """Least recently used embeddings are dropped past max_entries"""
+        cache = QueryEmbeddingCache(max_entries=2)
+        cache.put_many({"a": [1.0], "b": [2.0]})
+        cache.get_many(["a"])
+        cache.put_many({"c": [3.0]})
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+class TestVectorizedScoring:
+    """Test the candidate scorer against the per-candidate formula"""
+
+    @staticmethod
+    def reference_relevance(metadata, context):
+        score = 0.5
+        if context.target_iep_section:
+            score += metadata.get(f"relevance_{context.target_iep_section.value}", 0.0) * 0.3
+        if context.document_types and metadata.get("document_type") in [d.value for d in context.document_types]:
+            score += 0.2
+        if context.boost_recent and metadata.get("document_date"):
+            days_old = (datetime.now() - datetime.fromisoformat(metadata["document_date"])).days
+            if days_old < 365:
+                score += max(0, 0.1 - days_old / 3650)
+        if context.student_context and context.student_context.get("student_id") == metadata.get("student_id"):
+            score += 0.15
+        return min(score, 1.0)
+
+    def test_matches_reference(self, store):
+        """Relevance and final scores agree with the scalar formula"""
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        metadatas = [
+            {"document_type": "iep", "relevance_present_levels": 0.8, "student_id": "s1",
+             "overall_quality": 0.9, "document_date": (today - timedelta(days=30)).isoformat()},
+            {"document_type": "progress_report", "overall_quality": 0.4,
+             "document_date": (today - timedelta(days=400)).isoformat()},
+            {"document_type": "iep", "student_id": "s2", "relevance_present_levels": 0.2,
+             "document_date": "not a date"},
+            {"document_type": "iep", "student_id": "s1",
+             "document_date": (today - timedelta(days=10)).isoformat(),
+             "document_date_days": EnhancedVectorStore._document_date_days(today - timedelta(days=10))},
+        ]
+        distances = [0.1, 0.7, 1.3, 0.4]
+        context = SearchContext(
+            target_iep_section=IEPSection.PRESENT_LEVELS,
+            document_types=[DocumentType.IEP],
+            student_context={"student_id": "s1"},
+            boost_recent=True,
+        )
+
+        similarity, relevance, quality, final = store._score_candidates(metadatas, distances, context)
+
+        for i, metadata in enumerate(metadatas):
+            if metadata["document_date"] == "not a date":
+                metadata = {k: v for k, v in metadata.items() if k != "document_date"}
+            expected = self.reference_relevance(metadata, context)
+            assert relevance[i] == pytest.approx(expected)
+            expected_final = max(0.0, 1.0 - distances[i]) * 0.4 + expected * 0.4 + \
+                metadata.get("overall_quality", 0.5) * 0.2
+            assert final[i] == pytest.approx(expected_final)
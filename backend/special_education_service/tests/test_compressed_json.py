@@ -0,0 +1,146 @@
+"""Test CompressedJSON type decorator functionality"""
+import base64
+import gzip
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from src.models.special_education_models import QuantifiedAssessmentData
+from src.models.type_decorators import (
+    COMPRESSED_JSON_MAGIC, FORMAT_GZIP, FORMAT_ZSTD, CompressedJSON, CompressedText, compressed_json_format
+)
+from migrate_compressed_json import reencode
+
+LARGE_CONTENT = {
+    "present_levels": "Student reads 45 words per minute with 90% accuracy. " * 200,
+    "goals": [{"domain": "reading", "baseline": 45, "target": 90}] * 50
+}
+
+
+class TestCompressedJSON:
+    """Test the CompressedJSON TypeDecorator implementation"""
+
+    def setup_method(self):
+        """Set up test instance"""
+        self.compressed_json = CompressedJSON(threshold=1024, compression=FORMAT_GZIP)
+        self.dialect = None  # Mock dialect, not used in our implementation
+
+    def round_trip(self, value):
+        stored = self.compressed_json.process_bind_param(value, self.dialect)
+        return stored, self.compressed_json.process_result_value(stored, self.dialect)
+
+    def test_none_value(self):
+        """Test that None values pass through unchanged"""
+        assert self.compressed_json.process_bind_param(None, self.dialect) is None
+        assert self.compressed_json.process_result_value(None, self.dialect) is None
+
+    def test_small_value_stored_uncompressed(self):
+        """Test that values under the threshold are stored as raw JSON behind the header"""
+        stored, result = self.round_trip({"reading": 45})
+        assert compressed_json_format(stored) == "raw"
+        assert stored[len(COMPRESSED_JSON_MAGIC) + 1:] == b'{"reading":45}'
+        assert result == {"reading": 45}
+
+    def test_large_value_compressed(self):
+        """Test that large documents are gzip-compressed and read back unchanged"""
+        stored, result = self.round_trip(LARGE_CONTENT)
+        assert compressed_json_format(stored) == "gzip"
+        assert len(stored) < len(json.dumps(LARGE_CONTENT)) / 10
+        assert result == LARGE_CONTENT
+
+    def test_incompressible_value_stored_raw(self):
+        """Test that compression is skipped when it does not shrink the payload"""
+        compressed_json = CompressedJSON(threshold=16, compression=FORMAT_GZIP)
+        stored = compressed_json.process_bind_param("abcdefghijklmnopqrstuvwxyz", self.dialect)
+        assert compressed_json_format(stored) == "raw"  # Gzip framing outweighs the savings
+        assert compressed_json.process_result_value(stored, self.dialect) == "abcdefghijklmnopqrstuvwxyz"
+
+    def test_legacy_json_values(self):
+        """Test that plain JSON written before the column was converted still loads"""
+        assert self.compressed_json.process_result_value(b'{"goals": [1, 2]}', self.dialect) == {"goals": [1, 2]}
+        assert self.compressed_json.process_result_value('["SLD", "OHI"]', self.dialect) == ["SLD", "OHI"]
+        assert self.compressed_json.process_result_value("not json", self.dialect) == "not json"
+        assert compressed_json_format(b'{"goals": []}') == "legacy"
+
+    def test_zstd_format(self):
+        """Test the zstd format when the optional zstandard package is installed"""
+        pytest.importorskip("zstandard")
+        compressed_json = CompressedJSON(compression=FORMAT_ZSTD)
+        stored = compressed_json.process_bind_param(LARGE_CONTENT, self.dialect)
+        assert compressed_json_format(stored) == "zstd"
+        assert compressed_json.process_result_value(stored, self.dialect) == LARGE_CONTENT
+
+    def test_unknown_format_rejected(self):
+        """Test that an unknown format byte is reported rather than misread"""
+        with pytest.raises(ValueError):
+            self.compressed_json.process_result_value(COMPRESSED_JSON_MAGIC + b"\x09{}", self.dialect)
+
+    @pytest.mark.asyncio
+    async def test_database_round_trip(self, test_session):
+        """Test that model columns are stored compressed and legacy rows still load"""
+        record = QuantifiedAssessmentData(
+            student_id=uuid.uuid4(), assessment_date=datetime(2025, 1, 15),
+            standardized_plop=LARGE_CONTENT, source_documents=["doc-1"]
+        )
+        test_session.add(record)
+        await test_session.commit()
+        record_id = record.id
+
+        stored = (await test_session.execute(
+            text("SELECT standardized_plop FROM quantified_assessment_data WHERE id = :id"),
+            {"id": record_id.hex}
+        )).scalar()
+        assert compressed_json_format(stored) in ("gzip", "zstd")
+
+        await test_session.execute(
+            text("UPDATE quantified_assessment_data SET source_documents = :legacy WHERE id = :id"),
+            {"legacy": '["doc-1", "doc-2"]', "id": record_id.hex}
+        )
+        await test_session.commit()
+        test_session.expire_all()
+
+        loaded = await test_session.get(QuantifiedAssessmentData, record_id)
+        assert loaded.standardized_plop == LARGE_CONTENT
+        assert loaded.source_documents == ["doc-1", "doc-2"]
+
+
+class TestCompressedText:
+    """Test CompressedText, used for columns converted from text"""
+
+    def setup_method(self):
+        self.compressed_text = CompressedText(threshold=64, compression=FORMAT_GZIP)
+        self.raw_response = json.dumps(LARGE_CONTENT)
+
+    def test_round_trip_keeps_string(self):
+        """Test that a JSON-looking string is read back as the same string"""
+        stored = self.compressed_text.process_bind_param(self.raw_response, None)
+        assert compressed_json_format(stored) == "gzip"
+        assert self.compressed_text.process_result_value(stored, None) == self.raw_response
+
+    def test_legacy_text_not_parsed(self):
+        """Test that legacy rows holding JSON text are returned as text, not a dict"""
+        assert self.compressed_text.process_result_value(self.raw_response.encode("utf-8"), None) == self.raw_response
+        assert self.compressed_text.process_result_value('{"goals": []}', None) == '{"goals": []}'
+        assert self.compressed_text.process_result_value(None, None) is None
+
+    def test_reencode_legacy_text(self):
+        """Test that the migration compresses legacy text without parsing it"""
+        stored = reencode(self.raw_response, self.compressed_text, recompress=False, decompress=False, text_column=True)
+        assert compressed_json_format(stored) == "gzip"
+        assert self.compressed_text.process_result_value(stored, None) == self.raw_response
+
+        # --decompress writes the original text back
+        restored = reencode(stored, self.compressed_text, recompress=False, decompress=True, text_column=True)
+        assert restored == self.raw_response.encode("utf-8")
+
+    def test_reencode_legacy_gemini_text(self):
+        """Test that GeminiClient's old base64+gzip text is unpacked to the response string"""
+        legacy = base64.b64encode(gzip.compress(self.raw_response.encode("utf-8"))).decode("ascii")
+        stored = reencode(
+            legacy, self.compressed_text, recompress=False, decompress=False,
+            legacy_gemini=True, text_column=True
+        )
+        assert self.compressed_text.process_result_value(stored, None) == self.raw_response
@@ -0,0 +1,135 @@
+"""Test the single-query dashboard caseload aggregation"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database import Base
+from src.models.special_education_models import IEP, IEPGoal, Student
+from src.repositories.student_repository import StudentRepository
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+def make_student(n, teacher=None):
+    return Student(
+        student_id=f"S-{n:03d}",
+        first_name=f"First{n}",
+        last_name=f"Last{n:03d}",
+        date_of_birth=date(2012, 1, 1),
+        grade_level="5",
+        disability_codes=["SLD"],
+        case_manager_auth_id=teacher,
+    )
+
+
+def make_iep(student, status, created_at, version=1):
+    return IEP(
+        student_id=student.id,
+        academic_year="2025-2026",
+        status=status,
+        content={},
+        version=version,
+        created_by_auth_id=1,
+        created_at=created_at,
+    )
+
+
+def make_goal(iep, progress_status):
+    return IEPGoal(
+        iep_id=iep.id,
+        domain="Reading",
+        goal_text="Read",
+        target_criteria="80%",
+        measurement_method="probe",
+        progress_status=progress_status,
+    )
+
+
+@pytest.fixture
+async def caseload(session):
+    """Teacher 7 has three students; one other student belongs to teacher 9"""
+    now = datetime.now(timezone.utc)
+    students = [make_student(1, 7), make_student(2, 7), make_student(3, 7), make_student(4, 9)]
+    session.add_all(students)
+    await session.flush()
+
+    old = make_iep(students[0], "expired", now - timedelta(days=400), version=1)
+    current = make_iep(students[0], "active", now - timedelta(days=10), version=2)
+    review = make_iep(students[1], "under_review", now - timedelta(days=1))
+    other = make_iep(students[3], "active", now)
+    session.add_all([old, current, review, other])
+    await session.flush()
+
+    session.add_all([
+        make_goal(old, "mastered"),
+        make_goal(current, "mastered"),
+        make_goal(current, "in_progress"),
+        make_goal(current, "not_started"),
+        make_goal(current, "mastered"),
+        make_goal(review, "in_progress"),
+        make_goal(other, "mastered"),
+    ])
+    await session.commit()
+    return students
+
+
+class TestDashboardCaseload:
+    """Test students, latest IEP and goal aggregates come back together"""
+
+    @pytest.mark.asyncio
+    async def test_latest_iep_and_goal_progress(self, session, caseload):
+        """Only each student's latest IEP and its goals are aggregated"""
+        page = await StudentRepository(session).get_dashboard_caseload(teacher_auth_id=7)
+
+        assert page["total"] == 3
+        by_id = {s["student_id"]: s for s in page["students"]}
+        assert by_id["S-001"]["latest_iep"]["status"] == "active"
+        assert by_id["S-001"]["goal_progress"] == {"total": 4, "mastered": 2, "in_progress": 1}
+        assert by_id["S-002"]["latest_iep"]["status"] == "under_review"
+        assert by_id["S-003"]["latest_iep"] is None
+        assert by_id["S-003"]["goal_progress"] == {"total": 0, "mastered": 0, "in_progress": 0}
+
+    @pytest.mark.asyncio
+    async def test_pagination_keeps_total(self, session, caseload):
+        """Pages are ordered by name and report the full caseload size"""
+        repo = StudentRepository(session)
+        first = await repo.get_dashboard_caseload(limit=2)
+        second = await repo.get_dashboard_caseload(limit=2, offset=2)
+        past_end = await repo.get_dashboard_caseload(limit=2, offset=10)
+
+        assert [s["student_id"] for s in first["students"]] == ["S-001", "S-002"]
+        assert [s["student_id"] for s in second["students"]] == ["S-003", "S-004"]
+        assert first["total"] == second["total"] == past_end["total"] == 4
+        assert past_end["students"] == []
+
+    @pytest.mark.asyncio
+    async def test_single_query_per_page(self, session, caseload):
+        """The caseload page is one SQL statement regardless of size"""
+        statements = []
+        sync_engine = session.bind.sync_engine
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            await StudentRepository(session).get_dashboard_caseload(limit=50)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record)
+
+        assert len(statements) == 1
@@ -0,0 +1,170 @@
+"""Test materialized dashboard statistics and their incremental refresh"""
+from datetime import date, timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database import Base
+from src.models.special_education_models import DashboardStatistics
+from src.repositories.dashboard_stats_repository import DashboardStatsRepository, STAT_FIELDS
+from src.repositories.iep_repository import IEPRepository
+from src.repositories.student_repository import StudentRepository
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+def student_data(n, case_manager, district="North"):
+    return {
+        "student_id": f"S-{n:03d}",
+        "first_name": f"First{n}",
+        "last_name": f"Last{n:03d}",
+        "date_of_birth": date(2012, 1, 1),
+        "grade_level": "5",
+        "case_manager_auth_id": case_manager,
+        "school_district": district,
+    }
+
+
+def iep_data(student_id, status, version=1, review_date=None, goals=()):
+    return {
+        "student_id": student_id,
+        "academic_year": "2025-2026",
+        "status": status,
+        "version": version,
+        "review_date": review_date,
+        "created_by": 1,
+        "goals": [
+            {"domain": "Reading", "goal_text": "Read", "target_criteria": "80%",
+             "measurement_method": "probe", "progress_status": progress}
+            for progress in goals
+        ],
+    }
+
+
+def uid(record):
+    return UUID(record["id"])
+
+
+async def all_stats(session):
+    """Every scope row as comparable counts"""
+    result = await session.execute(select(DashboardStatistics))
+    return {
+        (row.scope_type, row.scope_key): {field: getattr(row, field) for field in STAT_FIELDS}
+        for row in result.scalars()
+        if any(getattr(row, field) for field in STAT_FIELDS)
+    }
+
+
+class TestIncrementalRefresh:
+    """Test writes keep the statistics equal to a full rebuild"""
+
+    @pytest.mark.asyncio
+    async def test_writes_match_reconcile(self, session):
+        """Student, IEP and goal writes leave the same rows reconcile builds"""
+        students = StudentRepository(session)
+        ieps = IEPRepository(session)
+
+        a = await students.create_student(student_data(1, 7))
+        b = await students.create_student(student_data(2, 7, district="South"))
+        c = await students.create_student(student_data(3, 9))
+
+        first = await ieps.create_iep(iep_data(uid(a), "active", goals=["mastered", "in_progress"]))
+        await ieps.create_iep(iep_data(uid(b), "draft", goals=["not_started"]))
+        other = await ieps.create_iep(iep_data(uid(c), "active", goals=["mastered"]))
+
+        # New version supersedes the first IEP, then moves to review
+        second = await ieps.create_iep(iep_data(uid(a), "draft", version=2, goals=["mastered"]))
+        await ieps.update_iep_status(uid(second), "under_review")
+        goal = await ieps.create_iep_goal({
+            "iep_id": uid(second), "domain": "Math", "goal_text": "Add",
+            "target_criteria": "90%", "measurement_method": "probe",
+        })
+        await ieps.update_goal_progress(uid(goal), "mastered", "Met target")
+        await ieps.delete_iep(uid(other))
+        await students.update_student(uid(b), {"case_manager_auth_id": 9})
+        await students.delete_student(uid(c))
+        await ieps.update_iep(uid(first), {"status": "expired"})
+
+        incremental = await all_stats(session)
+        await DashboardStatsRepository(session).reconcile()
+        rebuilt = await all_stats(session)
+
+        assert incremental == rebuilt
+        assert rebuilt[("case_manager", "7")] == {
+            "total_students": 1, "active_ieps": 1, "pending_approvals": 1,
+            "goals_achieved": 2, "total_goals": 2, "overdue_reviews": 0,
+        }
+        assert rebuilt[("all", "*")]["total_students"] == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_failure_keeps_write(self, session, monkeypatch):
+        """A failed refresh rolls back its savepoint but not the student write"""
+        async def fail(self, student_ids):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(DashboardStatsRepository, "refresh_students", fail)
+        created = await StudentRepository(session).create_student(student_data(1, 7))
+
+        assert await StudentRepository(session).get_student(uid(created)) is not None
+        assert await all_stats(session) == {}
+
+
+class TestGetStats:
+    """Test reading a scope's statistics"""
+
+    @pytest.mark.asyncio
+    async def test_missing_scope_is_zero(self, session):
+        """Scopes without students read as zeros with full compliance"""
+        stats = await DashboardStatsRepository(session).get_stats("case_manager", "42")
+
+        assert {field: stats[field] for field in STAT_FIELDS} == dict.fromkeys(STAT_FIELDS, 0)
+        assert stats["compliance_rate"] == 100.0
+        assert stats["updated_at"] is None
+
+    @pytest.mark.asyncio
+    async def test_overdue_reviews_lower_compliance(self, session):
+        """Active IEPs past their review date count as overdue"""
+        students = StudentRepository(session)
+        ieps = IEPRepository(session)
+        past = date.today() - timedelta(days=5)
+        future = date.today() + timedelta(days=30)
+
+        for n, review_date in enumerate([past, future, future, future], start=1):
+            student = await students.create_student(student_data(n, 7))
+            await ieps.create_iep(iep_data(uid(student), "active", review_date=review_date))
+
+        stats = await DashboardStatsRepository(session).get_stats("case_manager", "7")
+
+        assert stats["active_ieps"] == 4
+        assert stats["overdue_reviews"] == 1
+        assert stats["compliance_rate"] == 75.0
+
+    @pytest.mark.asyncio
+    async def test_caseload_summary_reads_stats(self, session):
+        """The case manager summary uses the materialized totals"""
+        students = StudentRepository(session)
+        created = await students.create_student(student_data(1, 7))
+        drafted = await students.create_student(student_data(2, 7))
+        await IEPRepository(session).create_iep(iep_data(uid(created), "active"))
+        await IEPRepository(session).create_iep(iep_data(uid(drafted), "draft"))
+
+        summary = await students.get_student_caseload_summary(7)
+
+        assert summary["total_students"] == 2
+        # Only status == "active" IEPs; drafts are not counted here
+        assert summary["active_ieps"] == 1
@@ -0,0 +1,152 @@
+"""Test the job event bus behind job long-poll and event streams"""
+import asyncio
+import json
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime
+
+import pytest
+
+from src.workers.job_events import JobEventBus, job_snapshot, wait_for_terminal
+
+
+async def watch_many(stack, bus, job_id, count):
+    return [await stack.enter_async_context(bus.watch(job_id)) for _ in range(count)]
+
+
+class TestJobEventBus:
+    """Test fan-out of job state changes"""
+
+    @pytest.mark.asyncio
+    async def test_publish_reaches_every_watcher(self):
+        """One published event is delivered to every watcher of the job"""
+        bus = JobEventBus(poll_interval=60)
+        async with AsyncExitStack() as stack:
+            queues = await watch_many(stack, bus, "job-1", 1000)
+            bus.publish(job_snapshot("job-1", "processing", 50, "Calling RAG IEP generation"))
+            bus.publish(job_snapshot("job-1", "processing", 50, "Calling RAG IEP generation"))
+
+            assert all(q.qsize() == 1 for q in queues)
+            assert bus.get_stats()["events_published"] == 1
+            assert bus.get_stats()["fallback_poll_queries"] == 0
+
+        assert bus.get_stats()["watchers"] == 0
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_unwatched_jobs_are_ignored(self):
+        """Events for jobs nobody is watching are not retained"""
+        bus = JobEventBus(poll_interval=60)
+        bus.publish(job_snapshot("job-1", "completed", 100, None))
+        async with bus.watch("job-1") as queue:
+            assert queue.empty()
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_fallback_poll_shared_across_watchers(self, monkeypatch):
+        """Watchers of many jobs share one status query per interval"""
+        bus = JobEventBus(poll_interval=0.05)
+        statuses = {"job-1": "processing", "job-2": "processing"}
+        calls = []
+
+        async def fetch_statuses(job_ids):
+            calls.append(sorted(job_ids))
+            return dict(statuses)
+
+        monkeypatch.setattr(bus, "_fetch_statuses", fetch_statuses)
+        async with AsyncExitStack() as stack:
+            first = await watch_many(stack, bus, "job-1", 200)
+            second = await watch_many(stack, bus, "job-2", 200)
+            for job_id in statuses:
+                bus.seed(job_snapshot(job_id, "processing", 50, None))
+
+            statuses["job-1"] = "completed"
+            await asyncio.sleep(0.18)
+
+            assert 1 <= len(calls) <= 4
+            assert calls[0] == ["job-1", "job-2"]
+            assert all(q.get_nowait()["status"] == "completed" for q in first)
+            assert all(q.empty() for q in second)
+        await bus.stop()
+
+
+class TestLongPollWait:
+    """Test the long-poll wait loop"""
+
+    @pytest.mark.asyncio
+    async def test_wakes_on_terminal_event(self):
+        """The wait returns as soon as the job reaches a terminal status"""
+        bus = JobEventBus(poll_interval=60)
+        async with bus.watch("job-1") as queue:
+            initial = job_snapshot("job-1", "pending", 0, None)
+            waiter = asyncio.create_task(wait_for_terminal(queue, initial, 30))
+
+            started = time.perf_counter()
+            bus.publish(job_snapshot("job-1", "processing", 50, "Calling RAG IEP generation"))
+            bus.publish(job_snapshot("job-1", "completed", 100, "Generation completed successfully"))
+            latest = await waiter
+
+        assert latest["status"] == "completed"
+        assert time.perf_counter() - started < 1
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_latest_progress(self):
+        """On timeout the last observed progress is returned"""
+        bus = JobEventBus(poll_interval=60)
+        async with bus.watch("job-1") as queue:
+            bus.publish(job_snapshot("job-1", "processing", 50, "Calling RAG IEP generation"))
+            latest = await wait_for_terminal(queue, job_snapshot("job-1", "pending", 0, None), 0.1)
+
+        assert latest["status"] == "processing"
+        assert latest["progress_percentage"] == 50
+        await bus.stop()
+
+
+class TestJobEventStream:
+    """Test the server-sent event stream for a job"""
+
+    @pytest.mark.asyncio
+    async def test_job_deleted_before_final_event(self, monkeypatch):
+        """A job removed once finished still ends the stream with its last snapshot"""
+        monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+        from src.routers import async_jobs
+        from src.services.async_job_service import JobStatus
+
+        bus = JobEventBus(poll_interval=60)
+        reads = [
+            JobStatus(
+                job_id="job-1", status="processing", progress_percentage=50,
+                status_message="Calling RAG IEP generation", created_at=datetime.utcnow(),
+                completed_at=None, failed_at=None, result=None, error_details=None
+            ),
+            None
+        ]
+
+        class FakeJobService:
+            def __init__(self, session):
+                pass
+
+            async def get_job_status(self, job_id):
+                return reads[0]
+
+        async def read_job_status(job_id):
+            return reads.pop(0)
+
+        async def get_request_session(request):
+            return None
+
+        monkeypatch.setattr(async_jobs, "get_job_event_bus", lambda: bus)
+        monkeypatch.setattr(async_jobs, "AsyncJobService", FakeJobService)
+        monkeypatch.setattr(async_jobs, "_read_job_status", read_job_status)
+        monkeypatch.setattr(async_jobs, "get_request_session", get_request_session)
+
+        response = await async_jobs.stream_job_events("job-1", request=None, current_user_id=1)
+        stream = response.body_iterator
+        assert (await stream.__anext__()).startswith("event: status")
+
+        bus.publish(job_snapshot("job-1", "completed", 100, "Generation completed successfully"))
+        final = await stream.__anext__()
+        assert final.startswith("event: completed")
+        assert json.loads(final.split("data: ", 1)[1])["progress_percentage"] == 100
+        await bus.stop()
@@ -0,0 +1,191 @@
+"""Test cursor (keyset) pagination and listing counts"""
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database import Base
+from src.models.special_education_models import IEP, Student
+from src.repositories.iep_repository import IEPRepository
+from src.repositories.student_repository import StudentRepository
+from src.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def add_students(session, count):
+    """Students with many duplicate names so ties are broken by id"""
+    await session.execute(insert(Student), [
+        {"id": uuid.uuid4(), "student_id": f"S-{n:05d}", "first_name": f"F{n % 3}",
+         "last_name": f"L{n % 7}", "date_of_birth": date(2012, 1, 1), "grade_level": "5",
+         "disability_codes": [], "case_manager_auth_id": 7 if n % 2 else 9}
+        for n in range(count)
+    ])
+    await session.commit()
+
+
+class TestCursorEncoding:
+    """Test opaque cursor round-trips"""
+
+    def test_round_trip(self):
+        """Datetimes, UUIDs and plain values survive encoding"""
+        values = [datetime(2025, 8, 1, 9, 30, tzinfo=timezone.utc), uuid.uuid4(), "Smith", 3]
+        cursor = encode_cursor(values)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == values
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor([1])[:-2] + "!!", "e30"])
+    def test_malformed(self, cursor):
+        """Garbage cursors raise InvalidCursorError"""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+class TestStudentPagination:
+    """Test the student listing count and keyset pages"""
+
+    @pytest.mark.asyncio
+    async def test_count_is_exact_past_1000(self, session):
+        """Counts are a COUNT query, not the length of a capped listing"""
+        await add_students(session, 1205)
+        repo = StudentRepository(session)
+        assert await repo.count_students() == 1205
+        assert await repo.count_students(case_manager_auth_id=7) == 602
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_listing_once(self, session):
+        """Following cursors yields every student once, in name order"""
+        await add_students(session, 95)
+        repo = StudentRepository(session)
+        expected = [s["id"] for s in await repo.list_students(limit=1000)]
+
+        seen, cursor = [], None
+        while True:
+            page = await repo.list_students_page(limit=10, cursor=cursor)
+            seen.extend(s["id"] for s in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == expected
+        assert len(seen) == 95
+
+    @pytest.mark.asyncio
+    async def test_deep_page_is_one_range_query(self, session):
+        """Later pages use the cursor predicate, never OFFSET"""
+        await add_students(session, 60)
+        repo = StudentRepository(session)
+        page = await repo.list_students_page(limit=25)
+        page = await repo.list_students_page(limit=25, cursor=page["next_cursor"])
+
+        statements = []
+        sync_engine = session.bind.sync_engine
+
+        def record(conn, cursor, statement, parameters, *args):
+            statements.append((statement, parameters))
+
+        event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            last = await repo.list_students_page(limit=25, cursor=page["next_cursor"])
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record)
+
+        assert len(last["items"]) == 10
+        assert last["next_cursor"] is None
+        assert len(statements) == 1
+        # SQLite always renders "LIMIT ? OFFSET ?"; nothing is skipped
+        statement, parameters = statements[0]
+        assert statement.endswith("LIMIT ? OFFSET ?")
+        assert parameters[-1] == 0
+
+    @pytest.mark.asyncio
+    async def test_cursor_from_other_listing_rejected(self, session):
+        """A cursor with the wrong key shape is refused"""
+        with pytest.raises(InvalidCursorError):
+            await StudentRepository(session).list_students_page(cursor=encode_cursor([1, 2]))
+
+
+class TestIEPPagination:
+    """Test keyset pages for IEP listings"""
+
+    @pytest.fixture
+    async def ieps(self, session):
+        student = Student(student_id="S-1", first_name="A", last_name="B",
+                          date_of_birth=date(2012, 1, 1), grade_level="5", disability_codes=[])
+        session.add(student)
+        await session.flush()
+        start = datetime(2025, 1, 1)
+        rows = [
+            IEP(student_id=student.id, academic_year=f"20{n:02d}", status="under_review",
+                content={}, version=1, created_by_auth_id=1,
+                # Pairs share a timestamp so the id tie-breaker matters
+                created_at=start + timedelta(days=n // 2))
+            for n in range(7)
+        ]
+        session.add_all(rows)
+        await session.commit()
+        return student, rows
+
+    @staticmethod
+    async def walk(fetch):
+        seen, cursor = [], None
+        while True:
+            page = await fetch(cursor)
+            seen.extend(iep["id"] for iep in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return seen
+
+    @pytest.mark.asyncio
+    async def test_student_ieps_newest_first(self, session, ieps):
+        """Student IEP pages run newest to oldest without gaps"""
+        student, rows = ieps
+        repo = IEPRepository(session)
+        seen = await self.walk(lambda c: repo.get_student_ieps_page(student.id, limit=3, cursor=c))
+        expected = [str(r.id) for r in sorted(rows, key=lambda r: (r.created_at, r.id), reverse=True)]
+        assert seen == expected
+
+    @pytest.mark.asyncio
+    async def test_approval_queue_oldest_first(self, session, ieps):
+        """Approval pages run oldest to newest without gaps"""
+        _, rows = ieps
+        repo = IEPRepository(session)
+        seen = await self.walk(lambda c: repo.get_ieps_for_approval_page(limit=2, cursor=c))
+        expected = [str(r.id) for r in sorted(rows, key=lambda r: (r.created_at, r.id))]
+        assert seen == expected
+
+    @pytest.mark.asyncio
+    async def test_server_default_timestamps(self, session, ieps):
+        """Rows stamped by the database (second precision on SQLite) page without repeats or gaps"""
+        student, _ = ieps
+        defaulted = [
+            IEP(student_id=student.id, academic_year=f"21{n:02d}", status="under_review",
+                content={}, version=1, created_by_auth_id=1)
+            for n in range(6)
+        ]
+        session.add_all(defaulted)
+        await session.commit()
+        rows = (await session.execute(select(IEP))).scalars().all()
+        newest_first = [str(r.id) for r in sorted(rows, key=lambda r: (r.created_at, r.id), reverse=True)]
+        repo = IEPRepository(session)
+
+        for limit in (1, 2, 4):
+            seen = await self.walk(lambda c: repo.get_student_ieps_page(student.id, limit=limit, cursor=c))
+            assert seen == newest_first
+            seen = await self.walk(lambda c: repo.get_ieps_for_approval_page(limit=limit, cursor=c))
+            assert seen == newest_first[::-1]
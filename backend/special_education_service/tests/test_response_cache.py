@@ -0,0 +1,196 @@
+"""Test the Gemini response cache and its backends"""
+import asyncio
+import pytest
+
+from src.utils.response_cache import (
+    GeminiResponseCache,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+)
+
+
+class TestCacheKeys:
+    """Test content-addressed key generation"""
+
+    def test_identical_prompts_share_key(self):
+        """Same prompt and params produce the same key"""
+        assert GeminiResponseCache.make_key("prompt", model="m") == \
+            GeminiResponseCache.make_key("prompt", model="m")
+
+    def test_params_change_key(self):
+        """Model or grounding changes are a different cache entry"""
+        base = GeminiResponseCache.make_key("prompt", model="m", grounding=False)
+        assert base != GeminiResponseCache.make_key("prompt", model="m", grounding=True)
+        assert base != GeminiResponseCache.make_key("prompt", model="other", grounding=False)
+
+    def test_content_key_tracks_template_version(self):
+        """Template version and student data both feed the content key"""
+        student = {"student_id": "1", "grade_level": "5"}
+        v1 = GeminiResponseCache.make_content_key("tpl", 1, student)
+        assert v1 == GeminiResponseCache.make_content_key("tpl", 1, dict(student))
+        assert v1 != GeminiResponseCache.make_content_key("tpl", 2, student)
+        assert v1 != GeminiResponseCache.make_content_key("tpl", 1, {**student, "grade_level": "6"})
+        assert v1 != GeminiResponseCache.make_content_key("tpl", 1, student, model="gemini-2.5-pro")
+
+    def test_client_key_follows_configured_model(self):
+        """Changing GEMINI_MODEL invalidates cached responses"""
+        from src.utils.gemini_client import GeminiClient
+
+        flash = GeminiClient.__new__(GeminiClient)
+        flash.model_name = "gemini-2.5-flash"
+        pro = GeminiClient.__new__(GeminiClient)
+        pro.model_name = "gemini-2.5-pro"
+        assert flash._cache_key("prompt", grounding=False) == \
+            GeminiResponseCache.make_key("prompt", model="gemini-2.5-flash", grounding=False)
+        assert flash._cache_key("prompt", grounding=False) != pro._cache_key("prompt", grounding=False)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCacheBackend(max_entries=2)
+    return SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=2)
+
+
+class TestCacheBackends:
+    """Test LRU eviction and TTL on each local backend"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, backend):
+        """Stored values come back unchanged"""
+        await backend.set("k", {"raw_text": "{}", "usage": {"total_tokens": 3}}, 60)
+        assert await backend.get("k") == {"raw_text": "{}", "usage": {"total_tokens": 3}}
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, backend):
+        """The least recently used entry is evicted past max_entries"""
+        await backend.set("a", 1, 60)
+        await asyncio.sleep(0.01)
+        await backend.set("b", 2, 60)
+        await asyncio.sleep(0.01)
+        assert await backend.get("a") == 1  # "b" is now least recently used
+        await asyncio.sleep(0.01)
+        await backend.set("c", 3, 60)
+        assert await backend.get("b") is None
+        assert await backend.get("a") == 1
+        assert await backend.size() == 2
+
+    @pytest.mark.asyncio
+    async def test_expiry(self, backend):
+        """Expired entries are misses"""
+        await backend.set("k", "v", -1)
+        assert await backend.get("k") is None
+
+
+class TestGeminiResponseCache:
+    """Test cache-through generation and metrics"""
+
+    @pytest.mark.asyncio
+    async def test_get_or_generate_counts_hits(self):
+        """Second identical call is served from cache"""
+        cache = GeminiResponseCache(MemoryCacheBackend())
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            return {"raw_text": "{}"}
+
+        key = cache.make_key("prompt")
+        await cache.get_or_generate(key, generate)
+        await cache.get_or_generate(key, generate)
+
+        stats = await cache.get_stats()
+        assert len(calls) == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_opt_out_bypasses_cache(self):
+        """use_cache=False always calls the model"""
+        cache = GeminiResponseCache(MemoryCacheBackend())
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            return "fresh"
+
+        key = cache.make_key("prompt")
+        await cache.set(key, "stale")
+        assert await cache.get_or_generate(key, generate, use_cache=False) == "fresh"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_is_a_miss(self):
+        """A failing backend degrades to uncached generation"""
+        class BrokenBackend(MemoryCacheBackend):
+            async def get(self, key):
+                raise ConnectionError("down")
+
+        cache = GeminiResponseCache(BrokenBackend())
+
+        async def generate():
+            return "value"
+
+        assert await cache.get_or_generate("k", generate) == "value"
+        assert cache.errors == 1
+
+
+class TestCallerCacheControl:
+    """Test the per-call opt-out and caller-supplied keys"""
+
+    @pytest.fixture
+    def generator(self):
+        from types import SimpleNamespace
+        from src.rag.iep_generator import IEPGenerator
+
+        class FakeModel:
+            model_name = "gemini-2.5-flash"
+
+            def __init__(self):
+                self.calls = 0
+
+            def generate_content(self, prompt, **kwargs):
+                self.calls += 1
+                return SimpleNamespace(text=f'{{"draft": {self.calls}}}', candidates=[])
+
+        class NoLimit:
+            async def acquire(self):
+                pass
+
+        generator = IEPGenerator.__new__(IEPGenerator)
+        generator.model = FakeModel()
+        generator.rate_limiter = NoLimit()
+        generator.response_cache = GeminiResponseCache(MemoryCacheBackend())
+        return generator
+
+    @pytest.mark.asyncio
+    async def test_regenerate_section_skips_cache(self, generator):
+        """An identical section prompt is cached unless use_cache=False"""
+        context = {"student_name": "Alex", "grade_level": "5", "disability_type": "SLD"}
+
+        first = await generator._generate_section("accommodations", {}, context)
+        again = await generator._generate_section("accommodations", {}, context)
+        assert generator.model.calls == 1
+        assert again == first
+
+        fresh = await generator._generate_section("accommodations", {}, context, use_cache=False)
+        assert generator.model.calls == 2
+        assert fresh != first
+
+    @pytest.mark.asyncio
+    async def test_client_uses_content_key(self):
+        """generate_iep_content looks up a caller-supplied content key instead of the prompt hash"""
+        from src.utils.gemini_client import GeminiClient
+
+        client = GeminiClient.__new__(GeminiClient)
+        client.model_name = "gemini-2.5-flash"
+        client.response_cache = GeminiResponseCache(MemoryCacheBackend())
+        student = {"student_id": "1", "grade_level": "5"}
+        template = {"id": "tpl", "version": 3, "name": "Default", "sections": {}}
+        key = GeminiResponseCache.make_content_key("tpl", 3, student, model=client.model_name, grounding=False)
+        await client.response_cache.set(key, {"raw_text": '{"draft": 1}', "usage": {"total_tokens": 1}})
+
+        result = await client.generate_iep_content(student, template, cache_key=key)
+        assert result["cached"] is True
+        assert result["raw_text"] == '{"draft": 1}'
@@ -0,0 +1,147 @@
+"""Test the precompiled score extraction and classification scanners"""
+import random
+import re
+import time
+import pytest
+
+from src.services.document_ai_service import SCORE_PATTERNS, SCORE_SCANNER
+from src.services.document_metadata_extractor import (
+    ASSESSMENT_TYPE_COUNTER,
+    ASSESSMENT_TYPE_PATTERNS,
+    DOCUMENT_TYPE_COUNTER,
+    DOCUMENT_TYPE_PATTERNS,
+)
+from src.utils.pattern_scanner import PatternCounter, ScorePatternScanner
+
+
+def legacy_scan(text):
+    """Per-pattern finditer loop the scanner replaced"""
+    results = []
+    for test_name, patterns in SCORE_PATTERNS.items():
+        for pattern, subtest_name, confidence in patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE | re.DOTALL):
+                results.append((test_name, subtest_name, int(match.group(1)), confidence,
+                                match.start(), match.end()))
+    return results
+
+
+def legacy_count(patterns, text):
+    """Per-pattern findall sums the counter replaced"""
+    return {
+        key: sum(len(re.findall(pattern, text, re.IGNORECASE)) for pattern in key_patterns)
+        for key, key_patterns in patterns.items()
+    }
+
+
+SAMPLE_REPORT = """
+Psychoeducational Evaluation Report - WISC-V and WIAT-IV
+
+Full Scale IQ (FSIQ) Standard Score: 102
+Verbal Comprehension Index: 98
+Perceptual Reasoning was not administered.
+Working Memory
+  WMI 88
+Processing Speed Index (PSI): 76
+Nonverbal Index: 110
+General Ability noted as a relative strength.
+
+WIAT-IV
+Overall composite achievement, Standard: 91
+Basic Reading SS 85
+Word Reading Standard 84
+Reading Comprehension Standard Score: 79
+Math Problem Solving SS: 93
+Numerical Operations Standard: 88
+Written Expression has no score reported.
+"""
+
+SECTION_TEMPLATES = [
+    "Full Scale IQ Standard Score: {n}",
+    "Verbal Comprehension Index {n}",
+    "Processing Speed (PSI) {n}",
+    "Working Memory Index: {n}",
+    "Basic Reading SS {n}",
+    "Total Achievement Standard: {n}",
+    "Reading Comprehension SS: {n}",
+    "Math Problem Solving Standard {n}",
+    "The student was cooperative and attentive during the {n} minute session.",
+    "Teacher reports concerns with reading fluency and working memory.",
+    "General Ability was discussed with parents.",
+    "Behavior Assessment System for Children third edition (BASC-3) was completed.",
+]
+
+
+def synthetic_report(pages, seed=7):
+    """Large report mixing score lines with narrative that only mentions labels"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(pages * 40):
+        lines.append(rng.choice(SECTION_TEMPLATES).format(n=rng.randint(40, 160)))
+    return "\n".join(lines)
+
+
+class TestScorePatternScanner:
+    """Test the scanner produces exactly the legacy regex matches"""
+
+    def test_matches_legacy_on_sample(self):
+        """Sample report with labels lacking scores and multi-part labels"""
+        assert [tuple(m) for m in SCORE_SCANNER.scan(SAMPLE_REPORT)] == legacy_scan(SAMPLE_REPORT)
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_matches_legacy_on_synthetic(self, seed):
+        """Randomised reports agree match-for-match, in order"""
+        text = synthetic_report(5, seed=seed)
+        assert [tuple(m) for m in SCORE_SCANNER.scan(text)] == legacy_scan(text)
+
+    def test_trailing_label_without_score(self):
+        """A label after the last score yields nothing"""
+        text = "Working Memory Index 90\nWorking Memory was an area of concern."
+        matches = [m for m in SCORE_SCANNER.scan(text) if m.subtest_name == "Working Memory Index"]
+        assert [m.value for m in matches] == [90]
+
+    def test_pattern_requires_label(self):
+        """A bare score pattern cannot be split into label and terminal"""
+        with pytest.raises(ValueError):
+            ScorePatternScanner({"X": [(r"(\d{2,3})", "score", 0.5)]})
+
+
+class TestPatternCounter:
+    """Test single-pass classification counts"""
+
+    def test_document_types_match_findall(self):
+        """Document type counts equal the per-pattern findall sums"""
+        text = (SAMPLE_REPORT + synthetic_report(2)).lower() + \
+            " iep annual goals progress report fba bip speech language evaluation"
+        assert DOCUMENT_TYPE_COUNTER.count(text) == legacy_count(DOCUMENT_TYPE_PATTERNS, text)
+
+    def test_assessment_types_match_findall(self):
+        """Assessment type counts equal the per-pattern findall sums"""
+        text = (SAMPLE_REPORT + " wisc 5, wj-iv, woodcock johnson iv, conners 3, basc iii").lower()
+        assert ASSESSMENT_TYPE_COUNTER.count(text) == legacy_count(ASSESSMENT_TYPE_PATTERNS, text)
+
+    def test_unmatched_keys_are_zero(self):
+        """Every key is reported even without matches"""
+        counter = PatternCounter({"a": [r"alpha"], "b": [r"beta"]})
+        assert counter.count("alpha alpha") == {"a": 2, "b": 0}
+
+
+@pytest.mark.performance
+class TestScoreExtractionBenchmark:
+    """Micro-benchmark on a large report"""
+
+    def test_scanner_faster_than_legacy(self):
+        """An ~80 page report scans faster than the per-pattern loop"""
+        text = synthetic_report(80)
+
+        start = time.perf_counter()
+        expected = legacy_scan(text)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = [tuple(m) for m in SCORE_SCANNER.scan(text)]
+        scanner_seconds = time.perf_counter() - start
+
+        print(f"\nlegacy {legacy_seconds:.3f}s, scanner {scanner_seconds:.3f}s, "
+              f"{len(actual)} matches over {len(text)} chars")
+        assert actual == expected
+        assert scanner_seconds < legacy_seconds
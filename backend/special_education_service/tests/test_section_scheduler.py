@@ -0,0 +1,123 @@
+"""Test concurrent section scheduling and Gemini rate limiting"""
+import asyncio
+import time
+import pytest
+
+from src.rag.section_scheduler import SectionScheduler
+from src.utils.rate_limiter import TokenBucketRateLimiter
+
+
+def _fallback(name, error):
+    return {"content": f"fallback {name}", "error": type(error).__name__}
+
+
+class TestSectionScheduler:
+    """Test the SectionScheduler fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_results_keep_submission_order(self):
+        """Sections finishing out of order are returned in template order"""
+        def job(value, delay):
+            async def run():
+                await asyncio.sleep(delay)
+                return value
+            return run
+
+        scheduler = SectionScheduler(max_concurrency=3, section_timeout=5)
+        results = await scheduler.run(
+            [("a", job(1, 0.03)), ("b", job(2, 0.01)), ("c", job(3, 0.02))],
+            _fallback
+        )
+        assert list(results.keys()) == ["a", "b", "c"]
+        assert list(results.values()) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than max_concurrency sections run at once"""
+        running = 0
+        peak = 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "ok"
+
+        scheduler = SectionScheduler(max_concurrency=2, section_timeout=5)
+        await scheduler.run([(f"s{i}", job) for i in range(6)], _fallback)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_errors_use_fallback(self):
+        """A slow or failing section is replaced without failing the others"""
+        async def slow():
+            await asyncio.sleep(1)
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        async def fine():
+            return "ok"
+
+        scheduler = SectionScheduler(max_concurrency=3, section_timeout=0.05)
+        results = await scheduler.run(
+            [("slow", slow), ("broken", broken), ("fine", fine)], _fallback
+        )
+        assert results["slow"]["error"] == "TimeoutError"
+        assert results["broken"]["error"] == "RuntimeError"
+        assert results["fine"] == "ok"
+
+
+    @pytest.mark.asyncio
+    async def test_on_result_reports_completion_order(self):
+        """on_result sees each section as soon as it finishes"""
+        def job(value, delay):
+            async def run():
+                await asyncio.sleep(delay)
+                return value
+            return run
+
+        seen = []
+
+        async def on_result(name, result):
+            seen.append((name, result))
+
+        scheduler = SectionScheduler(max_concurrency=2, section_timeout=5)
+        await scheduler.run(
+            [("slow", job(1, 0.03)), ("fast", job(2, 0.01))],
+            _fallback,
+            on_result=on_result
+        )
+        assert seen == [("fast", 2), ("slow", 1)]
+
+
+class TestTokenBucketRateLimiter:
+    """Test the TokenBucketRateLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_immediate(self):
+        """Up to capacity acquisitions do not wait"""
+        limiter = TokenBucketRateLimiter(rate=1, capacity=3)
+        started = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        assert time.monotonic() - started < 0.05
+
+    @pytest.mark.asyncio
+    async def test_sustained_rate_is_limited(self):
+        """Acquisitions beyond the burst are spaced at 1/rate"""
+        limiter = TokenBucketRateLimiter(rate=20, capacity=1)
+        started = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire()
+        # First token is free, the remaining four need ~0.05s each
+        assert time.monotonic() - started >= 0.18
+
+    def test_invalid_arguments(self):
+        """Non-positive rate or capacity is rejected"""
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(rate=1, capacity=0)
@@ -0,0 +1,126 @@
+"""Test lazy request sessions and connection release around external calls"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.database import PoolMetrics, release_session_connection
+from src.middleware import session_middleware
+from src.middleware.session_middleware import RequestScopedSessionMiddleware, get_request_session
+
+
+@pytest.fixture
+async def pooled(tmp_path, monkeypatch):
+    """A two-connection pool with its own metrics, wired into the middleware"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=0.5,
+    )
+    metrics = PoolMetrics()
+    metrics.attach(engine)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (name TEXT)"))
+    metrics.reset()
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(session_middleware, "async_session_factory", factory)
+    monkeypatch.setattr(session_middleware, "pool_metrics", metrics)
+    monkeypatch.setattr("src.database.pool_metrics", metrics)
+    yield factory, metrics
+    await engine.dispose()
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(RequestScopedSessionMiddleware)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/items/{name}")
+    async def add_item(name: str, request: Request):
+        db = await get_request_session(request)
+        await db.execute(text("INSERT INTO items (name) VALUES (:name)"), {"name": name})
+        return {"name": name}
+
+    return app
+
+
+async def generate(factory, name, release):
+    """Read, wait on a slow external call, then write"""
+    async with factory() as session:
+        await session.execute(text("SELECT COUNT(*) FROM items"))
+        if release:
+            await release_session_connection(session)
+        await asyncio.sleep(0.3)
+        await session.execute(text("INSERT INTO items (name) VALUES (:name)"), {"name": name})
+        await session.commit()
+
+
+class TestLazyRequestSession:
+    """Test the middleware only opens a session when one is used"""
+
+    @pytest.mark.asyncio
+    async def test_no_session_without_database_use(self, pooled):
+        """Requests that never ask for a session never check out a connection"""
+        _, metrics = pooled
+        transport = httpx.ASGITransport(app=make_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(5):
+                assert (await client.get("/ping")).status_code == 200
+
+        stats = metrics.get_stats()
+        assert stats["requests"] == 5
+        assert stats["requests_with_session"] == 0
+        assert stats["checkouts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_session_committed_and_returned(self, pooled):
+        """A lazily opened session is committed and its connection checked back in"""
+        factory, metrics = pooled
+        transport = httpx.ASGITransport(app=make_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.post("/items/a")).status_code == 200
+
+        async with factory() as session:
+            assert (await session.execute(text("SELECT name FROM items"))).scalars().all() == ["a"]
+        assert metrics.get_stats()["requests_with_session"] == 1
+        assert metrics.checked_out == 0
+
+
+class TestConnectionRelease:
+    """Test releasing the connection around long external awaits"""
+
+    @pytest.mark.asyncio
+    async def test_release_and_reattach(self, pooled):
+        """The connection is returned during the wait and re-acquired for the write"""
+        factory, metrics = pooled
+        async with factory() as session:
+            await session.execute(text("SELECT 1"))
+            assert metrics.checked_out == 1
+            await release_session_connection(session)
+            assert metrics.checked_out == 0
+            await session.execute(text("INSERT INTO items (name) VALUES ('x')"))
+            assert metrics.checked_out == 1
+            await session.commit()
+        assert metrics.connection_releases == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_generations_fit_small_pool(self, pooled):
+        """Six concurrent generations share two connections once they release"""
+        factory, metrics = pooled
+        await asyncio.gather(*(generate(factory, f"g{n}", release=True) for n in range(6)))
+        assert metrics.peak_checked_out <= 2
+
+        results = await asyncio.gather(
+            *(generate(factory, f"h{n}", release=False) for n in range(6)),
+            return_exceptions=True
+        )
+        assert any(isinstance(r, PoolTimeoutError) for r in results)
@@ -0,0 +1,150 @@
+"""Test incremental parsing of streamed Gemini JSON"""
+import json
+import pytest
+
+from src.utils.streaming_json import IncrementalJSONObjectParser
+
+
+DOCUMENT = {
+    "student_info": {"name": "A {tricky} \"name\"", "grade": "5"},
+    "goals": [{"goal_text": "Read, fluently", "targets": [1, 2]}],
+    "accommodations": "Extended time",
+    "empty": {}
+}
+
+
+class TestIncrementalJSONObjectParser:
+    """Test section-by-section emission across chunk boundaries"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 17, 10000])
+    def test_members_emitted_in_order(self, chunk_size):
+        """Every member is emitted once, whatever the chunking"""
+        text = json.dumps(DOCUMENT, indent=2)
+        parser = IncrementalJSONObjectParser()
+        emitted = []
+        for i in range(0, len(text), chunk_size):
+            emitted.extend(parser.feed(text[i:i + chunk_size]))
+
+        assert emitted == list(DOCUMENT.items())
+        assert parser.finished
+        assert parser.result() == DOCUMENT
+
+    def test_member_emitted_before_document_ends(self):
+        """A section is available as soon as the next one starts"""
+        parser = IncrementalJSONObjectParser()
+        assert parser.feed('{"present_levels": {"reading": "Grade 3"') == []
+        assert parser.feed('}, "goals": [') == [("present_levels", {"reading": "Grade 3"})]
+
+    def test_preamble_and_fences_are_skipped(self):
+        """Markdown fences around the object are ignored"""
+        parser = IncrementalJSONObjectParser()
+        emitted = parser.feed('```json\n{"a": 1, "b": "x}"}\n```')
+        assert emitted == [("a", 1), ("b", "x}")]
+
+    def test_escaped_quotes_in_strings(self):
+        """Escaped quotes and backslashes do not end a string early"""
+        parser = IncrementalJSONObjectParser()
+        emitted = parser.feed('{"a": "say \\"hi\\", ok\\\\", "b": 2}')
+        assert emitted == [("a", 'say "hi", ok\\'), ("b", 2)]
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class _StreamingModel:
+    """Fake GenerativeModel returning the response in small chunks"""
+
+    def __init__(self, text, chunk_size=7):
+        self.chunks = [_Chunk(text[i:i + chunk_size]) for i in range(0, len(text), chunk_size)]
+
+    def generate_content(self, prompt, stream=False):
+        assert stream
+        return self.chunks
+
+
+class TestGeminiStreaming:
+    """Test GeminiClient.stream_iep_content event sequence"""
+
+    @pytest.mark.asyncio
+    async def test_sections_then_result(self, monkeypatch):
+        """Sections stream first; the final result matches generate_iep_content"""
+        monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+        from src.utils.gemini_client import GeminiClient
+
+        client = GeminiClient()
+        client.response_cache = None
+        client.model = _StreamingModel(json.dumps(DOCUMENT))
+        monkeypatch.setattr(client, "_build_iep_prompt", lambda *args: "prompt")
+
+        events = [
+            event async for event in client.stream_iep_content(
+                student_data={"student_id": "s1"}, template_data={}
+            )
+        ]
+
+        assert [e["section"] for e in events[:-1]] == list(DOCUMENT.keys())
+        assert events[-1]["type"] == "result"
+        assert json.loads(events[-1]["result"]["raw_text"]) == DOCUMENT
+
+    @pytest.mark.asyncio
+    async def test_stream_is_retried_and_rate_limited(self, monkeypatch):
+        """A failure before any section is retried under the shared guards"""
+        monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+        from tenacity import wait_none
+        from src.utils import gemini_client
+        from src.utils.gemini_client import GeminiClient
+
+        monkeypatch.setitem(gemini_client.GEMINI_RETRY_POLICY, "wait", wait_none())
+        client = GeminiClient()
+        client.response_cache = None
+        acquired = []
+
+        class _Limiter:
+            async def acquire(self):
+                acquired.append(1)
+
+        class _FlakyModel(_StreamingModel):
+            calls = 0
+
+            def generate_content(self, prompt, stream=False):
+                _FlakyModel.calls += 1
+                if _FlakyModel.calls == 1:
+                    raise ConnectionError("stream reset")
+                return super().generate_content(prompt, stream)
+
+        client.rate_limiter = _Limiter()
+        client.model = _FlakyModel(json.dumps(DOCUMENT))
+        monkeypatch.setattr(client, "_build_iep_prompt", lambda *args: "prompt")
+
+        events = [
+            event async for event in client.stream_iep_content(
+                student_data={"student_id": "s1"}, template_data={}
+            )
+        ]
+
+        assert [e["section"] for e in events[:-1]] == list(DOCUMENT.keys())
+        assert len(acquired) == 2
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_rejects_stream(self, monkeypatch):
+        """Streaming honours the client's circuit breaker"""
+        monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+        from pybreaker import CircuitBreakerError
+        from tenacity import wait_none
+        from src.utils import gemini_client
+        from src.utils.gemini_client import GeminiClient
+
+        monkeypatch.setitem(gemini_client.GEMINI_RETRY_POLICY, "wait", wait_none())
+        client = GeminiClient()
+        client.response_cache = None
+        client.model = _StreamingModel(json.dumps(DOCUMENT))
+        client.circuit_breaker.open()
+        monkeypatch.setattr(client, "_build_iep_prompt", lambda *args: "prompt")
+
+        with pytest.raises(CircuitBreakerError):
+            async for _ in client.stream_iep_content(
+                student_data={"student_id": "s1"}, template_data={}
+            ):
+                pass
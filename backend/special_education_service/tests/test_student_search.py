@@ -0,0 +1,174 @@
+"""Test indexed student search and typeahead"""
+import os
+import random
+import time
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database import Base
+from src.models.special_education_models import Student
+from src.repositories.student_repository import StudentRepository
+from src.repositories.student_search_repository import (
+    StudentSearchRepository,
+    ensure_student_search_index,
+    fts_match_expression,
+)
+
+ROSTER = [
+    ("S-001", "Jordan", "Smith"),
+    ("S-002", "Smith", "Jordan"),
+    ("S-010", "Anna", "Smithson"),
+    ("S-011", "Ann", "Lee"),
+    ("T-100", "Omar", "Haddad"),
+]
+
+
+async def make_engine(with_index=True):
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    if with_index:
+        await ensure_student_search_index(engine)
+    return engine
+
+
+def student_data(student_id, first_name, last_name):
+    return {
+        "student_id": student_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "date_of_birth": date(2012, 1, 1),
+        "grade_level": "5",
+    }
+
+
+@pytest.fixture
+async def repo():
+    engine = await make_engine()
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        students = StudentRepository(session)
+        for row in ROSTER:
+            await students.create_student(student_data(*row))
+        yield students
+    await engine.dispose()
+
+
+def ids(results):
+    return [r["student_id"] for r in results]
+
+
+class TestStudentSearch:
+    """Test FTS5-backed ranked prefix search"""
+
+    @pytest.mark.asyncio
+    async def test_prefix_matches(self, repo):
+        """Name and student ID prefixes match; every word must match"""
+        assert set(ids(await repo.search_students("smi"))) == {"S-001", "S-002", "S-010"}
+        assert set(ids(await repo.search_students("S-01"))) == {"S-010", "S-011"}
+        assert ids(await repo.search_students("ann smi")) == ["S-010"]
+        assert await repo.search_students("zzz") == []
+
+    @pytest.mark.asyncio
+    async def test_last_name_ranks_above_first_name(self, repo):
+        """Whole-token hits come first; a last-name hit outranks a first-name hit"""
+        assert ids(await repo.search_students("smith"))[:2] == ["S-001", "S-002"]
+
+    @pytest.mark.asyncio
+    async def test_index_follows_updates(self, repo):
+        """Renames are searchable immediately; deactivated students drop out"""
+        student = (await repo.search_students("haddad"))[0]
+        await repo.update_student(uuid.UUID(student["id"]), {"last_name": "Nasser"})
+        assert await repo.search_students("haddad") == []
+        assert ids(await repo.search_students("nass")) == ["T-100"]
+
+        await repo.delete_student(uuid.UUID(student["id"]))
+        assert await repo.search_students("nass") == []
+
+    @pytest.mark.asyncio
+    async def test_typeahead(self, repo):
+        """Typeahead returns lightweight rows"""
+        suggestions = await repo.typeahead_students("jor", limit=1)
+        assert len(suggestions) == 1
+        assert set(suggestions[0]) == {"id", "student_id", "first_name", "last_name", "full_name", "grade_level"}
+
+    def test_match_expression_is_sanitized(self):
+        """Punctuation and FTS operators in input cannot change the query"""
+        assert fts_match_expression('S-001 "OR" x*') == \
+            '{student_id first_name last_name} : ("s 001"* "or"* "x"*)'
+        assert fts_match_expression("--- ***") is None
+
+
+class TestSearchBackends:
+    """Test index backfill and the scan fallback"""
+
+    @pytest.mark.asyncio
+    async def test_backfill_existing_students(self):
+        """Students inserted before the index exists are backfilled"""
+        engine = await make_engine(with_index=False)
+        async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+            await StudentRepository(session).create_student(student_data(*ROSTER[0]))
+            assert await ensure_student_search_index(engine) == "fts5"
+            found = await StudentSearchRepository(session).search("jord")
+            assert [s.student_id for s in found] == ["S-001"]
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_scan_fallback(self):
+        """Without an index the ILIKE scan still finds substrings"""
+        engine = await make_engine(with_index=False)
+        async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+            students = StudentRepository(session)
+            for row in ROSTER:
+                await students.create_student(student_data(*row))
+            assert set(ids(await students.search_students("mith"))) == {"S-001", "S-002", "S-010"}
+        await engine.dispose()
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(
+    not os.getenv("RUN_BENCHMARKS"),
+    reason="slow, machine-dependent benchmark; set RUN_BENCHMARKS=1 to run"
+)
+class TestStudentSearchBenchmark:
+    """Search latency on a 100k-student district (opt-in)"""
+
+    @pytest.mark.asyncio
+    async def test_indexed_search_latency(self):
+        """Indexed typeahead stays in single-digit milliseconds"""
+        rng = random.Random(3)
+        syllables = ["an", "bel", "cor", "dan", "el", "fin", "gar", "hal", "is", "jon", "ka", "lor", "mar", "ni"]
+
+        def name():
+            return "".join(rng.choice(syllables) for _ in range(3)).capitalize()
+
+        engine = await make_engine()
+        async with engine.begin() as conn:
+            await conn.execute(insert(Student), [
+                {"id": uuid.uuid4(), "student_id": f"D-{n:06d}", "first_name": name(), "last_name": name(),
+                 "date_of_birth": date(2012, 1, 1), "grade_level": "5", "disability_codes": []}
+                for n in range(100_000)
+            ])
+
+        async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+            search = StudentSearchRepository(session)
+            await search.typeahead("warmup")
+            timings = []
+            for term in ["corda", "Hal", "D-0421", "marni el", "jonka"]:
+                start = time.perf_counter()
+                results = await search.typeahead(term, limit=10)
+                timings.append(time.perf_counter() - start)
+                assert results
+            await engine.dispose()
+
+        median = sorted(timings)[len(timings) // 2]
+        print(f"\ntypeahead median {median * 1000:.2f}ms over 100k students")
+        assert median < 0.01
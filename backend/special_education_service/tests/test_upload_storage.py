@@ -0,0 +1,117 @@
+"""Test streaming content-addressed uploads and re-upload dedup"""
+import hashlib
+import io
+import uuid
+
+import pytest
+from fastapi import UploadFile
+
+from src.common.enums import AssessmentType
+from src.models.special_education_models import AssessmentDocument, PsychoedScore, ExtractedAssessmentData
+from src.repositories.assessment_repository import AssessmentRepository
+from src.utils.upload_storage import UploadTooLargeError, content_path, store_upload
+
+
+class CountingStream(io.BytesIO):
+    """BytesIO that records the largest single read"""
+
+    largest_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.largest_read = max(self.largest_read, len(chunk))
+        return chunk
+
+
+def make_upload(data: bytes, filename: str = "report.pdf"):
+    stream = CountingStream(data)
+    return UploadFile(file=stream, filename=filename), stream
+
+
+class TestStoreUpload:
+    """Test the chunked, hashing upload writer"""
+
+    @pytest.mark.asyncio
+    async def test_streams_in_chunks_and_hashes(self, tmp_path):
+        """The file is written in bounded chunks under its SHA-256"""
+        data = b"%PDF-1.7 " + bytes(range(256)) * 4096
+        upload, stream = make_upload(data)
+
+        stored = await store_upload(upload, tmp_path, max_bytes=10 * 1024 * 1024, suffix=".PDF", chunk_size=64 * 1024)
+
+        assert stored.sha256 == hashlib.sha256(data).hexdigest()
+        assert stored.size == len(data)
+        assert stored.path == content_path(tmp_path, stored.sha256, ".pdf")
+        assert stored.path.read_bytes() == data
+        assert stream.largest_read <= 64 * 1024
+        assert not stored.already_stored
+
+    @pytest.mark.asyncio
+    async def test_size_limit_enforced_mid_stream(self, tmp_path):
+        """Reading stops once the limit is exceeded and nothing is left on disk"""
+        upload, stream = make_upload(b"x" * (5 * 1024 * 1024))
+
+        with pytest.raises(UploadTooLargeError):
+            await store_upload(upload, tmp_path, max_bytes=1024 * 1024, chunk_size=256 * 1024)
+
+        assert stream.tell() < 2 * 1024 * 1024
+        assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+    @pytest.mark.asyncio
+    async def test_identical_content_stored_once(self, tmp_path):
+        """A re-upload of the same bytes reuses the stored file"""
+        first = await store_upload(make_upload(b"same scan")[0], tmp_path, max_bytes=1024, suffix=".pdf")
+        second = await store_upload(make_upload(b"same scan", "copy.pdf")[0], tmp_path, max_bytes=1024, suffix=".pdf")
+
+        assert second.path == first.path
+        assert second.already_stored
+        assert len([p for p in tmp_path.rglob("*.pdf")]) == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_upload_rejected(self, tmp_path):
+        """Empty files are rejected"""
+        with pytest.raises(IOError):
+            await store_upload(make_upload(b"")[0], tmp_path, max_bytes=1024)
+
+
+class TestProcessedDocumentReuse:
+    """Test linking re-uploads to existing extraction results"""
+
+    @pytest.mark.asyncio
+    async def test_copy_results_from_processed_duplicate(self, test_session):
+        """A re-upload finds the processed original and receives its scores and extracted data"""
+        content_hash = uuid.uuid4().hex * 2
+        student_id = uuid.uuid4()
+        original = AssessmentDocument(
+            student_id=student_id, document_type=list(AssessmentType)[0], file_path="a.pdf",
+            file_name="a.pdf", content_hash=content_hash, processing_status="completed",
+            extraction_confidence=0.93
+        )
+        reupload = AssessmentDocument(
+            student_id=student_id, document_type=list(AssessmentType)[0], file_path="a.pdf",
+            file_name="a-again.pdf", content_hash=content_hash, processing_status="uploaded"
+        )
+        test_session.add_all([original, reupload])
+        await test_session.flush()
+        test_session.add_all([
+            PsychoedScore(document_id=original.id, test_name="WISC-V", subtest_name="Verbal Comprehension",
+                          score_type="standard_score", standard_score=102),
+            PsychoedScore(document_id=original.id, test_name="WISC-V", subtest_name="Visual Spatial",
+                          score_type="standard_score", standard_score=95),
+            ExtractedAssessmentData(document_id=original.id, raw_text="WISC-V report",
+                                    structured_data={"pages": 12}, extraction_method="google_document_ai")
+        ])
+        await test_session.commit()
+
+        repo = AssessmentRepository(test_session)
+        found = await repo.find_processed_document_by_hash(content_hash, exclude_id=reupload.id)
+        assert found["id"] == str(original.id)
+        assert found["extraction_confidence"] == 0.93
+
+        assert await repo.copy_processing_results(original.id, reupload.id) == 2
+        scores = await repo.get_document_psychoed_scores(reupload.id)
+        assert sorted(s["standard_score"] for s in scores) == [95, 102]
+        extracted = await repo.get_document_extracted_data(reupload.id)
+        assert extracted["structured_data"] == {"pages": 12}
+
+        assert await repo.find_processed_document_by_hash(content_hash, exclude_id=original.id) is None